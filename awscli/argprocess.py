@@ -21,6 +21,7 @@ from awscli import SCALAR_TYPES, COMPLEX_TYPES
 from awscli.paramfile import get_paramfile, ResourceLoadingError
 from awscli.paramfile import PARAMFILE_DISABLED
 from awscli import shorthand
+from awscli.utils import LRUCache
 
 
 LOG = logging.getLogger('awscli.argprocess')
@@ -92,16 +93,31 @@ def uri_param(event_name, param, value, **kwargs):
     """
     cli_argument = param
     qualified_param_name = '.'.join(event_name.split('.')[1:])
-    if qualified_param_name in PARAMFILE_DISABLED or \
-            getattr(cli_argument, 'no_paramfile', None):
+    if is_paramfile_disabled(qualified_param_name, cli_argument):
         return
     else:
         return _check_for_uri_param(cli_argument, value)
 
 
-def _check_for_uri_param(param, value):
+def is_paramfile_disabled(qualified_param_name, cli_argument):
+    """Returns whether ``uri_param`` leaves the value of an argument as is.
+
+    :param qualified_param_name: The name of the argument qualified with
+        its service and operation, e.g. ``ec2.describe-instances.filters``.
+    """
+    return qualified_param_name in PARAMFILE_DISABLED or \
+        bool(getattr(cli_argument, 'no_paramfile', None))
+
+
+def get_uri_param_value(value):
+    """Returns the value ``uri_param`` tries to load as a resource URI."""
     if isinstance(value, list) and len(value) == 1:
         value = value[0]
+    return value
+
+
+def _check_for_uri_param(param, value):
+    value = get_uri_param_value(value)
     try:
         return get_paramfile(value)
     except ResourceLoadingError as e:
@@ -246,10 +262,13 @@ def _is_complex_shape(model):
 
 
 class ParamShorthand(object):
+    # The number of parsed shorthand values that are cached.
+    PARSE_CACHE_SIZE = 1024
 
     def __init__(self):
         self._parser = shorthand.ShorthandParser()
         self._visitor = shorthand.BackCompatVisitor()
+        self._parse_cache = LRUCache(self.PARSE_CACHE_SIZE)
 
     def __call__(self, cli_argument, value, **kwargs):
         """Attempt to parse shorthand syntax for values.
@@ -296,12 +315,12 @@ class ParamShorthand(object):
                 # is given to us "conveniently" as a list.  When
                 # this happens we need to parse each list element
                 # individually.
-                parsed = [self._parser.parse(v) for v in value]
-                self._visitor.visit(parsed, cli_argument.argument_model)
+                parsed = [self._parse(cli_argument.argument_model, v,
+                                      is_element=True)
+                          for v in value]
             else:
                 # Otherwise value is just a string.
-                parsed = self._parser.parse(value)
-                self._visitor.visit(parsed, cli_argument.argument_model)
+                parsed = self._parse(cli_argument.argument_model, value)
         except shorthand.ShorthandParseError as e:
             raise ParamError(cli_argument.cli_name, str(e))
         except (ParamError, ParamUnknownKeyError) as e:
@@ -312,6 +331,26 @@ class ParamShorthand(object):
             raise ParamError(cli_argument.cli_name, str(e))
         return parsed
 
+    def _parse(self, model, value, is_element=False):
+        # The same shorthand value is often given more than once, such as
+        # for the elements of a list argument, so the parsed values are
+        # cached.  A copy is returned because the parsed value can be
+        # modified by the handlers of the parsed arguments.
+        key = (model, value, is_element)
+        parsed = self._parse_cache.get(key)
+        if parsed is None:
+            parsed = self._parser.parse(value)
+            if is_element:
+                # The elements of a list are visited independently of each
+                # other, so each element is visited as a list on its own.
+                elements = [parsed]
+                self._visitor.visit(elements, model)
+                parsed = elements[0]
+            else:
+                self._visitor.visit(parsed, model)
+            self._parse_cache.put(key, parsed)
+        return _copy_parsed(parsed)
+
     def _handle_special_cases(self, cli_argument, value):
         # We need to handle a few special cases that the previous
         # parser handled in order to stay backwards compatible.
@@ -365,6 +404,15 @@ class ParamShorthand(object):
         return _is_complex_shape(model)
 
 
+def _copy_parsed(value):
+    # Parsed shorthand values are only made of dicts, lists and scalars.
+    if isinstance(value, dict):
+        return dict((k, _copy_parsed(v)) for k, v in value.items())
+    elif isinstance(value, list):
+        return [_copy_parsed(v) for v in value]
+    return value
+
+
 class ParamShorthandDocGen(object):
     """Documentation generator for param shorthand syntax."""
 
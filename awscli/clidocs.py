@@ -530,7 +530,7 @@ class TopicListerDocumentEventHandler(CLIDocumentEventHandler):
         self.register(help_command.session, help_command.event_class)
         self.help_command.doc.translation_map = self.build_translation_map()
         self._topic_tag_db = TopicTagDB()
-        self._topic_tag_db.load_json_index()
+        self._topic_tag_db.load_index()
 
     def doc_breadcrumbs(self, help_command, **kwargs):
         doc = help_command.doc
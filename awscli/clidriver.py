@@ -23,6 +23,8 @@ from botocore.exceptions import NoCredentialsError
 from botocore.exceptions import NoRegionError
 
 from awscli import EnvironmentVariables, __version__
+from awscli.clientcache import create_client
+from awscli.paramfile import ParamFileCache
 from awscli.formatter import get_formatter
 from awscli.plugin import load_plugins
 from awscli.argparser import MainArgParser
@@ -38,6 +40,8 @@ from awscli.arguments import BooleanArgument
 from awscli.arguments import CLIArgument
 from awscli.arguments import UnknownArgumentError
 from awscli.argprocess import unpack_argument
+from awscli.argprocess import get_uri_param_value
+from awscli.argprocess import is_paramfile_disabled
 
 
 LOG = logging.getLogger('awscli.clidriver')
@@ -514,16 +518,21 @@ class ServiceOperation(object):
                                                  self._name)
         self._emit(event, parsed_args=parsed_args,
                    parsed_globals=parsed_globals)
-        call_parameters = self._build_call_parameters(parsed_args,
-                                                      self.arg_table)
-        event = 'calling-command.%s.%s' % (self._parent_name,
-                                           self._name)
-        override = self._emit_first_non_none_response(
-            event,
-            call_parameters=call_parameters,
-            parsed_args=parsed_args,
-            parsed_globals=parsed_globals
-        )
+        # The resource URIs of the arguments, e.g. file://foo.json, are
+        # loaded once for the arguments and the calling-command handlers.
+        with ParamFileCache() as paramfile_cache:
+            self._prefetch_paramfiles(parsed_args, self.arg_table,
+                                      paramfile_cache)
+            call_parameters = self._build_call_parameters(parsed_args,
+                                                          self.arg_table)
+            event = 'calling-command.%s.%s' % (self._parent_name,
+                                               self._name)
+            override = self._emit_first_non_none_response(
+                event,
+                call_parameters=call_parameters,
+                parsed_args=parsed_args,
+                parsed_globals=parsed_globals
+            )
         # There are two possible values for override. It can be some type
         # of exception that will be raised if detected or it can represent
         # the desired return code. Note that a return code of 0 represents
@@ -573,6 +582,23 @@ class ServiceOperation(object):
                 arg_object.add_to_params(service_params, value)
         return service_params
 
+    def _prefetch_paramfiles(self, args, arg_table, paramfile_cache):
+        # Loads the resource URIs of all the arguments at once, rather
+        # than one at a time as each argument is unpacked.
+        service_name = self._operation_model.service_model.endpoint_prefix
+        operation_name = xform_name(self._name, '-')
+        parsed_args = vars(args)
+        paths = []
+        for arg_object in arg_table.values():
+            qualified_name = '%s.%s.%s' % (
+                service_name, operation_name,
+                getattr(arg_object, 'name', 'anonymous'))
+            if arg_object.py_name in parsed_args and \
+                    not is_paramfile_disabled(qualified_name, arg_object):
+                paths.append(get_uri_param_value(
+                    parsed_args[arg_object.py_name]))
+        paramfile_cache.prefetch(paths)
+
     def _unpack_arg(self, cli_argument, value):
         # Unpacks a commandline argument into a Python value by firing the
         # load-cli-arg.service-name.operation-name event.
@@ -657,8 +683,8 @@ class CLIOperationCaller(object):
             value is returned.
 
         """
-        client = self._session.create_client(
-            service_name, region_name=parsed_globals.region,
+        client = create_client(
+            self._session, service_name, region_name=parsed_globals.region,
             endpoint_url=parsed_globals.endpoint_url,
             verify=parsed_globals.verify_ssl)
         py_operation_name = xform_name(operation_name)
@@ -0,0 +1,135 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Reuse of the clients created for a session.
+
+Creating a client loads the models of its service and creates a new
+connection pool, so commands that make several calls to the same
+service, or customizations that call other commands, should share the
+clients they create::
+
+    client = create_client(session, 'emr', region_name=region)
+
+Clients are shared when they are created for the same service, region,
+endpoint, SSL verification, client config and credentials.  Because of
+that, a client returned by ``create_client`` must not be modified in a
+way that only makes sense for one caller.  Callers that need the errors
+of the client raised as exceptions, rather than handled by the CLI, ask
+for a client without the CLI error handler, which is cached separately::
+
+    client = create_client(session, 's3', remove_error_handler=True)
+
+"""
+import logging
+import threading
+import weakref
+
+
+LOG = logging.getLogger(__name__)
+# The unique id the CLI error handler is registered with.
+ERROR_HANDLER_ID = 'awscli-error-handler'
+_CACHES = weakref.WeakKeyDictionary()
+_CACHES_LOCK = threading.Lock()
+
+
+def create_client(session, service_name, region_name=None,
+                  endpoint_url=None, verify=None, config=None,
+                  remove_error_handler=False):
+    """Returns a client for the session, reusing one if possible."""
+    return get_client_cache(session).get_client(
+        service_name, region_name=region_name, endpoint_url=endpoint_url,
+        verify=verify, config=config,
+        remove_error_handler=remove_error_handler)
+
+
+def get_client_cache(session):
+    """Returns the ``ClientCache`` of a session, creating it if needed."""
+    with _CACHES_LOCK:
+        cache = _CACHES.get(session)
+        if cache is None:
+            cache = ClientCache(session)
+            _CACHES[session] = cache
+        return cache
+
+
+class ClientCache(object):
+    """Creates the clients of a session and reuses them.
+
+    The clients are keyed by the service name, region name, endpoint url,
+    SSL verification, client config, whether the CLI error handler is
+    removed and the credentials of the session, so a client is never
+    reused after the credentials of the session have changed.
+
+    :param session: The session used to create the clients.
+    """
+    def __init__(self, session):
+        self._session = session
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def get_client(self, service_name, region_name=None, endpoint_url=None,
+                   verify=None, config=None, remove_error_handler=False):
+        credentials = self._session.get_credentials()
+        key = (service_name, region_name, endpoint_url, verify,
+               _config_key(config), remove_error_handler,
+               _IdentityKey(credentials))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.reused += 1
+                LOG.debug('Reusing %s client for region %s (%s created, '
+                          '%s reused)', service_name, region_name,
+                          self.created, self.reused)
+                return client
+            client = self._session.create_client(
+                service_name, region_name=region_name,
+                endpoint_url=endpoint_url, verify=verify, config=config)
+            if remove_error_handler:
+                client.meta.events.unregister(
+                    'after-call', unique_id=ERROR_HANDLER_ID)
+            self._clients[key] = client
+            self.created += 1
+            LOG.debug('Created %s client for region %s (%s created, '
+                      '%s reused)', service_name, region_name,
+                      self.created, self.reused)
+            return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+
+class _IdentityKey(object):
+    # Compares the object it wraps by identity.  It also keeps a reference
+    # to the object so its id can not be reused while it is a cache key.
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __hash__(self):
+        return id(self._obj)
+
+    def __eq__(self, other):
+        return self._obj is other._obj
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+def _config_key(config):
+    # Client configs are created by each caller, so they are compared by
+    # the values of their options rather than by identity.
+    if config is None:
+        return None
+    return tuple(sorted((name, repr(value))
+                        for name, value in vars(config).items()))
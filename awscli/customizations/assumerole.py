@@ -1,8 +1,16 @@
 import os
+import copy
 import json
+import time
+import atexit
 import logging
+import tempfile
+import datetime
 
+from botocore.compat import total_seconds
 from botocore.exceptions import ProfileNotFound
+from dateutil.parser import parse
+from dateutil.tz import tzlocal
 
 LOG = logging.getLogger(__name__)
 
@@ -49,25 +57,45 @@ class JSONFileCache(object):
     The objects are serialized to JSON and stored in a file.  These
     values can be retrieved at a later time.
 
+    Values are written to a temporary file that is renamed over the cache
+    file, so a value is never read while it is partially written.  Values
+    that have been read or written are also kept in memory, and values
+    with credentials that expire within ``EXPIRY_WINDOW_SECONDS`` are
+    treated as missing.
+
+    When a value is missing, the first process to look it up takes a lock
+    file and gets a ``KeyError``, so it can create the value and set it.
+    Other processes looking up the same value wait for up to
+    ``LOCK_TIMEOUT_SECONDS`` for it to be set rather than all creating
+    it, which for assume role credentials means a single ``AssumeRole``
+    call is shared by every process.
+
     """
 
     CACHE_DIR = os.path.expanduser(os.path.join('~', '.aws', 'cli', 'cache'))
+    # The same window botocore uses to refresh assume role credentials.
+    EXPIRY_WINDOW_SECONDS = 60 * 15
+    # How long a process waits for another process to set a value, and
+    # how old a lock file must be to be considered abandoned.
+    LOCK_TIMEOUT_SECONDS = 10
+    LOCK_POLL_SECONDS = 0.1
 
     def __init__(self, working_dir=CACHE_DIR):
         self._working_dir = working_dir
+        self._memo = {}
+        self._held_locks = set()
 
     def __contains__(self, cache_key):
-        actual_key = self._convert_cache_key(cache_key)
-        return os.path.isfile(actual_key)
+        return self._get(cache_key) is not None
 
     def __getitem__(self, cache_key):
         """Retrieve value from a cache key."""
-        actual_key = self._convert_cache_key(cache_key)
-        try:
-            with open(actual_key) as f:
-                return json.load(f)
-        except (OSError, ValueError, IOError):
+        value = self._get(cache_key)
+        if value is None:
+            value = self._wait_for_value(cache_key)
+        if value is None:
             raise KeyError(cache_key)
+        return copy.deepcopy(value)
 
     def __setitem__(self, cache_key, value):
         full_key = self._convert_cache_key(cache_key)
@@ -78,11 +106,133 @@ class JSONFileCache(object):
                              "JSON serializable: %s" % value)
         if not os.path.isdir(self._working_dir):
             os.makedirs(self._working_dir)
-        with os.fdopen(os.open(full_key,
-                               os.O_WRONLY | os.O_CREAT, 0o600), 'w') as f:
-            f.truncate()
-            f.write(file_content)
+        # mkstemp creates the file with 0600 permissions.
+        fd, temp_path = tempfile.mkstemp(dir=self._working_dir,
+                                         suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(file_content)
+            _replace_file(temp_path, full_key)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._memo[cache_key] = copy.deepcopy(value)
+        self._release_lock(cache_key)
+
+    def _get(self, cache_key):
+        # Lookups do not take any lock: the memo is only ever replaced
+        # with complete values and cache files are replaced atomically.
+        value = self._memo.get(cache_key)
+        if value is None:
+            value = self._load(cache_key)
+            if value is None:
+                return None
+            self._memo[cache_key] = value
+        if self._is_expired(value):
+            return None
+        return value
+
+    def _load(self, cache_key):
+        actual_key = self._convert_cache_key(cache_key)
+        try:
+            with open(actual_key) as f:
+                return json.load(f)
+        except (OSError, ValueError, IOError):
+            return None
+
+    def _is_expired(self, value):
+        try:
+            expiration = value['Credentials']['Expiration']
+        except (KeyError, TypeError):
+            return False
+        seconds_left = total_seconds(
+            parse(expiration) - datetime.datetime.now(tzlocal()))
+        return seconds_left < self.EXPIRY_WINDOW_SECONDS
+
+    def _wait_for_value(self, cache_key):
+        # Returns the value set by another process, or None once this
+        # process holds the lock and is expected to set the value.
+        deadline = time.time() + self.LOCK_TIMEOUT_SECONDS
+        while not self._acquire_lock(cache_key):
+            if time.time() >= deadline:
+                LOG.debug("Timed out waiting for cache key %s to be set "
+                          "by another process.", cache_key)
+                return None
+            time.sleep(self.LOCK_POLL_SECONDS)
+            # Another process set the value, so it is no longer in the
+            # memo of this process.
+            self._memo.pop(cache_key, None)
+            value = self._get(cache_key)
+            if value is not None:
+                return value
+        # The value may have been set between the lookup and taking the
+        # lock.
+        self._memo.pop(cache_key, None)
+        value = self._get(cache_key)
+        if value is not None:
+            self._release_lock(cache_key)
+        return value
+
+    def _acquire_lock(self, cache_key):
+        if cache_key in self._held_locks:
+            return True
+        lock_path = self._convert_lock_key(cache_key)
+        try:
+            if not os.path.isdir(self._working_dir):
+                os.makedirs(self._working_dir)
+            os.close(os.open(lock_path,
+                             os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+        except OSError:
+            if not self._is_abandoned(lock_path):
+                return False
+            # The process that took the lock did not set the value, so
+            # the lock is taken over.
+            LOG.debug("Removing abandoned lock file %s", lock_path)
+            _remove_file(lock_path)
+            return False
+        if not self._held_locks:
+            atexit.register(self._release_all_locks)
+        self._held_locks.add(cache_key)
+        return True
+
+    def _is_abandoned(self, lock_path):
+        try:
+            age = time.time() - os.path.getmtime(lock_path)
+        except OSError:
+            # The lock was just released.
+            return False
+        return age > self.LOCK_TIMEOUT_SECONDS
+
+    def _release_lock(self, cache_key):
+        if cache_key in self._held_locks:
+            self._held_locks.discard(cache_key)
+            _remove_file(self._convert_lock_key(cache_key))
+
+    def _release_all_locks(self):
+        for cache_key in list(self._held_locks):
+            self._release_lock(cache_key)
 
     def _convert_cache_key(self, cache_key):
         full_path = os.path.join(self._working_dir, cache_key + '.json')
         return full_path
+
+    def _convert_lock_key(self, cache_key):
+        return os.path.join(self._working_dir, cache_key + '.lock')
+
+
+def _replace_file(src, dst):
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    else:
+        if os.name == 'nt' and os.path.exists(dst):
+            # Windows can not rename over an existing file on Python 2.
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -23,10 +23,11 @@ from datetime import datetime, timedelta
 from dateutil import tz, parser
 
 from pyasn1.error import PyAsn1Error
-import rsa
 
+from awscli.clientcache import create_client
+from awscli.customizations import crypto
 from awscli.customizations.cloudtrail.utils import get_trail_by_arn, \
-    get_account_id_from_arn, remove_cli_error_event
+    get_account_id_from_arn
 from awscli.customizations.commands import BasicCommand
 from botocore.exceptions import ClientError
 
@@ -137,12 +138,11 @@ class S3ClientProvider(object):
     """Creates Amazon S3 clients and determines the region name of a client.
 
     This class will cache the location constraints of previously requested
-    buckets and cache previously created clients for the same region.
+    buckets, and the clients are shared with the rest of the session.
     """
     def __init__(self, session, get_bucket_location_region='us-east-1'):
         self._session = session
         self._get_bucket_location_region = get_bucket_location_region
-        self._client_cache = {}
         self._region_cache = {}
 
     def get_client(self, bucket_name):
@@ -161,12 +161,9 @@ class S3ClientProvider(object):
 
     def _create_client(self, region_name):
         """Creates an Amazon S3 client for the given region name"""
-        if region_name not in self._client_cache:
-            client = self._session.create_client('s3', region_name)
-            # Remove the CLI error event that prevents exceptions.
-            remove_cli_error_event(client)
-            self._client_cache[region_name] = client
-        return self._client_cache[region_name]
+        # Remove the CLI error event that prevents exceptions.
+        return create_client(self._session, 's3', region_name,
+                             remove_error_handler=True)
 
 
 class DigestError(ValueError):
@@ -511,8 +508,14 @@ class Sha256RSADigestValidator(object):
 
     The result of validating the digest is inserted into the digest_data
     dictionary using the isValid key value pair.
+
+    The public keys are loaded once per validator, as many digests are
+    signed with the same key.
     """
 
+    def __init__(self):
+        self._public_keys = {}
+
     def validate(self, bucket, key, public_key, digest_data, inflated_digest):
         """Validates a digest file.
 
@@ -526,23 +529,29 @@ class Sha256RSADigestValidator(object):
         :param inflated_digest: Inflated digest file contents as bytes.
         """
         try:
-            decoded_key = base64.b64decode(public_key)
-            public_key = rsa.PublicKey.load_pkcs1(decoded_key, format='DER')
+            loaded_key = self._load_public_key(public_key)
             to_sign = self._create_string_to_sign(digest_data, inflated_digest)
             signature_bytes = binascii.unhexlify(digest_data['_signature'])
-            rsa.verify(to_sign, signature_bytes, public_key)
+            loaded_key.verify(to_sign, signature_bytes, 'SHA-256')
         except PyAsn1Error:
             raise DigestError(
                 ('Digest file\ts3://%s/%s\tINVALID: Unable to load PKCS #1 key'
                  ' with fingerprint %s')
                 % (bucket, key, digest_data['digestPublicKeyFingerprint']))
-        except rsa.pkcs1.VerificationError:
-            # Note from the Python-RSA docs: Never display the stack trace of
-            # a rsa.pkcs1.VerificationError exception. It shows where in the
-            # code the exception occurred, and thus leaks information about
-            # the key.
+        except crypto.VerificationError:
+            # Never display the stack trace of the underlying verification
+            # error. It shows where in the code the verification failed, and
+            # thus leaks information about the key.
             raise DigestSignatureError(bucket, key)
 
+    def _load_public_key(self, public_key):
+        loaded_key = self._public_keys.get(public_key)
+        if loaded_key is None:
+            decoded_key = base64.b64decode(public_key)
+            loaded_key = crypto.load_public_key(decoded_key, format='DER')
+            self._public_keys[public_key] = loaded_key
+        return loaded_key
+
     def _create_string_to_sign(self, digest_data, inflated_digest):
         previous_signature = digest_data['previousDigestSignature']
         if previous_signature is None:
@@ -13,20 +13,20 @@
 
 import os
 import sys
-import zipfile
-import tempfile
 import contextlib
 from datetime import datetime
 
-from awscli.compat import six
+from concurrent import futures
+
 from awscli.customizations.codedeploy.utils import validate_s3_location
 from awscli.customizations.commands import BasicCommand
-from awscli.errorhandler import ServerError, ClientError
-from awscli.compat import ZIP_COMPRESSION_MODE
+from awscli.customizations.zipbundle import ZipBundler, StreamingBundle, \
+    BundlePartReader
 
 
 ONE_MB = 1 << 20
 MULTIPART_LIMIT = 6 * ONE_MB
+MAX_CONCURRENT_PARTS = 10
 
 
 class Push(BasicCommand):
@@ -184,34 +184,37 @@ class Push(BasicCommand):
     def _compress(self, source, ignore_hidden_files=False):
         source_path = os.path.abspath(source)
         appspec_path = os.path.sep.join([source_path, 'appspec.yml'])
-        with tempfile.TemporaryFile('w+b') as tf:
-            zf = zipfile.ZipFile(tf, 'w', allowZip64=True)
-            # Using 'try'/'finally' instead of 'with' statement since ZipFile
-            # does not have support context manager in Python 2.6.
-            try:
-                contains_appspec = False
-                for root, dirs, files in os.walk(source, topdown=True):
-                    if ignore_hidden_files:
-                        files = [fn for fn in files if not fn.startswith('.')]
-                        dirs[:] = [dn for dn in dirs if not dn.startswith('.')]
-                    for fn in files:
-                        filename = os.path.join(root, fn)
-                        filename = os.path.abspath(filename)
-                        arcname = filename[len(source_path) + 1:]
-                        if filename == appspec_path:
-                            contains_appspec = True
-                        zf.write(filename, arcname, ZIP_COMPRESSION_MODE)
-                if not contains_appspec:
-                    raise RuntimeError(
-                        '{0} was not found'.format(appspec_path)
-                    )
-            finally:
-                zf.close()
-            yield tf
+        contains_appspec = False
+        members = []
+        for root, dirs, files in os.walk(source, topdown=True):
+            if ignore_hidden_files:
+                files = [fn for fn in files if not fn.startswith('.')]
+                dirs[:] = [dn for dn in dirs if not dn.startswith('.')]
+            for fn in files:
+                filename = os.path.join(root, fn)
+                filename = os.path.abspath(filename)
+                arcname = filename[len(source_path) + 1:]
+                if filename == appspec_path:
+                    contains_appspec = True
+                members.append((filename, arcname))
+        if not contains_appspec:
+            raise RuntimeError(
+                '{0} was not found'.format(appspec_path)
+            )
+        # The bundle is compressed in the background so that its first
+        # parts can be uploaded while the rest is still being compressed.
+        bundle = StreamingBundle(ZipBundler(), members)
+        bundle.start()
+        try:
+            yield bundle
+        finally:
+            bundle.close()
 
     def _upload_to_s3(self, params, bundle):
-        size_remaining = self._bundle_size(bundle)
-        if size_remaining < MULTIPART_LIMIT:
+        # Finding the size of the first part waits until either a full part
+        # has been compressed or the whole bundle is smaller than a part.
+        if self._part_size(bundle, 0) < MULTIPART_LIMIT:
+            bundle.seek(0)
             return self.s3.put_object(
                 Bucket=params.bucket,
                 Key=params.key,
@@ -220,48 +223,56 @@ class Push(BasicCommand):
         else:
             return self._multipart_upload_to_s3(
                 params,
-                bundle,
-                size_remaining
+                bundle
             )
 
-    def _bundle_size(self, bundle):
-        bundle.seek(0, 2)
-        size = bundle.tell()
-        bundle.seek(0)
-        return size
+    def _part_size(self, bundle, offset):
+        # Reading the last byte of the part blocks until the part has been
+        # compressed, so only the final part has to wait for the size of
+        # the whole bundle.
+        if bundle.read_at(offset + MULTIPART_LIMIT - 1, 1):
+            return MULTIPART_LIMIT
+        return max(bundle.size - offset, 0)
 
-    def _multipart_upload_to_s3(self, params, bundle, size_remaining):
+    def _multipart_upload_to_s3(self, params, bundle):
         create_response = self.s3.create_multipart_upload(
             Bucket=params.bucket,
             Key=params.key
         )
         upload_id = create_response['UploadId']
+        # The parts are uploaded with the same client, so the number of
+        # parts in flight is kept within the size of its connection pool.
+        pool = futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PARTS)
+        pending = set()
         try:
-            part_num = 1
-            multipart_list = []
-            bundle.seek(0)
-            while size_remaining > 0:
-                data = bundle.read(MULTIPART_LIMIT)
-                upload_response = self.s3.upload_part(
-                    Bucket=params.bucket,
-                    Key=params.key,
-                    UploadId=upload_id,
-                    PartNumber=part_num,
-                    Body=six.BytesIO(data)
+            part_futures = []
+            for part_num, offset, size in self._iter_parts(bundle):
+                if len(pending) >= MAX_CONCURRENT_PARTS:
+                    done, pending = futures.wait(
+                        pending, return_when=futures.FIRST_COMPLETED)
+                    # Raise the first error without waiting for the rest
+                    # of the bundle.
+                    for future in done:
+                        future.result()
+                future = pool.submit(
+                    self._upload_part, params, upload_id, part_num,
+                    BundlePartReader(bundle, offset, size)
                 )
-                multipart_list.append({
-                    'PartNumber': part_num,
-                    'ETag': upload_response['ETag']
-                })
-                part_num += 1
-                size_remaining -= len(data)
+                pending.add(future)
+                part_futures.append(future)
+            multipart_list = [future.result() for future in part_futures]
+            pool.shutdown(wait=True)
             return self.s3.complete_multipart_upload(
                 Bucket=params.bucket,
                 Key=params.key,
                 UploadId=upload_id,
                 MultipartUpload={'Parts': multipart_list}
             )
-        except (ServerError, ClientError) as e:
+        except Exception as e:
+            # This includes errors compressing the rest of the bundle.
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
             self.s3.abort_multipart_upload(
                 Bucket=params.bucket,
                 Key=params.key,
@@ -269,6 +280,32 @@ class Push(BasicCommand):
             )
             raise e
 
+    def _iter_parts(self, bundle):
+        part_num = 1
+        offset = 0
+        while True:
+            size = self._part_size(bundle, offset)
+            if size == 0:
+                return
+            yield part_num, offset, size
+            if size < MULTIPART_LIMIT:
+                return
+            part_num += 1
+            offset += size
+
+    def _upload_part(self, params, upload_id, part_num, body):
+        upload_response = self.s3.upload_part(
+            Bucket=params.bucket,
+            Key=params.key,
+            UploadId=upload_id,
+            PartNumber=part_num,
+            Body=body
+        )
+        return {
+            'PartNumber': part_num,
+            'ETag': upload_response['ETag']
+        }
+
     def _register_revision(self, params):
         revision = {
             'revisionType': 'S3',
@@ -4,7 +4,6 @@ import os
 from botocore import model
 from botocore.compat import OrderedDict
 from botocore.validate import validate_parameters
-from botocore.docs.bcdoc import docevents
 
 import awscli
 from awscli.argparser import ArgTableArgParser
@@ -350,14 +349,7 @@ class BasicHelp(HelpCommand):
             return value
 
     def __call__(self, args, parsed_globals):
-        # Create an event handler for a Provider Document
-        instance = self.EventHandlerClass(self)
-        # Now generate all of the events for a Provider document.
-        # We pass ourselves along so that we can, in turn, get passed
-        # to all event handlers.
-        docevents.generate_events(self.session, self)
-        self.renderer.render(self.doc.getvalue())
-        instance.unregister()
+        self._render()
 
 
 class BasicDocHandler(OperationDocumentEventHandler):
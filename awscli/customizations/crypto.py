@@ -0,0 +1,167 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""RSA signing, verification and decryption.
+
+The RSA operations of the customizations go through a backend.  If the
+``cryptography`` package is installed, the operations are done by
+OpenSSL, otherwise they are done by the pure Python ``rsa`` package,
+which is much slower for private key operations::
+
+    private_key = load_private_key(pem_bytes)
+    signature = private_key.sign(message, 'SHA-1')
+
+Keys are always parsed by the ``rsa`` package, so the same key formats
+are accepted and the same errors are raised by both backends.  A key
+should be loaded once and reused, as converting it for the backend is
+about as expensive as an operation with it.
+
+"""
+import rsa
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+    from cryptography.hazmat.primitives.asymmetric import rsa as openssl_rsa
+except ImportError:
+    openssl_rsa = None
+
+
+class VerificationError(Exception):
+    """Raised when a signature does not match its message."""
+
+
+class RSABackend(object):
+    """Does the RSA operations with the pure Python ``rsa`` package."""
+    name = 'rsa'
+
+    def load_private_key(self, rsa_key):
+        return RSAPrivateKey(rsa_key)
+
+    def load_public_key(self, rsa_key):
+        return RSAPublicKey(rsa_key)
+
+
+class RSAPrivateKey(object):
+    def __init__(self, rsa_key):
+        self._key = rsa_key
+
+    def sign(self, message, hash_name):
+        return rsa.sign(message, self._key, hash_name)
+
+    def decrypt(self, ciphertext):
+        return rsa.decrypt(ciphertext, self._key)
+
+
+class RSAPublicKey(object):
+    def __init__(self, rsa_key):
+        self._key = rsa_key
+
+    def verify(self, message, signature, hash_name):
+        try:
+            rsa.verify(message, signature, self._key)
+        except rsa.pkcs1.VerificationError:
+            # The error of the rsa package is not chained, as its stack
+            # trace shows where the verification failed.
+            raise VerificationError('Verification failed')
+
+
+class OpenSSLBackend(object):
+    """Does the RSA operations with the ``cryptography`` package."""
+    name = 'cryptography'
+
+    def load_private_key(self, rsa_key):
+        public_numbers = openssl_rsa.RSAPublicNumbers(rsa_key.e, rsa_key.n)
+        private_numbers = openssl_rsa.RSAPrivateNumbers(
+            p=rsa_key.p, q=rsa_key.q, d=rsa_key.d, dmp1=rsa_key.exp1,
+            dmq1=rsa_key.exp2, iqmp=rsa_key.coef,
+            public_numbers=public_numbers)
+        return OpenSSLPrivateKey(
+            private_numbers.private_key(default_backend()))
+
+    def load_public_key(self, rsa_key):
+        public_numbers = openssl_rsa.RSAPublicNumbers(rsa_key.e, rsa_key.n)
+        return OpenSSLPublicKey(public_numbers.public_key(default_backend()))
+
+
+class OpenSSLPrivateKey(object):
+    def __init__(self, key):
+        self._key = key
+
+    def sign(self, message, hash_name):
+        return self._key.sign(
+            message, padding.PKCS1v15(), _get_hash(hash_name))
+
+    def decrypt(self, ciphertext):
+        return self._key.decrypt(ciphertext, padding.PKCS1v15())
+
+
+class OpenSSLPublicKey(object):
+    def __init__(self, key):
+        self._key = key
+
+    def verify(self, message, signature, hash_name):
+        try:
+            self._key.verify(
+                signature, message, padding.PKCS1v15(), _get_hash(hash_name))
+        except InvalidSignature:
+            raise VerificationError('Verification failed')
+
+
+def _get_hash(hash_name):
+    # The hash names are the ones used by the rsa package.
+    return {
+        'SHA-1': hashes.SHA1,
+        'SHA-256': hashes.SHA256,
+        'SHA-384': hashes.SHA384,
+        'SHA-512': hashes.SHA512,
+    }[hash_name]()
+
+
+def get_backend():
+    """Returns the fastest backend that is available."""
+    if openssl_rsa is not None:
+        return OpenSSLBackend()
+    return RSABackend()
+
+
+def load_private_key(key_bytes, format='PEM', backend=None):
+    """Loads a PKCS #1 private key.
+
+    :param key_bytes: The bytes of the key.
+    :param format: ``PEM`` or ``DER``.
+    :param backend: The backend of the key, the fastest one by default.
+    :returns: A key with ``sign(message, hash_name)`` and
+        ``decrypt(ciphertext)`` methods.
+    """
+    if backend is None:
+        backend = get_backend()
+    return backend.load_private_key(
+        rsa.PrivateKey.load_pkcs1(key_bytes, format=format))
+
+
+def load_public_key(key_bytes, format='PEM', backend=None):
+    """Loads a PKCS #1 public key.
+
+    :param key_bytes: The bytes of the key.
+    :param format: ``PEM`` or ``DER``.
+    :param backend: The backend of the key, the fastest one by default.
+    :returns: A key with a ``verify(message, signature, hash_name)``
+        method, which raises a ``VerificationError`` if the signature
+        does not match.
+    """
+    if backend is None:
+        backend = get_backend()
+    return backend.load_public_key(
+        rsa.PublicKey.load_pkcs1(key_bytes, format=format))
@@ -14,6 +14,8 @@
 import json
 from datetime import datetime, timedelta
 
+from concurrent import futures
+
 from awscli.formatter import get_formatter
 from awscli.arguments import CustomArgument
 from awscli.customizations.commands import BasicCommand
@@ -22,6 +24,7 @@ from awscli.customizations.datapipeline.createdefaultroles \
     import CreateDefaultRoles
 from awscli.customizations.datapipeline.listrunsformatter \
     import ListRunsFormatter
+from awscli.customizations.datapipeline.mergesort import MergeSorter
 
 
 DEFINITION_HELP_TEXT = """\
@@ -177,6 +180,10 @@ def convert_described_objects(api_describe_objects, sort_key_func=None):
     return converted
 
 
+def _run_sort_key(run):
+    return (run.get('@scheduledStartTime'), run.get('name'))
+
+
 class QueryArgBuilder(object):
     """
     Convert CLI arguments to Query arguments used by QueryObject.
@@ -350,6 +357,9 @@ class ListRunsCommand(BasicCommand):
     VALID_STATUS = ['waiting', 'pending', 'cancelled', 'running',
                     'finished', 'failed', 'waiting_for_runner',
                     'waiting_on_dependencies', 'shutting_down']
+    # The most object ids DescribeObjects accepts in a request.
+    MAX_DESCRIBE_OBJECT_IDS = 25
+    MAX_CONCURRENT_REQUESTS = 10
 
     def _run_main(self, parsed_args, parsed_globals, **kwargs):
         self._set_client(parsed_globals)
@@ -391,27 +401,63 @@ class ListRunsCommand(BasicCommand):
 
     def _list_runs(self, parsed_args, parsed_globals):
         query = QueryArgBuilder().build_query(parsed_args)
-        object_ids = self._query_objects(parsed_args.pipeline_id, query)
-        objects = self._describe_objects(parsed_args.pipeline_id, object_ids)[
-            'pipelineObjects']
-        converted = convert_described_objects(
-            objects,
-            sort_key_func=lambda x: (x.get('@scheduledStartTime'),
-                                     x.get('name')))
-        formatter = self._get_formatter(parsed_globals)
-        formatter(self.NAME, converted)
+        sorter = MergeSorter(key=_run_sort_key)
+        try:
+            for objects in self._describe_runs(parsed_args.pipeline_id,
+                                               query):
+                sorter.add(convert_described_objects(objects))
+            runs = sorter.sorted()
+            formatter = self._get_formatter(parsed_globals)
+            if not isinstance(formatter, ListRunsFormatter):
+                runs = list(runs)
+            formatter(self.NAME, runs)
+        finally:
+            sorter.close()
+
+    def _describe_runs(self, pipeline_id, query):
+        # The ids are described in batches on a thread pool, and the
+        # objects of each batch are yielded as soon as they are described.
+        pool = futures.ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_REQUESTS)
+        in_flight = set()
+        try:
+            for object_ids in self._query_objects(pipeline_id, query):
+                if len(in_flight) >= self.MAX_CONCURRENT_REQUESTS:
+                    done, in_flight = futures.wait(
+                        in_flight, return_when=futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                in_flight.add(pool.submit(
+                    self._describe_objects, pipeline_id, object_ids))
+            for future in futures.as_completed(in_flight):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=True)
 
     def _describe_objects(self, pipeline_id, object_ids):
-        parsed = self.client.describe_objects(
-            pipelineId=pipeline_id, objectIds=object_ids)
-        return parsed
+        kwargs = {'pipelineId': pipeline_id, 'objectIds': object_ids}
+        objects = []
+        while True:
+            parsed = self.client.describe_objects(**kwargs)
+            objects.extend(parsed['pipelineObjects'])
+            if not parsed.get('hasMoreResults'):
+                return objects
+            kwargs['marker'] = parsed['marker']
 
     def _query_objects(self, pipeline_id, query):
+        # Yields the ids of the objects in batches of at most
+        # MAX_DESCRIBE_OBJECT_IDS, the most DescribeObjects accepts.
         paginator = self.client.get_paginator('query_objects').paginate(
             pipelineId=pipeline_id,
             sphere='INSTANCE', query=query)
-        parsed = paginator.build_full_result()
-        return parsed['ids']
+        object_ids = []
+        for page in paginator:
+            object_ids.extend(page.get('ids', []))
+            while len(object_ids) >= self.MAX_DESCRIBE_OBJECT_IDS:
+                yield object_ids[:self.MAX_DESCRIBE_OBJECT_IDS]
+                object_ids = object_ids[self.MAX_DESCRIBE_OBJECT_IDS:]
+        if object_ids:
+            yield object_ids
 
     def _get_formatter(self, parsed_globals):
         output = parsed_globals.output
@@ -19,6 +19,23 @@ class ListRunsFormatter(FullyBufferedFormatter):
     FIRST_ROW_FORMAT_STRING = "%4d.  %-50.50s  %-19.19s  %-23.23s"
     SECOND_ROW_FORMAT_STRING = "       %-50.50s  %-19.19s  %-19.19s"
 
+    def __call__(self, command_name, response, stream=None):
+        # The runs can be an iterator, in which case each run is written
+        # as soon as it is returned instead of once all of them have been
+        # retrieved.  A --query needs all of the runs, so they are
+        # buffered in that case.
+        if self._args.query is not None:
+            return super(ListRunsFormatter, self).__call__(
+                command_name, list(response), stream)
+        if stream is None:
+            stream = self._get_default_stream()
+        try:
+            self._format_response(command_name, response, stream)
+        except IOError:
+            pass
+        finally:
+            self._flush_stream(stream)
+
     def _format_response(self, command_name, response, stream):
         self._print_headers(stream)
         for i, obj in enumerate(response):
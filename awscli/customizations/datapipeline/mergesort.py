@@ -0,0 +1,85 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import heapq
+import json
+import tempfile
+
+
+# The number of objects kept in memory before they are written to a
+# temporary file as a sorted run.
+MAX_RUN_SIZE = 10000
+
+
+class MergeSorter(object):
+    """Sorts JSON serializable objects with a bounded amount of memory.
+
+    Objects are added in batches and kept in memory until there are
+    ``max_run_size`` of them, at which point they are sorted and written
+    to a temporary file as a sorted run.  ``sorted`` then merges the runs,
+    only reading one object of each run at a time.  Objects that compare
+    equal are returned in the order they were added.
+
+    :param key: The function that returns the sort key of an object.
+    :param max_run_size: The number of objects kept in memory.
+    """
+    def __init__(self, key, max_run_size=MAX_RUN_SIZE):
+        self._key = key
+        self._max_run_size = max_run_size
+        self._buffer = []
+        self._runs = []
+
+    def add(self, objects):
+        self._buffer.extend(objects)
+        if len(self._buffer) >= self._max_run_size:
+            self._write_run()
+
+    def sorted(self):
+        """Returns an iterator of all of the objects in sorted order."""
+        self._buffer.sort(key=self._key)
+        if not self._runs:
+            return iter(self._buffer)
+        runs = [self._decorate(self._read_run(run), i)
+                for i, run in enumerate(self._runs)]
+        runs.append(self._decorate(self._buffer, len(runs)))
+        return self._merge(runs)
+
+    def close(self):
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._buffer = []
+
+    def _write_run(self):
+        self._buffer.sort(key=self._key)
+        run = tempfile.TemporaryFile(mode='w+')
+        run.writelines(json.dumps(obj) + '\n' for obj in self._buffer)
+        run.seek(0)
+        self._runs.append(run)
+        self._buffer = []
+
+    def _read_run(self, run):
+        for line in run:
+            yield json.loads(line)
+
+    def _decorate(self, objects, run_index):
+        # heapq.merge does not take a key function before python 3.5, so
+        # each object is paired with its key.  The run index and position
+        # keep the merge stable and ensure the objects themselves are
+        # never compared.
+        key = self._key
+        for i, obj in enumerate(objects):
+            yield key(obj), run_index, i, obj
+
+    def _merge(self, runs):
+        for _, _, _, obj in heapq.merge(*runs):
+            yield obj
@@ -13,12 +13,12 @@
 import logging
 import os
 import base64
-import rsa
 from awscli.compat import six
 
 from botocore import model
 
 from awscli.arguments import BaseCLIArgument
+from awscli.customizations import crypto
 
 
 logger = logging.getLogger(__name__)
@@ -109,9 +109,9 @@ class LaunchKeyArgument(BaseCLIArgument):
             try:
                 with open(self._key_path) as pk_file:
                     pk_contents = pk_file.read()
-                    private_key = rsa.PrivateKey.load_pkcs1(six.b(pk_contents))
+                    private_key = crypto.load_private_key(six.b(pk_contents))
                     value = base64.b64decode(value)
-                    value = rsa.decrypt(value, private_key)
+                    value = private_key.decrypt(value)
                     logger.debug(parsed)
                     parsed['PasswordData'] = value.decode('utf-8')
                     logger.debug(parsed)
@@ -11,6 +11,10 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+import sys
+
+from concurrent import futures
+
 from awscli.customizations.commands import BasicCommand
 from awscli.customizations.emr import constants
 from awscli.customizations.emr import emrutils
@@ -26,39 +30,76 @@ class DescribeCluster(Command):
                    ' actions, instance groups and so on. For information about'
                    ' the cluster steps, see <code>list-steps</code>.')
     ARG_TABLE = [
-        {'name': 'cluster-id', 'required': True,
-         'help_text': helptext.CLUSTER_ID}
+        {'name': 'cluster-id', 'required': True, 'nargs': '+',
+         'help_text': helptext.CLUSTER_ID + (
+             '<p>If more than one cluster is specified, the clusters are '
+             'described at the same time and are returned in a '
+             '<code>Clusters</code> list in the same order.</p>')}
+    ]
+    # The number of requests made at the same time.
+    MAX_CONCURRENT_REQUESTS = 10
+    # The operations that describe each cluster, and whether they are
+    # paginated.
+    OPERATIONS = [
+        ('describe_cluster', False),
+        ('list_instance_groups', True),
+        ('list_bootstrap_actions', True),
     ]
 
     def _run_main_command(self, parsed_args, parsed_globals):
-        parameters = {'ClusterId': parsed_args.cluster_id}
-
-        describe_cluster_result = self._call(
-            self._session, 'describe_cluster', parameters, parsed_globals)
-
-        list_instance_groups_result = self._call(
-            self._session, 'list_instance_groups', parameters, parsed_globals)
-
-        list_bootstrap_actions_result = self._call(
-            self._session, 'list_bootstrap_actions',
-            parameters, parsed_globals)
-
-        constructed_result = self._construct_result(
-            describe_cluster_result,
-            list_instance_groups_result,
-            list_bootstrap_actions_result)
+        cluster_ids = parsed_args.cluster_id
+        pool = futures.ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_REQUESTS)
+        try:
+            # The calls of all of the clusters are submitted at once, and
+            # the pool bounds how many are made at the same time.
+            cluster_futures = [
+                self._submit_calls(pool, cluster_id, parsed_globals)
+                for cluster_id in cluster_ids]
+            if len(cluster_ids) == 1:
+                constructed_result = self._construct_result(
+                    *[f.result() for f in cluster_futures[0]])
+                rc = 0
+            else:
+                constructed_result, rc = self._construct_results(
+                    cluster_ids, cluster_futures)
+        finally:
+            pool.shutdown(wait=True)
 
         emrutils.display_response(self._session, 'describe_cluster',
                                   constructed_result, parsed_globals)
 
-        return 0
+        return rc
+
+    def _submit_calls(self, pool, cluster_id, parsed_globals):
+        parameters = {'ClusterId': cluster_id}
+        return [
+            pool.submit(self._call, self._session, operation_name,
+                        parameters, parsed_globals, paginate=paginate)
+            for operation_name, paginate in self.OPERATIONS]
+
+    def _construct_results(self, cluster_ids, cluster_futures):
+        clusters = []
+        rc = 0
+        for cluster_id, calls in zip(cluster_ids, cluster_futures):
+            try:
+                result = self._construct_result(*[f.result() for f in calls])
+            except Exception as e:
+                sys.stderr.write(
+                    'An error occurred describing cluster %s: %s\n' %
+                    (cluster_id, e))
+                rc = 1
+                continue
+            clusters.append(result['Cluster'])
+        return {'Clusters': clusters}, rc
 
-    def _call(self, session, operation_name, parameters, parsed_globals):
+    def _call(self, session, operation_name, parameters, parsed_globals,
+              paginate=False):
         return emrutils.call(
             session, operation_name, parameters,
             region_name=self.region,
             endpoint_url=parsed_globals.endpoint_url,
-            verify=parsed_globals.verify_ssl)
+            verify=parsed_globals.verify_ssl, paginate=paginate)
 
     def _get_key_of_result(self, keys):
         # Return the first key that is not "Marker"
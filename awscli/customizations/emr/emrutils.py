@@ -17,6 +17,7 @@ import os
 
 
 from awscli.clidriver import CLIOperationCaller
+from awscli.clientcache import create_client
 from awscli.customizations.emr import constants
 from awscli.customizations.emr import exceptions
 from botocore.exceptions import WaiterError, NoCredentialsError
@@ -154,17 +155,21 @@ def check_empty_string_list(name, value):
 
 
 def call(session, operation_name, parameters, region_name=None,
-         endpoint_url=None, verify=None):
+         endpoint_url=None, verify=None, paginate=False):
     # We could get an error from get_endpoint() about not having
     # a region configured.  Before this happens we want to check
     # for credentials so we can give a good error message.
     if session.get_credentials() is None:
         raise NoCredentialsError()
 
-    client = session.create_client(
-        'emr', region_name=region_name, endpoint_url=endpoint_url,
+    client = create_client(
+        session, 'emr', region_name=region_name, endpoint_url=endpoint_url,
         verify=verify)
     LOG.debug('Calling ' + str(operation_name))
+    if paginate:
+        # Returns the results of all of the pages.
+        paginator = client.get_paginator(operation_name)
+        return paginator.paginate(**parameters).build_full_result()
     return getattr(client, operation_name)(**parameters)
 
 
@@ -177,8 +182,8 @@ def dict_to_string(dict, indent=2):
 
 
 def get_client(session, parsed_globals):
-    return session.create_client(
-        'emr',
+    return create_client(
+        session, 'emr',
         region_name=get_region(session, parsed_globals),
         endpoint_url=parsed_globals.endpoint_url,
         verify=parsed_globals.verify_ssl)
@@ -11,16 +11,15 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 import threading
-import contextlib
 import os
 import tempfile
 import sys
-import zipfile
 
 from s3transfer import S3Transfer
 
 from awscli.customizations.commands import BasicCommand
 from awscli.customizations.s3.utils import human_readable_size
+from awscli.customizations.zipbundle import ZipBundler
 
 
 class UploadBuildCommand(BasicCommand):
@@ -91,15 +90,15 @@ class UploadBuildCommand(BasicCommand):
 
 def zip_directory(zipfile_name, source_root):
     source_root = os.path.abspath(source_root)
+    members = []
+    for root, dirs, files in os.walk(source_root):
+        for filename in files:
+            full_path = os.path.join(root, filename)
+            relative_path = os.path.relpath(
+                full_path, source_root)
+            members.append((full_path, relative_path))
     with open(zipfile_name, 'wb') as f:
-        zip_file = zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED, True)
-        with contextlib.closing(zip_file) as zf:
-            for root, dirs, files in os.walk(source_root):
-                for filename in files:
-                    full_path = os.path.join(root, filename)
-                    relative_path = os.path.relpath(
-                        full_path, source_root)
-                    zf.write(full_path, relative_path)
+        ZipBundler().write(members, f)
 
 
 # TODO: Remove this class once available to CLI from s3transfer
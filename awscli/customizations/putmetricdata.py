@@ -21,14 +21,49 @@ cloudwatch put-metric-data operation:
 * --statistic-values
 * --unit
 
+It also adds a ``--metric-data-file`` parameter that publishes the metric
+records in a CSV or JSON lines file, or stdin, with as many
+``PutMetricData`` requests as needed.
+
 """
+import csv
 import decimal
+import json
+import logging
+import os
+import sys
+
+from concurrent import futures
 
 from awscli.arguments import CustomArgument
+from awscli.clientcache import create_client
 from awscli.utils import split_on_commas
 from awscli.customizations.utils import validate_mutually_exclusive_handler
 
 
+LOG = logging.getLogger(__name__)
+
+# The maximum number of metric datums in a PutMetricData request.
+MAX_DATUMS_PER_REQUEST = 20
+MAX_CONCURRENT_REQUESTS = 10
+# The columns of a CSV metric data file.
+CSV_COLUMNS = ['MetricName', 'Value', 'Unit', 'Timestamp', 'Dimensions',
+               'StatisticValues']
+METRIC_DATA_FILE_HELP = (
+    '<p>A file of metric records to publish, or <code>-</code> to read the '
+    'records from stdin.  The records are published in batches of %s '
+    'with up to %s requests at the same time, and the batches that could '
+    'not be published are reported.</p>'
+    '<p>In the <code>json</code> format, each line is a JSON object with '
+    'the same keys as an element of <code>--metric-data</code>.  In the '
+    '<code>csv</code> format, the first line is a header with any of the '
+    'columns %s.  The <code>Dimensions</code> and '
+    '<code>StatisticValues</code> columns use the same syntax as the '
+    '<code>--dimensions</code> and <code>--statistic-values</code> '
+    'parameters.</p>' % (MAX_DATUMS_PER_REQUEST, MAX_CONCURRENT_REQUESTS,
+                         ', '.join(CSV_COLUMNS)))
+
+
 def register_put_metric_data(event_handler):
     event_handler.register('building-argument-table.cloudwatch.put-metric-data',
                            _promote_args)
@@ -36,10 +71,11 @@ def register_put_metric_data(event_handler):
         'operation-args-parsed.cloudwatch.put-metric-data',
         validate_mutually_exclusive_handler(
             ['metric_data'], ['metric_name', 'timestamp', 'unit', 'value',
-                              'dimensions', 'statistic_values']))
+                              'dimensions', 'statistic_values'],
+            ['metric_data_file']))
 
 
-def _promote_args(argument_table, **kwargs):
+def _promote_args(argument_table, session=None, **kwargs):
     # We're providing top level params for metric-data.  This means
     # that metric-data is now longer a required arg.  We do need
     # to check that either metric-data or the complex args we've added
@@ -73,6 +109,13 @@ def _promote_args(argument_table, **kwargs):
     argument_table['statistic-values'] = PutMetricArgument(
         'statistic-values', help_text='A set of statistical values describing '
                                       'the metric.')
+    argument_table['metric-data-file'] = MetricDataFileArgument(
+        session, 'metric-data-file', help_text=METRIC_DATA_FILE_HELP)
+    argument_table['metric-data-format'] = CustomArgument(
+        'metric-data-format', choices=['csv', 'json'],
+        help_text=('The format of <code>--metric-data-file</code>.  By '
+                   'default files ending in <code>.csv</code> are read as '
+                   'CSV and all other files as JSON lines.'))
 
 
 def insert_first_element(name):
@@ -117,24 +160,237 @@ class PutMetricArgument(CustomArgument):
 
     @insert_first_element('MetricData')
     def _add_param_dimensions(self, first_element, value):
-        # Dimensions needs a little more processing.  We support
-        # the key=value,key2=value syntax so we need to parse
-        # that.
-        dimensions = []
-        for pair in split_on_commas(value):
-            key, value = pair.split('=')
-            dimensions.append({'Name': key, 'Value': value})
-        first_element['Dimensions'] = dimensions
+        first_element['Dimensions'] = _parse_dimensions(value)
 
     @insert_first_element('MetricData')
     def _add_param_statistic_values(self, first_element, value):
-        # StatisticValues is a struct type so we are parsing
-        # a csv keyval list into a dict.
-        statistics = {}
-        for pair in split_on_commas(value):
-            key, value = pair.split('=')
-            # There are four supported values: Maximum, Minimum, SampleCount,
-            # and Sum.  All of them are documented as a type double so we can
-            # convert these to a decimal value to preserve precision.
-            statistics[key] = decimal.Decimal(value)
-        first_element['StatisticValues'] = statistics
+        first_element['StatisticValues'] = _parse_statistic_values(value)
+
+
+def _parse_dimensions(value):
+    # Dimensions needs a little more processing.  We support
+    # the key=value,key2=value syntax so we need to parse
+    # that.
+    dimensions = []
+    for pair in split_on_commas(value):
+        key, value = pair.split('=')
+        dimensions.append({'Name': key, 'Value': value})
+    return dimensions
+
+
+def _parse_statistic_values(value):
+    # StatisticValues is a struct type so we are parsing
+    # a csv keyval list into a dict.
+    statistics = {}
+    for pair in split_on_commas(value):
+        key, value = pair.split('=')
+        # There are four supported values: Maximum, Minimum, SampleCount,
+        # and Sum.  All of them are documented as a type double so we can
+        # convert these to a decimal value to preserve precision.
+        statistics[key] = decimal.Decimal(value)
+    return statistics
+
+
+class MetricDataFileArgument(CustomArgument):
+    """Publishes the metric records of a file instead of the operation.
+
+    When the argument is given, the ``PutMetricData`` operation is not
+    called with the parameters of the command line.  Instead the records
+    of the file are published with the other parameters, such as
+    ``--namespace``, by a ``MetricDataPublisher``.
+    """
+    def __init__(self, session, name, **kwargs):
+        self._session = session
+        super(MetricDataFileArgument, self).__init__(name, **kwargs)
+
+    def add_to_params(self, parameters, value):
+        if value is None:
+            return
+        self._session.register(
+            'calling-command.cloudwatch.put-metric-data',
+            self.publish_metric_data)
+
+    def publish_metric_data(self, call_parameters, parsed_args,
+                            parsed_globals, **kwargs):
+        client = create_client(
+            self._session, 'cloudwatch', region_name=parsed_globals.region,
+            endpoint_url=parsed_globals.endpoint_url,
+            verify=parsed_globals.verify_ssl)
+        filename = parsed_args.metric_data_file
+        data_format = parsed_args.metric_data_format
+        if data_format is None:
+            data_format = _get_data_format(filename)
+        publisher = MetricDataPublisher(client, call_parameters)
+        if filename == '-':
+            publisher.publish(read_metric_records(sys.stdin, data_format))
+        else:
+            path = os.path.expandvars(os.path.expanduser(filename))
+            with open(path) as f:
+                publisher.publish(read_metric_records(f, data_format))
+        if publisher.num_failed:
+            sys.stderr.write(
+                '%s of %s metric record(s) could not be published\n' %
+                (publisher.num_failed,
+                 publisher.num_failed + publisher.num_published))
+            return 1
+        return 0
+
+
+def _get_data_format(filename):
+    if filename.lower().endswith('.csv'):
+        return 'csv'
+    return 'json'
+
+
+def read_metric_records(fileobj, data_format):
+    """Reads the metric records of a CSV or JSON lines file.
+
+    Yields a ``(line_number, datum, error)`` tuple for each record.  The
+    datum is a ``MetricDatum`` dict, or ``None`` if the record could not
+    be read, in which case ``error`` says why.
+    """
+    if data_format == 'csv':
+        return _read_csv_records(fileobj)
+    return _read_json_records(fileobj)
+
+
+def _read_json_records(fileobj):
+    for line_number, line in enumerate(fileobj, 1):
+        if not line.strip():
+            continue
+        try:
+            datum = json.loads(line, parse_float=decimal.Decimal)
+        except ValueError as e:
+            yield line_number, None, 'Invalid JSON: %s' % e
+            continue
+        if not isinstance(datum, dict):
+            yield line_number, None, 'Expected a JSON object'
+            continue
+        yield line_number, datum, None
+
+
+def _read_csv_records(fileobj):
+    reader = csv.reader(fileobj)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [column.strip() for column in header]
+    unknown = [column for column in header if column not in CSV_COLUMNS]
+    if unknown:
+        raise ValueError(
+            'Unknown columns in the metric data file: %s, valid columns '
+            'are: %s' % (', '.join(unknown), ', '.join(CSV_COLUMNS)))
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        line_number = reader.line_num
+        try:
+            datum = _datum_from_row(header, row)
+        except (ValueError, decimal.InvalidOperation) as e:
+            yield line_number, None, 'Invalid record: %s' % e
+            continue
+        yield line_number, datum, None
+
+
+def _datum_from_row(header, row):
+    if len(row) > len(header):
+        raise ValueError('expected at most %s columns, received %s' %
+                         (len(header), len(row)))
+    datum = {}
+    for column, cell in zip(header, row):
+        cell = cell.strip()
+        if not cell:
+            continue
+        if column == 'Value':
+            datum[column] = decimal.Decimal(cell)
+        elif column == 'Dimensions':
+            datum[column] = _parse_dimensions(cell)
+        elif column == 'StatisticValues':
+            datum[column] = _parse_statistic_values(cell)
+        else:
+            datum[column] = cell
+    return datum
+
+
+class MetricDataPublisher(object):
+    """Publishes metric records with batched PutMetricData requests.
+
+    The records are put in batches of ``MAX_DATUMS_PER_REQUEST`` that are
+    sent on a thread pool, with at most ``max_concurrent_requests``
+    requests in flight, so records are read as fast as they can be
+    published.  A batch that fails is reported to ``error_file`` with the
+    lines of its records and the other batches are still published.
+
+    :param client: The CloudWatch client used to publish the records.
+    :param parameters: The parameters of each request other than
+        ``MetricData``, such as the ``Namespace``.
+    """
+    def __init__(self, client, parameters,
+                 max_concurrent_requests=MAX_CONCURRENT_REQUESTS,
+                 error_file=None):
+        self._client = client
+        self._parameters = dict(
+            (k, v) for k, v in parameters.items() if k != 'MetricData')
+        self._max_concurrent_requests = max_concurrent_requests
+        if error_file is None:
+            error_file = sys.stderr
+        self._error_file = error_file
+        self.num_published = 0
+        self.num_failed = 0
+
+    def publish(self, records):
+        """Publishes records from ``read_metric_records``."""
+        executor = futures.ThreadPoolExecutor(
+            max_workers=self._max_concurrent_requests)
+        in_flight = set()
+        try:
+            for batch in self._iter_batches(records):
+                if len(in_flight) >= self._max_concurrent_requests:
+                    done, in_flight = futures.wait(
+                        in_flight, return_when=futures.FIRST_COMPLETED)
+                    self._record_results(done)
+                in_flight.add(executor.submit(self._put_batch, batch))
+            done, _ = futures.wait(in_flight)
+            self._record_results(done)
+        finally:
+            executor.shutdown(wait=True)
+
+    def _iter_batches(self, records):
+        batch = []
+        for line_number, datum, error in records:
+            if error is not None:
+                self._report_failure(
+                    'line %s' % line_number, error)
+                self.num_failed += 1
+                continue
+            batch.append((line_number, datum))
+            if len(batch) == MAX_DATUMS_PER_REQUEST:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _put_batch(self, batch):
+        params = dict(self._parameters)
+        params['MetricData'] = [datum for _, datum in batch]
+        try:
+            self._client.put_metric_data(**params)
+        except Exception as e:
+            LOG.debug('PutMetricData failed', exc_info=True)
+            return batch, e
+        return batch, None
+
+    def _record_results(self, done):
+        for future in done:
+            batch, error = future.result()
+            if error is None:
+                self.num_published += len(batch)
+            else:
+                self.num_failed += len(batch)
+                self._report_failure(
+                    'lines %s-%s' % (batch[0][0], batch[-1][0]), error)
+
+    def _report_failure(self, lines, error):
+        self._error_file.write(
+            'put-metric-data failed for the records on %s: %s\n' %
+            (lines, error))
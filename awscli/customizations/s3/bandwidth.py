@@ -0,0 +1,165 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import logging
+import threading
+import time
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket(object):
+    """A thread safe token bucket that limits the rate bytes are consumed.
+
+    Consumers reserve the tokens they need up front and then sleep until
+    the bucket has refilled enough to pay for them.  Because the bucket is
+    allowed to go negative, a consumer never waits for other consumers to
+    wake up, which keeps the aggregate rate of all threads at the limit
+    without the jitter of retrying when the bucket is empty.
+
+    :param rate: The maximum number of bytes per second.
+    :param burst_seconds: The number of seconds of unused bandwidth that
+        can be saved up and consumed in a burst.
+    """
+    def __init__(self, rate, burst_seconds=0.25, clock=time.time,
+                 sleep=time.sleep):
+        self._rate = float(rate)
+        self._capacity = self._rate * burst_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self._capacity
+        self._last_refill = self._clock()
+
+    @property
+    def rate(self):
+        return self._rate
+
+    def consume(self, amount):
+        """Block until ``amount`` bytes can be consumed."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last_refill) * self._rate)
+            self._last_refill = now
+            self._tokens -= amount
+            deficit = -self._tokens
+        if deficit > 0:
+            self._sleep(deficit / self._rate)
+
+
+class BandwidthLimitedStream(object):
+    """Wraps a file-like object so that its reads are rate limited.
+
+    Upload streams are created with bandwidth limiting disabled so that
+    the reads made to calculate the MD5 and signature of a request do not
+    consume any tokens.  The ``BandwidthLimiter`` enables the limiting once
+    the request has been signed and the body is about to be sent.
+    """
+    # Large reads are split so the wait between the reads stays short.
+    MAX_READ_SIZE = 256 * 1024
+
+    def __init__(self, fileobj, token_bucket, bandwidth_limiting=True):
+        self._fileobj = fileobj
+        self._token_bucket = token_bucket
+        self._bandwidth_limiting = bandwidth_limiting
+
+    def enable_bandwidth_limiting(self):
+        self._bandwidth_limiting = True
+
+    def read(self, amount=None):
+        if not self._bandwidth_limiting:
+            return self._fileobj.read(amount)
+        if amount is not None and amount <= self.MAX_READ_SIZE:
+            self._token_bucket.consume(amount)
+            return self._fileobj.read(amount)
+        chunks = []
+        remaining = amount
+        while remaining is None or remaining > 0:
+            read_size = self.MAX_READ_SIZE
+            if remaining is not None:
+                read_size = min(remaining, read_size)
+                remaining -= read_size
+            self._token_bucket.consume(read_size)
+            chunk = self._fileobj.read(read_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def seek(self, where):
+        self._fileobj.seek(where)
+
+    def tell(self):
+        return self._fileobj.tell()
+
+    def close(self):
+        self._fileobj.close()
+
+    def __len__(self):
+        if hasattr(self._fileobj, '__len__'):
+            return len(self._fileobj)
+        # Streams such as the BytesIO payloads of stdin uploads do not
+        # have a length, so use the amount left to read.
+        position = self._fileobj.tell()
+        self._fileobj.seek(0, 2)
+        end = self._fileobj.tell()
+        self._fileobj.seek(position)
+        return end - position
+
+    def __iter__(self):
+        # See ReadFileChunk.__iter__ for why the stream is not iterated.
+        return iter([])
+
+    def __getattr__(self, name):
+        # Pass through everything else, such as ``set_socket_timeout`` on
+        # download bodies.
+        return getattr(self._fileobj, name)
+
+
+class BandwidthLimiter(object):
+    """Creates streams that share a single bandwidth limit.
+
+    :param max_bandwidth: The maximum number of bytes per second all of
+        the streams can transfer in aggregate.
+    """
+    def __init__(self, max_bandwidth):
+        self._token_bucket = TokenBucket(max_bandwidth)
+        self._clients = []
+        self._lock = threading.Lock()
+
+    def get_upload_stream(self, fileobj, client):
+        """Wrap the body of a request that will be sent with ``client``."""
+        self._register_client(client)
+        return BandwidthLimitedStream(fileobj, self._token_bucket,
+                                      bandwidth_limiting=False)
+
+    def get_download_stream(self, fileobj):
+        """Wrap the body of a response."""
+        return BandwidthLimitedStream(fileobj, self._token_bucket)
+
+    def _register_client(self, client):
+        with self._lock:
+            if any(registered is client for registered in self._clients):
+                return
+            self._clients.append(client)
+            # The handler is registered after the request signer, so it
+            # runs once the body has been read to sign the request.
+            client.meta.events.register('request-created.s3',
+                                        self._enable_bandwidth_limiting)
+
+    def _enable_bandwidth_limiting(self, request, **kwargs):
+        if isinstance(request.body, BandwidthLimitedStream):
+            LOGGER.debug('Enabling bandwidth limiting for request body.')
+            request.body.enable_bandwidth_limiting()
@@ -0,0 +1,216 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import logging
+import sys
+import threading
+
+from concurrent import futures
+
+from awscli.customizations.s3.utils import uni_print
+
+
+LOGGER = logging.getLogger(__name__)
+
+# The most keys a single DeleteObjects request can delete.
+MAX_DELETE_BATCH_SIZE = 1000
+
+
+class BucketDrainer(object):
+    """Deletes every object in a bucket with batched ``DeleteObjects`` calls.
+
+    The keys of a bucket can only be listed one page at a time, so the
+    bucket is split into shards by the first levels of its ``/`` separated
+    prefixes, and the shards are listed at the same time.  Each page of
+    keys is sent to a pool of workers as a single ``DeleteObjects`` request
+    instead of one ``DeleteObject`` request per key.
+
+    :param client: The S3 client used to list and delete the objects.
+    :param num_workers: The number of threads deleting batches of keys.
+        The same number of threads is used to list the shards.
+    :param max_shard_depth: How many levels of prefixes are listed to find
+        shards when there are fewer shards than workers.
+    """
+    def __init__(self, client, num_workers=10, max_shard_depth=2,
+                 out_file=None, error_file=None):
+        self._client = client
+        self._num_workers = num_workers
+        self._max_shard_depth = max_shard_depth
+        self._progress = DrainProgress(out_file, error_file)
+        # Bound the number of batches waiting for a worker so listing
+        # does not get too far ahead of deleting.
+        self._pending_batches = threading.BoundedSemaphore(num_workers * 2)
+        self._delete_pool = None
+
+    @property
+    def num_deleted(self):
+        return self._progress.num_deleted
+
+    @property
+    def num_failed(self):
+        return self._progress.num_failed
+
+    def drain(self, bucket):
+        """Delete all of the objects in ``bucket``.
+
+        Errors deleting individual keys are reported and counted in
+        ``num_failed``.  An error listing the bucket is raised once the
+        batches already sent have finished.
+        """
+        self._delete_pool = futures.ThreadPoolExecutor(
+            max_workers=self._num_workers)
+        try:
+            shards = self._find_shards(bucket)
+            self._drain_shards(bucket, shards)
+        finally:
+            self._delete_pool.shutdown(wait=True)
+            self._progress.finish()
+
+    def _find_shards(self, bucket):
+        # Keys directly under a prefix come back from the delimited
+        # listing, so they are deleted while the shards are found.
+        shards = ['']
+        for _ in range(self._max_shard_depth):
+            if len(shards) >= self._num_workers:
+                break
+            next_shards = []
+            for prefix in shards:
+                next_shards.extend(self._list_level(bucket, prefix))
+            shards = next_shards
+        return shards
+
+    def _list_level(self, bucket, prefix):
+        common_prefixes = []
+        for page in self._paginate(bucket, prefix, delimiter='/'):
+            self._delete_keys(bucket, page.get('Contents', []))
+            for common_prefix in page.get('CommonPrefixes', []):
+                common_prefixes.append(common_prefix['Prefix'])
+        return common_prefixes
+
+    def _drain_shards(self, bucket, shards):
+        if not shards:
+            return
+        num_listers = min(self._num_workers, len(shards))
+        with futures.ThreadPoolExecutor(max_workers=num_listers) as pool:
+            listings = [pool.submit(self._drain_prefix, bucket, prefix)
+                        for prefix in shards]
+            for listing in listings:
+                listing.result()
+
+    def _drain_prefix(self, bucket, prefix):
+        for page in self._paginate(bucket, prefix):
+            self._delete_keys(bucket, page.get('Contents', []))
+
+    def _paginate(self, bucket, prefix, delimiter=None):
+        kwargs = {'Bucket': bucket, 'Prefix': prefix,
+                  'PaginationConfig': {'PageSize': MAX_DELETE_BATCH_SIZE}}
+        if delimiter is not None:
+            kwargs['Delimiter'] = delimiter
+        paginator = self._client.get_paginator('list_objects')
+        return paginator.paginate(**kwargs)
+
+    def _delete_keys(self, bucket, contents):
+        keys = [content['Key'] for content in contents]
+        for i in range(0, len(keys), MAX_DELETE_BATCH_SIZE):
+            self._pending_batches.acquire()
+            try:
+                future = self._delete_pool.submit(
+                    self._delete_batch, bucket,
+                    keys[i:i + MAX_DELETE_BATCH_SIZE])
+            except Exception:
+                self._pending_batches.release()
+                raise
+            future.add_done_callback(
+                lambda future: self._pending_batches.release())
+
+    def _delete_batch(self, bucket, keys):
+        try:
+            response = self._client.delete_objects(
+                Bucket=bucket,
+                Delete={'Objects': [{'Key': key} for key in keys],
+                        'Quiet': False})
+        except Exception as e:
+            LOGGER.debug('Failed to delete batch of %s keys from %s',
+                         len(keys), bucket, exc_info=True)
+            self._progress.record(
+                bucket, [], [(key, str(e)) for key in keys])
+            return
+        errors = []
+        for error in response.get('Errors', []):
+            message = (
+                'An error occurred (%s) when calling the DeleteObjects '
+                'operation: %s' % (error.get('Code'), error.get('Message')))
+            errors.append((error['Key'], message))
+        deleted = [deleted['Key'] for deleted in response.get('Deleted', [])]
+        self._progress.record(bucket, deleted, errors)
+
+
+class DrainProgress(object):
+    """Reports the keys deleted by a ``BucketDrainer``.
+
+    Every batch is written with a single write in the same
+    ``delete: s3://bucket/key`` format as ``aws s3 rm``.  When writing to
+    a terminal the line after them shows how many keys have been deleted
+    and how many have failed.
+    """
+    def __init__(self, out_file=None, error_file=None):
+        if out_file is None:
+            out_file = sys.stdout
+        if error_file is None:
+            error_file = sys.stderr
+        self._out_file = out_file
+        self._error_file = error_file
+        self._is_tty = _isatty(out_file)
+        self._lock = threading.Lock()
+        self._progress_length = 0
+        self.num_deleted = 0
+        self.num_failed = 0
+
+    def record(self, bucket, deleted, errors):
+        with self._lock:
+            self.num_deleted += len(deleted)
+            self.num_failed += len(errors)
+            if errors:
+                self._write(self._error_file, ''.join(
+                    'delete failed: s3://%s/%s %s\n' % (bucket, key, message)
+                    for key, message in errors))
+            if deleted:
+                self._write(self._out_file, ''.join(
+                    'delete: s3://%s/%s\n' % (bucket, key)
+                    for key in deleted))
+            if self._is_tty:
+                progress = 'Deleted %s object(s) with %s failure(s)' % (
+                    self.num_deleted, self.num_failed)
+                uni_print(progress + '\r', self._out_file)
+                self._out_file.flush()
+                self._progress_length = len(progress)
+
+    def finish(self):
+        with self._lock:
+            if self._progress_length:
+                uni_print(' ' * self._progress_length + '\r', self._out_file)
+                self._out_file.flush()
+                self._progress_length = 0
+
+    def _write(self, out_file, lines):
+        # Pad the first line so it overwrites the progress line.
+        first_line, rest = lines.split('\n', 1)
+        uni_print(first_line.ljust(self._progress_length) + '\n' + rest,
+                  out_file)
+        self._progress_length = 0
+
+
+def _isatty(out_file):
+    try:
+        return out_file.isatty()
+    except AttributeError:
+        return False
@@ -14,9 +14,11 @@ import os
 import logging
 import sys
 import threading
+import time
 
 from awscli.customizations.s3.utils import uni_print, bytes_print, \
-    IORequest, IOCloseRequest, StablePriorityQueue, set_file_utime
+    IORequest, IOCloseRequest, StablePriorityQueue, set_file_utime, \
+    human_readable_size
 from awscli.customizations.s3.tasks import OrderableTask
 from awscli.compat import queue
 
@@ -42,8 +44,9 @@ class Executor(object):
     IMMEDIATE_PRIORITY = 1
 
     def __init__(self, num_threads, result_queue, quiet,
-                 only_show_errors, max_queue_size, write_queue):
+                 only_show_errors, max_queue_size, write_queue, stats=None):
         self._max_queue_size = max_queue_size
+        self._stats = stats
         LOGGER.debug("Using max queue size for s3 tasks of: %s",
                      self._max_queue_size)
         self.queue = StablePriorityQueue(maxsize=self._max_queue_size,
@@ -92,6 +95,8 @@ class Executor(object):
         This is the function used to submit a task to the ``Executor``.
         """
         LOGGER.debug("Submitting task: %s", task)
+        if self._stats is not None:
+            task = self._stats.timed_task(task)
         self.queue.put(task)
 
     def initiate_shutdown(self, priority=STANDARD_PRIORITY):
@@ -237,6 +242,13 @@ class PrintThread(threading.Thread):
     out. Otherwise, it is a part of a multipart upload/download and
     only shows the most current part upload/download.
 
+    Results are collected in memory and written out in batches every
+    ``REFRESH_INTERVAL`` seconds rather than once per task.  When standard
+    out is a terminal, the progress line is also only rendered once per
+    interval and includes the transfer rate.  Otherwise the progress line
+    is written after every result, exactly as it always has been, so that
+    consumers of the output see the same bytes.
+
     Result Queue
     ------------
 
@@ -251,8 +263,11 @@ class PrintThread(threading.Thread):
             deprecated, will be removed in the future).
         * warning: Boolean indicating whether or not a file generated a
             warning.
+        * bytes_transferred: The number of bytes transferred by the task.
 
     """
+    REFRESH_INTERVAL = 0.1
+
     def __init__(self, result_queue, quiet, only_show_errors):
         threading.Thread.__init__(self)
         self._progress_dict = {}
@@ -264,6 +279,12 @@ class PrintThread(threading.Thread):
         self._file_count = 0
         self._lock = threading.Lock()
         self._needs_newline = False
+        self._is_tty = False
+        self._output_buffer = []
+        self._progress_changed = False
+        self._bytes_transferred = 0
+        self._start_time = None
+        self._next_refresh_time = None
 
         self._total_parts = '...'
         self._total_files = '...'
@@ -282,10 +303,15 @@ class PrintThread(threading.Thread):
             self._total_files = total_files
 
     def run(self):
+        self._is_tty = self._stdout_is_tty()
+        self._start_time = time.time()
+        self._next_refresh_time = self._start_time + self.REFRESH_INTERVAL
         while True:
             try:
-                print_task = self._result_queue.get(True)
+                print_task = self._result_queue.get(
+                    True, self.REFRESH_INTERVAL)
                 if isinstance(print_task, ShutdownThreadRequest):
+                    self._flush_output()
                     if self._needs_newline:
                         sys.stdout.write('\n')
                     LOGGER.debug("Shutdown request received in print thread, "
@@ -299,6 +325,13 @@ class PrintThread(threading.Thread):
                                  exc_info=True)
             except queue.Empty:
                 pass
+            self._maybe_refresh()
+
+    def _stdout_is_tty(self):
+        try:
+            return sys.stdout.isatty()
+        except Exception:
+            return False
 
     def _process_print_task(self, print_task):
         print_str = print_task.message
@@ -306,12 +339,14 @@ class PrintThread(threading.Thread):
         if print_task.error:
             self.num_errors_seen += 1
             print_to_stderr = True
+        if print_task.bytes_transferred:
+            self._bytes_transferred += print_task.bytes_transferred
 
         final_str = ''
         if print_task.warning:
             self.num_warnings_seen += 1
             print_to_stderr = True
-            final_str += print_str.ljust(self._progress_length, ' ')
+            final_str += self._clear_progress(print_str)
             final_str += '\n'
         elif print_task.total_parts:
             # Normalize keys so failures and sucess
@@ -328,7 +363,7 @@ class PrintThread(threading.Thread):
                 self._progress_dict[print_str]['total'] = total_part
         else:
             print_components = print_str.split(':')
-            final_str += print_str.ljust(self._progress_length, ' ')
+            final_str += self._clear_progress(print_str)
             final_str += '\n'
             key = ':'.join(print_components[1:])
             if key in self._progress_dict:
@@ -339,17 +374,53 @@ class PrintThread(threading.Thread):
 
         # If the message is an error or warning, print it to standard error.
         if print_to_stderr and not self._quiet:
+            # Anything already buffered for standard out is written first
+            # so the two streams stay in order.
+            self._flush_output()
             uni_print(final_str, sys.stderr)
             final_str = ''
 
+        if self._quiet or self._only_show_errors:
+            return
         is_done = self._total_files == self._file_count
-        if not is_done:
+        if self._is_tty:
+            # The progress line is rendered on the next refresh.
+            self._progress_changed = not is_done
+        elif not is_done:
             final_str += self._make_progress_bar()
-        if not (self._quiet or self._only_show_errors):
-            uni_print(final_str)
-            self._needs_newline = not final_str.endswith('\n')
-
-    def _make_progress_bar(self):
+        if final_str:
+            self._output_buffer.append(final_str)
+
+    def _clear_progress(self, print_str):
+        # Pad the line so it overwrites the last progress line.
+        print_str = print_str.ljust(self._progress_length, ' ')
+        if self._is_tty:
+            # Progress lines are only rendered on a refresh, so once a
+            # line has overwritten it the next line does not need padding.
+            self._progress_length = 0
+        return print_str
+
+    def _maybe_refresh(self):
+        now = time.time()
+        if now < self._next_refresh_time:
+            return
+        self._next_refresh_time = now + self.REFRESH_INTERVAL
+        if self._progress_changed:
+            self._output_buffer.append(self._make_progress_bar(now))
+            self._progress_changed = False
+        self._flush_output()
+
+    def _flush_output(self):
+        if not self._output_buffer:
+            return
+        output = ''.join(self._output_buffer)
+        self._output_buffer = []
+        uni_print(output)
+        self._needs_newline = not output.endswith('\n')
+        if self._is_tty:
+            sys.stdout.flush()
+
+    def _make_progress_bar(self, now=None):
         """Creates the progress bar string to print out."""
 
         prog_str = "Completed %s " % self._num_parts
@@ -359,8 +430,14 @@ class PrintThread(threading.Thread):
             num_files = self._total_files - self._file_count
         prog_str += "part(s) with %s file(s) remaining" % \
             num_files
+        if now is not None and self._bytes_transferred:
+            prog_str += " (%s/s)" % self._get_transfer_rate(now)
         length_prog = len(prog_str)
         prog_str += '\r'
         prog_str = prog_str.ljust(self._progress_length, ' ')
         self._progress_length = length_prog
         return prog_str
+
+    def _get_transfer_rate(self, now):
+        elapsed = max(now - self._start_time, self.REFRESH_INTERVAL)
+        return human_readable_size(self._bytes_transferred / elapsed)
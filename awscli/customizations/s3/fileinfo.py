@@ -12,7 +12,7 @@ from dateutil.tz import tzlocal
 from botocore.compat import quote
 from awscli.customizations.s3.utils import find_bucket_key, \
     uni_print, guess_content_type, MD5Error, bytes_print, set_file_utime, \
-    RequestParamsMapper
+    RequestParamsMapper, ReadFileChunk
 
 
 LOGGER = logging.getLogger(__name__)
@@ -40,14 +40,7 @@ def save_file(filename, response_data, last_update, is_stream=False):
     body = response_data['Body']
     etag = response_data['ETag'][1:-1]
     if not is_stream:
-        d = os.path.dirname(filename)
-        try:
-            if not os.path.exists(d):
-                os.makedirs(d)
-        except OSError as e:
-            if not e.errno == errno.EEXIST:
-                raise CreateDirectoryError(
-                    "Could not create directory %s: %s" % (d, e))
+        create_parent_directory(filename)
     md5 = hashlib.md5()
     file_chunks = iter(partial(body.read, 1024 * 1024), b'')
     if is_stream:
@@ -66,15 +59,38 @@ def save_file(filename, response_data, last_update, is_stream=False):
             raise MD5Error(filename)
 
     if not is_stream:
-        last_update_tuple = last_update.timetuple()
-        mod_timestamp = time.mktime(last_update_tuple)
-        set_file_utime(filename, int(mod_timestamp))
+        set_last_update_time(filename, last_update)
     else:
         # Now write the output to stdout since the md5 is correct.
         bytes_print(payload)
         sys.stdout.flush()
 
 
+def create_parent_directory(filename):
+    """
+    Creates the directory that ``filename`` will be written to if it does
+    not already exist.
+    """
+    d = os.path.dirname(filename)
+    try:
+        if not os.path.exists(d):
+            os.makedirs(d)
+    except OSError as e:
+        if not e.errno == errno.EEXIST:
+            raise CreateDirectoryError(
+                "Could not create directory %s: %s" % (d, e))
+
+
+def set_last_update_time(filename, last_update):
+    """
+    Sets the modification time of a downloaded file to the last modified
+    time of the S3 object it was downloaded from.
+    """
+    last_update_tuple = last_update.timetuple()
+    mod_timestamp = time.mktime(last_update_tuple)
+    set_file_utime(filename, int(mod_timestamp))
+
+
 def _can_validate_md5_with_etag(etag, response_data):
     sse = response_data.get('ServerSideEncryption', None)
     sse_customer_algorithm = response_data.get('SSECustomerAlgorithm', None)
@@ -183,6 +199,10 @@ class FileInfo(TaskInfo):
         from the list of a ListObjects or the response from a HeadObject. It
         will only be filled if the task was generated from an S3 bucket.
     """
+    # The ``BandwidthLimiter`` used to limit the rate the file is uploaded
+    # or downloaded.  This is assigned in the ``BasicTask`` object.
+    bandwidth_limiter = None
+
     def __init__(self, src, dest=None, compare_key=None, size=None,
                  last_update=None, src_type=None, dest_type=None,
                  operation_name=None, client=None, parameters=None,
@@ -254,12 +274,19 @@ class FileInfo(TaskInfo):
         """
         if payload:
             self._handle_upload(payload)
+        elif self.bandwidth_limiter is not None:
+            # The limited stream needs the length of the file, which
+            # ``ReadFileChunk`` provides.
+            with ReadFileChunk(self.src, 0, self.size) as body:
+                self._handle_upload(body)
         else:
             with open(self.src, 'rb') as body:
                 self._handle_upload(body)
 
     def _handle_upload(self, body):
         bucket, key = find_bucket_key(self.dest)
+        if self.bandwidth_limiter is not None:
+            body = self.bandwidth_limiter.get_upload_stream(body, self.client)
         params = {
             'Bucket': bucket,
             'Key': key,
@@ -269,6 +296,25 @@ class FileInfo(TaskInfo):
         RequestParamsMapper.map_put_object_params(params, self.parameters)
         response_data = self.client.put_object(**params)
 
+    def get_upload_extra_args(self):
+        """
+        Returns the extra arguments to use when uploading the file with an
+        ``S3Transfer`` object.
+        """
+        extra_args = {}
+        self._inject_content_type(extra_args)
+        RequestParamsMapper.map_put_object_params(extra_args, self.parameters)
+        return extra_args
+
+    def transfer_upload(self, transfer):
+        """
+        Uploads the file to s3 with an ``S3Transfer`` object, which will
+        use a multipart upload if the file is large.
+        """
+        bucket, key = find_bucket_key(self.dest)
+        transfer.upload_file(self.src, bucket, key,
+                             extra_args=self.get_upload_extra_args())
+
     def _inject_content_type(self, params):
         if not self.parameters['guess_mime_type']:
             return
@@ -301,9 +347,24 @@ class FileInfo(TaskInfo):
         params = {'Bucket': bucket, 'Key': key}
         RequestParamsMapper.map_get_object_params(params, self.parameters)
         response_data = self.client.get_object(**params)
+        if self.bandwidth_limiter is not None:
+            response_data['Body'] = self.bandwidth_limiter.get_download_stream(
+                response_data['Body'])
         save_file(self.dest, response_data, self.last_update,
                   self.is_stream)
 
+    def transfer_download(self, transfer):
+        """
+        Downloads the object from s3 with an ``S3Transfer`` object, which
+        will use ranged downloads if the object is large.
+        """
+        bucket, key = find_bucket_key(self.src)
+        extra_args = {}
+        RequestParamsMapper.map_get_object_params(extra_args, self.parameters)
+        create_parent_directory(self.dest)
+        transfer.download_file(bucket, key, self.dest, extra_args=extra_args)
+        set_last_update_time(self.dest, self.last_update)
+
     def copy(self):
         """
         Copies a object in s3 to another location in s3.
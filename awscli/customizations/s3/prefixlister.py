@@ -0,0 +1,200 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import threading
+from collections import deque
+
+from concurrent import futures
+
+from awscli.compat import queue
+
+
+class ParallelPrefixLister(object):
+    """Lists the objects under a prefix by listing its prefixes in parallel.
+
+    The prefix is first listed with a ``/`` delimiter.  Each of the common
+    prefixes it returns is then listed recursively on a thread pool.  All
+    of the keys under a common prefix sort next to each other, so the pages
+    are yielded in the same order a single recursive listing returns them:
+    the keys directly under the prefix and the listings of the common
+    prefixes are merged in sorted order, and a listing that gets ahead
+    waits until the pages before it have been consumed.
+
+    :param client: The S3 client used to list the objects.
+    :param num_workers: The number of prefixes listed at the same time.
+    """
+    # The number of pages each listing can buffer before it waits.
+    MAX_BUFFERED_PAGES = 2
+    # The number of keys read ahead from the delimited listing to find
+    # prefixes to start listing.
+    MAX_LOOKAHEAD_KEYS = 1000
+
+    def __init__(self, client, num_workers=10):
+        self._client = client
+        self._num_workers = num_workers
+
+    def list_objects(self, bucket, prefix='', page_size=None, ordered=True):
+        """Yields the pages of a recursive listing of ``prefix``.
+
+        The pages only have a ``Contents`` key, and at least one page is
+        always yielded.  If ``ordered`` is False, the pages are yielded as
+        soon as they are listed instead of in the order of the keys, which
+        keeps all of the workers busy.
+        """
+        cancelled = threading.Event()
+        pool = futures.ThreadPoolExecutor(max_workers=self._num_workers)
+        if ordered:
+            list_objects = self._list_objects
+        else:
+            list_objects = self._list_objects_unordered
+        try:
+            yielded = False
+            for page in list_objects(bucket, prefix, page_size, pool,
+                                     cancelled):
+                yielded = True
+                yield page
+            if not yielded:
+                yield {'Contents': []}
+        finally:
+            # Stop any listings that are waiting for their pages to be
+            # consumed if the caller stopped early.
+            cancelled.set()
+            pool.shutdown(wait=True)
+
+    def _list_objects(self, bucket, prefix, page_size, pool, cancelled):
+        entries = self._iter_delimited_entries(bucket, prefix, page_size)
+        lookahead = deque()
+        num_listings = 0
+        exhausted = False
+        while True:
+            while not exhausted and num_listings < self._num_workers and \
+                    len(lookahead) < self.MAX_LOOKAHEAD_KEYS:
+                entry = next(entries, None)
+                if entry is None:
+                    exhausted = True
+                elif 'Key' in entry:
+                    lookahead.append(entry)
+                else:
+                    page_queue = queue.Queue(self.MAX_BUFFERED_PAGES)
+                    pool.submit(self._list_prefix, bucket, entry['Prefix'],
+                                page_size, page_queue, cancelled)
+                    lookahead.append(page_queue)
+                    num_listings += 1
+            if not lookahead:
+                return
+            if isinstance(lookahead[0], dict):
+                contents = []
+                while lookahead and isinstance(lookahead[0], dict):
+                    contents.append(lookahead.popleft())
+                yield {'Contents': contents}
+            else:
+                page_queue = lookahead.popleft()
+                for page in self._iter_queue(page_queue):
+                    yield page
+                num_listings -= 1
+
+    def _list_objects_unordered(self, bucket, prefix, page_size, pool,
+                                cancelled):
+        page_queue = queue.Queue(self._num_workers * self.MAX_BUFFERED_PAGES)
+        num_listings = 0
+        contents = []
+        for entry in self._iter_delimited_entries(bucket, prefix, page_size):
+            if 'Key' in entry:
+                contents.append(entry)
+                if len(contents) >= self.MAX_LOOKAHEAD_KEYS:
+                    yield {'Contents': contents}
+                    contents = []
+            else:
+                pool.submit(self._list_prefix, bucket, entry['Prefix'],
+                            page_size, page_queue, cancelled)
+                num_listings += 1
+            # Consume the pages that are ready so the listings do not wait
+            # for the delimited listing to finish.
+            while num_listings:
+                try:
+                    item = page_queue.get_nowait()
+                except queue.Empty:
+                    break
+                num_listings -= self._count_finished(item)
+                if item[0] is not None:
+                    yield item[0]
+        if contents:
+            yield {'Contents': contents}
+        while num_listings:
+            item = page_queue.get()
+            num_listings -= self._count_finished(item)
+            if item[0] is not None:
+                yield item[0]
+
+    def _count_finished(self, item):
+        page, error = item
+        if error is not None:
+            raise error
+        if page is None:
+            return 1
+        return 0
+
+    def _iter_delimited_entries(self, bucket, prefix, page_size):
+        for page in self._paginate(bucket, prefix, page_size, delimiter='/'):
+            # The keys and common prefixes of a page are returned in
+            # separate lists, but are in sorted order together.
+            entries = page.get('Contents', []) + \
+                page.get('CommonPrefixes', [])
+            entries.sort(key=_entry_name)
+            for entry in entries:
+                yield entry
+
+    def _list_prefix(self, bucket, prefix, page_size, page_queue, cancelled):
+        try:
+            for page in self._paginate(bucket, prefix, page_size):
+                contents = page.get('Contents', [])
+                if not contents:
+                    continue
+                if not self._put(page_queue, ({'Contents': contents}, None),
+                                 cancelled):
+                    return
+        except Exception as e:
+            self._put(page_queue, (None, e), cancelled)
+        else:
+            self._put(page_queue, (None, None), cancelled)
+
+    def _put(self, page_queue, item, cancelled):
+        while not cancelled.is_set():
+            try:
+                page_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _iter_queue(self, page_queue):
+        while True:
+            page, error = page_queue.get()
+            if error is not None:
+                raise error
+            if page is None:
+                return
+            yield page
+
+    def _paginate(self, bucket, prefix, page_size, delimiter=None):
+        kwargs = {'Bucket': bucket, 'Prefix': prefix,
+                  'PaginationConfig': {'PageSize': page_size}}
+        if delimiter is not None:
+            kwargs['Delimiter'] = delimiter
+        paginator = self._client.get_paginator('list_objects')
+        return paginator.paginate(**kwargs)
+
+
+def _entry_name(entry):
+    if 'Key' in entry:
+        return entry['Key']
+    return entry['Prefix']
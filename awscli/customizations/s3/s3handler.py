@@ -15,11 +15,17 @@ import logging
 import math
 import os
 import sys
+import threading
+
+from concurrent import futures
+from s3transfer import S3Transfer
 
 from awscli.customizations.s3.utils import find_chunksize, \
     find_bucket_key, relative_path, PrintTask, create_warning
 from awscli.customizations.s3.executor import Executor
+from awscli.customizations.s3.bandwidth import BandwidthLimiter
 from awscli.customizations.s3 import tasks
+from awscli.customizations.s3 import transferconfig
 from awscli.customizations.s3.transferconfig import RuntimeConfig
 from awscli.compat import six
 from awscli.compat import queue
@@ -43,8 +49,9 @@ class S3Handler(object):
     MAX_IO_QUEUE_SIZE = 20
 
     def __init__(self, session, params, result_queue=None,
-                 runtime_config=None):
+                 runtime_config=None, stats=None):
         self.session = session
+        self._stats = stats
         if runtime_config is None:
             runtime_config = RuntimeConfig.defaults()
         self._runtime_config = runtime_config
@@ -76,13 +83,20 @@ class S3Handler(object):
         self.chunksize = self._runtime_config['multipart_chunksize']
         LOGGER.debug("Using a multipart threshold of %s and a part size of %s",
                      self.multi_threshold, self.chunksize)
+        self._bandwidth_limiter = None
+        max_bandwidth = self._runtime_config.get('max_bandwidth')
+        if max_bandwidth is not None:
+            LOGGER.debug("Limiting bandwidth to %s bytes per second",
+                         max_bandwidth)
+            self._bandwidth_limiter = BandwidthLimiter(max_bandwidth)
         self.executor = Executor(
             num_threads=self._runtime_config['max_concurrent_requests'],
             result_queue=self.result_queue,
             quiet=self.params['quiet'],
             only_show_errors=self.params['only_show_errors'],
             max_queue_size=self._runtime_config['max_queue_size'],
-            write_queue=self.write_queue
+            write_queue=self.write_queue,
+            stats=self._stats
         )
         self._multipart_uploads = []
         self._multipart_downloads = []
@@ -101,6 +115,8 @@ class S3Handler(object):
             total_files, total_parts = self._enqueue_tasks(files)
             self.executor.print_thread.set_total_files(total_files)
             self.executor.print_thread.set_total_parts(total_parts)
+            if self._stats is not None:
+                self._stats.set_total_files(total_files)
             self.executor.initiate_shutdown()
             self.executor.wait_until_shutdown()
             self._shutdown()
@@ -203,24 +219,30 @@ class S3Handler(object):
                     )
                     self.result_queue.put(warning)
                 continue
-            elif is_multipart_task and not self.params['dryrun']:
-                # If we're in dryrun mode, then we don't need the
-                # real multipart tasks.  We can just use a BasicTask
-                # in the else clause below, which will print out the
-                # fact that it's transferring a file rather than
-                # the specific part tasks required to perform the
-                # transfer.
-                num_uploads = self._enqueue_multipart_tasks(filename)
             else:
-                task = tasks.BasicTask(
-                    session=self.session, filename=filename,
-                    parameters=self.params,
-                    result_queue=self.result_queue)
-                self.executor.submit(task)
+                num_uploads = self._enqueue_file_tasks(
+                    filename, is_multipart_task)
             total_files += 1
             total_parts += num_uploads
         return total_files, total_parts
 
+    def _enqueue_file_tasks(self, filename, is_multipart_task):
+        if is_multipart_task and not self.params['dryrun']:
+            # If we're in dryrun mode, then we don't need the
+            # real multipart tasks.  We can just use a BasicTask
+            # in the else clause below, which will print out the
+            # fact that it's transferring a file rather than
+            # the specific part tasks required to perform the
+            # transfer.
+            return self._enqueue_multipart_tasks(filename)
+        task = tasks.BasicTask(
+            session=self.session, filename=filename,
+            parameters=self.params,
+            result_queue=self.result_queue, stats=self._stats,
+            bandwidth_limiter=self._bandwidth_limiter)
+        self.executor.submit(task)
+        return 1
+
     def _is_multipart_task(self, filename):
         # First we need to determine if it's an operation that even
         # qualifies for multipart upload.
@@ -291,7 +313,8 @@ class S3Handler(object):
                 part_number=i, chunk_size=chunksize,
                 result_queue=self.result_queue, filename=filename,
                 context=context, io_queue=self.write_queue,
-                params=self.params)
+                params=self.params, stats=self._stats,
+                bandwidth_limiter=self._bandwidth_limiter)
             self.executor.submit(task)
 
     def _enqueue_multipart_upload_tasks(self, filename,
@@ -355,9 +378,11 @@ class S3Handler(object):
         kwargs = {'part_number': part_number, 'chunk_size': chunk_size,
                   'result_queue': self.result_queue,
                   'upload_context': upload_context, 'filename': filename,
-                  'params': self.params}
+                  'params': self.params, 'stats': self._stats}
         if payload:
             kwargs['payload'] = payload
+        if task_class is tasks.UploadPartTask:
+            kwargs['bandwidth_limiter'] = self._bandwidth_limiter
         task = task_class(**kwargs)
         self.executor.submit(task)
 
@@ -369,6 +394,143 @@ class S3Handler(object):
         self._multipart_uploads.append((upload_context, filename))
 
 
+class S3TransferHandler(S3Handler):
+    """
+    This class is an alternative ``S3Handler`` that runs the transfer
+    commands on the ``s3transfer`` engine.  Every task is run on a
+    ``concurrent.futures`` thread pool, and files large enough for a
+    multipart operation are transferred as a whole by an ``S3Transfer``
+    object that shares the client, and therefore the connection pool, of
+    the command.  Multipart transfers that ``s3transfer`` does not support
+    (S3 to S3 copies, and transfers needing request parameters it does
+    not accept) still fall back to the part tasks run by the ``Executor``.
+    """
+    def __init__(self, session, params, result_queue=None,
+                 runtime_config=None, stats=None):
+        super(S3TransferHandler, self).__init__(session, params, result_queue,
+                                                runtime_config, stats)
+        self._transfer_config = \
+            transferconfig.create_transfer_config_from_runtime_config(
+                self._runtime_config)
+        # The files are transferred by a pool of threads and multipart
+        # transfers have a pool of their own, so ``max_concurrent_requests``
+        # is split between the two.
+        self._max_workers = transferconfig.split_concurrency(
+            self._runtime_config['max_concurrent_requests'])[0]
+        # Bound the number of submitted but unfinished futures the same
+        # way the ``Executor`` bounds the size of its task queue.
+        self._max_pending = self._max_workers + \
+            self._runtime_config['max_queue_size']
+        self._pending_semaphore = threading.BoundedSemaphore(
+            self._max_pending)
+        self._transfers = {}
+        self._pool = None
+        self._pending_futures = set()
+        self._pending_lock = threading.Lock()
+
+    def call(self, files):
+        self._pool = futures.ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            self.executor.start()
+            total_files, total_parts = self._enqueue_tasks(files)
+            self.executor.print_thread.set_total_files(total_files)
+            self.executor.print_thread.set_total_parts(total_parts)
+            if self._stats is not None:
+                self._stats.set_total_files(total_files)
+            self._pool.shutdown(wait=True)
+            self.executor.initiate_shutdown()
+            self.executor.wait_until_shutdown()
+            self._shutdown()
+        except Exception as e:
+            LOGGER.debug('Exception caught during task execution: %s',
+                         str(e), exc_info=True)
+            self.result_queue.put(PrintTask(message=str(e), error=True))
+            self._cancel_pending_futures()
+            self.executor.initiate_shutdown(
+                priority=self.executor.IMMEDIATE_PRIORITY)
+            self._shutdown()
+            self.executor.wait_until_shutdown()
+        except KeyboardInterrupt:
+            self.result_queue.put(PrintTask(message=("Cleaning up. "
+                                                     "Please wait..."),
+                                            error=True))
+            self._cancel_pending_futures()
+            self.executor.initiate_shutdown(
+                priority=self.executor.IMMEDIATE_PRIORITY)
+            self._shutdown()
+            self.executor.wait_until_shutdown()
+        return CommandResult(self.executor.num_tasks_failed,
+                             self.executor.num_tasks_warned)
+
+    def _cancel_pending_futures(self):
+        # Futures that have not started yet are cancelled, while the ones
+        # currently running are allowed to finish so that s3transfer can
+        # clean up after any in progress multipart transfers.
+        with self._pending_lock:
+            pending_futures = list(self._pending_futures)
+        for future in pending_futures:
+            future.cancel()
+        self._pool.shutdown(wait=True)
+
+    def _enqueue_file_tasks(self, filename, is_multipart_task):
+        if is_multipart_task and not self.params['dryrun']:
+            if not self._can_use_s3transfer(filename):
+                return self._enqueue_multipart_tasks(filename)
+            task = tasks.S3TransferTask(
+                session=self.session, filename=filename,
+                parameters=self.params, result_queue=self.result_queue,
+                transfer=self._get_transfer(filename.client),
+                stats=self._stats)
+        else:
+            task = tasks.BasicTask(
+                session=self.session, filename=filename,
+                parameters=self.params,
+                result_queue=self.result_queue, stats=self._stats,
+                bandwidth_limiter=self._bandwidth_limiter)
+        self._submit(task)
+        return 1
+
+    def _can_use_s3transfer(self, filename):
+        if self._bandwidth_limiter is not None:
+            # s3transfer reads the file and response bodies itself, so
+            # the bandwidth limit can only be applied to the part tasks.
+            return False
+        if filename.src_type == 'local' and filename.dest_type == 's3':
+            filename.parameters = self.params
+            extra_args = filename.get_upload_extra_args()
+            return all(arg in S3Transfer.ALLOWED_UPLOAD_ARGS
+                       for arg in extra_args)
+        elif filename.src_type == 's3' and filename.dest_type == 'local':
+            # Ranged downloads in s3transfer do not forward the SSE-C
+            # parameters to each GetObject request.
+            return not self.params['sse_c']
+        return False
+
+    def _get_transfer(self, client):
+        # One ``S3Transfer`` is created per client so that all of the
+        # transfers made with a client share its connection pool.
+        transfer = self._transfers.get(id(client))
+        if transfer is None:
+            transfer = S3Transfer(client, self._transfer_config)
+            self._transfers[id(client)] = transfer
+        return transfer
+
+    def _submit(self, task):
+        LOGGER.debug("Submitting task to transfer pool: %s", task)
+        if self._stats is not None:
+            task = self._stats.timed_task(task)
+        self._pending_semaphore.acquire()
+        future = self._pool.submit(task)
+        with self._pending_lock:
+            self._pending_futures.add(future)
+        future.add_done_callback(self._task_done)
+
+    def _task_done(self, future):
+        with self._pending_lock:
+            self._pending_futures.discard(future)
+        self._pending_semaphore.release()
+
+
 class S3StreamHandler(S3Handler):
     """
     This class is an alternative ``S3Handler`` to be used when the operation
@@ -381,7 +543,7 @@ class S3StreamHandler(S3Handler):
     EXECUTOR_NUM_THREADS = 6
 
     def __init__(self, session, params, result_queue=None,
-                 runtime_config=None):
+                 runtime_config=None, stats=None):
         if runtime_config is None:
             # Rather than using the .defaults(), streaming
             # has different default values so that it does not
@@ -390,7 +552,7 @@ class S3StreamHandler(S3Handler):
                 max_queue_size=self.MAX_EXECUTOR_QUEUE_SIZE,
                 max_concurrent_requests=self.EXECUTOR_NUM_THREADS)
         super(S3StreamHandler, self).__init__(session, params, result_queue,
-                                              runtime_config)
+                                              runtime_config, stats)
 
     def _enqueue_tasks(self, files):
         total_files = 0
@@ -422,7 +584,8 @@ class S3StreamHandler(S3Handler):
                     session=self.session, filename=filename,
                     parameters=self.params,
                     result_queue=self.result_queue,
-                    payload=payload)
+                    payload=payload, stats=self._stats,
+                    bandwidth_limiter=self._bandwidth_limiter)
                 self.executor.submit(task)
             total_files += 1
             total_parts += num_uploads
@@ -0,0 +1,258 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import json
+import threading
+import time
+
+from awscli.customizations.s3.tasks import OrderableTask
+from awscli.customizations.s3.utils import human_readable_size
+
+
+class TransferStats(object):
+    """Records metrics about the run of an s3 transfer command.
+
+    The metrics are grouped by the phase of the command they were
+    recorded in:
+
+        * listing: Time spent listing the source and destination files.
+        * comparing: Time spent deciding which files need to be
+          transferred, not including the time spent listing.
+        * queued: Time tasks spent waiting in a queue for a worker.
+        * transferring: Time workers spent running tasks.
+
+    Along with the phases, the number of bytes transferred, the number
+    and latency of requests made with the registered clients, and the
+    number of retries made by the tasks are recorded.  All of the
+    ``record_*`` methods are thread safe.
+    """
+    PHASES = ['listing', 'comparing', 'queued', 'transferring']
+    PERCENTILES = [50, 90, 99]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._start_time = None
+        self._end_time = None
+        self._phase_times = dict((phase, 0.0) for phase in self.PHASES)
+        self._queue_waits = []
+        self._task_times = []
+        self._latencies = []
+        self._requests = {}
+        self._retries = {}
+        self._bytes_transferred = 0
+        self._total_files = 0
+        self._clients = []
+
+    def start(self):
+        self._start_time = time.time()
+
+    def stop(self):
+        self._end_time = time.time()
+
+    def register_client(self, client):
+        """Record the latency of every request made with ``client``."""
+        if any(registered is client for registered in self._clients):
+            return
+        self._clients.append(client)
+        client.meta.events.register('before-call.s3', self._before_call)
+        client.meta.events.register('after-call.s3', self._after_call)
+
+    def _before_call(self, context, **kwargs):
+        context['transfer_stats_start_time'] = time.time()
+
+    def _after_call(self, model, context, **kwargs):
+        start_time = context.pop('transfer_stats_start_time', None)
+        if start_time is not None:
+            self.record_request(model.name, time.time() - start_time)
+
+    def timed_iter(self, iterable, phase):
+        """Record the time spent producing each item of ``iterable``.
+
+        Time spent in another ``timed_iter`` nested within this one is
+        only counted against the phase of the nested iterator.  This
+        allows the comparing phase to exclude the time spent listing
+        the files being compared.
+        """
+        iterator = iter(iterable)
+        while True:
+            timer = self._start_timer()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._stop_timer(timer, phase)
+            yield item
+
+    def _start_timer(self):
+        timers = self._local.__dict__.setdefault('timers', [])
+        # The timer is a list of the start time and the time spent in
+        # any nested timers.
+        timer = [time.time(), 0.0]
+        timers.append(timer)
+        return timer
+
+    def _stop_timer(self, timer, phase):
+        timers = self._local.timers
+        timers.pop()
+        elapsed = time.time() - timer[0]
+        if timers:
+            timers[-1][1] += elapsed
+        self.record_phase_time(phase, elapsed - timer[1])
+
+    def timed_task(self, task):
+        """Wrap a task so its queue wait and run time are recorded."""
+        return TimedTask(task, self)
+
+    def record_phase_time(self, phase, seconds):
+        with self._lock:
+            self._phase_times[phase] += seconds
+
+    def record_queue_wait(self, seconds):
+        with self._lock:
+            self._phase_times['queued'] += seconds
+            self._queue_waits.append(seconds)
+
+    def record_task_time(self, seconds):
+        with self._lock:
+            self._phase_times['transferring'] += seconds
+            self._task_times.append(seconds)
+
+    def record_request(self, operation_name, latency):
+        with self._lock:
+            self._requests[operation_name] = \
+                self._requests.get(operation_name, 0) + 1
+            self._latencies.append(latency)
+
+    def record_retry(self, source):
+        with self._lock:
+            self._retries[source] = self._retries.get(source, 0) + 1
+
+    def record_bytes(self, amount):
+        with self._lock:
+            self._bytes_transferred += amount
+
+    def set_total_files(self, total_files):
+        with self._lock:
+            self._total_files = total_files
+
+    @property
+    def wall_time(self):
+        if self._start_time is None:
+            return 0.0
+        end_time = self._end_time
+        if end_time is None:
+            end_time = time.time()
+        return end_time - self._start_time
+
+    def to_dict(self):
+        with self._lock:
+            wall_time = self.wall_time
+            bytes_per_second = 0.0
+            if wall_time > 0:
+                bytes_per_second = self._bytes_transferred / wall_time
+            phases = {}
+            for phase in self.PHASES:
+                phases[phase] = {'seconds': self._phase_times[phase]}
+            phases['queued'].update(self._summarize(self._queue_waits))
+            phases['transferring'].update(self._summarize(self._task_times))
+            requests = {'count': sum(self._requests.values()),
+                        'operations': dict(self._requests)}
+            requests.update(self._summarize(self._latencies))
+            return {
+                'wall_time': wall_time,
+                'total_files': self._total_files,
+                'bytes_transferred': self._bytes_transferred,
+                'bytes_per_second': bytes_per_second,
+                'phases': phases,
+                'requests': requests,
+                'retries': {'count': sum(self._retries.values()),
+                            'sources': dict(self._retries)},
+            }
+
+    def _summarize(self, samples):
+        samples = sorted(samples)
+        summary = {'count': len(samples)}
+        for percentile in self.PERCENTILES:
+            summary['p%s' % percentile] = _percentile(samples, percentile)
+        summary['max'] = samples[-1] if samples else 0.0
+        return summary
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=4, sort_keys=True)
+
+    def format_summary(self):
+        """Return a human readable summary of the recorded metrics."""
+        stats = self.to_dict()
+        lines = [
+            'Transfer statistics:',
+            '   Total time: %.2f seconds' % stats['wall_time'],
+            '   Total files: %s' % stats['total_files'],
+            '   Bytes transferred: %s (%s/s)' % (
+                human_readable_size(stats['bytes_transferred']),
+                human_readable_size(stats['bytes_per_second'])),
+            '   Phases:',
+        ]
+        for phase in self.PHASES:
+            phase_stats = stats['phases'][phase]
+            line = '      %s: %.2f seconds' % (phase, phase_stats['seconds'])
+            if 'count' in phase_stats:
+                line += ' over %s tasks (%s)' % (
+                    phase_stats['count'], self._format_percentiles(
+                        phase_stats))
+            lines.append(line)
+        requests = stats['requests']
+        lines.append('   Requests: %s (%s)' % (
+            requests['count'], self._format_percentiles(requests)))
+        for operation_name in sorted(requests['operations']):
+            lines.append('      %s: %s' % (
+                operation_name, requests['operations'][operation_name]))
+        lines.append('   Retries: %s' % stats['retries']['count'])
+        for source in sorted(stats['retries']['sources']):
+            lines.append('      %s: %s' % (
+                source, stats['retries']['sources'][source]))
+        return '\n'.join(lines) + '\n'
+
+    def _format_percentiles(self, summary):
+        parts = ['p%s %.3fs' % (percentile, summary['p%s' % percentile])
+                 for percentile in self.PERCENTILES]
+        parts.append('max %.3fs' % summary['max'])
+        return ', '.join(parts)
+
+
+class TimedTask(OrderableTask):
+    """A task that records how long it was queued and how long it ran."""
+    def __init__(self, task, stats):
+        self.PRIORITY = task.PRIORITY
+        self.task = task
+        self._stats = stats
+        self._submitted_time = time.time()
+
+    def __call__(self):
+        started_time = time.time()
+        self._stats.record_queue_wait(started_time - self._submitted_time)
+        try:
+            return self.task()
+        finally:
+            self._stats.record_task_time(time.time() - started_time)
+
+    def __repr__(self):
+        return 'TimedTask(%r)' % self.task
+
+
+def _percentile(sorted_samples, percentile):
+    # Uses the nearest-rank method.
+    if not sorted_samples:
+        return 0.0
+    index = int(len(sorted_samples) * percentile / 100.0)
+    return sorted_samples[min(index, len(sorted_samples) - 1)]
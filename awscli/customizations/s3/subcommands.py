@@ -14,27 +14,35 @@ import os
 import sys
 
 from botocore.client import Config
-from dateutil.parser import parse
-from dateutil.tz import tzlocal
 
+from awscli.clientcache import create_client
 from awscli.compat import six
 from awscli.compat import queue
 from awscli.customizations.commands import BasicCommand
+from awscli.customizations.s3.bucketdrain import BucketDrainer
+from awscli.customizations.s3.prefixlister import ParallelPrefixLister
+from awscli.customizations.s3.summary import ListingSummary
 from awscli.customizations.s3.comparator import Comparator
 from awscli.customizations.s3.fileinfobuilder import FileInfoBuilder
 from awscli.customizations.s3.fileformat import FileFormat
 from awscli.customizations.s3.filegenerator import FileGenerator
 from awscli.customizations.s3.fileinfo import TaskInfo, FileInfo
 from awscli.customizations.s3.filters import create_filter
-from awscli.customizations.s3.s3handler import S3Handler, S3StreamHandler
+from awscli.customizations.s3.s3handler import S3Handler, S3StreamHandler, \
+    S3TransferHandler
+from awscli.customizations.s3.stats import TransferStats
 from awscli.customizations.s3.utils import find_bucket_key, uni_print, \
     AppendFilter, find_dest_path_comp_key, human_readable_size, \
-    RequestParamsMapper
+    RequestParamsMapper, LocalTimeFormatter
 from awscli.customizations.s3.syncstrategy.base import MissingFileSync, \
     SizeAndLastModifiedSync, NeverSync
 from awscli.customizations.s3 import transferconfig
 
 
+# The most keys a single ListObjects request can return.
+MAX_LIST_PAGE_SIZE = 1000
+
+
 RECURSIVE = {'name': 'recursive', 'action': 'store_true', 'dest': 'dir_op',
              'help_text': (
                  "Command is performed on all files or objects "
@@ -51,6 +59,34 @@ SUMMARIZE = {'name': 'summarize', 'action': 'store_true',
                  "(number of objects, total size).")}
 
 
+PARALLEL_PREFIXES = {'name': 'parallel-prefixes', 'action': 'store_true',
+                     'help_text': (
+                         "When used with ``--recursive``, lists each of the "
+                         "prefixes directly under the path at the same time. "
+                         "The objects are displayed in the same order. The "
+                         "number of prefixes listed at once is set by the "
+                         "``max_concurrent_requests`` s3 configuration "
+                         "value.")}
+
+
+SUMMARY_ONLY = {'name': 'summary-only', 'action': 'store_true',
+                'help_text': (
+                    "Displays only summary information for all of the "
+                    "objects under the path instead of listing each object. "
+                    "Along with the total number of objects and total size, "
+                    "the objects are counted by first level prefix, storage "
+                    "class and size range. The prefixes under the path are "
+                    "listed at the same time.")}
+
+
+SUMMARY_FORMAT = {'name': 'summary-format', 'choices': ['text', 'json'],
+                  'default': 'text',
+                  'help_text': (
+                      "The format of the summary displayed by "
+                      "``--summary-only``. Valid values are ``text`` and "
+                      "``json``.")}
+
+
 DRYRUN = {'name': 'dryrun', 'action': 'store_true',
           'help_text': (
               "Displays the operations that would be performed using the "
@@ -381,6 +417,22 @@ PAGE_SIZE = {'name': 'page-size', 'cli_type_name': 'integer',
                  'Using a lower value may help if an operation times out.')}
 
 
+STATS = {'name': 'stats', 'action': 'store_true',
+         'help_text': (
+             'Prints a summary of transfer statistics once the command '
+             'completes. The summary includes the time spent listing, '
+             'comparing, queued and transferring, the number of bytes '
+             'transferred and the throughput, the number and latency '
+             'percentiles of the requests made, and the number of retries.')}
+
+
+STATS_FILE = {'name': 'stats-file',
+              'help_text': (
+                  'Writes the transfer statistics described in ``--stats`` '
+                  'as JSON to the specified file once the command '
+                  'completes.')}
+
+
 IGNORE_GLACIER_WARNINGS = {
     'name': 'ignore-glacier-warnings', 'action': 'store_true',
     'help_text': (
@@ -399,13 +451,13 @@ TRANSFER_ARGS = [DRYRUN, QUIET, INCLUDE, EXCLUDE, ACL,
                  WEBSITE_REDIRECT, CONTENT_TYPE, CACHE_CONTROL,
                  CONTENT_DISPOSITION, CONTENT_ENCODING, CONTENT_LANGUAGE,
                  EXPIRES, SOURCE_REGION, ONLY_SHOW_ERRORS,
-                 PAGE_SIZE, IGNORE_GLACIER_WARNINGS]
+                 PAGE_SIZE, IGNORE_GLACIER_WARNINGS, STATS, STATS_FILE]
 
 
 def get_client(session, region, endpoint_url, verify, config=None):
-    return session.create_client('s3', region_name=region,
-                                 endpoint_url=endpoint_url, verify=verify,
-                                 config=config)
+    return create_client(session, 's3', region_name=region,
+                         endpoint_url=endpoint_url, verify=verify,
+                         config=config)
 
 
 class S3Command(BasicCommand):
@@ -423,7 +475,8 @@ class ListCommand(S3Command):
     USAGE = "<S3Uri> or NONE"
     ARG_TABLE = [{'name': 'paths', 'nargs': '?', 'default': 's3://',
                   'positional_arg': True, 'synopsis': USAGE}, RECURSIVE,
-                 PAGE_SIZE, HUMAN_READABLE, SUMMARIZE]
+                 PAGE_SIZE, HUMAN_READABLE, SUMMARIZE, PARALLEL_PREFIXES,
+                 SUMMARY_ONLY, SUMMARY_FORMAT]
 
     def _run_main(self, parsed_args, parsed_globals):
         super(ListCommand, self)._run_main(parsed_args, parsed_globals)
@@ -432,16 +485,26 @@ class ListCommand(S3Command):
         self._size_accumulator = 0
         self._total_objects = 0
         self._human_readable = parsed_args.human_readable
+        self._time_formatter = LocalTimeFormatter()
         path = parsed_args.paths
         if path.startswith('s3://'):
             path = path[5:]
         bucket, key = find_bucket_key(path)
+        if parsed_args.summary_only:
+            if not bucket:
+                raise ValueError('--summary-only requires an S3Uri of a '
+                                 'bucket, e.g. s3://mybucket')
+            return self._summarize_objects(bucket, key, parsed_args)
         if not bucket:
             self._list_all_buckets()
         elif parsed_args.dir_op:
             # Then --recursive was specified.
-            self._list_all_objects_recursive(bucket, key,
-                                             parsed_args.page_size)
+            if parsed_args.parallel_prefixes:
+                self._list_all_objects_parallel(bucket, key,
+                                                parsed_args.page_size)
+            else:
+                self._list_all_objects_recursive(bucket, key,
+                                                 parsed_args.page_size)
         else:
             self._list_all_objects(bucket, key, parsed_args.page_size)
         if parsed_args.summarize:
@@ -474,25 +537,26 @@ class ListCommand(S3Command):
         if not contents and not common_prefixes:
             self._empty_result = True
             return
+        # The lines of a page are written at once, which is much faster
+        # than writing them one at a time for large listings.
+        lines = []
+        pre_string = "PRE".rjust(30, " ")
         for common_prefix in common_prefixes:
             prefix_components = common_prefix['Prefix'].split('/')
             prefix = prefix_components[-2]
-            pre_string = "PRE".rjust(30, " ")
-            print_str = pre_string + ' ' + prefix + '/\n'
-            uni_print(print_str)
+            lines.append(pre_string + ' ' + prefix + '/\n')
         for content in contents:
             last_mod_str = self._make_last_mod_str(content['LastModified'])
             self._size_accumulator += int(content['Size'])
             self._total_objects += 1
             size_str = self._make_size_str(content['Size'])
             if use_basename:
-                filename_components = content['Key'].split('/')
-                filename = filename_components[-1]
+                filename = content['Key'].rsplit('/', 1)[-1]
             else:
                 filename = content['Key']
-            print_str = last_mod_str + ' ' + size_str + ' ' + \
-                filename + '\n'
-            uni_print(print_str)
+            lines.append(last_mod_str + ' ' + size_str + ' ' +
+                         filename + '\n')
+        uni_print(''.join(lines))
         self._at_first_page = False
 
     def _list_all_buckets(self):
@@ -511,6 +575,34 @@ class ListCommand(S3Command):
         for response_data in iterator:
             self._display_page(response_data, use_basename=False)
 
+    def _list_all_objects_parallel(self, bucket, key, page_size=None):
+        lister = self._create_prefix_lister()
+        for response_data in lister.list_objects(bucket, key, page_size):
+            self._display_page(response_data, use_basename=False)
+
+    def _summarize_objects(self, bucket, key, parsed_args):
+        summary = ListingSummary(key)
+        # The order of the objects does not matter for the summary, so
+        # the pages are counted as soon as any of the prefixes return them.
+        lister = self._create_prefix_lister()
+        page_size = parsed_args.page_size or MAX_LIST_PAGE_SIZE
+        for response_data in lister.list_objects(bucket, key, page_size,
+                                                 ordered=False):
+            summary.add_contents(response_data['Contents'])
+        if parsed_args.summary_format == 'json':
+            uni_print(summary.to_json())
+        else:
+            uni_print(summary.format_text(self._human_readable))
+        if key and not summary.total_objects:
+            return 1
+        return 0
+
+    def _create_prefix_lister(self):
+        runtime_config = transferconfig.RuntimeConfig().build_config(
+            **self._session.get_scoped_config().get('s3', {}))
+        return ParallelPrefixLister(
+            self.client, num_workers=runtime_config['max_concurrent_requests'])
+
     def _check_no_objects(self):
         if self._empty_result and self._at_first_page:
             # Nothing was returned in the first page of results when listing
@@ -523,15 +615,7 @@ class ListCommand(S3Command):
         This function creates the last modified time string whenever objects
         or buckets are being listed
         """
-        last_mod = parse(last_mod)
-        last_mod = last_mod.astimezone(tzlocal())
-        last_mod_tup = (str(last_mod.year), str(last_mod.month).zfill(2),
-                        str(last_mod.day).zfill(2),
-                        str(last_mod.hour).zfill(2),
-                        str(last_mod.minute).zfill(2),
-                        str(last_mod.second).zfill(2))
-        last_mod_str = "%s-%s-%s %s:%s:%s" % last_mod_tup
-        return last_mod_str.ljust(19, ' ')
+        return self._time_formatter.format(last_mod)
 
     def _make_size_str(self, size):
         """
@@ -607,10 +691,11 @@ class S3TransferCommand(S3Command):
         cmd_params.add_verify_ssl(parsed_globals)
         cmd_params.add_page_size(parsed_args)
         cmd_params.add_paths(parsed_args.paths)
-        self._handle_rm_force(parsed_globals, cmd_params.parameters)
 
         runtime_config = transferconfig.RuntimeConfig().build_config(
             **self._session.get_scoped_config().get('s3', {}))
+        if not self._handle_rm_force(cmd_params.parameters, runtime_config):
+            return 1
         cmd = CommandArchitecture(self._session, self.NAME,
                                   cmd_params.parameters,
                                   runtime_config)
@@ -638,11 +723,12 @@ class S3TransferCommand(S3Command):
                 new_path = enc_path.decode('utf-8')
                 parsed_args.paths[i] = new_path
 
-    def _handle_rm_force(self, parsed_globals, parameters):
+    def _handle_rm_force(self, parameters, runtime_config):
         """
-        This function recursively deletes objects in a bucket if the force
+        This function deletes all of the objects in a bucket if the force
         parameter was thrown when using the remove bucket command. It will
-        refuse to delete if a key is specified in the s3path.
+        refuse to delete if a key is specified in the s3path.  Returns
+        False if any of the objects could not be deleted.
         """
         # XXX: This shouldn't really be here.  This was originally moved from
         # the CommandParameters class to here, but this is still not the ideal
@@ -658,9 +744,17 @@ class S3TransferCommand(S3Command):
                 if key:
                     raise ValueError('Please specify a valid bucket name only.'
                                      ' E.g. s3://%s' % bucket)
-                path = 's3://' + bucket
-                del_objects = RmCommand(self._session)
-                del_objects([path, '--recursive'], parsed_globals)
+                drainer = BucketDrainer(
+                    self.client,
+                    num_workers=runtime_config['max_concurrent_requests'])
+                drainer.drain(bucket)
+                if drainer.num_failed:
+                    uni_print(
+                        'remove_bucket failed: s3://%s %s object(s) could '
+                        'not be deleted\n' % (bucket, drainer.num_failed),
+                        sys.stderr)
+                    return False
+        return True
 
 
 class CpCommand(S3TransferCommand):
@@ -690,7 +784,7 @@ class RmCommand(S3TransferCommand):
     USAGE = "<S3Uri>"
     ARG_TABLE = [{'name': 'paths', 'nargs': 1, 'positional_arg': True,
                   'synopsis': USAGE}, DRYRUN, QUIET, RECURSIVE, INCLUDE,
-                 EXCLUDE, ONLY_SHOW_ERRORS, PAGE_SIZE]
+                 EXCLUDE, ONLY_SHOW_ERRORS, PAGE_SIZE, STATS, STATS_FILE]
 
 
 class SyncCommand(S3TransferCommand):
@@ -738,6 +832,14 @@ class CommandArchitecture(object):
     lsit of instructions to wire together an assortment of generators to
     perform the command.
     """
+    # The transfer statistics phase the files yielded by each
+    # instruction are recorded against.
+    INSTRUCTION_PHASES = {
+        'file_generator': 'listing',
+        'filters': 'listing',
+        'comparator': 'comparing',
+    }
+
     def __init__(self, session, cmd, parameters, runtime_config=None):
         self.session = session
         self.cmd = cmd
@@ -748,6 +850,9 @@ class CommandArchitecture(object):
         self._source_endpoint = None
         self._client = None
         self._source_client = None
+        self._stats = None
+        if self.parameters.get('stats') or self.parameters.get('stats_file'):
+            self._stats = TransferStats()
 
     def set_clients(self):
         client_config = None
@@ -776,6 +881,9 @@ class CommandArchitecture(object):
                     verify=self.parameters['verify_ssl'],
                     config=client_config
                 )
+        if self._stats is not None:
+            self._stats.register_client(self._client)
+            self._stats.register_client(self._source_client)
 
     def create_instructions(self):
         """
@@ -827,6 +935,14 @@ class CommandArchitecture(object):
 
         return sync_strategies
 
+    def _get_s3_handler_cls(self):
+        engine = transferconfig.DEFAULTS['transfer_engine']
+        if self._runtime_config is not None:
+            engine = self._runtime_config.get('transfer_engine', engine)
+        if engine == 's3transfer':
+            return S3TransferHandler
+        return S3Handler
+
     def run(self):
         """
         This function wires together all of the generators and completes
@@ -920,11 +1036,13 @@ class CommandArchitecture(object):
                                      is_stream=True)]
         file_info_builder = FileInfoBuilder(
             self._client, self._source_client, self.parameters)
-        s3handler = S3Handler(self.session, self.parameters,
-                              runtime_config=self._runtime_config,
-                              result_queue=result_queue)
+        s3handler = self._get_s3_handler_cls()(
+            self.session, self.parameters,
+            runtime_config=self._runtime_config,
+            result_queue=result_queue, stats=self._stats)
         s3_stream_handler = S3StreamHandler(self.session, self.parameters,
-                                            result_queue=result_queue)
+                                            result_queue=result_queue,
+                                            stats=self._stats)
 
         sync_strategies = self.choose_sync_strategies()
 
@@ -966,6 +1084,8 @@ class CommandArchitecture(object):
             command_dict = {'setup': [taskinfo],
                             's3_handler': [s3handler]}
 
+        if self._stats is not None:
+            self._stats.start()
         files = command_dict['setup']
         while self.instructions:
             instruction = self.instructions.pop(0)
@@ -976,7 +1096,10 @@ class CommandArchitecture(object):
                     file_list.append(components[i].call(*files))
                 else:
                     file_list.append(components[i].call(files[i]))
-            files = file_list
+            files = self._time_phase(instruction, file_list)
+        if self._stats is not None:
+            self._stats.stop()
+            self._report_stats()
         # This is kinda quirky, but each call through the instructions
         # will replaces the files attr with the return value of the
         # file_list.  The very last call is a single list of
@@ -994,6 +1117,26 @@ class CommandArchitecture(object):
             rc = 2
         return rc
 
+    def _time_phase(self, instruction, file_list):
+        # The generators are lazy, so the time spent listing and
+        # comparing is recorded as the s3 handler pulls files from them.
+        phase = self.INSTRUCTION_PHASES.get(instruction)
+        if self._stats is None or phase is None:
+            return file_list
+        return [self._stats.timed_iter(files, phase) for files in file_list]
+
+    def _report_stats(self):
+        # The summary is output like the progress of the transfers, so it
+        # is not printed when the output of the command is quieted.
+        quiet = self.parameters.get('quiet') or \
+            self.parameters.get('only_show_errors')
+        if self.parameters.get('stats') and not quiet:
+            uni_print(self._stats.format_summary())
+        stats_file = self.parameters.get('stats_file')
+        if stats_file:
+            with open(stats_file, 'w') as f:
+                f.write(self._stats.to_json())
+
 
 class CommandParameters(object):
     """
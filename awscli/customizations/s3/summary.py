@@ -0,0 +1,155 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import bisect
+import json
+
+from awscli.customizations.s3.utils import human_readable_size
+
+
+# The upper bounds of the size ranges objects are counted in, and the
+# label of each range.  The last range has no upper bound.
+SIZE_RANGES = [
+    (1024, '< 1 KiB'),
+    (1024 ** 2, '1 KiB - 1 MiB'),
+    (16 * 1024 ** 2, '1 MiB - 16 MiB'),
+    (128 * 1024 ** 2, '16 MiB - 128 MiB'),
+    (1024 ** 3, '128 MiB - 1 GiB'),
+    (5 * 1024 ** 3, '1 GiB - 5 GiB'),
+    (None, '>= 5 GiB'),
+]
+_SIZE_RANGE_BOUNDS = [bound for bound, _ in SIZE_RANGES[:-1]]
+# The label used in text output for the objects that are not under
+# a prefix.
+NO_PREFIX_LABEL = '(none)'
+
+
+class ListingSummary(object):
+    """Aggregates the objects of a listing without keeping the objects.
+
+    The number of objects and their total size are counted for the listing
+    as a whole, for each first level prefix under the listed prefix, for
+    each storage class and for each range of sizes in ``SIZE_RANGES``.
+    The memory used only grows with the number of first level prefixes
+    and storage classes, not with the number of objects.
+
+    :param prefix: The prefix that was listed.  The first level prefix of
+        a key is the part of the key up to the first ``/`` after it.
+    """
+    def __init__(self, prefix=''):
+        self._prefix = prefix
+        self.total_objects = 0
+        self.total_size = 0
+        self._prefixes = {}
+        self._storage_classes = {}
+        self._size_ranges = [[0, 0] for _ in SIZE_RANGES]
+
+    def add_contents(self, contents):
+        prefix_start = len(self._prefix)
+        prefixes = self._prefixes
+        storage_classes = self._storage_classes
+        for content in contents:
+            key = content['Key']
+            size = int(content['Size'])
+            self.total_objects += 1
+            self.total_size += size
+            end = key.find('/', prefix_start)
+            first_level_prefix = None
+            if end != -1:
+                first_level_prefix = key[:end + 1]
+            _add(prefixes, first_level_prefix, size)
+            _add(storage_classes, content.get('StorageClass'), size)
+            size_range = self._size_ranges[
+                bisect.bisect_right(_SIZE_RANGE_BOUNDS, size)]
+            size_range[0] += 1
+            size_range[1] += size
+
+    def to_dict(self):
+        return {
+            'TotalObjects': self.total_objects,
+            'TotalSize': self.total_size,
+            'Prefixes': [
+                {'Prefix': prefix, 'Objects': count, 'Size': size}
+                for prefix, (count, size) in
+                sorted(self._prefixes.items(), key=_sort_key)
+            ],
+            'StorageClasses': [
+                {'StorageClass': storage_class, 'Objects': count,
+                 'Size': size}
+                for storage_class, (count, size) in
+                sorted(self._storage_classes.items(), key=_sort_key)
+            ],
+            'SizeRanges': [
+                {'Range': label, 'Objects': count, 'Size': size}
+                for (_, label), (count, size) in
+                zip(SIZE_RANGES, self._size_ranges)
+            ],
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=4) + '\n'
+
+    def format_text(self, human_readable=False):
+        if human_readable:
+            size_str = human_readable_size
+        else:
+            size_str = str
+        summary = self.to_dict()
+        lines = [
+            'Total Objects: %s' % summary['TotalObjects'],
+            '   Total Size: %s' % size_str(summary['TotalSize']),
+        ]
+        sections = [
+            ('Prefix', 'Prefixes', 'Prefix'),
+            ('Storage Class', 'StorageClasses', 'StorageClass'),
+            ('Size Range', 'SizeRanges', 'Range'),
+        ]
+        for title, section, name in sections:
+            rows = [(_label(entry[name]), str(entry['Objects']),
+                     size_str(entry['Size']))
+                    for entry in summary[section]]
+            lines.append('')
+            lines.extend(_format_table((title, 'Objects', 'Size'), rows))
+        return '\n'.join(lines) + '\n'
+
+
+def _add(totals, name, size):
+    total = totals.get(name)
+    if total is None:
+        totals[name] = [1, size]
+    else:
+        total[0] += 1
+        total[1] += size
+
+
+def _sort_key(item):
+    # Sort the objects that are not under a prefix or do not have a
+    # storage class first.
+    name = item[0]
+    return (name is not None, name or '')
+
+
+def _label(name):
+    if name is None:
+        return NO_PREFIX_LABEL
+    return name
+
+
+def _format_table(header, rows):
+    widths = [max(len(row[i]) for row in [header] + rows)
+              for i in range(len(header))]
+    lines = []
+    for row in [header] + rows:
+        lines.append('%s  %s  %s' % (row[0].ljust(widths[0]),
+                                     row[1].rjust(widths[1]),
+                                     row[2].rjust(widths[2])))
+    return lines
@@ -65,16 +65,22 @@ class BasicTask(OrderableTask):
     attributes like ``session`` object in order for the filename to
     perform its designated operation.
     """
+    # The operations that transfer the contents of the file.
+    TRANSFER_OPERATIONS = ['upload', 'download', 'copy', 'move']
+
     def __init__(self, session, filename, parameters,
-                 result_queue, payload=None):
+                 result_queue, payload=None, stats=None,
+                 bandwidth_limiter=None):
         self.session = session
 
         self.filename = filename
         self.filename.parameters = parameters
+        self.filename.bandwidth_limiter = bandwidth_limiter
 
         self.parameters = parameters
         self.result_queue = result_queue
         self.payload = payload
+        self._stats = stats
 
     def __call__(self):
         self._execute_task(attempts=3)
@@ -92,48 +98,95 @@ class BasicTask(OrderableTask):
             kwargs['payload'] = self.payload
         try:
             if not self.parameters['dryrun']:
-                getattr(filename, filename.operation_name)(**kwargs)
+                self._perform_operation(filename, **kwargs)
         except requests.ConnectionError as e:
             connect_error = str(e)
             LOGGER.debug("%s %s failure: %s",
                          filename.src, filename.operation_name, connect_error)
-            self._execute_task(attempts - 1, last_error=str(e))
+            self._retry_task(attempts, last_error=str(e))
         except MD5Error as e:
             LOGGER.debug("%s %s failure: Data was corrupted: %s",
                          filename.src, filename.operation_name, e)
-            self._execute_task(attempts - 1, last_error=str(e))
+            self._retry_task(attempts, last_error=str(e))
         except Exception as e:
             LOGGER.debug(str(e), exc_info=True)
             self._queue_print_message(filename, failed=True,
                                       dryrun=self.parameters['dryrun'],
                                       error_message=str(e))
         else:
+            bytes_transferred = self._get_bytes_transferred(filename)
+            if self._stats is not None and bytes_transferred is not None:
+                self._stats.record_bytes(bytes_transferred)
             self._queue_print_message(filename, failed=False,
-                                      dryrun=self.parameters['dryrun'])
+                                      dryrun=self.parameters['dryrun'],
+                                      bytes_transferred=bytes_transferred)
+
+    def _retry_task(self, attempts, last_error):
+        if self._stats is not None and attempts > 1:
+            self._stats.record_retry('task')
+        self._execute_task(attempts - 1, last_error=last_error)
+
+    def _get_bytes_transferred(self, filename):
+        if self.parameters['dryrun']:
+            return None
+        if filename.operation_name not in self.TRANSFER_OPERATIONS:
+            return None
+        if self.payload is not None:
+            # Streams being uploaded do not have a size.
+            return len(self.payload.getvalue())
+        return filename.size
+
+    def _perform_operation(self, filename, **kwargs):
+        getattr(filename, filename.operation_name)(**kwargs)
 
     def _queue_print_message(self, filename, failed, dryrun,
-                             error_message=None):
+                             error_message=None, bytes_transferred=None):
         try:
             if filename.operation_name != 'list_objects':
                 message = print_operation(filename, failed,
                                           self.parameters['dryrun'])
                 if error_message is not None:
                     message += ' ' + error_message
-                result = {'message': message, 'error': failed}
+                result = {'message': message, 'error': failed,
+                          'bytes_transferred': bytes_transferred}
                 self.result_queue.put(PrintTask(**result))
         except Exception as e:
             LOGGER.debug('%s' % str(e))
 
 
+class S3TransferTask(BasicTask):
+    """
+    This task performs the transfer of an entire file through an
+    ``S3Transfer`` object instead of splitting the file into part tasks.
+    The ``S3Transfer`` object takes care of the multipart upload or ranged
+    download and runs the individual parts on its own thread pool using
+    the client it was created with.
+    """
+    def __init__(self, session, filename, parameters, result_queue,
+                 transfer, stats=None):
+        super(S3TransferTask, self).__init__(
+            session, filename, parameters, result_queue, stats=stats)
+        self._transfer = transfer
+
+    def _perform_operation(self, filename, **kwargs):
+        if filename.src_type == 'local':
+            filename.transfer_upload(self._transfer)
+        else:
+            filename.transfer_download(self._transfer)
+        if filename.operation_name == 'move':
+            filename.delete()
+
+
 class CopyPartTask(OrderableTask):
     def __init__(self, part_number, chunk_size,
-                 result_queue, upload_context, filename, params):
+                 result_queue, upload_context, filename, params, stats=None):
         self._result_queue = result_queue
         self._upload_context = upload_context
         self._part_number = part_number
         self._chunk_size = chunk_size
         self._filename = filename
         self._params = params
+        self._stats = stats
 
     def _is_last_part(self, part_number):
         return self._part_number == int(
@@ -169,10 +222,13 @@ class CopyPartTask(OrderableTask):
             etag = response_data['CopyPartResult']['ETag'][1:-1]
             self._upload_context.announce_finished_part(
                 etag=etag, part_number=self._part_number)
+            part_size = end_range - start_range + 1
+            if self._stats is not None:
+                self._stats.record_bytes(part_size)
 
             message = print_operation(self._filename, 0)
             result = {'message': message, 'total_parts': self._total_parts(),
-                      'error': False}
+                      'error': False, 'bytes_transferred': part_size}
             self._result_queue.put(PrintTask(**result))
         except UploadCancelledError as e:
             # We don't need to do anything in this case.  The task
@@ -203,7 +259,8 @@ class UploadPartTask(OrderableTask):
     object.
     """
     def __init__(self, part_number, chunk_size, result_queue, upload_context,
-                 filename, params, payload=None):
+                 filename, params, payload=None, stats=None,
+                 bandwidth_limiter=None):
         self._result_queue = result_queue
         self._upload_context = upload_context
         self._part_number = part_number
@@ -211,6 +268,8 @@ class UploadPartTask(OrderableTask):
         self._filename = filename
         self._params = params
         self._payload = payload
+        self._stats = stats
+        self._bandwidth_limiter = bandwidth_limiter
 
     def _read_part(self):
         actual_filename = self._filename.src
@@ -228,10 +287,15 @@ class UploadPartTask(OrderableTask):
             if self._filename.is_stream:
                 body = self._payload
                 total = self._upload_context.expected_parts
+                part_size = len(body.getvalue())
             else:
                 total = int(math.ceil(
                     self._filename.size/float(self._chunk_size)))
                 body = self._read_part()
+                part_size = len(body)
+            if self._bandwidth_limiter is not None:
+                body = self._bandwidth_limiter.get_upload_stream(
+                    body, self._filename.client)
             params = {'Bucket': bucket, 'Key': key,
                       'PartNumber': self._part_number,
                       'UploadId': upload_id,
@@ -244,10 +308,12 @@ class UploadPartTask(OrderableTask):
             etag = response_data['ETag'][1:-1]
             self._upload_context.announce_finished_part(
                 etag=etag, part_number=self._part_number)
+            if self._stats is not None:
+                self._stats.record_bytes(part_size)
 
             message = print_operation(self._filename, 0)
             result = {'message': message, 'total_parts': total,
-                      'error': False}
+                      'error': False, 'bytes_transferred': part_size}
             self._result_queue.put(PrintTask(**result))
         except UploadCancelledError as e:
             # We don't need to do anything in this case.  The task
@@ -341,7 +407,8 @@ class DownloadPartTask(OrderableTask):
     TOTAL_ATTEMPTS = 5
 
     def __init__(self, part_number, chunk_size, result_queue,
-                 filename, context, io_queue, params):
+                 filename, context, io_queue, params, stats=None,
+                 bandwidth_limiter=None):
         self._part_number = part_number
         self._chunk_size = chunk_size
         self._result_queue = result_queue
@@ -350,6 +417,8 @@ class DownloadPartTask(OrderableTask):
         self._context = context
         self._io_queue = io_queue
         self._params = params
+        self._stats = stats
+        self._bandwidth_limiter = bandwidth_limiter
 
     def __call__(self):
         try:
@@ -377,19 +446,24 @@ class DownloadPartTask(OrderableTask):
                   'Range': range_param}
         RequestParamsMapper.map_get_object_params(params, self._params)
         for i in range(self.TOTAL_ATTEMPTS):
+            if i > 0 and self._stats is not None:
+                self._stats.record_retry('download_part')
             try:
                 LOGGER.debug("Making GetObject requests with byte range: %s",
                              range_param)
                 response_data = self._client.get_object(**params)
                 LOGGER.debug("Response received from GetObject")
                 body = response_data['Body']
-                self._queue_writes(body)
+                amount_written = self._queue_writes(body)
                 self._context.announce_completed_part(self._part_number)
+                if self._stats is not None:
+                    self._stats.record_bytes(amount_written)
 
                 message = print_operation(self._filename, 0)
                 total_parts = int(self._filename.size / self._chunk_size)
                 result = {'message': message, 'error': False,
-                          'total_parts': total_parts}
+                          'total_parts': total_parts,
+                          'bytes_transferred': amount_written}
                 self._result_queue.put(PrintTask(**result))
                 LOGGER.debug("Task complete: %s", self)
                 return
@@ -411,10 +485,12 @@ class DownloadPartTask(OrderableTask):
                      self._part_number, self._filename.dest)
         iterate_chunk_size = self.ITERATE_CHUNK_SIZE
         body.set_socket_timeout(self.READ_TIMEOUT)
+        if self._bandwidth_limiter is not None:
+            body = self._bandwidth_limiter.get_download_stream(body)
         if self._filename.is_stream:
-            self._queue_writes_for_stream(body)
+            return self._queue_writes_for_stream(body)
         else:
-            self._queue_writes_in_chunks(body, iterate_chunk_size)
+            return self._queue_writes_in_chunks(body, iterate_chunk_size)
 
     def _queue_writes_for_stream(self, body):
         # We have to handle an output stream differently.  The main reason is
@@ -432,6 +508,7 @@ class DownloadPartTask(OrderableTask):
                       self._filename.is_stream)
         )
         self._context.done_with_turn()
+        return len(chunk)
 
     def _queue_writes_in_chunks(self, body, iterate_chunk_size):
         amount_read = 0
@@ -449,6 +526,7 @@ class DownloadPartTask(OrderableTask):
         # Change log message.
         LOGGER.debug("Done queueing writes for part number %s to file: %s",
                      self._part_number, self._filename.dest)
+        return amount_read
 
 
 class CreateMultipartUploadTask(BasicTask):
@@ -10,6 +10,10 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import math
+
+from s3transfer import TransferConfig
+
 from awscli.customizations.s3.utils import human_readable_to_bytes
 # If the user does not specify any overrides,
 # these are the default values we use for the s3 transfer
@@ -19,7 +23,14 @@ DEFAULTS = {
     'multipart_chunksize': 8 * (1024 ** 2),
     'max_concurrent_requests': 10,
     'max_queue_size': 1000,
+    'transfer_engine': 's3transfer',
+    'max_bandwidth': None,
 }
+# The engines that can be used to run the s3 transfer commands.  The
+# ``classic`` engine splits transfers into part tasks run by the
+# ``Executor``, while the ``s3transfer`` engine hands whole files to
+# ``s3transfer`` and runs them on a ``concurrent.futures`` thread pool.
+TRANSFER_ENGINES = ['classic', 's3transfer']
 
 
 class InvalidConfigError(Exception):
@@ -29,8 +40,10 @@ class InvalidConfigError(Exception):
 class RuntimeConfig(object):
 
     POSITIVE_INTEGERS = ['multipart_chunksize', 'multipart_threshold',
-                         'max_concurrent_requests', 'max_queue_size']
+                         'max_concurrent_requests', 'max_queue_size',
+                         'max_bandwidth']
     HUMAN_READABLE_SIZES = ['multipart_chunksize', 'multipart_threshold']
+    HUMAN_READABLE_RATES = ['max_bandwidth']
 
     @staticmethod
     def defaults():
@@ -51,7 +64,9 @@ class RuntimeConfig(object):
         if kwargs:
             runtime_config.update(kwargs)
         self._convert_human_readable_sizes(runtime_config)
+        self._convert_human_readable_rates(runtime_config)
         self._validate_config(runtime_config)
+        self._validate_transfer_engine(runtime_config)
         return runtime_config
 
     def _convert_human_readable_sizes(self, runtime_config):
@@ -60,6 +75,19 @@ class RuntimeConfig(object):
             if value is not None and not isinstance(value, int):
                 runtime_config[attr] = human_readable_to_bytes(value)
 
+    def _convert_human_readable_rates(self, runtime_config):
+        for attr in self.HUMAN_READABLE_RATES:
+            value = runtime_config.get(attr)
+            if value is not None and not isinstance(value, int):
+                if value.endswith('B/s'):
+                    try:
+                        value = human_readable_to_bytes(value[:-2])
+                    except ValueError:
+                        self._error_rate_value(attr, value)
+                elif not value.isdigit():
+                    self._error_rate_value(attr, value)
+                runtime_config[attr] = value
+
     def _validate_config(self, runtime_config):
         for attr in self.POSITIVE_INTEGERS:
             value = runtime_config.get(attr)
@@ -71,6 +99,52 @@ class RuntimeConfig(object):
                 except ValueError:
                     self._error_positive_value(attr, value)
 
+    def _validate_transfer_engine(self, runtime_config):
+        value = runtime_config.get('transfer_engine')
+        if value is not None and value not in TRANSFER_ENGINES:
+            raise InvalidConfigError(
+                "Value for transfer_engine must be one of %s: %s" % (
+                    ', '.join(TRANSFER_ENGINES), value))
+
+    def _error_rate_value(self, name, value):
+        raise InvalidConfigError(
+            "Value for %s must be a number of bytes per second, for "
+            "example 1048576 or 1MB/s: %s" % (name, value))
+
     def _error_positive_value(self, name, value):
         raise InvalidConfigError(
             "Value for %s must be a positive integer: %s" % (name, value))
+
+
+def split_concurrency(max_concurrent_requests):
+    """Split the concurrent requests between transfers and their parts.
+
+    Each file is transferred by one of ``max_workers`` threads, and the
+    parts of a multipart transfer are sent by up to ``max_concurrency``
+    threads of that transfer.  The two are chosen so that their product
+    never exceeds ``max_concurrent_requests``, which is also the size of
+    the connection pool of the client the transfers share.
+
+    :return: A ``(max_workers, max_concurrency)`` tuple.
+
+    """
+    max_concurrency = max(1, int(math.sqrt(max_concurrent_requests)))
+    max_workers = max(1, max_concurrent_requests // max_concurrency)
+    return max_workers, max_concurrency
+
+
+def create_transfer_config_from_runtime_config(runtime_config):
+    """Create an ``s3transfer.TransferConfig`` from a runtime config.
+
+    :param runtime_config: A runtime config dictionary as returned by
+        ``RuntimeConfig.build_config``.
+    :return: A ``TransferConfig`` with the matching thresholds, and the
+        concurrency of each transfer as given by ``split_concurrency``.
+
+    """
+    return TransferConfig(
+        multipart_threshold=runtime_config['multipart_threshold'],
+        multipart_chunksize=runtime_config['multipart_chunksize'],
+        max_concurrency=split_concurrency(
+            runtime_config['max_concurrent_requests'])[1],
+    )
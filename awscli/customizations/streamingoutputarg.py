@@ -10,9 +10,26 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import os
+import threading
+
+from botocore import xform_name
 from botocore.model import Shape
+from concurrent import futures
+
+from awscli.arguments import BaseCLIArgument, CustomArgument
+from awscli.clientcache import create_client
+
 
-from awscli.arguments import BaseCLIArgument
+# The size of the ranges of a ranged get.
+RANGE_SIZE = 8 * 1024 ** 2
+CONCURRENT_RANGES_HELP = (
+    '<p>Downloads the object with this many ranged requests at the same '
+    'time instead of with a single request.  The object is downloaded in '
+    'ranges of %s MiB, which are written to their place in the output '
+    'file as they are received.  The ranges are only requested if the '
+    'object is larger than one range and <code>--range</code> is not '
+    'specified.</p>' % (RANGE_SIZE // 1024 ** 2))
 
 
 def add_streaming_output_arg(argument_table, operation_model,
@@ -21,10 +38,19 @@ def add_streaming_output_arg(argument_table, operation_model,
     # event.
     if _has_streaming_output(operation_model):
         streaming_argument_name = _get_streaming_argument_name(operation_model)
-        argument_table['outfile'] = StreamingOutputArgument(
+        streaming_argument = StreamingOutputArgument(
             response_key=streaming_argument_name,
             operation_model=operation_model,
             session=session, name='outfile')
+        argument_table['outfile'] = streaming_argument
+        if _supports_ranges(operation_model):
+            # The command is called with the same names the argument table
+            # is built with.
+            command_event = kwargs['event_name'].replace(
+                'building-argument-table', 'calling-command', 1)
+            argument_table['concurrent-ranges'] = ConcurrentRangesArgument(
+                streaming_argument, streaming_argument_name, operation_model,
+                session, command_event)
 
 
 def _has_streaming_output(model):
@@ -35,9 +61,37 @@ def _get_streaming_argument_name(model):
     return model.output_shape.serialization['payload']
 
 
+def _supports_ranges(model):
+    # Operations such as S3 GetObject that return any byte range of their
+    # payload, along with its full length.
+    input_members = model.input_shape.members if model.input_shape else {}
+    output_members = model.output_shape.members
+    return ('Range' in input_members and 'ContentRange' in output_members
+            and 'ContentLength' in output_members)
+
+
+def copy_stream(stream, write, buffer_size, limit=None):
+    """Copies a stream with ``write`` and returns the number of bytes copied.
+
+    The stream is read ``buffer_size`` bytes at a time.  At most ``limit``
+    bytes are copied if it is given.
+    """
+    copied = 0
+    while limit is None or copied < limit:
+        size = buffer_size
+        if limit is not None:
+            size = min(size, limit - copied)
+        data = stream.read(size)
+        if not data:
+            break
+        write(data)
+        copied += len(data)
+    return copied
+
+
 class StreamingOutputArgument(BaseCLIArgument):
 
-    BUFFER_SIZE = 32768
+    BUFFER_SIZE = 1024 ** 2
     HELP = 'Filename where the content will be saved'
 
     def __init__(self, response_key, operation_model, name,
@@ -56,6 +110,8 @@ class StreamingOutputArgument(BaseCLIArgument):
         self._required = True
         self._operation_model = operation_model
         self._session = session
+        self._ranged_getter = None
+        self._saved = False
 
     @property
     def cli_name(self):
@@ -91,6 +147,10 @@ class StreamingOutputArgument(BaseCLIArgument):
         self._session.register('after-call.%s.%s' % (
             service_name, operation_name), self.save_file)
 
+    def set_ranged_getter(self, ranged_getter):
+        """Saves the payload with concurrent ranged requests."""
+        self._ranged_getter = ranged_getter
+
     def save_file(self, parsed, **kwargs):
         if self._response_key not in parsed:
             # If the response key is not in parsed, then
@@ -98,13 +158,182 @@ class StreamingOutputArgument(BaseCLIArgument):
             # error handler print out an error message.  We have no
             # file to save in this situation.
             return
+        if self._saved:
+            # The requests of a ranged get are made with the client of the
+            # command, so this is called for each of their responses too.
+            return
+        self._saved = True
         body = parsed[self._response_key]
-        buffer_size = self._buffer_size
-        with open(self._output_file, 'wb') as fp:
-            data = body.read(buffer_size)
-            while data:
-                fp.write(data)
-                data = body.read(buffer_size)
+        ranged_getter = self._ranged_getter
+        if ranged_getter is not None and ranged_getter.should_get(parsed):
+            ranged_getter.get(parsed, body, self._output_file)
+            # The response describes the first range, but the whole
+            # payload has been saved.
+            parsed['ContentLength'] = ranged_getter.content_length
+            parsed.pop('ContentRange', None)
+        else:
+            with open(self._output_file, 'wb') as fp:
+                copy_stream(body, fp.write, self._buffer_size)
         # We don't want to include the streaming param in
         # the returned response.
         del parsed[self._response_key]
+
+
+class ConcurrentRangesArgument(CustomArgument):
+    def __init__(self, streaming_argument, response_key, operation_model,
+                 session, command_event):
+        super(ConcurrentRangesArgument, self).__init__(
+            'concurrent-ranges', cli_type_name='integer',
+            help_text=CONCURRENT_RANGES_HELP)
+        self._streaming_argument = streaming_argument
+        self._response_key = response_key
+        self._operation_model = operation_model
+        self._session = session
+        self._command_event = command_event
+        self._max_concurrency = None
+
+    def add_to_parser(self, parser):
+        parser.add_argument(self.cli_name, dest=self.py_name, type=int)
+
+    def add_to_params(self, parameters, value):
+        if value is None:
+            return
+        if value < 1:
+            raise ValueError('--concurrent-ranges must be at least 1')
+        self._max_concurrency = value
+        self._session.register(self._command_event, self.set_ranged_getter)
+
+    def set_ranged_getter(self, call_parameters, parsed_globals, **kwargs):
+        client = create_client(
+            self._session, self._operation_model.service_model.service_name,
+            region_name=parsed_globals.region,
+            endpoint_url=parsed_globals.endpoint_url,
+            verify=parsed_globals.verify_ssl)
+        self._streaming_argument.set_ranged_getter(RangedGetter(
+            client, self._operation_model.name, call_parameters,
+            self._response_key, self._max_concurrency))
+        # The operation is still called by the command.
+        return None
+
+
+class RangedGetter(object):
+    """Saves a payload by getting its ranges with concurrent requests.
+
+    The response of the operation is used for the first range, and the
+    other ranges are requested with the same parameters and a ``Range``.
+    The output file is created with the full size of the payload, and each
+    range is written at its offset as it is received, so the ranges do not
+    need to be received in order.
+
+    :param client: The client used to request the ranges.
+    :param operation_name: The name of the operation, such as ``GetObject``.
+    :param call_parameters: The parameters the operation was called with.
+    :param response_key: The key of the payload in the responses.
+    :param max_concurrency: The number of ranges requested at the same time.
+    """
+    def __init__(self, client, operation_name, call_parameters,
+                 response_key, max_concurrency, range_size=RANGE_SIZE,
+                 buffer_size=StreamingOutputArgument.BUFFER_SIZE):
+        self._client = client
+        self._method_name = xform_name(operation_name)
+        self._call_parameters = call_parameters
+        self._response_key = response_key
+        self._max_concurrency = max_concurrency
+        self._range_size = range_size
+        self._buffer_size = buffer_size
+        self.content_length = None
+
+    def should_get(self, parsed):
+        # A range that was asked for is saved as is.
+        return ('Range' not in self._call_parameters and
+                parsed.get('ContentLength', 0) > self._range_size)
+
+    def get(self, parsed, body, filename):
+        try:
+            self._get(parsed, body, filename)
+        finally:
+            # Only the first range is read from the response of the
+            # operation.  Closing it stops the rest of the payload from
+            # being received on its connection.
+            body.close()
+
+    def _get(self, parsed, body, filename):
+        self.content_length = parsed['ContentLength']
+        parameters = dict(self._call_parameters)
+        if 'IfMatch' not in parameters and parsed.get('ETag'):
+            # Fail rather than mix the ranges of different versions if the
+            # object is replaced while it is being downloaded.
+            parameters['IfMatch'] = parsed['ETag']
+        with open(filename, 'wb') as f:
+            f.truncate(self.content_length)
+        writer = PositionalWriter(filename)
+        pending = []
+        try:
+            pool = futures.ThreadPoolExecutor(self._max_concurrency)
+            try:
+                pending = [
+                    pool.submit(self._get_range, parameters, writer, start)
+                    for start in range(self._range_size,
+                                       self.content_length,
+                                       self._range_size)]
+                self._copy_range(body, writer, 0)
+                body.close()
+                for future in futures.as_completed(pending):
+                    future.result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+            finally:
+                pool.shutdown(wait=True)
+        finally:
+            writer.close()
+
+    def _get_range(self, parameters, writer, start):
+        end = min(start + self._range_size, self.content_length) - 1
+        response = getattr(self._client, self._method_name)(
+            Range='bytes=%s-%s' % (start, end), **parameters)
+        stream = response[self._response_key]
+        try:
+            self._copy_range(stream, writer, start)
+        finally:
+            stream.close()
+
+    def _copy_range(self, stream, writer, start):
+        size = min(self._range_size, self.content_length - start)
+        offset = [start]
+
+        def write(data):
+            writer.write_at(data, offset[0])
+            offset[0] += len(data)
+
+        copied = copy_stream(stream, write, self._buffer_size, limit=size)
+        if copied != size:
+            raise IOError('Expected %s bytes at offset %s, received %s' %
+                          (size, start, copied))
+
+
+class PositionalWriter(object):
+    """Writes data at offsets of a file from any number of threads."""
+    def __init__(self, filename):
+        flags = os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(filename, flags)
+        self._lock = threading.Lock()
+
+    def write_at(self, data, offset):
+        while data:
+            if hasattr(os, 'pwrite'):
+                written = os.pwrite(self._fd, data, offset)
+            else:
+                # Without pwrite, the seek and write must not be
+                # interleaved with the ones of another thread.
+                with self._lock:
+                    os.lseek(self._fd, offset, os.SEEK_SET)
+                    written = os.write(self._fd, data)
+            # Writes to regular files are rarely partial, so the copy
+            # made by slicing the rest of the data is seldom made.
+            data = data[written:]
+            offset += written
+
+    def close(self):
+        os.close(self._fd)
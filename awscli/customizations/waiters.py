@@ -10,14 +10,57 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import sys
+import time
+from collections import namedtuple
+
 from botocore import xform_name
-from botocore.exceptions import DataNotFoundError
+from botocore.compat import OrderedDict
+from botocore.exceptions import ClientError, DataNotFoundError
 
+from awscli.arguments import CustomArgument
 from awscli.clidriver import ServiceOperation
+from awscli.clientcache import create_client
 from awscli.customizations.commands import BasicCommand, BasicHelp, \
     BasicDocHandler
 
 
+# Describes the resources of an operation that a waiter can wait on
+# separately with --multi-resource.  ``id_parameter`` is the parameter
+# that lists the identifiers of the resources and ``max_ids`` the most
+# identifiers a request can have.  ``path`` is the keys of the list of
+# resources in a response, each key but the last one naming a list, and
+# ``id_key`` is the key of the identifier of a resource.
+ResourceListConfig = namedtuple(
+    'ResourceListConfig', ['id_parameter', 'max_ids', 'path', 'id_key'])
+MULTI_RESOURCE_OPERATIONS = {
+    ('ec2', 'DescribeInstances'): ResourceListConfig(
+        'InstanceIds', 1000, ['Reservations', 'Instances'], 'InstanceId'),
+    ('ec2', 'DescribeInstanceStatus'): ResourceListConfig(
+        'InstanceIds', 100, ['InstanceStatuses'], 'InstanceId'),
+    ('ec2', 'DescribeVolumes'): ResourceListConfig(
+        'VolumeIds', 1000, ['Volumes'], 'VolumeId'),
+    ('ec2', 'DescribeSnapshots'): ResourceListConfig(
+        'SnapshotIds', 1000, ['Snapshots'], 'SnapshotId'),
+    ('ec2', 'DescribeImages'): ResourceListConfig(
+        'ImageIds', 1000, ['Images'], 'ImageId'),
+    ('ec2', 'DescribeSubnets'): ResourceListConfig(
+        'SubnetIds', 1000, ['Subnets'], 'SubnetId'),
+    ('ec2', 'DescribeVpcs'): ResourceListConfig(
+        'VpcIds', 1000, ['Vpcs'], 'VpcId'),
+}
+MULTI_RESOURCE_HELP = (
+    '<p>Waits for each resource in <code>--%s</code> separately.  The '
+    'resources are described with as few requests as possible, and each '
+    'resource is reported on stderr as soon as it reaches a success or a '
+    'failure state.  Resources that reach a failure state do not stop the '
+    'wait for the others.  The polling interval starts at the delay of '
+    'the waiter and grows while no resource changes state, and the wait '
+    'gives up after the delay times the maximum attempts of the waiter.  '
+    'This will exit with a return code of 255 if any resource did not '
+    'reach a success state.</p>')
+
+
 def register_add_waiters(cli):
     cli.register('building-command-table', add_waiters)
 
@@ -120,6 +163,7 @@ class WaiterStateCommandBuilder(object):
             operation_caller=WaiterCaller(self._session, waiter_name),
             session=self._session,
             operation_model=operation_model,
+            waiter_config=waiter_config,
         )
         # Build the top level description for the waiter state command.
         # Most waiters do not have a description so they need to be generated
@@ -200,10 +244,12 @@ class WaiterCaller(object):
     def invoke(self, service_name, operation_name, parameters, parsed_globals):
         self._session.unregister(
             'after-call', unique_id='awscli-error-handler')
-        client = self._session.create_client(
-            service_name, region_name=parsed_globals.region,
+        # The client may have been created before the error handler was
+        # unregistered from the session.
+        client = create_client(
+            self._session, service_name, region_name=parsed_globals.region,
             endpoint_url=parsed_globals.endpoint_url,
-            verify=parsed_globals.verify_ssl)
+            verify=parsed_globals.verify_ssl, remove_error_handler=True)
         waiter = client.get_waiter(xform_name(self._waiter_name))
         waiter.wait(**parameters)
         return 0
@@ -212,6 +258,28 @@ class WaiterCaller(object):
 class WaiterStateCommand(ServiceOperation):
     DESCRIPTION = ''
 
+    def __init__(self, name, parent_name, operation_caller, operation_model,
+                 session, waiter_config=None):
+        super(WaiterStateCommand, self).__init__(
+            name, parent_name, operation_caller, operation_model, session)
+        self._waiter_config = waiter_config
+
+    def _create_argument_table(self):
+        argument_table = super(
+            WaiterStateCommand, self)._create_argument_table()
+        service_name = self._operation_model.service_model.service_name
+        resource_config = MULTI_RESOURCE_OPERATIONS.get(
+            (service_name, self._operation_model.name))
+        if self._waiter_config is not None and resource_config is not None:
+            id_argument = xform_name(resource_config.id_parameter, '-')
+            argument_table['multi-resource'] = MultiResourceWaitArgument(
+                self._session, service_name, self._waiter_config,
+                resource_config,
+                'calling-command.%s.%s' % (self._parent_name, self._name),
+                name='multi-resource', action='store_true',
+                help_text=MULTI_RESOURCE_HELP % id_argument)
+        return argument_table
+
     def create_help_command(self):
         help_command = super(WaiterStateCommand, self).create_help_command()
         # Change the operation object's description by changing it to the
@@ -222,6 +290,204 @@ class WaiterStateCommand(ServiceOperation):
         return help_command
 
 
+class MultiResourceWaitArgument(CustomArgument):
+    """Waits with a ``MultiResourceWaiter`` instead of the waiter.
+
+    When the argument is given, it registers a handler for the
+    ``calling-command`` event of the waiter state command that waits for
+    the resources and returns the return code of the command.
+    """
+    def __init__(self, session, service_name, waiter_config,
+                 resource_config, event_name, **kwargs):
+        self._session = session
+        self._service_name = service_name
+        self._waiter_config = waiter_config
+        self._resource_config = resource_config
+        self._event_name = event_name
+        super(MultiResourceWaitArgument, self).__init__(**kwargs)
+
+    def add_to_params(self, parameters, value):
+        if value:
+            self._session.register(self._event_name, self.wait)
+
+    def wait(self, call_parameters, parsed_globals, **kwargs):
+        if not call_parameters.get(self._resource_config.id_parameter):
+            raise ValueError(
+                '--multi-resource requires --%s' %
+                xform_name(self._resource_config.id_parameter, '-'))
+        self._session.unregister(
+            'after-call', unique_id='awscli-error-handler')
+        client = create_client(
+            self._session, self._service_name,
+            region_name=parsed_globals.region,
+            endpoint_url=parsed_globals.endpoint_url,
+            verify=parsed_globals.verify_ssl, remove_error_handler=True)
+        waiter = MultiResourceWaiter(
+            client, self._waiter_config, self._resource_config)
+        return waiter.wait(call_parameters)
+
+
+class MultiResourceWaiter(object):
+    """Waits for many resources with shared polling.
+
+    Each cycle describes all of the resources that are still pending with
+    as few requests as the operation allows, and the acceptors of the
+    waiter are matched against each resource on its own.  A request that
+    fails, for example because one of the resources does not exist, is
+    split in half until the error can be attributed to a single resource.
+
+    The delay between cycles starts at the delay of the waiter and is
+    multiplied by ``BACKOFF_FACTOR``, up to ``MAX_DELAY_FACTOR`` times the
+    delay of the waiter, after each cycle in which no resource reached a
+    success or failure state.  The wait gives up after the delay times
+    the maximum attempts of the waiter, the longest the waiter itself
+    would wait.
+
+    :param client: The client used to describe the resources.
+    :param waiter_config: The ``SingleWaiterConfig`` of the waiter.
+    :param resource_config: The ``ResourceListConfig`` of the operation
+        of the waiter.
+    """
+    BACKOFF_FACTOR = 1.5
+    MAX_DELAY_FACTOR = 4
+
+    def __init__(self, client, waiter_config, resource_config,
+                 stream=None, sleep=time.sleep, clock=time.time):
+        self._client = client
+        self._waiter_config = waiter_config
+        self._resource_config = resource_config
+        self._acceptors = list(waiter_config.acceptors)
+        if stream is None:
+            stream = sys.stderr
+        self._stream = stream
+        self._sleep = sleep
+        self._clock = clock
+
+    def wait(self, parameters):
+        """Waits for the resources and returns the return code."""
+        id_parameter = self._resource_config.id_parameter
+        parameters = dict(parameters)
+        pending = list(OrderedDict.fromkeys(
+            parameters.pop(id_parameter)))
+        total = len(pending)
+        num_done = 0
+        num_failed = 0
+        base_delay = self._waiter_config.delay
+        delay = base_delay
+        deadline = self._clock() + \
+            base_delay * self._waiter_config.max_attempts
+        while True:
+            states = self._poll(pending, parameters)
+            still_pending = []
+            for resource_id in pending:
+                state, reason = states[resource_id]
+                if state in ('success', 'failure'):
+                    num_done += 1
+                    if state == 'failure':
+                        num_failed += 1
+                    self._report(resource_id, state, reason, num_done, total)
+                else:
+                    still_pending.append(resource_id)
+            progressed = len(still_pending) < len(pending)
+            pending = still_pending
+            if not pending:
+                break
+            if progressed:
+                delay = base_delay
+            else:
+                delay = min(delay * self.BACKOFF_FACTOR,
+                            base_delay * self.MAX_DELAY_FACTOR)
+            if self._clock() + delay > deadline:
+                for resource_id in pending:
+                    num_done += 1
+                    num_failed += 1
+                    self._report(resource_id, 'failure',
+                                 'Max wait time exceeded', num_done, total)
+                break
+            self._sleep(delay)
+        if num_failed:
+            self._stream.write(
+                '%s of %s resource(s) did not reach a success state\n' %
+                (num_failed, total))
+            return 255
+        return 0
+
+    def _poll(self, resource_ids, parameters):
+        states = {}
+        max_ids = self._resource_config.max_ids
+        for i in range(0, len(resource_ids), max_ids):
+            self._describe(resource_ids[i:i + max_ids], parameters, states)
+        return states
+
+    def _describe(self, resource_ids, parameters, states):
+        params = dict(parameters)
+        params[self._resource_config.id_parameter] = resource_ids
+        operation_name = xform_name(self._waiter_config.operation)
+        try:
+            response = getattr(self._client, operation_name)(**params)
+        except ClientError as e:
+            response = e.response
+        if 'Error' in response:
+            if len(resource_ids) > 1:
+                middle = len(resource_ids) // 2
+                self._describe(resource_ids[:middle], parameters, states)
+                self._describe(resource_ids[middle:], parameters, states)
+            else:
+                states[resource_ids[0]] = self._match(response)
+            return
+        resources = self._group_resources(response)
+        for resource_id in resource_ids:
+            if resource_id not in resources:
+                # A resource that is not in the response, e.g. one that is
+                # not visible yet, is not matched against the acceptors,
+                # as acceptors such as length(Reservations[]) > `0` would
+                # match a response built without it.
+                states[resource_id] = ('waiting', None)
+                continue
+            states[resource_id] = self._match(self._resource_response(
+                response, resources[resource_id]))
+
+    def _group_resources(self, response):
+        items = [response]
+        for key in self._resource_config.path:
+            items = [child for item in items for child in item.get(key, [])]
+        resources = {}
+        id_key = self._resource_config.id_key
+        for item in items:
+            resources.setdefault(item.get(id_key), []).append(item)
+        return resources
+
+    def _resource_response(self, response, items):
+        # Builds a response that only has the given resources, so the
+        # acceptors of the waiter can be matched against it.
+        path = self._resource_config.path
+        resource_response = {path[-1]: items}
+        for key in reversed(path[:-1]):
+            resource_response = {key: [resource_response]}
+        if 'ResponseMetadata' in response:
+            resource_response['ResponseMetadata'] = \
+                response['ResponseMetadata']
+        return resource_response
+
+    def _match(self, response):
+        for acceptor in self._acceptors:
+            if acceptor.matcher_func(response):
+                if acceptor.state == 'failure':
+                    return 'failure', 'Reached a failure state'
+                return acceptor.state, None
+        if 'Error' in response:
+            return 'failure', response['Error'].get('Message', 'Unknown')
+        return 'waiting', None
+
+    def _report(self, resource_id, state, reason, num_done, total):
+        if state == 'success':
+            message = 'success'
+        else:
+            message = 'failure: %s' % reason
+        self._stream.write('%s: %s (%s of %s done)\n' %
+                           (resource_id, message, num_done, total))
+
+
 class WaiterCommandDocHandler(BasicDocHandler):
     def doc_synopsis_start(self, help_command, **kwargs):
         pass
@@ -0,0 +1,592 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Create zip archives while compressing their members in parallel.
+
+The ``zipfile`` module compresses every member serially, which makes
+bundling a large directory slower than uploading it.  ``ZipBundler``
+splits the files into chunks that are compressed concurrently on a thread
+pool and writes the results, in order, as a standard ZIP64 capable
+archive.  Chunks of a file are compressed as independent raw deflate
+streams that are flushed to a byte boundary so that concatenating them
+produces a single valid deflate stream.
+
+The archive is only ever appended to, so it can be written to a
+non-seekable file object.  ``StreamingBundle`` uses this to let the start
+of an archive be read, and uploaded, while the rest of it is still being
+compressed.
+"""
+import binascii
+import collections
+import logging
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+from concurrent import futures
+
+from awscli.compat import six
+from awscli.compat import ZIP_COMPRESSION_MODE
+
+try:
+    import zlib
+except ImportError:
+    zlib = None
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Files that are already compressed are stored as is since deflating them
+# again costs CPU time without making the archive any smaller.
+STORED_EXTENSIONS = frozenset([
+    '.7z', '.aac', '.apk', '.avi', '.bz2', '.cab', '.docx', '.ear', '.flac',
+    '.gif', '.gz', '.jar', '.jpeg', '.jpg', '.lz', '.lzma', '.m4a', '.mkv',
+    '.mov', '.mp3', '.mp4', '.ogg', '.png', '.pptx', '.rar', '.tbz2', '.tgz',
+    '.war', '.webm', '.webp', '.whl', '.xlsx', '.xz', '.zip', '.zst',
+])
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# The same limits the ``zipfile`` module uses to decide when the ZIP64
+# extensions are needed.
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+ZIP_MAX_VALUE = 0xFFFFFFFF
+DEFAULT_VERSION = 20
+ZIP64_VERSION = 45
+DATA_DESCRIPTOR_FLAG = 0x08
+UTF8_FLAG = 0x800
+
+LOCAL_FILE_HEADER = struct.Struct('<4sHHHHHLLLHH')
+CENTRAL_DIRECTORY_HEADER = struct.Struct('<4sHHHHHHLLLHHHHHLL')
+END_OF_CENTRAL_DIRECTORY = struct.Struct('<4sHHHHLLH')
+ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct('<4sQHHLLQQQQ')
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct('<4sLQL')
+DATA_DESCRIPTOR = struct.Struct('<4sLLL')
+ZIP64_DATA_DESCRIPTOR = struct.Struct('<4sLQQ')
+
+
+class ZipBundler(object):
+    """Writes zip archives, compressing the members on a thread pool.
+
+    Threads are used instead of processes because ``zlib`` and file reads
+    release the GIL, so the chunks are compressed in parallel without the
+    cost of sending their contents to other processes.
+
+    :param max_workers: The number of threads compressing chunks.  Defaults
+        to the number of CPUs.
+    :param chunk_size: Files are split into chunks of this many bytes that
+        are compressed independently.
+    :param compression: The compression method for files that are not
+        already compressed, either ``zipfile.ZIP_DEFLATED`` or
+        ``zipfile.ZIP_STORED``.
+    :param stored_extensions: The extensions of files that are stored
+        without being compressed.
+    """
+    def __init__(self, max_workers=None, chunk_size=CHUNK_SIZE,
+                 compression=ZIP_COMPRESSION_MODE,
+                 stored_extensions=STORED_EXTENSIONS):
+        if max_workers is None:
+            max_workers = _cpu_count()
+        if zlib is None:
+            compression = zipfile.ZIP_STORED
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._compression = compression
+        self._stored_extensions = stored_extensions
+        # Bound the number of chunks, and so the memory, held at once.
+        self._max_pending_chunks = max_workers * 2
+        self._chunk_crc_operator = None
+
+    def write(self, members, fileobj):
+        """Write a zip archive of ``members`` to ``fileobj``.
+
+        :param members: An iterable of ``(filename, arcname)`` tuples.
+        :param fileobj: The file-like object to write the archive to.  Only
+            its ``write`` method is used, so it does not need to be
+            seekable.
+        """
+        writer = _ZipWriter(fileobj)
+        pending = collections.deque()
+        pool = futures.ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            for chunk in self._iter_chunks(members):
+                future = pool.submit(self._compress_chunk, chunk)
+                pending.append((chunk, future))
+                if len(pending) >= self._max_pending_chunks:
+                    self._write_chunk(writer, *pending.popleft())
+            while pending:
+                self._write_chunk(writer, *pending.popleft())
+            writer.close()
+        finally:
+            for _, future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def _iter_chunks(self, members):
+        for filename, arcname in members:
+            entry = self._create_entry(filename, arcname)
+            num_chunks = max(1, -(-entry.size_hint // self._chunk_size))
+            for index in range(num_chunks):
+                yield _Chunk(entry, index * self._chunk_size,
+                             self._chunk_size, index,
+                             index == num_chunks - 1)
+
+    def _create_entry(self, filename, arcname):
+        stat = os.stat(filename)
+        method = self._compression
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in self._stored_extensions:
+            method = zipfile.ZIP_STORED
+        return _ZipEntry(filename, arcname, stat, method)
+
+    def _compress_chunk(self, chunk):
+        with open(chunk.entry.filename, 'rb') as f:
+            f.seek(chunk.offset)
+            data = f.read(chunk.length)
+        crc = binascii.crc32(data) & 0xFFFFFFFF
+        if chunk.entry.method == zipfile.ZIP_STORED:
+            return _CompressedChunk(data, crc, len(data), zipfile.ZIP_STORED)
+        compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data)
+        if chunk.is_last:
+            compressed += compressor.flush()
+        else:
+            # A sync flush ends the chunk on a byte boundary without
+            # marking the end of the stream, so the next chunk can be
+            # appended to it.
+            compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+        if chunk.index == 0 and chunk.is_last and \
+                len(compressed) >= len(data):
+            # The whole file is in this chunk and did not get any smaller,
+            # so it is stored instead.
+            return _CompressedChunk(data, crc, len(data), zipfile.ZIP_STORED)
+        return _CompressedChunk(compressed, crc, len(data),
+                                zipfile.ZIP_DEFLATED)
+
+    def _write_chunk(self, writer, chunk, future):
+        result = future.result()
+        entry = chunk.entry
+        if chunk.index == 0:
+            entry.method = result.method
+            entry.crc = result.crc
+            entry.file_size = result.size
+            entry.compress_size = len(result.data)
+            # Only the sizes of files that fit in a single chunk are known
+            # before their data is written.  The others are written with a
+            # data descriptor following the data.
+            writer.start_entry(entry, streamed=not chunk.is_last)
+        else:
+            entry.crc = self._combine_crc(entry.crc, result.crc, result.size)
+            entry.file_size += result.size
+            entry.compress_size += len(result.data)
+        writer.write_data(result.data)
+        if chunk.is_last:
+            writer.finish_entry(entry)
+
+    def _combine_crc(self, crc1, crc2, length2):
+        if length2 != self._chunk_size:
+            return _crc32_combine(crc1, crc2, length2)
+        # Every chunk but the last one of a file has the same length, so
+        # the operator for that length is only calculated once.
+        if self._chunk_crc_operator is None:
+            self._chunk_crc_operator = _crc32_shift_operator(length2)
+        return _gf2_matrix_times(self._chunk_crc_operator, crc1) ^ crc2
+
+
+class StreamingBundle(object):
+    """A zip archive that can be read while it is still being written.
+
+    The archive is written to a temporary file by a background thread.
+    Reads block until the bytes they ask for have been written, so the
+    start of the archive can be uploaded while the rest of it is still
+    being compressed.  Anything that needs the size of the archive, such as
+    ``seek(0, 2)`` or ``len()``, waits for the archive to be finished.
+
+    If writing the archive fails, the error is raised from the next read.
+
+    :param bundler: The ``ZipBundler`` used to write the archive.
+    :param members: An iterable of ``(filename, arcname)`` tuples.
+    """
+    def __init__(self, bundler, members):
+        self._bundler = bundler
+        self._members = members
+        self._file = tempfile.TemporaryFile()
+        self._condition = threading.Condition()
+        self._size = 0
+        self._position = 0
+        self._finished = False
+        self._closed = False
+        self._error = None
+        self._thread = threading.Thread(target=self._write_archive)
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def _write_archive(self):
+        try:
+            self._bundler.write(self._members, _BundleWriter(self))
+        except Exception as e:
+            LOGGER.debug('Failed to write bundle: %s', e, exc_info=True)
+            with self._condition:
+                self._error = e
+                self._condition.notify_all()
+        else:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+    def _append(self, data):
+        with self._condition:
+            if self._closed:
+                raise ValueError('The bundle has been closed.')
+            self._file.seek(self._size)
+            self._file.write(data)
+            self._size += len(data)
+            self._condition.notify_all()
+
+    def _wait_for(self, size):
+        # Must be called with the condition held.
+        while self._error is None and not self._finished:
+            if size is not None and self._size >= size:
+                break
+            self._condition.wait()
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def size(self):
+        """The size of the finished archive."""
+        with self._condition:
+            self._wait_for(None)
+            return self._size
+
+    def read(self, amount=None):
+        data = self.read_at(self._position, amount)
+        self._position += len(data)
+        return data
+
+    def read_at(self, offset, amount=None):
+        """Read ``amount`` bytes starting at ``offset``.
+
+        This does not use or change the position of the bundle, so it can
+        be called from multiple threads.  Less than ``amount`` bytes are
+        only returned at the end of the archive.
+        """
+        with self._condition:
+            end = None
+            if amount is not None:
+                end = offset + amount
+            self._wait_for(end)
+            if end is None or end > self._size:
+                end = self._size
+            self._file.seek(offset)
+            return self._file.read(max(end - offset, 0))
+
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self._position = offset
+        elif whence == 1:
+            self._position += offset
+        else:
+            self._position = self.size + offset
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+        self._thread.join()
+        self._file.close()
+
+    def __len__(self):
+        return self.size - self._position
+
+    def __iter__(self):
+        # This is a workaround for http://bugs.python.org/issue17575
+        # Basically httplib will try to iterate over the contents, even
+        # if its a file like object.  This wasn't noticed because we've
+        # already exhausted the stream so iterating over the file immediately
+        # stops, which is what we're simulating here.
+        return iter([])
+
+
+class BundlePartReader(object):
+    """A file-like view of ``size`` bytes of a bundle starting at ``offset``.
+
+    Reads go straight to ``StreamingBundle.read_at`` so several parts of
+    the same bundle can be sent at once without copying them into memory.
+    """
+    def __init__(self, bundle, offset, size):
+        self._bundle = bundle
+        self._offset = offset
+        self._size = size
+        self._position = 0
+
+    def read(self, amount=None):
+        remaining = self._size - self._position
+        if amount is None or amount > remaining:
+            amount = remaining
+        if amount <= 0:
+            return b''
+        data = self._bundle.read_at(self._offset + self._position, amount)
+        self._position += len(data)
+        return data
+
+    def seek(self, where):
+        self._position = min(where, self._size)
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        pass
+
+    def __len__(self):
+        return self._size - self._position
+
+    def __iter__(self):
+        # See StreamingBundle.__iter__.
+        return iter([])
+
+
+class _BundleWriter(object):
+    def __init__(self, bundle):
+        self._bundle = bundle
+
+    def write(self, data):
+        self._bundle._append(data)
+
+
+class _ZipEntry(object):
+    def __init__(self, filename, arcname, stat, method):
+        self.filename = filename
+        self.arcname, self.flags = _encode_arcname(arcname)
+        self.method = method
+        self.dos_time, self.dos_date = _dos_date_time(stat.st_mtime)
+        self.external_attr = (stat.st_mode & 0xFFFF) << 16
+        self.size_hint = stat.st_size
+        # The same heuristic ``zipfile`` uses for files that are written
+        # before their compressed size is known.
+        self.zip64 = stat.st_size * 1.05 > ZIP64_LIMIT
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+        self.header_offset = 0
+
+
+_Chunk = collections.namedtuple(
+    '_Chunk', ['entry', 'offset', 'length', 'index', 'is_last'])
+_CompressedChunk = collections.namedtuple(
+    '_CompressedChunk', ['data', 'crc', 'size', 'method'])
+
+
+class _ZipWriter(object):
+    """Writes the records of a zip archive to a file object."""
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._offset = 0
+        self._entries = []
+
+    def _write(self, data):
+        self._fileobj.write(data)
+        self._offset += len(data)
+
+    def start_entry(self, entry, streamed):
+        entry.header_offset = self._offset
+        if streamed:
+            entry.flags |= DATA_DESCRIPTOR_FLAG
+            crc, compress_size, file_size = 0, 0, 0
+        else:
+            crc = entry.crc
+            compress_size = entry.compress_size
+            file_size = entry.file_size
+            entry.zip64 = entry.zip64 or max(compress_size,
+                                             file_size) > ZIP64_LIMIT
+        extra = b''
+        version = DEFAULT_VERSION
+        if entry.zip64:
+            extra = struct.pack('<HHQQ', 1, 16, file_size, compress_size)
+            compress_size = file_size = ZIP_MAX_VALUE
+            version = ZIP64_VERSION
+        self._write(LOCAL_FILE_HEADER.pack(
+            b'PK\003\004', version, entry.flags, entry.method,
+            entry.dos_time, entry.dos_date, crc, compress_size, file_size,
+            len(entry.arcname), len(extra)))
+        self._write(entry.arcname)
+        self._write(extra)
+
+    def write_data(self, data):
+        self._write(data)
+
+    def finish_entry(self, entry):
+        if entry.flags & DATA_DESCRIPTOR_FLAG:
+            if not entry.zip64 and \
+                    max(entry.compress_size, entry.file_size) > ZIP64_LIMIT:
+                raise RuntimeError(
+                    '%s grew past the zip64 limit while it was being '
+                    'bundled.' % entry.filename)
+            descriptor = DATA_DESCRIPTOR
+            if entry.zip64:
+                descriptor = ZIP64_DATA_DESCRIPTOR
+            self._write(descriptor.pack(
+                b'PK\007\010', entry.crc, entry.compress_size,
+                entry.file_size))
+        self._entries.append(entry)
+
+    def close(self):
+        central_directory_offset = self._offset
+        for entry in self._entries:
+            self._write_central_directory_header(entry)
+        central_directory_size = self._offset - central_directory_offset
+        count = len(self._entries)
+        if count > ZIP_FILECOUNT_LIMIT or \
+                central_directory_offset > ZIP64_LIMIT or \
+                central_directory_size > ZIP64_LIMIT:
+            zip64_offset = self._offset
+            self._write(ZIP64_END_OF_CENTRAL_DIRECTORY.pack(
+                b'PK\006\006', ZIP64_END_OF_CENTRAL_DIRECTORY.size - 12,
+                ZIP64_VERSION, ZIP64_VERSION, 0, 0, count, count,
+                central_directory_size, central_directory_offset))
+            self._write(ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.pack(
+                b'PK\006\007', 0, zip64_offset, 1))
+            count = min(count, 0xFFFF)
+            central_directory_size = min(central_directory_size,
+                                         ZIP_MAX_VALUE)
+            central_directory_offset = min(central_directory_offset,
+                                           ZIP_MAX_VALUE)
+        self._write(END_OF_CENTRAL_DIRECTORY.pack(
+            b'PK\005\006', 0, 0, count, count, central_directory_size,
+            central_directory_offset, 0))
+
+    def _write_central_directory_header(self, entry):
+        file_size = entry.file_size
+        compress_size = entry.compress_size
+        header_offset = entry.header_offset
+        extra_values = []
+        if file_size > ZIP64_LIMIT:
+            extra_values.append(file_size)
+            file_size = ZIP_MAX_VALUE
+        if compress_size > ZIP64_LIMIT:
+            extra_values.append(compress_size)
+            compress_size = ZIP_MAX_VALUE
+        if header_offset > ZIP64_LIMIT:
+            extra_values.append(header_offset)
+            header_offset = ZIP_MAX_VALUE
+        extra = b''
+        version = DEFAULT_VERSION
+        if extra_values:
+            extra = struct.pack('<HH' + 'Q' * len(extra_values), 1,
+                                8 * len(extra_values), *extra_values)
+        if extra_values or entry.zip64:
+            version = ZIP64_VERSION
+        self._write(CENTRAL_DIRECTORY_HEADER.pack(
+            b'PK\001\002', (_CREATE_SYSTEM << 8) | version, version,
+            entry.flags, entry.method, entry.dos_time, entry.dos_date,
+            entry.crc, compress_size, file_size, len(entry.arcname),
+            len(extra), 0, 0, 0, entry.external_attr, header_offset))
+        self._write(entry.arcname)
+        self._write(extra)
+
+
+if sys.platform == 'win32':
+    _CREATE_SYSTEM = 0
+else:
+    _CREATE_SYSTEM = 3
+
+
+def _cpu_count():
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def _encode_arcname(arcname):
+    # Normalize the name the same way ``zipfile.ZipFile.write`` does.
+    arcname = os.path.normpath(os.path.splitdrive(arcname)[1])
+    while arcname[0] in (os.sep, os.altsep):
+        arcname = arcname[1:]
+    if os.sep != '/':
+        arcname = arcname.replace(os.sep, '/')
+    if isinstance(arcname, six.text_type):
+        try:
+            return arcname.encode('ascii'), 0
+        except UnicodeEncodeError:
+            return arcname.encode('utf-8'), UTF8_FLAG
+    return arcname, 0
+
+
+def _dos_date_time(timestamp):
+    year, month, day, hour, minute, second = time.localtime(timestamp)[:6]
+    # Zip files can only hold timestamps between 1980 and 2107.
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    elif year > 2107:
+        year, month, day, hour, minute, second = 2107, 12, 31, 23, 59, 59
+    dos_date = (year - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_time, dos_date
+
+
+# The crc32 of concatenated data is calculated from the crc32 of its parts
+# with the GF(2) matrix method from zlib's crc32_combine().
+def _gf2_matrix_times(matrix, vector):
+    total = 0
+    index = 0
+    while vector:
+        if vector & 1:
+            total ^= matrix[index]
+        vector >>= 1
+        index += 1
+    return total
+
+
+def _gf2_matrix_square(matrix):
+    return [_gf2_matrix_times(matrix, row) for row in matrix]
+
+
+def _crc32_combine(crc1, crc2, length2):
+    if length2 <= 0:
+        return crc1
+    # The operator for a single zero bit.
+    odd = [0xEDB88320] + [1 << n for n in range(31)]
+    # The operators for two and four zero bits.
+    even = _gf2_matrix_square(odd)
+    odd = _gf2_matrix_square(even)
+    # Apply length2 zero bytes to crc1.
+    while True:
+        even = _gf2_matrix_square(odd)
+        if length2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+        odd = _gf2_matrix_square(even)
+        if length2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+    return crc1 ^ crc2
+
+
+def _crc32_shift_operator(length):
+    # The matrix that applies ``length`` zero bytes to a crc32.
+    return [_crc32_combine(1 << n, 0, length) for n in range(32)]
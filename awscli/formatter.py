@@ -13,7 +13,7 @@
 import logging
 from botocore.compat import json
 
-from botocore.utils import set_value_from_jmespath
+from botocore.utils import set_value_from_jmespath, merge_dicts
 from botocore.paginate import PageIterator
 
 from awscli.table import MultiTable, Styler, ColorizedStyler
@@ -103,7 +103,15 @@ class TableFormatter(FullyBufferedFormatter):
     and generate a pretty printed table.  It does this without
     using the output definition from the model.
 
+    Paginated responses with a single result key are not fully buffered
+    when no query is given.  Up to ``MAX_BUFFERED_ROWS`` results are
+    buffered so the table fits them, and if there are more the table is
+    written with the widths of the buffered results while the rest of
+    the pages are retrieved.
+
     """
+    MAX_BUFFERED_ROWS = 1000
+
     def __init__(self, args, table=None):
         super(TableFormatter, self).__init__(args)
         if args.color == 'auto':
@@ -119,6 +127,82 @@ class TableFormatter(FullyBufferedFormatter):
                                     column_separator='|', styler=styler)
         else:
             raise ValueError("Unknown color option: %s" % args.color)
+        # Whether the first list of dicts built into the table continues
+        # the current section of the table.
+        self._continue_section = False
+
+    def __call__(self, command_name, response, stream=None):
+        if not self._can_stream(response):
+            super(TableFormatter, self).__call__(
+                command_name, response, stream)
+            return
+        if stream is None:
+            stream = self._get_default_stream()
+        try:
+            self._format_paginated_response(command_name, response, stream)
+        except IOError:
+            # If the reading end of our stdout stream has closed the file
+            # we can just exit.
+            pass
+        finally:
+            self._flush_stream(stream)
+
+    def _can_stream(self, response):
+        return (is_response_paginated(response) and
+                self._args.query is None and
+                len(response.result_keys) == 1)
+
+    def _format_paginated_response(self, command_name, response, stream):
+        result_key = response.result_keys[0]
+        pages = iter(response)
+        buffered = {}
+        num_rows = 0
+        for page in pages:
+            data = result_key.search(page)
+            if data is None:
+                continue
+            existing = result_key.search(buffered)
+            if existing is None:
+                set_value_from_jmespath(buffered, result_key.expression,
+                                        data)
+            elif isinstance(data, list):
+                existing.extend(data)
+            else:
+                set_value_from_jmespath(buffered, result_key.expression,
+                                        existing + data)
+            if isinstance(data, list):
+                num_rows += len(data)
+            # Operations that return other keys along with the results
+            # are always fully buffered.
+            if num_rows > self.MAX_BUFFERED_ROWS and \
+                    not response.non_aggregate_part:
+                break
+        else:
+            # All of the results fit in the buffer, which renders the same
+            # table as the fully buffered response would.
+            merge_dicts(buffered, response.non_aggregate_part)
+            if response.resume_token is not None:
+                buffered['NextToken'] = response.resume_token
+            self._format_response(command_name, buffered, stream)
+            return
+        self._build_table(command_name, buffered)
+        self.table.flush(stream)
+        for page in pages:
+            data = result_key.search(page)
+            if not data:
+                continue
+            current = {}
+            set_value_from_jmespath(current, result_key.expression, data)
+            # The title of the table was already written, so the sections
+            # of the page are built without it.
+            self._continue_section = True
+            self._build_sub_table_from_dict(current, indent_level=0)
+            self._continue_section = False
+            self.table.flush(stream)
+        if response.resume_token is not None:
+            self._build_table(
+                command_name, {'NextToken': response.resume_token})
+        self.table.render(stream)
 
     def _format_response(self, command_name, response, stream):
         if self._build_table(command_name, response):
@@ -133,7 +217,8 @@ class TableFormatter(FullyBufferedFormatter):
     def _build_table(self, title, current, indent_level=0):
         if not current:
             return False
-        if title is not None:
+        if title is not None and \
+                not self._can_continue_section(title, current, indent_level):
             self.table.new_section(title, indent_level=indent_level)
         if isinstance(current, list):
             if isinstance(current[0], dict):
@@ -189,6 +274,23 @@ class TableFormatter(FullyBufferedFormatter):
                     self._build_table(remaining, element[remaining],
                                     indent_level=indent_level + 1)
 
+    def _can_continue_section(self, title, current, indent_level):
+        # The rows of a list of dicts from the next page of a response
+        # are added to the section of the previous page if they would
+        # have been in the same section.
+        if not self._continue_section:
+            return False
+        self._continue_section = False
+        section = self.table.current_section
+        if section is None or section.title != title or \
+                section.indent_level != indent_level:
+            return False
+        if not isinstance(current, list) or \
+                not isinstance(current[0], dict):
+            return False
+        headers, more = self._group_scalar_keys_from_list(current)
+        return not more and headers == section.headers
+
     def _scalar_type(self, element):
         return not isinstance(element, (list, dict))
 
@@ -224,9 +326,17 @@ class TableFormatter(FullyBufferedFormatter):
 
 class TextFormatter(Formatter):
 
+    def __init__(self, args):
+        super(TextFormatter, self).__init__(args)
+        # Maps (command_name, query) to the writer used for the output of
+        # that command, so the layouts it works out for one page or call
+        # are reused for the next ones.
+        self._text_writers = {}
+
     def __call__(self, command_name, response, stream=None):
         if stream is None:
             stream = self._get_default_stream()
+        writer = self._get_text_writer(command_name)
         try:
             if is_response_paginated(response):
                 result_keys = response.result_keys
@@ -239,26 +349,34 @@ class TextFormatter(Formatter):
                             result_key.expression,
                             data
                         )
-                    self._format_response(current, stream)
+                    self._format_response(current, stream, writer)
                 if response.resume_token:
                     # Tell the user about the next token so they can continue
                     # if they want.
                     self._format_response(
                         {'NextToken': {'NextToken': response.resume_token}},
-                        stream)
+                        stream, writer)
             else:
                 self._remove_request_id(response)
-                self._format_response(response, stream)
+                self._format_response(response, stream, writer)
         finally:
             # flush is needed to avoid the "close failed in file object
             # destructor" in python2.x (see http://bugs.python.org/issue11380).
             self._flush_stream(stream)
 
-    def _format_response(self, response, stream):
+    def _get_text_writer(self, command_name):
+        key = (command_name, self._args.query)
+        writer = self._text_writers.get(key)
+        if writer is None:
+            writer = text.TextWriter()
+            self._text_writers[key] = writer
+        return writer
+
+    def _format_response(self, response, stream, writer):
         if self._args.query is not None:
             expression = self._args.query
             response = expression.search(response)
-        text.format_text(response, stream)
+        writer.write(response, stream)
 
 
 def get_formatter(format_type, args):
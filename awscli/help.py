@@ -10,19 +10,26 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import hashlib
+import json
 import logging
 import os
 import platform
 import shlex
+import shutil
+import sys
+import tempfile
 from subprocess import Popen, PIPE
 
 from docutils.core import publish_string
 from docutils.writers import manpage
 
+import botocore
 from botocore.docs.bcdoc import docevents
 from botocore.docs.bcdoc.restdoc import ReSTDocument
 from botocore.docs.bcdoc.textwriter import TextWriter
 
+import awscli
 from awscli.clidocs import ProviderDocumentEventHandler
 from awscli.clidocs import ServiceDocumentEventHandler
 from awscli.clidocs import OperationDocumentEventHandler
@@ -30,6 +37,7 @@ from awscli.clidocs import TopicListerDocumentEventHandler
 from awscli.clidocs import TopicDocumentEventHandler
 from awscli.argprocess import ParamShorthand
 from awscli.argparser import ArgTableArgParser
+from awscli.table import determine_terminal_width
 from awscli.topictags import TopicTagDB
 from awscli.utils import ignore_ctrl_c
 
@@ -49,9 +57,104 @@ def get_renderer():
     current platform.
     """
     if platform.system() == 'Windows':
-        return WindowsHelpRenderer()
+        renderer = WindowsHelpRenderer()
     else:
-        return PosixHelpRenderer()
+        renderer = PosixHelpRenderer()
+    renderer.help_cache = HelpCache()
+    return renderer
+
+
+class HelpCache(object):
+    """Per-user cache of rendered help output.
+
+    Rendering the help of a large operation takes about a second, most
+    of it spent generating the document and converting it with docutils
+    and groff, so the converted output is stored in a file per help page
+    and reused for as long as its key does not change.
+
+    The pages are stored in a directory per version of the CLI and
+    botocore.  When a page is cached, the directories of other versions
+    are removed, along with the least recently used pages once there are
+    more than ``MAX_ENTRIES`` of them.
+
+    """
+
+    CACHE_DIR = os.path.expanduser(
+        os.path.join('~', '.aws', 'cli', 'cache', 'help'))
+    MAX_ENTRIES = 500
+
+    def __init__(self, working_dir=CACHE_DIR, version=None):
+        if version is None:
+            version = '%s-%s' % (awscli.__version__, botocore.__version__)
+        self._root_dir = working_dir
+        self._version = version
+        self._working_dir = os.path.join(working_dir, version)
+
+    def get(self, cache_key):
+        """Returns the output cached for a key, or None."""
+        path = self._get_path(cache_key)
+        try:
+            with open(path, 'rb') as f:
+                output = f.read()
+            # The modification time of a page is when it was last used.
+            os.utime(path, None)
+            return output
+        except (OSError, IOError):
+            return None
+
+    def set(self, cache_key, output):
+        # The output is written to a temporary file that is renamed, so
+        # another process never reads a partially written page.  Failing
+        # to cache a page only makes the next lookup slower.
+        temp_path = None
+        try:
+            if not os.path.isdir(self._working_dir):
+                os.makedirs(self._working_dir)
+            fd, temp_path = tempfile.mkstemp(dir=self._working_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(output)
+            os.rename(temp_path, self._get_path(cache_key))
+            self._prune()
+        except (OSError, IOError):
+            LOG.debug('Unable to cache help output', exc_info=True)
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _prune(self):
+        for name in os.listdir(self._root_dir):
+            if name == self._version:
+                continue
+            path = os.path.join(self._root_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                _remove_file(path)
+        names = os.listdir(self._working_dir)
+        if len(names) <= self.MAX_ENTRIES:
+            return
+        paths = [os.path.join(self._working_dir, name) for name in names]
+        paths.sort(key=_get_mtime)
+        for path in paths[:len(paths) - self.MAX_ENTRIES]:
+            _remove_file(path)
+
+    def _get_path(self, cache_key):
+        key_hash = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
+        return os.path.join(self._working_dir, key_hash)
+
+
+def _get_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        # Removed by another process.
+        return 0
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 class PagingHelpRenderer(object):
@@ -64,6 +167,8 @@ class PagingHelpRenderer(object):
     """
 
     PAGER = None
+    # The ``HelpCache`` of the converted contents, if any.
+    help_cache = None
 
     def get_pager_cmdline(self):
         pager = self.PAGER
@@ -73,14 +178,39 @@ class PagingHelpRenderer(object):
             pager = os.environ['PAGER']
         return shlex.split(pager)
 
-    def render(self, contents):
+    def render(self, contents, cache_key=None):
         """
         Each implementation of HelpRenderer must implement this
         render method.
+
+        If a ``cache_key`` is given, the converted contents are cached
+        so they can be displayed by ``render_cached``.
         """
         converted_content = self._convert_doc_content(contents)
+        if cache_key is not None and self.help_cache is not None:
+            self.help_cache.set(self._get_output_cache_key(cache_key),
+                                converted_content)
         self._send_output_to_pager(converted_content)
 
+    def render_cached(self, cache_key):
+        """Displays the cached output of a help page.
+
+        :param cache_key: The key identifying the contents of the page.
+        :returns: True if the output was cached and has been displayed.
+        """
+        if self.help_cache is None:
+            return False
+        output = self.help_cache.get(self._get_output_cache_key(cache_key))
+        if output is None:
+            return False
+        self._send_output_to_pager(output)
+        return True
+
+    def _get_output_cache_key(self, cache_key):
+        # The output also depends on how the contents are converted.
+        return json.dumps([cache_key, type(self).__name__,
+                           determine_terminal_width()])
+
     def _send_output_to_pager(self, output):
         cmdline = self.get_pager_cmdline()
         LOG.debug("Running command: %s", cmdline)
@@ -254,16 +384,76 @@ class HelpCommand(object):
             if getattr(parsed, 'subcommand', None) is not None:
                 return self.subcommand_table[parsed.subcommand](remaining,
                                                                 parsed_globals)
-
+        self._render()
+
+    def _render(self):
+        cache_key = None
+        # Renderers that do not cache, e.g. the ones used to build the
+        # documentation, may only accept the contents to render.
+        if isinstance(self.renderer, PagingHelpRenderer) and \
+                self.renderer.help_cache is not None:
+            cache_key = self._get_cache_key()
+            if self.renderer.render_cached(cache_key):
+                return
         # Create an event handler for a Provider Document
         instance = self.EventHandlerClass(self)
         # Now generate all of the events for a Provider document.
         # We pass ourselves along so that we can, in turn, get passed
         # to all event handlers.
         docevents.generate_events(self.session, self)
-        self.renderer.render(self.doc.getvalue())
+        if cache_key is not None:
+            self.renderer.render(self.doc.getvalue(), cache_key=cache_key)
+        else:
+            self.renderer.render(self.doc.getvalue())
         instance.unregister()
 
+    def _get_cache_key(self):
+        """Returns the key of the rendered help in the help cache.
+
+        The help of a command depends on the versions of the CLI and
+        botocore, the plugins and preview services that are enabled and
+        the code of the plugins, and the models that can be loaded.
+        """
+        config = self.session.full_config
+        plugins = config.get('plugins', {})
+        loader = self.session.get_component('data_loader')
+        search_paths = []
+        for path in loader.search_paths:
+            if os.path.isdir(path):
+                search_paths.append([path] + _get_tree_state(path))
+        return json.dumps([
+            type(self).__name__, self.event_class, self.name,
+            awscli.__version__, botocore.__version__,
+            plugins, _get_plugin_mtimes(plugins), config.get('preview', {}),
+            search_paths], sort_keys=True)
+
+
+def _get_tree_state(path):
+    # The models are loaded from files nested in the search paths, and
+    # editing a file does not change the modification time of the
+    # directories above it.  Stating every file takes a few
+    # milliseconds, and the number of files catches files that were
+    # removed.
+    num_files = 0
+    max_mtime = 0
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            num_files += 1
+            max_mtime = max(max_mtime,
+                            _get_mtime(os.path.join(root, filename)))
+    return [num_files, max_mtime]
+
+
+def _get_plugin_mtimes(plugins):
+    # The plugins are imported by the time help is rendered, so the
+    # files of their modules tell when their code was changed.
+    mtimes = {}
+    for module_name in plugins.values():
+        module_file = getattr(sys.modules.get(module_name), '__file__', None)
+        if module_file is not None:
+            mtimes[module_name] = _get_mtime(module_file)
+    return mtimes
+
 
 class ProviderHelpCommand(HelpCommand):
     """Implements top level help command.
@@ -297,7 +487,7 @@ class ProviderHelpCommand(HelpCommand):
         if self._subcommand_table is None:
             if self._topic_tag_db is None:
                 self._topic_tag_db = TopicTagDB()
-            self._topic_tag_db.load_json_index()
+            self._topic_tag_db.load_index()
             self._subcommand_table = self._create_subcommand_table()
         return self._subcommand_table
 
@@ -12,14 +12,24 @@
 # language governing permissions and limitations under the License.
 import logging
 import os
+import threading
 
+from concurrent import futures
 from botocore.vendored import requests
+from botocore.vendored.requests.adapters import HTTPAdapter
 from awscli.compat import six
 
 from awscli.compat import compat_open
 
 
 logger = logging.getLogger(__name__)
+# The number of resources that are loaded at once by
+# ``ParamFileCache.prefetch``, which is also the number of connections
+# kept alive for each host.
+MAX_CONCURRENT_LOADS = 10
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+_ACTIVE_CACHES = []
 
 # These are special cased arguments that do _not_ get the
 # special param file processing.  This is typically because it
@@ -94,8 +104,14 @@ def get_paramfile(path):
         value of ``None`` is returned.
 
     """
+    if _ACTIVE_CACHES:
+        return _ACTIVE_CACHES[-1].get_paramfile(path)
+    return _load_paramfile(path)
+
+
+def _load_paramfile(path):
     data = None
-    if isinstance(path, six.string_types):
+    if is_paramfile(path):
         for prefix, function_spec in PREFIX_MAP.items():
             if path.startswith(prefix):
                 function, kwargs = function_spec
@@ -103,6 +119,81 @@ def get_paramfile(path):
     return data
 
 
+def is_paramfile(path):
+    """Returns whether ``path`` is a resource URI that would be loaded."""
+    return isinstance(path, six.string_types) and any(
+        path.startswith(prefix) for prefix in PREFIX_MAP)
+
+
+class ParamFileCache(object):
+    """Loads each resource URI once while it is active.
+
+    A cache is activated with a ``with`` statement, after which
+    ``get_paramfile`` returns the values it has loaded, so a resource
+    that is referred to by several arguments, or by an argument and
+    ``--cli-input-json``, is only loaded once::
+
+        with ParamFileCache() as cache:
+            cache.prefetch(['file://a.json', 'https://example.com/b.json'])
+            get_paramfile('file://a.json')
+
+    Errors are cached as well and raised every time the resource is
+    retrieved.
+
+    :param max_workers: The number of resources loaded at once by
+        ``prefetch``.
+    """
+    def __init__(self, max_workers=MAX_CONCURRENT_LOADS):
+        self._max_workers = max_workers
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        _ACTIVE_CACHES.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _ACTIVE_CACHES.remove(self)
+
+    def get_paramfile(self, path):
+        if not is_paramfile(path):
+            return None
+        with self._lock:
+            result = self._results.get(path)
+        if result is None:
+            result = self._load(path)
+        data, error = result
+        if error is not None:
+            raise error
+        return data
+
+    def prefetch(self, paths):
+        """Loads resource URIs concurrently.
+
+        Values that are not resource URIs, or that were already loaded,
+        are ignored.
+        """
+        with self._lock:
+            paths = set(path for path in paths if is_paramfile(path) and
+                        path not in self._results)
+        if len(paths) < 2:
+            # There is nothing to load concurrently.
+            return
+        max_workers = min(self._max_workers, len(paths))
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for path in paths:
+                pool.submit(self._load, path)
+
+    def _load(self, path):
+        try:
+            result = (_load_paramfile(path), None)
+        except ResourceLoadingError as e:
+            result = (None, e)
+        with self._lock:
+            self._results[path] = result
+        return result
+
+
 def get_file(prefix, path, mode):
     file_path = os.path.expandvars(os.path.expanduser(path[len(prefix):]))
     try:
@@ -120,7 +211,7 @@ def get_file(prefix, path, mode):
 
 def get_uri(prefix, uri):
     try:
-        r = requests.get(uri)
+        r = get_http_session().get(uri)
         if r.status_code == 200:
             return r.text
         else:
@@ -131,6 +222,24 @@ def get_uri(prefix, uri):
         raise ResourceLoadingError('Unable to retrieve %s: %s' % (uri, e))
 
 
+def get_http_session():
+    """Returns the HTTP session shared by the loads of resource URIs.
+
+    The session keeps connections alive, so resources from the same host
+    reuse a connection.
+    """
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_CONCURRENT_LOADS,
+                                  pool_maxsize=MAX_CONCURRENT_LOADS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
 PREFIX_MAP = {
     'file://': (get_file, {'mode': 'r'}),
     'fileb://': (get_file, {'mode': 'rb'}),
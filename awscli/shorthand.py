@@ -50,8 +50,8 @@ class _NamedRegex(object):
         self.name = name
         self.regex = re.compile(regex_str, re.UNICODE)
 
-    def match(self, value):
-        return self.regex.match(value)
+    def match(self, value, pos=0):
+        return self.regex.match(value, pos)
 
 
 class ShorthandParseError(Exception):
@@ -124,6 +124,9 @@ class ShorthandParser(object):
             follow_chars=_SECOND_FOLLOW_CHARS,
         ))
 
+    _KEY = re.compile(r'[a-zA-Z0-9\-_.]*')
+    _WHITESPACE = re.compile('[%s]*' % re.escape(string.whitespace))
+
     def __init__(self):
         self._tokens = []
 
@@ -163,12 +166,8 @@ class ShorthandParser(object):
 
     def _key(self):
         # key = 1*(alpha / %x30-39 / %x5f / %x2e)  ; [a-zA-Z0-9\-_.]
-        valid_chars = string.ascii_letters + string.digits + '-_.'
         start = self._index
-        while not self._at_eof():
-            if self._current() not in valid_chars:
-                break
-            self._index += 1
+        self._index = self._KEY.match(self._input_value, start).end()
         return self._input_value[start:self._index]
 
     def _values(self):
@@ -231,7 +230,7 @@ class ShorthandParser(object):
         return csv_list
 
     def _value(self):
-        result = self._FIRST_VALUE.match(self._input_value[self._index:])
+        result = self._FIRST_VALUE.match(self._input_value, self._index)
         if result is not None:
             consumed = self._consume_matched_regex(result)
             return consumed.replace('\\,', ',').rstrip()
@@ -323,17 +322,19 @@ class ShorthandParser(object):
             self._consume_whitespace()
 
     def _must_consume_regex(self, regex):
-        result = regex.match(self._input_value[self._index:])
+        result = regex.match(self._input_value, self._index)
         if result is not None:
             return self._consume_matched_regex(result)
         raise ShorthandParseError(self._input_value, '<%s>' % regex.name,
                                   '<none>', self._index)
 
     def _consume_matched_regex(self, result):
+        # The regexes are matched at the current index of the input
+        # value instead of against the remaining input, so the span of
+        # the match is relative to the whole input value.
         start, end = result.span()
-        v = self._input_value[self._index+start:self._index+end]
-        self._index += (end - start)
-        return v
+        self._index = end
+        return self._input_value[start:end]
 
     def _current(self):
         # If the index is at the end of the input value,
@@ -350,8 +351,8 @@ class ShorthandParser(object):
             self._index -= 1
 
     def _consume_whitespace(self):
-        while self._current() != _EOF and self._current() in string.whitespace:
-            self._index += 1
+        self._index = self._WHITESPACE.match(
+            self._input_value, self._index).end()
 
 
 class ModelVisitor(object):
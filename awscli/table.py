@@ -170,6 +170,18 @@ class ColorizedStyler(Styler):
 
 
 class MultiTable(object):
+    """A table made of sections that is rendered to a stream.
+
+    By default every section and row is kept until ``render`` is called,
+    so the width of the table and of its columns fits all of the rows.
+    Calling ``flush`` renders the sections and rows added so far and
+    forgets them.  The first call to ``flush`` fixes the width of the
+    table from the sections added before it, and the widths of the
+    columns of a section are fixed from the rows it has the first time
+    it is flushed.  The rows added afterwards are rendered with those
+    widths, so only the rows added between two flushes are kept in
+    memory.
+    """
     def __init__(self, terminal_width=None, initial_section=True,
                  column_separator='|', terminal=None,
                  styler=None, auto_reformat=True):
@@ -192,6 +204,19 @@ class MultiTable(object):
         self._column_separator = column_separator
         if terminal_width is None:
             self._terminal_width = determine_terminal_width()
+        else:
+            self._terminal_width = terminal_width
+        # The width of the table and whether single row sections are
+        # converted to vertical tables, once they are fixed by ``flush``.
+        self._max_width = None
+        self._should_convert_table = False
+        # The column widths of the section whose rows are being flushed
+        # as they are added.
+        self._flushed_widths = None
+
+    @property
+    def current_section(self):
+        return self._current_section
 
     def add_title(self, title):
         self._current_section.add_title(title)
@@ -209,6 +234,11 @@ class MultiTable(object):
         self._current_section.indent_level = indent_level
 
     def render(self, stream):
+        if self._max_width is not None:
+            # Part of the table has already been flushed, so only what
+            # is left has to be rendered.
+            self._flush(stream, final=True)
+            return
         max_width = self._calculate_max_width()
         should_convert_table = self._determine_conversion_needed(max_width)
         if should_convert_table:
@@ -218,67 +248,151 @@ class MultiTable(object):
         for section in self._sections:
             self._render_section(section, max_width, stream)
 
+    def flush(self, stream):
+        """Renders the sections and rows added so far.
+
+        Every section but the current one is rendered in full.  The rows
+        of the current section are rendered, and the rows added to it
+        later are rendered by the next ``flush`` or ``render``.
+        """
+        if not self._sections:
+            return
+        self._flush(stream, final=False)
+
+    def _flush(self, stream, final):
+        if final:
+            closed = list(self._sections)
+            current = None
+        else:
+            closed = self._sections[:-1]
+            current = self._sections[-1]
+        if self._max_width is None:
+            max_width = self._calculate_max_width()
+            self._should_convert_table = bool(
+                self._determine_conversion_needed(max_width))
+            if self._should_convert_table:
+                # The current section can still get more rows, so it is
+                # not converted.
+                convert_to_vertical_table(closed)
+                max_width = self._calculate_max_width(closed + [current])
+            self._max_width = max_width
+            stream.write('-' * max_width + '\n')
+        elif self._should_convert_table:
+            # The first section may have been flushed before, in which
+            # case it is not converted either.
+            start = 0 if self._flushed_widths is None else 1
+            remaining = closed[start:]
+            convert_to_vertical_table(remaining)
+            closed[start:] = remaining
+        for i, section in enumerate(closed):
+            if i == 0 and self._flushed_widths is not None:
+                self._finish_flushed_section(section, stream)
+            else:
+                self._render_section(section, self._max_width, stream)
+        self._sections = []
+        if current is not None:
+            self._sections.append(current)
+            # A section with a single row is held back, as it is converted
+            # to a vertical table if it does not get any more rows.
+            if len(current.rows) > 1 or \
+                    (current.rows and self._flushed_widths is not None):
+                self._flush_rows(current, stream)
+
+    def _flush_rows(self, section, stream):
+        max_width = self._max_width - (section.indent_level * 2)
+        lines = []
+        if self._flushed_widths is None:
+            self._render_title(section, max_width, lines)
+            widths = section.calculate_column_widths(padding=4,
+                                                     max_width=max_width)
+            self._render_column_titles(section, widths, lines)
+            if widths:
+                lines.append(self._line_break(widths))
+            self._flushed_widths = widths
+        if self._flushed_widths:
+            self._render_row_lines(section.rows, self._flushed_widths, lines)
+        # The rows are not needed once they are rendered.
+        section.rows = []
+        self._write_lines(section, lines, stream)
+
+    def _finish_flushed_section(self, section, stream):
+        widths = self._flushed_widths
+        self._flushed_widths = None
+        lines = []
+        if widths:
+            self._render_row_lines(section.rows, widths, lines)
+            lines.append(self._line_break(widths))
+        section.rows = []
+        self._write_lines(section, lines, stream)
+
     def _determine_conversion_needed(self, max_width):
         # If we don't know the width of the controlling terminal,
         # then we don't try to resize the table.
         if max_width > self._terminal_width:
             return self._auto_reformat
 
-    def _calculate_max_width(self):
+    def _calculate_max_width(self, sections=None):
+        if sections is None:
+            sections = self._sections
         max_width = max(s.total_width(padding=4, with_border=True,
                                       outer_padding=s.indent_level)
-                        for s in self._sections)
+                        for s in sections if s is not None)
         return max_width
 
     def _render_section(self, section, max_width, stream):
-        stream = IndentedStream(stream, section.indent_level,
-                                self._styler.style_indentation_char('|'),
-                                self._styler.style_indentation_char('|'))
         max_width -= (section.indent_level * 2)
-        self._render_title(section, max_width, stream)
-        self._render_column_titles(section, max_width, stream)
-        self._render_rows(section, max_width, stream)
-
-    def _render_title(self, section, max_width, stream):
+        lines = []
+        self._render_title(section, max_width, lines)
+        if section.headers or section.rows:
+            # In order to render the column titles and the rows we need
+            # to know the width of each of the columns.
+            widths = section.calculate_column_widths(padding=4,
+                                                     max_width=max_width)
+            self._render_column_titles(section, widths, lines)
+            self._render_rows(section, widths, lines)
+        self._write_lines(section, lines, stream)
+
+    def _write_lines(self, section, lines, stream):
+        # Each line is wrapped in the indentation chars of the section,
+        # and the whole section is written at once.
+        if not lines:
+            return
+        if section.indent_level:
+            indent_char = self._styler.style_indentation_char('|')
+            indent = indent_char * section.indent_level
+            lines = [indent + line + indent for line in lines]
+        lines.append('')
+        stream.write('\n'.join(lines))
+
+    def _render_title(self, section, max_width, lines):
         # The title consists of:
         # title        :  |   This is the title      |
         # bottom_border:  ----------------------------
         if section.title:
             title = self._styler.style_title(section.title)
-            stream.write(center_text(title, max_width, '|', '|',
-                                     len(section.title)) + '\n')
+            lines.append(center_text(title, max_width, '|', '|',
+                                     len(section.title)))
             if not section.headers and not section.rows:
-                stream.write('+%s+' % ('-' * (max_width - 2)) + '\n')
+                lines.append('+%s+' % ('-' * (max_width - 2)))
 
-    def _render_column_titles(self, section, max_width, stream):
+    def _render_column_titles(self, section, widths, lines):
         if not section.headers:
             return
-        # In order to render the column titles we need to know
-        # the width of each of the columns.
-        widths = section.calculate_column_widths(padding=4,
-                                                 max_width=max_width)
-        # TODO: Built a list instead of +=, it's more efficient.
-        current = ''
-        length_so_far = 0
         # The first cell needs both left and right edges '|  foo  |'
         # while subsequent cells only need right edges '  foo  |'.
-        first = True
+        current = []
+        left_edge = '|'
         for width, header in zip(widths, section.headers):
             stylized_header = self._styler.style_header_column(header)
-            if first:
-                left_edge = '|'
-                first = False
-            else:
-                left_edge = ''
-            current += center_text(text=stylized_header, length=width,
-                                   left_edge=left_edge, right_edge='|',
-                                   text_length=len(header))
-            length_so_far += width
-        self._write_line_break(stream, widths)
-        stream.write(current + '\n')
-
-    def _write_line_break(self, stream, widths):
-        # Write out something like:
+            current.append(center_text(text=stylized_header, length=width,
+                                       left_edge=left_edge, right_edge='|',
+                                       text_length=len(header)))
+            left_edge = ''
+        lines.append(self._line_break(widths))
+        lines.append(''.join(current))
+
+    def _line_break(self, widths):
+        # Build something like:
         # +-------+---------+---------+
         parts = []
         first = True
@@ -288,37 +402,44 @@ class MultiTable(object):
                 first = False
             else:
                 parts.append('%s+' % ('-' * (width - 1)))
-        parts.append('\n')
-        stream.write(''.join(parts))
+        return ''.join(parts)
 
-    def _render_rows(self, section, max_width, stream):
-        if not section.rows:
+    def _render_rows(self, section, widths, lines):
+        if not section.rows or not widths:
             return
-        widths = section.calculate_column_widths(padding=4,
-                                                 max_width=max_width)
-        if not widths:
-            return
-        self._write_line_break(stream, widths)
-        for row in section.rows:
-            # TODO: Built the string in a list then join instead of using +=,
-            # it's more efficient.
-            current = ''
-            length_so_far = 0
-            first = True
-            for width, element in zip(widths, row):
-                if first:
-                    left_edge = '|'
-                    first = False
+        lines.append(self._line_break(widths))
+        self._render_row_lines(section.rows, widths, lines)
+        lines.append(self._line_break(widths))
+
+    def _render_row_lines(self, rows, widths, lines):
+        # This does the same as calling align_left() for each element,
+        # but the parts of each cell that only depend on its column are
+        # worked out once for all of the rows.
+        separator = self._column_separator
+        style = self._styler.style_row_element
+        columns = []
+        left_edge = '|'
+        for width in widths:
+            # The width left for the text and its padding.
+            space = width - len(left_edge) - len(separator)
+            columns.append((left_edge, space))
+            left_edge = ''
+        for row in rows:
+            current = []
+            for (left_edge, space), element in zip(columns, row):
+                text_length = len(element)
+                if text_length + 2 <= space:
+                    padding = '  '
+                    trailing = space - text_length - 2
                 else:
-                    left_edge = ''
-                stylized = self._styler.style_row_element(element)
-                current += align_left(text=stylized, length=width,
-                                      left_edge=left_edge,
-                                      right_edge=self._column_separator,
-                                      text_length=len(element))
-                length_so_far += width
-            stream.write(current + '\n')
-        self._write_line_break(stream, widths)
+                    padding = ''
+                    trailing = space - text_length
+                current.append(left_edge)
+                current.append(padding)
+                current.append(style(element))
+                current.append(' ' * trailing)
+                current.append(separator)
+            lines.append(''.join(current))
 
 
 class Section(object):
@@ -401,8 +522,8 @@ class Section(object):
         return [six.text_type(r) for r in row]
 
     def _update_max_widths(self, row):
+        lengths = [len(el) for el in row]
         if not self._max_widths:
-            self._max_widths = [len(el) for el in row]
+            self._max_widths = lengths
         else:
-            for i, el in enumerate(row):
-                self._max_widths[i] = max(len(el), self._max_widths[i])
+            self._max_widths = list(map(max, self._max_widths, lengths))
@@ -13,105 +13,177 @@
 from awscli.compat import six
 
 
-def format_text(data, stream):
-    _format_text(data, stream)
-
+_CONTAINER_TYPES = (dict, list)
+# The most layouts each cache of a ``TextWriter`` holds.  Dicts that are
+# maps, such as the items of a DynamoDB scan, can have a different set
+# of keys each, so the layouts that do not fit are worked out every time
+# rather than cached.
+MAX_CACHED_LAYOUTS = 1000
 
-def _format_text(item, stream, identifier=None, scalar_keys=None):
-    if isinstance(item, dict):
-        _format_dict(scalar_keys, item, identifier, stream)
-    elif isinstance(item, list):
-        _format_list(item, identifier, stream)
-    else:
-        # If it's not a list or a dict, we just write the scalar
-        # value out directly.
-        stream.write(six.text_type(item))
-        stream.write('\n')
 
+def format_text(data, stream):
+    TextWriter().write(data, stream)
+
+
+class TextWriter(object):
+    """Writes data in the text output format.
+
+    The layouts of the dicts that are written are cached: the sorted
+    order of their keys, and for the dicts in a list of dicts, which of
+    their keys are written on the row of the dict and which are written
+    on rows of their own.  Using the same writer for every page of a
+    paginated response means the layouts of the similar dicts in each
+    page only have to be worked out once.  Each cache holds at most
+    ``MAX_CACHED_LAYOUTS`` layouts.  The text of each call to ``write`` is
+    written to the stream with a single write.
+    """
+    def __init__(self):
+        # Maps the keys of a dict, in the order they are in the dict, to
+        # the keys in sorted order.
+        self._sorted_keys = {}
+        # Maps the set of scalar keys of a list of dicts to its layout.
+        self._list_layouts = {}
+
+    def write(self, data, stream):
+        out = []
+        self._format_text(data, out)
+        if out:
+            stream.write(''.join(out))
+
+    def _format_text(self, item, out, identifier=None):
+        if isinstance(item, dict):
+            self._format_dict(item, identifier, out)
+        elif isinstance(item, list):
+            self._format_list(item, identifier, out)
+        else:
+            # If it's not a list or a dict, we just write the scalar
+            # value out directly.
+            out.append(six.text_type(item) + '\n')
+
+    def _format_list(self, item, identifier, out):
+        if not item:
+            return
+        has_dicts = False
+        has_lists = False
+        for element in item:
+            if isinstance(element, dict):
+                has_dicts = True
+                break
+            elif isinstance(element, list):
+                has_lists = True
+        if has_dicts:
+            self._format_list_of_dicts(item, identifier, out)
+        elif has_lists:
+            scalar_elements, non_scalars = _partition_list(item)
+            if scalar_elements:
+                _format_scalar_list(scalar_elements, identifier, out)
+            for non_scalar in non_scalars:
+                self._format_text(non_scalar, out, identifier)
+        else:
+            _format_scalar_list(item, identifier, out)
 
-def _format_list(item, identifier, stream):
-    if not item:
-        return
-    if any(isinstance(el, dict) for el in item):
-        all_keys = _all_scalar_keys(item)
+    def _format_list_of_dicts(self, item, identifier, out):
+        # Every dict in the list is written with the scalar keys of all
+        # of the dicts in the list, so the rows line up.
+        layout = self._get_list_layout(item)
+        scalar_keys = layout.scalar_keys
+        if identifier is not None:
+            prefix = identifier.upper() + '\t'
+        else:
+            prefix = ''
+        text_type = six.text_type
+        format_text = self._format_text
         for element in item:
-            _format_text(element, stream=stream, identifier=identifier,
-                         scalar_keys=all_keys)
-    elif any(isinstance(el, list) for el in item):
-        scalar_elements, non_scalars = _partition_list(item)
-        if scalar_elements:
-            _format_scalar_list(scalar_elements, identifier, stream)
-        for non_scalar in non_scalars:
-            _format_text(non_scalar, stream=stream,
-                         identifier=identifier)
-    else:
-        _format_scalar_list(item, identifier, stream)
+            if not isinstance(element, dict):
+                format_text(element, out, identifier)
+                continue
+            if scalar_keys:
+                get = element.get
+                out.append(prefix + '\t'.join(
+                    [text_type(get(key, '')) for key in scalar_keys]) + '\n')
+            for key in layout.get_remaining_keys(tuple(element)):
+                format_text(element[key], out, key)
+
+    def _format_dict(self, item, identifier, out):
+        # If the dict is not in a list of dicts, the scalar values are
+        # the ones in the dict itself.
+        keys = tuple(item)
+        sorted_keys = self._sorted_keys.get(keys)
+        if sorted_keys is None:
+            sorted_keys = sorted(keys)
+            if len(self._sorted_keys) < MAX_CACHED_LAYOUTS:
+                self._sorted_keys[keys] = sorted_keys
+        scalars = []
+        non_scalars = []
+        for key in sorted_keys:
+            value = item[key]
+            if isinstance(value, _CONTAINER_TYPES):
+                non_scalars.append(key)
+            else:
+                scalars.append(six.text_type(value))
+        if scalars:
+            if identifier is not None:
+                scalars.insert(0, identifier.upper())
+            out.append('\t'.join(scalars) + '\n')
+        for key in non_scalars:
+            self._format_text(item[key], out, key)
+
+    def _get_list_layout(self, list_of_dicts):
+        scalar_keys = frozenset(_all_scalar_keys(list_of_dicts))
+        layout = self._list_layouts.get(scalar_keys)
+        if layout is None:
+            layout = _ListLayout(scalar_keys)
+            if len(self._list_layouts) < MAX_CACHED_LAYOUTS:
+                self._list_layouts[scalar_keys] = layout
+        return layout
+
+
+class _ListLayout(object):
+    def __init__(self, scalar_key_set):
+        self.scalar_key_set = scalar_key_set
+        self.scalar_keys = sorted(scalar_key_set)
+        # Maps the keys of a dict in the list to the sorted keys that
+        # are not scalar keys.
+        self._remaining_keys = {}
+
+    def get_remaining_keys(self, keys):
+        remaining_keys = self._remaining_keys.get(keys)
+        if remaining_keys is None:
+            remaining_keys = sorted(set(keys) - self.scalar_key_set)
+            if len(self._remaining_keys) < MAX_CACHED_LAYOUTS:
+                self._remaining_keys[keys] = remaining_keys
+        return remaining_keys
 
 
 def _partition_list(item):
     scalars = []
     non_scalars = []
     for element in item:
-        if isinstance(element, (list, dict)):
+        if isinstance(element, _CONTAINER_TYPES):
             non_scalars.append(element)
         else:
             scalars.append(element)
     return scalars, non_scalars
 
 
-def _format_scalar_list(elements, identifier, stream):
+def _format_scalar_list(elements, identifier, out):
     if identifier is not None:
+        identifier = identifier.upper()
         for item in elements:
-            stream.write('%s\t%s\n' % (identifier.upper(),
-                                       item))
+            out.append('%s\t%s\n' % (identifier, item))
     else:
         # For a bare list, just print the contents.
-        stream.write('\t'.join([six.text_type(item) for item in elements]))
-        stream.write('\n')
-
-
-def _format_dict(scalar_keys, item, identifier, stream):
-    scalars, non_scalars = _partition_dict(item, scalar_keys=scalar_keys)
-    if scalars:
-        if identifier is not None:
-            scalars.insert(0, identifier.upper())
-        stream.write('\t'.join(scalars))
-        stream.write('\n')
-    for new_identifier, non_scalar in non_scalars:
-        _format_text(item=non_scalar, stream=stream,
-                     identifier=new_identifier)
+        out.append('\t'.join([six.text_type(item) for item in elements]) +
+                   '\n')
 
 
 def _all_scalar_keys(list_of_dicts):
     keys_seen = set()
+    add = keys_seen.add
     for item_dict in list_of_dicts:
+        if not isinstance(item_dict, dict):
+            continue
         for key, value in item_dict.items():
-            if not isinstance(value, (dict, list)):
-                keys_seen.add(key)
-    return list(sorted(keys_seen))
-
-
-def _partition_dict(item_dict, scalar_keys):
-    # Given a dictionary, partition it into two list based on the
-    # values associated with the keys.
-    # {'foo': 'scalar', 'bar': 'scalar', 'baz': ['not, 'scalar']}
-    # scalar = [('foo', 'scalar'), ('bar', 'scalar')]
-    # non_scalar = [('baz', ['not', 'scalar'])]
-    scalar = []
-    non_scalar = []
-    if scalar_keys is None:
-        # scalar_keys can have more than just the keys in the item_dict,
-        # but if user does not provide scalar_keys, we'll grab the keys
-        # from the current item_dict
-        for key, value in sorted(item_dict.items()):
-            if isinstance(value, (dict, list)):
-                non_scalar.append((key, value))
-            else:
-                scalar.append(six.text_type(value))
-    else:
-        for key in scalar_keys:
-            scalar.append(six.text_type(item_dict.get(key, '')))
-        remaining_keys = sorted(set(item_dict.keys()) - set(scalar_keys))
-        for remaining_key in remaining_keys:
-            non_scalar.append((remaining_key, item_dict[remaining_key]))
-    return scalar, non_scalar
+            if not isinstance(value, _CONTAINER_TYPES):
+                add(key)
+    return keys_seen
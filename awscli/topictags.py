@@ -65,6 +65,20 @@ class TopicTagDB(object):
     to the topic. The value of these keys are dictionaries of tags, where the
     tags are keys and their value is a list of values for that tag. Note
     that all tag values for a specific tag of a specific topic are unique.
+
+    The tags are also kept as inverted lists of the topics of each value of
+    each tag, so that ``query`` does not need to look at every topic:
+
+    {'category': {
+        'General Topics': ['topic-name-1', 'topic-name-2'],
+        'S3': ['topic-name-1']
+     },
+     'related topic': { .....
+    }
+
+    The JSON index and the inverted lists are saved together in a compiled
+    index by ``scripts/make-topic-index``, which ``load_index`` loads
+    instead of building the inverted lists from the JSON index.
     """
 
     VALID_TAGS = ['category', 'description', 'title', 'related topic',
@@ -78,6 +92,10 @@ class TopicTagDB(object):
     # The default JSON index to load.
     JSON_INDEX = os.path.join(TOPIC_DIR, 'topic-tags.json')
 
+    # The suffix of the compiled index, which is stored next to the JSON
+    # index it is compiled from.
+    COMPILED_INDEX_SUFFIX = '.index.json'
+
     def __init__(self, tag_dictionary=None, index_file=JSON_INDEX,
                  topic_dir=TOPIC_DIR):
         """
@@ -98,6 +116,9 @@ class TopicTagDB(object):
 
         self._index_file = index_file
         self._topic_dir = topic_dir
+        # The inverted lists of the tags, which are built when they are
+        # first queried.
+        self._tag_index = None
 
     @property
     def index_file(self):
@@ -115,20 +136,50 @@ class TopicTagDB(object):
     def topic_dir(self, value):
         self._topic_dir = value
 
+    @property
+    def compiled_index_file(self):
+        """The path of the compiled index of the JSON index."""
+        return os.path.splitext(self.index_file)[0] + \
+            self.COMPILED_INDEX_SUFFIX
+
     @property
     def valid_tags(self):
         return self.VALID_TAGS
 
+    def load_index(self):
+        """Loads the compiled index, or the JSON index if there is none."""
+        try:
+            self.load_compiled_index()
+        except (IOError, OSError):
+            self.load_json_index()
+
     def load_json_index(self):
         """Loads a JSON file into the tag dictionary."""
         with open(self.index_file, 'r') as f:
             self._tag_dictionary = json.load(f)
+        self._tag_index = None
+
+    def load_compiled_index(self):
+        """Loads the tag dictionary and its inverted lists."""
+        with open(self.compiled_index_file, 'r') as f:
+            compiled_index = json.load(f)
+        self._tag_dictionary = compiled_index['topics']
+        self._tag_index = compiled_index['tags']
 
     def save_to_json_index(self):
         """Writes the loaded data back out to the JSON index."""
         with open(self.index_file, 'w') as f:
             f.write(json.dumps(self._tag_dictionary, indent=4, sort_keys=True))
 
+    def save_compiled_index(self):
+        """Writes the loaded data and its inverted lists to the compiled
+        index."""
+        compiled_index = {'topics': self._tag_dictionary,
+                          'tags': self._get_tag_index()}
+        with open(self.compiled_index_file, 'w') as f:
+            f.write(json.dumps(compiled_index, sort_keys=True,
+                               separators=(',', ':')))
+
     def get_all_topic_names(self):
         """Retrieves all of the topic names of the loaded JSON index"""
         return list(self._tag_dictionary)
@@ -141,8 +192,9 @@ class TopicTagDB(object):
             # Do not try to load hidden files.
             if not topic_name.startswith('.'):
                 topic_full_path = os.path.join(self.topic_dir, topic_name)
-                # Ignore the JSON Index as it is stored with topic files.
-                if topic_full_path != self.index_file:
+                # Ignore the indexes as they are stored with topic files.
+                if topic_full_path not in [self.index_file,
+                                           self.compiled_index_file]:
                     topic_full_paths.append(topic_full_path)
         return topic_full_paths
 
@@ -212,6 +264,7 @@ class TopicTagDB(object):
 
         # Add topic to the topic tag dictionary if needed.
         self._add_topic_name_to_dict(topic_name)
+        self._tag_index = None
         # Get all of a topics tags
         topic_tags = self._tag_dictionary[topic_name]
         self._add_key_values(topic_tags, tag, values)
@@ -249,21 +302,33 @@ class TopicTagDB(object):
             }
 
         """
+        tag_values = self._get_tag_index().get(tag, {})
+        if values is None:
+            values = tag_values
         query_dict = {}
-        for topic_name in self._tag_dictionary.keys():
-            # Get the tag values for a specified tag of the topic
-            if self._tag_dictionary[topic_name].get(tag, None) is not None:
-                tag_values = self._tag_dictionary[topic_name][tag]
-                for tag_value in tag_values:
-                    # Add the values to dictionary to be returned if
-                    # no value constraints are provided or if the tag value
-                    # falls in the allowed tag values.
-                    if values is None or tag_value in values:
-                        self._add_key_values(query_dict,
-                                             key=tag_value,
-                                             values=[topic_name])
+        for value in values:
+            if value in tag_values:
+                query_dict[value] = list(tag_values[value])
         return query_dict
 
+    def _get_tag_index(self):
+        if self._tag_index is None:
+            tag_index = {}
+            for topic_name in sorted(self._tag_dictionary):
+                topic_tags = self._tag_dictionary[topic_name]
+                for tag, tag_values in topic_tags.items():
+                    self._add_tag_index_values(
+                        tag_index, tag, tag_values, topic_name)
+            self._tag_index = tag_index
+        return self._tag_index
+
+    def _add_tag_index_values(self, tag_index, tag, tag_values, topic_name):
+        for tag_value in tag_values:
+            topic_names = tag_index.setdefault(tag, {}).setdefault(
+                tag_value, [])
+            if topic_name not in topic_names:
+                topic_names.append(topic_name)
+
     def get_tag_value(self, topic_name, tag, default_value=None):
         """Get a value of a tag for a topic
 
@@ -15,6 +15,8 @@ import signal
 import datetime
 import contextlib
 
+from botocore.compat import OrderedDict
+
 from awscli.compat import six
 
 
@@ -109,6 +111,38 @@ def _find_quote_char_in_part(part):
     return quote_char
 
 
+class LRUCache(object):
+    """A cache that holds at most ``max_size`` entries.
+
+    Once the cache is full, adding an entry evicts the entry that was
+    least recently added or retrieved.
+
+    """
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            return default
+        self._entries[key] = value
+        return value
+
+    def put(self, key, value):
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
 def json_encoder(obj):
     """JSON encoder that formats datetimes as ISO8601 format."""
     if isinstance(obj, datetime.datetime):
@@ -0,0 +1,113 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Helpers shared by the performance scripts."""
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+
+AWS_CMD = [sys.executable, '-c',
+           'import sys, awscli.clidriver; '
+           'sys.exit(awscli.clidriver.main())']
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+CommandMetrics = namedtuple('CommandMetrics',
+                            ['rc', 'wall_time', 'cpu_time', 'max_rss'])
+
+
+def create_file(filename, size, chunk=None):
+    """Create ``filename`` with ``size`` bytes of random data."""
+    if chunk is None:
+        chunk = os.urandom(min(size, WRITE_CHUNK_SIZE) or 1)
+    dirname = os.path.dirname(filename)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    with open(filename, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            f.write(chunk[:remaining])
+            remaining -= len(chunk)
+
+
+def create_files(rootdir, num_files, file_size):
+    """Create ``num_files`` files of ``file_size`` bytes in ``rootdir``."""
+    chunk = os.urandom(min(file_size, WRITE_CHUNK_SIZE) or 1)
+    for i in range(num_files):
+        create_file(os.path.join(rootdir, 'file%06d' % i), file_size, chunk)
+
+
+def write_config(filename, s3_config):
+    """Write an AWS config file with ``s3_config`` in the s3 section."""
+    with open(filename, 'w') as f:
+        f.write('[default]\nregion = us-east-1\n')
+        if s3_config:
+            f.write('s3 =\n')
+        for name, value in sorted(s3_config.items()):
+            f.write('  %s = %s\n' % (name, value))
+
+
+def run_aws(args, endpoint_url, config_file, stdout=None):
+    """Run an aws command against ``endpoint_url`` and measure it.
+
+    :returns: A ``CommandMetrics`` with the return code, the wall clock
+        time and CPU time in seconds, and the peak resident set size of
+        the process in bytes.  The CPU time and peak RSS are ``None`` on
+        platforms without ``os.wait4``.
+
+    """
+    env = os.environ.copy()
+    env.update({
+        'AWS_ACCESS_KEY_ID': 'benchmark',
+        'AWS_SECRET_ACCESS_KEY': 'benchmark',
+        'AWS_CONFIG_FILE': config_file,
+    })
+    cmdline = AWS_CMD + ['--endpoint-url', endpoint_url] + args
+    close_stdout = False
+    if stdout is None:
+        stdout = open(os.devnull, 'w')
+        close_stdout = True
+    try:
+        start = time.time()
+        process = subprocess.Popen(cmdline, env=env, stdout=stdout)
+        if hasattr(os, 'wait4'):
+            _, status, rusage = os.wait4(process.pid, 0)
+            wall_time = time.time() - start
+            # Mark the process as reaped so Popen does not wait on it.
+            process.returncode = _status_to_rc(status)
+            cpu_time = rusage.ru_utime + rusage.ru_stime
+            max_rss = _max_rss_in_bytes(rusage.ru_maxrss)
+        else:
+            process.wait()
+            wall_time = time.time() - start
+            cpu_time = None
+            max_rss = None
+    finally:
+        if close_stdout:
+            stdout.close()
+    return CommandMetrics(process.returncode, wall_time, cpu_time, max_rss)
+
+
+def _status_to_rc(status):
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _max_rss_in_bytes(max_rss):
+    # ru_maxrss is reported in bytes on OS X and in kilobytes elsewhere.
+    if sys.platform == 'darwin':
+        return max_rss
+    return max_rss * 1024
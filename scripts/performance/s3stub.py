@@ -0,0 +1,429 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""A small in-memory stand-in for S3 used by the performance scripts.
+
+The stub implements just enough of the S3 REST API, using path style
+addressing, for the ``aws s3`` commands to run against it:
+
+* ListBuckets, CreateBucket, DeleteBucket
+* ListObjects (prefix, delimiter, marker and max-keys)
+* PutObject, CopyObject, GetObject (including ranges), HeadObject,
+  DeleteObject, DeleteObjects
+* CreateMultipartUpload, UploadPart, UploadPartCopy,
+  CompleteMultipartUpload, AbortMultipartUpload
+
+Requests are not authenticated.  Every request is counted by operation
+name so that benchmarks can report how many requests a command made::
+
+    server = S3StubServer()
+    server.start()
+    ... run aws s3 --endpoint-url server.endpoint_url ...
+    print(server.request_counts)
+    server.stop()
+
+"""
+import hashlib
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from email.utils import formatdate
+from xml.etree import ElementTree
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit, parse_qs, unquote
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit, parse_qs
+    from urllib import unquote
+
+
+S3_NS = 'http://s3.amazonaws.com/doc/2006-03-01/'
+DEFAULT_MAX_KEYS = 1000
+RANGE_REGEX = re.compile(r'bytes=(\d+)-(\d*)')
+
+
+class StubObject(object):
+    def __init__(self, data, etag=None):
+        self.data = data
+        if etag is None:
+            etag = hashlib.md5(data).hexdigest()
+        self.etag = etag
+        self.last_modified = time.time()
+
+    @property
+    def iso_last_modified(self):
+        return time.strftime('%Y-%m-%dT%H:%M:%S.000Z',
+                             time.gmtime(self.last_modified))
+
+    @property
+    def http_last_modified(self):
+        return formatdate(self.last_modified, usegmt=True)
+
+
+class S3StubBackend(object):
+    """Thread safe in-memory storage for buckets, objects and uploads."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets = {}
+        self.uploads = {}
+        self.request_counts = defaultdict(int)
+
+    def record(self, operation_name):
+        with self._lock:
+            self.request_counts[operation_name] += 1
+
+    def create_bucket(self, bucket):
+        with self._lock:
+            self.buckets.setdefault(bucket, {})
+
+    def delete_bucket(self, bucket):
+        with self._lock:
+            if self.buckets.get(bucket):
+                return False
+            self.buckets.pop(bucket, None)
+            return True
+
+    def put_object(self, bucket, key, obj):
+        with self._lock:
+            self.buckets.setdefault(bucket, {})[key] = obj
+
+    def get_object(self, bucket, key):
+        with self._lock:
+            return self.buckets.get(bucket, {}).get(key)
+
+    def delete_object(self, bucket, key):
+        with self._lock:
+            self.buckets.get(bucket, {}).pop(key, None)
+
+    def list_keys(self, bucket):
+        with self._lock:
+            return sorted(self.buckets.get(bucket, {}).items())
+
+    def create_upload(self):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = {}
+        return upload_id
+
+    def put_part(self, upload_id, part_number, data):
+        with self._lock:
+            self.uploads[upload_id][part_number] = data
+
+    def pop_upload(self, upload_id):
+        with self._lock:
+            return self.uploads.pop(upload_id, None)
+
+
+class S3StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def backend(self):
+        return self.server.backend
+
+    def _parse_path(self):
+        parts = urlsplit(self.path)
+        query = dict((k, v[0]) for k, v in
+                     parse_qs(parts.query, keep_blank_values=True).items())
+        path = parts.path.lstrip('/')
+        if '/' in path:
+            bucket, key = path.split('/', 1)
+        else:
+            bucket, key = path, ''
+        return unquote(bucket), unquote(key), query
+
+    def _read_body(self):
+        # Python 3 answers "Expect: 100-continue" in parse_request(), but
+        # on Python 2 the client would wait for its continue timeout.
+        expect = self.headers.get('Expect', '')
+        if expect.lower() == '100-continue' and \
+                not hasattr(BaseHTTPRequestHandler, 'handle_expect_100'):
+            self.wfile.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            return self.rfile.read(length)
+        return b''
+
+    def _respond(self, status=200, body=b'', headers=None):
+        self.send_response(status)
+        headers = headers or {}
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _respond_xml(self, root, status=200):
+        body = ElementTree.tostring(root)
+        self._respond(status, body, {'Content-Type': 'application/xml'})
+
+    def _respond_error(self, status, code, message=''):
+        root = ElementTree.Element('Error')
+        ElementTree.SubElement(root, 'Code').text = code
+        ElementTree.SubElement(root, 'Message').text = message
+        self._respond_xml(root, status)
+
+    def do_GET(self):
+        bucket, key, query = self._parse_path()
+        if not bucket:
+            self.backend.record('ListBuckets')
+            return self._list_buckets()
+        if not key:
+            self.backend.record('ListObjects')
+            return self._list_objects(bucket, query)
+        self.backend.record('GetObject')
+        self._get_object(bucket, key)
+
+    def do_HEAD(self):
+        bucket, key, query = self._parse_path()
+        self.backend.record('HeadObject')
+        obj = self.backend.get_object(bucket, key)
+        if obj is None:
+            return self._respond(404)
+        self._respond(200, obj.data, {
+            'ETag': '"%s"' % obj.etag,
+            'Last-Modified': obj.http_last_modified,
+        })
+
+    def do_PUT(self):
+        bucket, key, query = self._parse_path()
+        body = self._read_body()
+        if not key:
+            self.backend.record('CreateBucket')
+            self.backend.create_bucket(bucket)
+            return self._respond(200)
+        copy_source = self.headers.get('x-amz-copy-source')
+        if 'uploadId' in query:
+            part_number = int(query['partNumber'])
+            if copy_source:
+                self.backend.record('UploadPartCopy')
+                data = self._read_copy_source(copy_source)
+                copy_range = self.headers.get('x-amz-copy-source-range')
+                if copy_range:
+                    start, end = RANGE_REGEX.match(copy_range).groups()
+                    data = data[int(start):int(end) + 1]
+                self.backend.put_part(query['uploadId'], part_number, data)
+                root = ElementTree.Element('CopyPartResult')
+                ElementTree.SubElement(root, 'ETag').text = \
+                    '"%s"' % hashlib.md5(data).hexdigest()
+                return self._respond_xml(root)
+            self.backend.record('UploadPart')
+            self.backend.put_part(query['uploadId'], part_number, body)
+            return self._respond(200, b'', {
+                'ETag': '"%s"' % hashlib.md5(body).hexdigest()})
+        if copy_source:
+            self.backend.record('CopyObject')
+            data = self._read_copy_source(copy_source)
+            obj = StubObject(data)
+            self.backend.put_object(bucket, key, obj)
+            root = ElementTree.Element('CopyObjectResult')
+            ElementTree.SubElement(root, 'ETag').text = '"%s"' % obj.etag
+            ElementTree.SubElement(root, 'LastModified').text = \
+                obj.iso_last_modified
+            return self._respond_xml(root)
+        self.backend.record('PutObject')
+        obj = StubObject(body)
+        self.backend.put_object(bucket, key, obj)
+        self._respond(200, b'', {'ETag': '"%s"' % obj.etag})
+
+    def do_POST(self):
+        bucket, key, query = self._parse_path()
+        body = self._read_body()
+        if 'delete' in query:
+            self.backend.record('DeleteObjects')
+            return self._delete_objects(bucket, body)
+        if 'uploads' in query:
+            self.backend.record('CreateMultipartUpload')
+            root = ElementTree.Element('InitiateMultipartUploadResult')
+            ElementTree.SubElement(root, 'Bucket').text = bucket
+            ElementTree.SubElement(root, 'Key').text = key
+            ElementTree.SubElement(root, 'UploadId').text = \
+                self.backend.create_upload()
+            return self._respond_xml(root)
+        if 'uploadId' in query:
+            self.backend.record('CompleteMultipartUpload')
+            parts = self.backend.pop_upload(query['uploadId'])
+            if parts is None:
+                return self._respond_error(404, 'NoSuchUpload')
+            data = b''.join(parts[n] for n in sorted(parts))
+            digests = b''.join(
+                hashlib.md5(parts[n]).digest() for n in sorted(parts))
+            etag = '%s-%s' % (hashlib.md5(digests).hexdigest(), len(parts))
+            self.backend.put_object(bucket, key, StubObject(data, etag))
+            root = ElementTree.Element('CompleteMultipartUploadResult')
+            ElementTree.SubElement(root, 'ETag').text = '"%s"' % etag
+            return self._respond_xml(root)
+        self._respond_error(400, 'InvalidRequest')
+
+    def do_DELETE(self):
+        bucket, key, query = self._parse_path()
+        if not key:
+            self.backend.record('DeleteBucket')
+            if not self.backend.delete_bucket(bucket):
+                return self._respond_error(409, 'BucketNotEmpty')
+            return self._respond(204)
+        if 'uploadId' in query:
+            self.backend.record('AbortMultipartUpload')
+            self.backend.pop_upload(query['uploadId'])
+            return self._respond(204)
+        self.backend.record('DeleteObject')
+        self.backend.delete_object(bucket, key)
+        self._respond(204)
+
+    def _read_copy_source(self, copy_source):
+        copy_source = unquote(copy_source).lstrip('/')
+        src_bucket, src_key = copy_source.split('/', 1)
+        obj = self.backend.get_object(src_bucket, src_key)
+        if obj is None:
+            return b''
+        return obj.data
+
+    def _get_object(self, bucket, key):
+        obj = self.backend.get_object(bucket, key)
+        if obj is None:
+            return self._respond_error(404, 'NoSuchKey')
+        data = obj.data
+        status = 200
+        headers = {'ETag': '"%s"' % obj.etag,
+                   'Last-Modified': obj.http_last_modified}
+        range_header = self.headers.get('Range')
+        if range_header:
+            start, end = RANGE_REGEX.match(range_header).groups()
+            start = int(start)
+            end = int(end) if end else len(data) - 1
+            headers['Content-Range'] = 'bytes %s-%s/%s' % (
+                start, end, len(data))
+            data = data[start:end + 1]
+            status = 206
+        self._respond(status, data, headers)
+
+    def _list_buckets(self):
+        root = ElementTree.Element('ListAllMyBucketsResult', xmlns=S3_NS)
+        buckets = ElementTree.SubElement(root, 'Buckets')
+        for name in sorted(self.backend.buckets):
+            bucket = ElementTree.SubElement(buckets, 'Bucket')
+            ElementTree.SubElement(bucket, 'Name').text = name
+            ElementTree.SubElement(bucket, 'CreationDate').text = \
+                '2016-01-01T00:00:00.000Z'
+        self._respond_xml(root)
+
+    def _list_objects(self, bucket, query):
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter', '')
+        marker = query.get('marker', '')
+        max_keys = int(query.get('max-keys', DEFAULT_MAX_KEYS))
+        root = ElementTree.Element('ListBucketResult', xmlns=S3_NS)
+        ElementTree.SubElement(root, 'Name').text = bucket
+        ElementTree.SubElement(root, 'Prefix').text = prefix
+        ElementTree.SubElement(root, 'Marker').text = marker
+        ElementTree.SubElement(root, 'MaxKeys').text = str(max_keys)
+        if delimiter:
+            ElementTree.SubElement(root, 'Delimiter').text = delimiter
+        count = 0
+        truncated = False
+        seen_prefixes = set()
+        last_key = None
+        for key, obj in self.backend.list_keys(bucket):
+            if not key.startswith(prefix) or key <= marker:
+                continue
+            if count >= max_keys:
+                truncated = True
+                break
+            if delimiter:
+                index = key.find(delimiter, len(prefix))
+                if index != -1:
+                    common_prefix = key[:index + len(delimiter)]
+                    if common_prefix not in seen_prefixes:
+                        seen_prefixes.add(common_prefix)
+                        element = ElementTree.SubElement(
+                            root, 'CommonPrefixes')
+                        ElementTree.SubElement(element, 'Prefix').text = \
+                            common_prefix
+                        count += 1
+                    last_key = key
+                    continue
+            contents = ElementTree.SubElement(root, 'Contents')
+            ElementTree.SubElement(contents, 'Key').text = key
+            ElementTree.SubElement(contents, 'LastModified').text = \
+                obj.iso_last_modified
+            ElementTree.SubElement(contents, 'ETag').text = '"%s"' % obj.etag
+            ElementTree.SubElement(contents, 'Size').text = str(len(obj.data))
+            ElementTree.SubElement(contents, 'StorageClass').text = 'STANDARD'
+            count += 1
+            last_key = key
+        ElementTree.SubElement(root, 'IsTruncated').text = \
+            'true' if truncated else 'false'
+        if truncated and last_key is not None:
+            ElementTree.SubElement(root, 'NextMarker').text = last_key
+        self._respond_xml(root)
+
+    def _delete_objects(self, bucket, body):
+        request = ElementTree.fromstring(body)
+        root = ElementTree.Element('DeleteResult', xmlns=S3_NS)
+        for key_element in request.iter():
+            if key_element.tag.split('}')[-1] != 'Key':
+                continue
+            self.backend.delete_object(bucket, key_element.text)
+            deleted = ElementTree.SubElement(root, 'Deleted')
+            ElementTree.SubElement(deleted, 'Key').text = key_element.text
+        self._respond_xml(root)
+
+
+class _ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class S3StubServer(object):
+    """Runs an ``S3StubRequestHandler`` server on a background thread."""
+    def __init__(self, host='127.0.0.1', port=0):
+        self._server = _ThreadedHTTPServer((host, port),
+                                           S3StubRequestHandler)
+        self._server.backend = S3StubBackend()
+        self._thread = None
+
+    @property
+    def backend(self):
+        return self._server.backend
+
+    @property
+    def endpoint_url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    @property
+    def request_counts(self):
+        return dict(self.backend.request_counts)
+
+    def reset_request_counts(self):
+        self.backend.request_counts.clear()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -11,6 +11,7 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 import mock
+from botocore.compat import six
 from botocore.compat import urlparse, parse_qs
 
 from awscli.testutils import FileCreator
@@ -53,6 +54,7 @@ class TestSign(BaseAWSCommandParamsTest):
 
     def setUp(self):
         files = FileCreator()
+        self.files = files
         self.private_key_file = files.create_file('foo.pem', self.private_key)
         self.addCleanup(files.remove_all)
         super(TestSign, self).setUp()
@@ -82,3 +84,57 @@ class TestSign(BaseAWSCommandParamsTest):
             'Policy': [mock.ANY], 'Signature': [mock.ANY]}
         self.assertDesiredUrl(
             self.run_cmd(cmdline)[0], 'http://example.com/hi', expected_params)
+
+    def assertDesiredUrls(self, stdout, bases, params):
+        urls = stdout.splitlines()
+        self.assertEqual(len(urls), len(bases))
+        for url, base in zip(urls, bases):
+            self.assertTrue(url.startswith(base + '?'), "URL mismatch")
+            self.assertEqual(parse_qs(urlparse(url).query), params)
+
+    def batch_cmdline(self, url_file):
+        return (
+            'cloudfront sign --key-pair-id my_id --url-file ' + url_file +
+            ' --private-key file://' + self.private_key_file +
+            ' --date-less-than 2016-1-1')
+
+    def test_signs_urls_of_file(self):
+        url_file = self.files.create_file(
+            'urls.txt',
+            'http://example.com/a\n\nhttp://example.com/b?c=d\n')
+        expected_params = {
+            'Key-Pair-Id': ['my_id'],
+            'Expires': ['1451606400'], 'Signature': [mock.ANY]}
+        stdout = self.run_cmd(self.batch_cmdline(url_file))[0]
+        urls = stdout.splitlines()
+        self.assertEqual(len(urls), 2)
+        self.assertDesiredUrls(
+            urls[0], ['http://example.com/a'], expected_params)
+        expected_params['c'] = ['d']
+        self.assertDesiredUrls(
+            urls[1], ['http://example.com/b'], expected_params)
+
+    def test_signs_urls_from_stdin(self):
+        stdin = six.StringIO('http://example.com/a\nhttp://example.com/b\n')
+        expected_params = {
+            'Key-Pair-Id': ['my_id'],
+            'Policy': [mock.ANY], 'Signature': [mock.ANY]}
+        with mock.patch('sys.stdin', stdin):
+            stdout = self.run_cmd(
+                self.batch_cmdline('-') + ' --ip-address 12.34.56.78')[0]
+        self.assertDesiredUrls(
+            stdout, ['http://example.com/a', 'http://example.com/b'],
+            expected_params)
+
+    def test_url_and_url_file_are_mutually_exclusive(self):
+        self.run_cmd(
+            self.prefix + '--url-file - --private-key file://' +
+            self.private_key_file + ' --date-less-than 2016-1-1',
+            expected_rc=255)
+
+    def test_url_or_url_file_is_required(self):
+        stderr = self.run_cmd(
+            'cloudfront sign --key-pair-id my_id --private-key file://' +
+            self.private_key_file + ' --date-less-than 2016-1-1',
+            expected_rc=255)[1]
+        self.assertIn('--url-file', stderr)
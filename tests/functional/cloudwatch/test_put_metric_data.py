@@ -13,7 +13,11 @@
 # language governing permissions and limitations under the License.
 import decimal
 
+import mock
+
+from awscli.clientcache import create_client
 from awscli.testutils import BaseAWSCommandParamsTest
+from awscli.testutils import FileCreator
 
 
 class TestPutMetricData(BaseAWSCommandParamsTest):
@@ -21,6 +25,14 @@ class TestPutMetricData(BaseAWSCommandParamsTest):
 
     prefix = 'cloudwatch put-metric-data '
 
+    def setUp(self):
+        super(TestPutMetricData, self).setUp()
+        self.files = FileCreator()
+
+    def tearDown(self):
+        super(TestPutMetricData, self).tearDown()
+        self.files.remove_all()
+
     expected_output = {
         'MetricData': [
             {'MetricName': 'FreeMemoryBytes',
@@ -70,3 +82,53 @@ class TestPutMetricData(BaseAWSCommandParamsTest):
             'Namespace': 'MyService'
         }
         self.assert_params_for_cmd(cmdline, expected)
+
+    def test_using_metric_data_file(self):
+        filename = self.files.create_file(
+            'metrics.json',
+            ''.join('{"MetricName": "Metric%s", "Value": %s}\n' % (i, i)
+                    for i in range(25)))
+        cmdline = self.prefix + (
+            '--namespace MyService --metric-data-file %s' % filename)
+        self.run_cmd(cmdline)
+        self.assertEqual(len(self.operations_called), 2)
+        batches = sorted(
+            [params for _, params in self.operations_called],
+            key=lambda params: len(params['MetricData']))
+        self.assertEqual(batches[0]['Namespace'], 'MyService')
+        self.assertEqual(len(batches[0]['MetricData']), 5)
+        self.assertEqual(len(batches[1]['MetricData']), 20)
+
+    def test_metric_data_file_uses_shared_client(self):
+        filename = self.files.create_file(
+            'metrics.json', '{"MetricName": "Metric", "Value": 1}\n')
+        cmdline = self.prefix + (
+            '--namespace MyService --metric-data-file %s' % filename)
+        with mock.patch('awscli.customizations.putmetricdata.create_client',
+                        wraps=create_client) as create_client_mock:
+            self.run_cmd(cmdline)
+        self.assertEqual(create_client_mock.call_count, 1)
+        self.assertEqual(create_client_mock.call_args[0][1], 'cloudwatch')
+        self.assertEqual(len(self.operations_called), 1)
+
+    def test_using_csv_metric_data_file(self):
+        filename = self.files.create_file(
+            'metrics.csv',
+            'MetricName,Value,Dimensions\n'
+            'Latency,12.5,"Host=web-1,Stage=prod"\n')
+        cmdline = self.prefix + (
+            '--namespace MyService --metric-data-file %s' % filename)
+        self.run_cmd(cmdline)
+        self.assertEqual(self.operations_called[0][1], {
+            'Namespace': 'MyService',
+            'MetricData': [
+                {'MetricName': 'Latency', 'Value': decimal.Decimal('12.5'),
+                 'Dimensions': [{'Name': 'Host', 'Value': 'web-1'},
+                                {'Name': 'Stage', 'Value': 'prod'}]}]})
+
+    def test_metric_data_file_and_metric_data_are_exclusive(self):
+        filename = self.files.create_file('metrics.json', '')
+        cmdline = self.prefix + (
+            '--namespace MyService --metric-data-file %s '
+            '--metric-name Foo --value 1' % filename)
+        self.run_cmd(cmdline, expected_rc=255)
@@ -11,6 +11,8 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import json
+
 from awscli.testutils import BaseAWSCommandParamsTest
 from dateutil import parser, tz
 
@@ -178,3 +180,35 @@ class TestLSCommand(BaseAWSCommandParamsTest):
 
 if __name__ == "__main__":
     unittest.main()
+
+    def test_summary_only(self):
+        time_utc = "2014-01-09T20:45:49.000Z"
+        self.parsed_responses = [{"CommonPrefixes": [], "Contents": [
+            {"Key": "foo.txt", "Size": 100, "StorageClass": "STANDARD",
+             "LastModified": time_utc},
+            {"Key": "bar.txt", "Size": 2048, "StorageClass": "GLACIER",
+             "LastModified": time_utc}]}]
+        stdout, _, _ = self.run_cmd(
+            's3 ls s3://bucket/ --summary-only --summary-format json',
+            expected_rc=0)
+        call_args = self.operations_called[0][1]
+        self.assertEqual(call_args['MaxKeys'], 1000)
+        self.assertEqual(call_args['Delimiter'], '/')
+        summary = json.loads(stdout)
+        self.assertEqual(summary['TotalObjects'], 2)
+        self.assertEqual(summary['TotalSize'], 2148)
+        self.assertEqual(summary['StorageClasses'], [
+            {'StorageClass': 'GLACIER', 'Objects': 1, 'Size': 2048},
+            {'StorageClass': 'STANDARD', 'Objects': 1, 'Size': 100}])
+        self.assertNotIn('foo.txt', stdout)
+
+    def test_summary_only_text(self):
+        self.parsed_responses = [{"CommonPrefixes": [], "Contents": []}]
+        stdout, _, _ = self.run_cmd('s3 ls s3://bucket/ --summary-only',
+                                    expected_rc=0)
+        self.assertTrue(stdout.startswith(
+            'Total Objects: 0\n   Total Size: 0\n'))
+
+    def test_summary_only_with_no_matching_keys(self):
+        self.parsed_responses = [{"CommonPrefixes": [], "Contents": []}]
+        self.run_cmd('s3 ls s3://bucket/foo --summary-only', expected_rc=1)
@@ -11,6 +11,7 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 from awscli.testutils import BaseAWSCommandParamsTest, FileCreator
+import json
 import os
 
 from awscli.compat import six
@@ -49,6 +50,51 @@ class TestSyncCommand(BaseAWSCommandParamsTest):
             'http://someserver'
         )
 
+    def test_stats_file(self):
+        self.files.create_file('foo.txt', 'mycontent')
+        stats_file = os.path.join(self.files.rootdir, 'stats.json')
+        cmdline = '%s %s s3://bucket/ --exclude stats.json --stats-file %s' % (
+            self.prefix, self.files.rootdir, stats_file)
+        self.parsed_responses = [
+            {"CommonPrefixes": [], "Contents": []},
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'}
+        ]
+        self.run_cmd(cmdline, expected_rc=0)
+        with open(stats_file) as f:
+            stats = json.load(f)
+        self.assertEqual(stats['total_files'], 1)
+        self.assertEqual(stats['bytes_transferred'], len('mycontent'))
+        self.assertEqual(stats['requests']['operations'],
+                         {'ListObjects': 1, 'PutObject': 1})
+        self.assertEqual(stats['phases']['queued']['count'], 1)
+        self.assertEqual(stats['phases']['transferring']['count'], 1)
+        self.assertEqual(stats['retries']['count'], 0)
+
+    def test_stats_summary_is_printed(self):
+        self.files.create_file('foo.txt', 'mycontent')
+        cmdline = '%s %s s3://bucket/ --stats' % (
+            self.prefix, self.files.rootdir)
+        self.parsed_responses = [
+            {"CommonPrefixes": [], "Contents": []},
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'}
+        ]
+        stdout, _, _ = self.run_cmd(cmdline, expected_rc=0)
+        self.assertIn('Transfer statistics:', stdout)
+        self.assertIn('      ListObjects: 1\n', stdout)
+        self.assertIn('      PutObject: 1\n', stdout)
+
+    def test_stats_summary_is_not_printed_when_quiet(self):
+        self.files.create_file('foo.txt', 'mycontent')
+        for option in ['--quiet', '--only-show-errors']:
+            cmdline = '%s %s s3://bucket/ --stats %s' % (
+                self.prefix, self.files.rootdir, option)
+            self.parsed_responses = [
+                {"CommonPrefixes": [], "Contents": []},
+                {'ETag': '"c8afdb36c52cf4727836669019e69222"'}
+            ]
+            stdout, _, _ = self.run_cmd(cmdline, expected_rc=0)
+            self.assertNotIn('Transfer statistics:', stdout)
+
     def test_no_recursive_option(self):
         cmdline = '. s3://mybucket --recursive'
         # Return code will be 2 for invalid parameter ``--recursive``
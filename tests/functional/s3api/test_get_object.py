@@ -86,6 +86,30 @@ class TestGetObject(BaseAWSCommandParamsTest):
         self.assert_params_for_cmd(
             cmdline, {'Bucket': 'mybucket', 'Key': 'mykey'})
 
+    def test_concurrent_ranges_of_small_object(self):
+        self.parsed_response = {'Body': six.BytesIO(b'foo'),
+                                'ContentLength': 3}
+        cmdline = self.prefix
+        cmdline += ' --bucket mybucket'
+        cmdline += ' --key mykey'
+        cmdline += ' --concurrent-ranges 4'
+        cmdline += ' outfile'
+        self.addCleanup(self.remove_file_if_exists, 'outfile')
+        self.assert_params_for_cmd(
+            cmdline, {'Bucket': 'mybucket', 'Key': 'mykey'})
+        self.assertEqual(len(self.operations_called), 1)
+        with open('outfile', 'rb') as f:
+            self.assertEqual(f.read(), b'foo')
+
+    def test_concurrent_ranges_must_be_positive(self):
+        cmdline = self.prefix
+        cmdline += ' --bucket mybucket'
+        cmdline += ' --key mykey'
+        cmdline += ' --concurrent-ranges 0'
+        cmdline += ' outfile'
+        self.addCleanup(self.remove_file_if_exists, 'outfile')
+        self.run_cmd(cmdline, expected_rc=255)
+
 
 if __name__ == "__main__":
     unittest.main()
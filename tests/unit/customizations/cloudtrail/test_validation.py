@@ -19,7 +19,7 @@ from datetime import datetime, timedelta
 from dateutil import parser, tz
 
 import rsa
-from mock import Mock, call
+from mock import Mock, call, patch
 from argparse import Namespace
 
 from awscli.compat import six
@@ -293,6 +293,14 @@ class TestSha256RSADigestValidator(unittest.TestCase):
         validator.validate('b', 'k', public_key_b64, self._digest_data,
                            self._inflated_digest)
 
+    def test_loads_each_public_key_once(self):
+        validator = Sha256RSADigestValidator()
+        with patch('awscli.customizations.crypto.load_public_key') as m:
+            for _ in range(3):
+                validator.validate('b', 'k', VALID_TEST_KEY,
+                                   self._digest_data, self._inflated_digest)
+        self.assertEqual(m.call_count, 1)
+
     def test_does_not_expose_underlying_key_decoding_error(self):
         validator = Sha256RSADigestValidator()
         try:
@@ -781,7 +789,9 @@ class TestS3ClientProvider(BaseAWSCommandParamsTest):
         created_client = provider.get_client('foo')
         self.assertEqual(s3_client, created_client)
         create_client_calls = session.create_client.call_args_list
-        self.assertEqual(create_client_calls, [call('s3', 'us-east-1')])
+        self.assertEqual(create_client_calls, [
+            call('s3', region_name='us-east-1', endpoint_url=None,
+                 verify=None, config=None)])
         self.assertEqual(1, s3_client.get_bucket_location.call_count)
 
     def test_creates_clients_for_buckets_outside_us_east_1(self):
@@ -795,8 +805,10 @@ class TestS3ClientProvider(BaseAWSCommandParamsTest):
         self.assertEqual(s3_client, created_client)
         create_client_calls = session.create_client.call_args_list
         self.assertEqual(create_client_calls, [
-            call('s3', 'us-west-1'),
-            call('s3', 'us-west-2')
+            call('s3', region_name='us-west-1', endpoint_url=None,
+                 verify=None, config=None),
+            call('s3', region_name='us-west-2', endpoint_url=None,
+                 verify=None, config=None)
         ])
         self.assertEqual(1, s3_client.get_bucket_location.call_count)
 
@@ -11,6 +11,9 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+import os
+import zipfile
+
 import awscli
 
 from argparse import Namespace
@@ -18,8 +21,10 @@ from mock import MagicMock, patch, ANY, call
 from six import StringIO
 
 from awscli.customizations.codedeploy.push import Push
+from awscli.customizations.zipbundle import StreamingBundle
 from awscli.errorhandler import ClientError
-from awscli.testutils import unittest
+from awscli.testutils import unittest, FileCreator
+from awscli.compat import six
 from awscli.compat import ZIP_COMPRESSION_MODE
 
 
@@ -94,6 +99,19 @@ class TestPush(unittest.TestCase):
             .return_value = self.upload_response
         self.push.codedeploy = MagicMock()
 
+        self.files = FileCreator()
+
+    def tearDown(self):
+        self.files.remove_all()
+
+    def create_bundle(self, contents):
+        bundler = MagicMock()
+        bundler.write.side_effect = lambda members, f: f.write(contents)
+        bundle = StreamingBundle(bundler, [])
+        bundle.start()
+        self.addCleanup(bundle.close)
+        return bundle
+
     def test_run_main_throws_on_invalid_args(self):
         self.push._validate_args = MagicMock()
         self.push._validate_args.side_effect = RuntimeError()
@@ -185,55 +203,51 @@ class TestPush(unittest.TestCase):
         )
         self.assertEquals(expected_output, output)
 
-    @patch('zipfile.ZipFile')
-    @patch('tempfile.TemporaryFile')
-    @patch('os.path')
-    @patch('os.walk')
-    def test_compress_throws_when_no_appspec(self, walk, path, tf, zf):
-        walk.return_value = [(self.source, [], ['noappspec.yml'])]
-        noappsec_path = self.source + '/noappspec.yml'
-        path.join.return_value = noappsec_path
-        path.sep = '/'
-        path.abspath.side_effect = [self.source, noappsec_path]
-        tf.return_value = self.bundle_mock
-        zf.return_value = self.zipfile_mock
+    def test_compress_throws_when_no_appspec(self):
+        self.files.create_file('noappspec.yml', 'contents')
         with self.assertRaises(RuntimeError):
             with self.push._compress(
-                    self.args.source,
+                    self.files.rootdir,
                     self.args.ignore_hidden_files):
                 pass
 
-    @patch('zipfile.ZipFile')
-    @patch('tempfile.TemporaryFile')
-    @patch('os.path')
-    @patch('os.walk')
-    def test_compress_writes_to_zip_file(self, walk, path, tf, zf):
-        walk.return_value = [(self.source, [], [self.appspec])]
-        path.join.return_value = self.appspec_path
-        path.sep = '/'
-        path.abspath.side_effect = [self.source, self.appspec_path]
-        tf.return_value = self.bundle_mock
-        zf.return_value = self.zipfile_mock
+    def test_compress_writes_to_zip_file(self):
+        appspec = 'version: 0.0\n' * 100
+        self.files.create_file(self.appspec, appspec)
+        self.files.create_file(os.path.join('scripts', 'start.sh'), 'start')
         with self.push._compress(
-                self.args.source,
-                self.args.ignore_hidden_files):
-            zf.assert_called_with(ANY, 'w', allowZip64=True)
-            zf().write.assert_called_with(
-                '/tmp/appspec.yml',
-                self.appspec,
+                self.files.rootdir,
+                self.args.ignore_hidden_files) as bundle:
+            zf = zipfile.ZipFile(six.BytesIO(bundle.read()))
+            self.assertEqual(
+                sorted(zf.namelist()), ['appspec.yml', 'scripts/start.sh'])
+            self.assertEqual(
+                zf.read('appspec.yml'), appspec.encode('utf-8'))
+            self.assertEqual(
+                zf.getinfo('appspec.yml').compress_type,
                 ZIP_COMPRESSION_MODE
             )
 
+    def test_compress_ignores_hidden_files(self):
+        self.files.create_file(self.appspec, 'version: 0.0')
+        self.files.create_file('.hidden', 'hidden')
+        self.files.create_file(os.path.join('.git', 'config'), 'config')
+        with self.push._compress(self.files.rootdir, True) as bundle:
+            zf = zipfile.ZipFile(six.BytesIO(bundle.read()))
+            self.assertEqual(zf.namelist(), ['appspec.yml'])
+
     def test_upload_to_s3_with_put_object(self):
         self.args.bucket = self.bucket
         self.args.key = self.key
-        response = self.push._upload_to_s3(self.args, self.bundle_mock)
+        bundle = self.create_bundle(b'a' * (5 << 20))
+        response = self.push._upload_to_s3(self.args, bundle)
         self.assertDictEqual(self.upload_response, response)
         self.push.s3.put_object.assert_called_with(
             Bucket=self.bucket,
             Key=self.key,
-            Body=self.bundle_mock
+            Body=bundle
         )
+        self.assertEqual(bundle.tell(), 0)
         self.assertFalse(self.push.s3.create_multipart_upload.called)
         self.assertFalse(self.push.s3.upload_part.called)
         self.assertFalse(self.push.s3.complete_multipart_upload.called)
@@ -242,9 +256,8 @@ class TestPush(unittest.TestCase):
     def test_upload_to_s3_with_multipart_upload(self):
         self.args.bucket = self.bucket
         self.args.key = self.key
-        self.bundle_mock.tell.return_value = (6 << 20)
-        self.bundle_mock.read.return_value = b'a' * (6 << 20)
-        response = self.push._upload_to_s3(self.args, self.bundle_mock)
+        bundle = self.create_bundle(b'a' * (6 << 20))
+        response = self.push._upload_to_s3(self.args, bundle)
         self.assertDictEqual(self.upload_response, response)
         self.assertFalse(self.push.s3.put_object.called)
         self.push.s3.create_multipart_upload.assert_called_with(
@@ -266,11 +279,37 @@ class TestPush(unittest.TestCase):
         )
         self.assertFalse(self.push.s3.abort_multipart_upload.called)
 
+    def test_upload_to_s3_uploads_parts_concurrently(self):
+        self.args.bucket = self.bucket
+        self.args.key = self.key
+        contents = b'a' * (6 << 20) + b'b' * (6 << 20) + b'c' * (1 << 20)
+        bundle = self.create_bundle(contents)
+        uploaded = {}
+
+        def upload_part(**kwargs):
+            uploaded[kwargs['PartNumber']] = kwargs['Body'].read()
+            return {'ETag': '"etag-%s"' % kwargs['PartNumber']}
+
+        self.push.s3.upload_part.side_effect = upload_part
+        self.push._upload_to_s3(self.args, bundle)
+        self.assertEqual(
+            b''.join(uploaded[part] for part in sorted(uploaded)), contents)
+        self.assertEqual(len(uploaded[3]), 1 << 20)
+        self.push.s3.complete_multipart_upload.assert_called_with(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={'Parts': [
+                {'PartNumber': 1, 'ETag': '"etag-1"'},
+                {'PartNumber': 2, 'ETag': '"etag-2"'},
+                {'PartNumber': 3, 'ETag': '"etag-3"'},
+            ]}
+        )
+
     def test_upload_to_s3_with_multipart_upload_aborted_on_error(self):
         self.args.bucket = self.bucket
         self.args.key = self.key
-        self.bundle_mock.tell.return_value = (6 << 20)
-        self.bundle_mock.read.return_value = b'a' * (6 << 20)
+        bundle = self.create_bundle(b'a' * (12 << 20))
         self.push.s3.upload_part.side_effect = ClientError(
             error_code='Error',
             error_message='Error',
@@ -279,7 +318,7 @@ class TestPush(unittest.TestCase):
             http_status_code=400
         )
         with self.assertRaises(ClientError):
-            self.push._upload_to_s3(self.args, self.bundle_mock)
+            self.push._upload_to_s3(self.args, bundle)
         self.assertFalse(self.push.s3.put_object.called)
         self.push.s3.create_multipart_upload.assert_called_with(
             Bucket=self.bucket,
@@ -189,8 +189,7 @@ class TestCommandsRunProperly(BaseAWSCommandParamsTest):
         self.driver.session = mock.Mock()
         self.driver.session.emit_first_non_none_response.return_value = None
         self.driver.session.create_client.return_value = self.client
-        self.query_objects.paginate.return_value.build_full_result.\
-            return_value = {'ids': ['object-ids']}
+        self.query_objects.paginate.return_value = [{'ids': ['object-ids']}]
         self.describe_objects.return_value = \
             {'pipelineObjects': API_DESCRIBE_OBJECTS}
         self.expected_response = convert_described_objects(
@@ -225,10 +224,54 @@ class TestCommandsRunProperly(BaseAWSCommandParamsTest):
         command = ListRunsCommand(self.driver.session)
         command(['--pipeline-id', 'my-pipeline-id'],
                 parsed_globals=FakeParsedArgs(region='us-east-1'))
-        list_formatter.assert_called_once_with(
-            'list-runs', self.expected_response)
+        self.assertEqual(list_formatter.call_count, 1)
+        command_name, runs = list_formatter.call_args[0]
+        self.assertEqual(command_name, 'list-runs')
+        self.assertEqual(list(runs), self.expected_response)
         self.assertFalse(json_formatter.called)
 
+    def test_list_runs_describes_ids_in_batches(self):
+        ids = ['id-%03d' % i for i in range(60)]
+        self.query_objects.paginate.return_value = [
+            {'ids': ids[:40]}, {'ids': ids[40:]}]
+        self.describe_objects.return_value = {'pipelineObjects': []}
+        command = ListRunsCommand(self.driver.session)
+        command(['--pipeline-id', 'my-pipeline-id'],
+                parsed_globals=FakeParsedArgs(
+                    region='us-east-1', output='json'))
+        described = sorted(
+            call[1]['objectIds']
+            for call in self.describe_objects.call_args_list)
+        self.assertEqual(described, [ids[:25], ids[25:50], ids[50:]])
+
+    def test_list_runs_follows_describe_objects_marker(self):
+        self.describe_objects.side_effect = [
+            {'pipelineObjects': API_DESCRIBE_OBJECTS[:1],
+             'hasMoreResults': True, 'marker': 'next'},
+            {'pipelineObjects': API_DESCRIBE_OBJECTS[1:],
+             'hasMoreResults': False},
+        ]
+        command = ListRunsCommand(self.driver.session)
+        with mock.patch(JSON_FORMATTER_PATH) as json_formatter:
+            command(['--pipeline-id', 'my-pipeline-id'],
+                    parsed_globals=FakeParsedArgs(
+                        region='us-east-1', output='json'))
+        self.describe_objects.assert_called_with(
+            pipelineId='my-pipeline-id', objectIds=['object-ids'],
+            marker='next')
+        json_formatter.assert_called_once_with(
+            'list-runs', self.expected_response)
+
+    def test_list_runs_without_runs(self):
+        self.query_objects.paginate.return_value = [{'ids': []}]
+        command = ListRunsCommand(self.driver.session)
+        with mock.patch(JSON_FORMATTER_PATH) as json_formatter:
+            command(['--pipeline-id', 'my-pipeline-id'],
+                    parsed_globals=FakeParsedArgs(
+                        region='us-east-1', output='json'))
+        self.assertFalse(self.describe_objects.called)
+        json_formatter.assert_called_once_with('list-runs', [])
+
 
 class TestHelpOutput(BaseAWSHelpOutputTest):
     def test_list_runs_help_output(self):
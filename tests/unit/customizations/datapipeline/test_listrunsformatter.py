@@ -58,3 +58,13 @@ class TestListRunsFormatter(unittest.TestCase):
             "       id                                                  actualStartTime      actualEndTime      \n"  # noqa
             "\n"
         )
+
+    def test_iterator_of_runs(self):
+        runs = iter([
+            {'@componentParent': 'first', '@id': 'id1'},
+            {'@componentParent': 'second', '@id': 'id2'},
+        ])
+        self.formatter('list-runs', runs, stream=self.stream)
+        rendered = self.stream.getvalue()
+        self.assertIn('   1.  first ', rendered)
+        self.assertIn('   2.  second ', rendered)
@@ -0,0 +1,76 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import random
+
+from awscli.testutils import unittest
+from awscli.customizations.datapipeline.mergesort import MergeSorter
+
+
+def sort_key(obj):
+    return obj['start']
+
+
+class TestMergeSorter(unittest.TestCase):
+    def sort(self, batches, max_run_size):
+        sorter = MergeSorter(key=sort_key, max_run_size=max_run_size)
+        try:
+            for batch in batches:
+                sorter.add(batch)
+            return list(sorter.sorted())
+        finally:
+            sorter.close()
+
+    def make_objects(self, count):
+        objects = [{'start': '2016-01-%02d' % (i % 28 + 1), 'id': i}
+                   for i in range(count)]
+        random.Random(count).shuffle(objects)
+        return objects
+
+    def test_sorts_in_memory(self):
+        objects = self.make_objects(50)
+        self.assertEqual(self.sort([objects[:20], objects[20:]], 100),
+                         sorted(objects, key=sort_key))
+
+    def test_merges_runs_written_to_disk(self):
+        objects = self.make_objects(100)
+        batches = [objects[i:i + 7] for i in range(0, len(objects), 7)]
+        sorter = MergeSorter(key=sort_key, max_run_size=10)
+        for batch in batches:
+            sorter.add(batch)
+        self.assertGreater(len(sorter._runs), 1)
+        self.assertEqual(list(sorter.sorted()),
+                         sorted(objects, key=sort_key))
+        sorter.close()
+
+    def test_equal_keys_keep_order_added(self):
+        objects = [{'start': 'same', 'id': i} for i in range(25)]
+        batches = [objects[i:i + 5] for i in range(0, len(objects), 5)]
+        self.assertEqual(self.sort(batches, 10), objects)
+
+    def test_runs_without_key_value(self):
+        # list-runs sorts by the scheduled start time and then the name,
+        # and runs may not have a scheduled start time.
+        sorter = MergeSorter(key=lambda obj: (obj.get('start'), obj['id']),
+                             max_run_size=2)
+        objects = [{'id': 3}, {'start': None, 'id': 1},
+                   {'start': None, 'id': 2}]
+        sorter.add(objects)
+        self.assertEqual([obj['id'] for obj in sorter.sorted()], [1, 2, 3])
+        sorter.close()
+
+    def test_no_objects(self):
+        self.assertEqual(self.sort([], 10), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
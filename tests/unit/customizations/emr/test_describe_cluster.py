@@ -11,6 +11,7 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+import copy
 import json
 
 from tests.unit.customizations.emr import EMRBaseAWSCommandParamsTest as \
@@ -219,21 +220,57 @@ class TestDescribeCluster(BaseAWSCommandParamsTest):
 
         self.run_cmd(cmdline, expected_rc=0)
 
+        # The calls are made at the same time, so they can be made in any
+        # order.
         self.assertEqual(len(self.operations_called), 3)
-        self.assertEqual(self.operations_called[0][0].name,
-                         'DescribeCluster')
-        self.assertEqual(self.operations_called[0][1]['ClusterId'],
-                         'j-ABCD')
+        self.assertEqual(
+            sorted(operation.name
+                   for operation, _ in self.operations_called),
+            ['DescribeCluster', 'ListBootstrapActions',
+             'ListInstanceGroups'])
+        for _, params in self.operations_called:
+            self.assertEqual(params['ClusterId'], 'j-ABCD')
 
-        self.assertEqual(self.operations_called[1][0].name,
-                         'ListInstanceGroups')
-        self.assertEqual(self.operations_called[1][1]['ClusterId'],
-                         'j-ABCD')
+    @patch('awscli.customizations.emr.emr.DescribeCluster._call')
+    def test_list_operations_are_paginated(self, call_patch):
+        call_patch.side_effect = side_effect_of_call
+
+        self.run_cmd(self.prefix + ' --cluster-id j-ABCD', expected_rc=0)
+        paginated = dict(
+            (call[0][1], call[1]['paginate'])
+            for call in call_patch.call_args_list)
+        self.assertEqual(paginated, {
+            'describe_cluster': False,
+            'list_instance_groups': True,
+            'list_bootstrap_actions': True,
+        })
 
-        self.assertEqual(self.operations_called[2][0].name,
-                         'ListBootstrapActions')
-        self.assertEqual(self.operations_called[2][1]['ClusterId'],
-                         'j-ABCD')
+    @patch('awscli.customizations.emr.emr.DescribeCluster._call')
+    def test_multiple_clusters(self, call_patch):
+        call_patch.side_effect = side_effect_of_multiple_clusters_call
+
+        cmdline = self.prefix + ' --cluster-id j-1 j-2 j-3'
+        result = self.run_cmd(cmdline, expected_rc=0)
+        clusters = json.loads(result[0])['Clusters']
+        self.assertEqual([cluster['Id'] for cluster in clusters],
+                         ['j-1', 'j-2', 'j-3'])
+        self.assertEqual(clusters[0]['InstanceGroups'],
+                         EXPECTED_RESULT['Cluster']['InstanceGroups'])
+        self.assertEqual(clusters[0]['BootstrapActions'],
+                         EXPECTED_RESULT['Cluster']['BootstrapActions'])
+        self.assertEqual(call_patch.call_count, 9)
+
+    @patch('awscli.customizations.emr.emr.DescribeCluster._call')
+    def test_multiple_clusters_with_error(self, call_patch):
+        call_patch.side_effect = side_effect_of_multiple_clusters_call
+
+        cmdline = self.prefix + ' --cluster-id j-1 j-missing j-3'
+        stdout, stderr, _ = self.run_cmd(cmdline, expected_rc=1)
+        clusters = json.loads(stdout)['Clusters']
+        self.assertEqual([cluster['Id'] for cluster in clusters],
+                         ['j-1', 'j-3'])
+        self.assertIn('An error occurred describing cluster j-missing: '
+                      'Cluster not found', stderr)
 
     @patch('awscli.customizations.emr.emr.DescribeCluster._call')
     def test_constructed_result(self, call_patch):
@@ -255,5 +292,15 @@ def side_effect_of_call(*args, **kwargs):
         return list_bootstrap_actions_result_mock
 
 
+def side_effect_of_multiple_clusters_call(*args, **kwargs):
+    cluster_id = args[2]['ClusterId']
+    if cluster_id == 'j-missing':
+        raise ValueError('Cluster not found')
+    result = copy.deepcopy(side_effect_of_call(*args, **kwargs))
+    if 'Cluster' in result:
+        result['Cluster']['Id'] = cluster_id
+    return result
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -11,6 +11,9 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+import mock
+
+from awscli.customizations.emr.emrutils import call
 from awscli.customizations.emr.emrutils import which
 from nose.tools import assert_equal
 from nose.tools import assert_not_equal
@@ -25,3 +28,27 @@ class TestEMRutils(object):
     def test_which_with_non_existing_command(self):
         path = which('klajsflklj')
         assert_equal(path, None)
+
+    def test_call_reuses_client(self):
+        session = mock.Mock()
+        client = session.create_client.return_value
+        call(session, 'describe_cluster', {'ClusterId': 'j-1'},
+             region_name='us-west-2')
+        call(session, 'list_steps', {'ClusterId': 'j-1'},
+             region_name='us-west-2')
+        assert_equal(session.create_client.call_count, 1)
+        client.describe_cluster.assert_called_with(ClusterId='j-1')
+        client.list_steps.assert_called_with(ClusterId='j-1')
+
+    def test_call_with_paginate(self):
+        session = mock.Mock()
+        client = session.create_client.return_value
+        paginator = client.get_paginator.return_value
+        paginator.paginate.return_value.build_full_result.return_value = {
+            'InstanceGroups': [{'Id': 'ig-1'}, {'Id': 'ig-2'}]}
+        result = call(session, 'list_instance_groups', {'ClusterId': 'j-1'},
+                      region_name='us-west-2', paginate=True)
+        assert_equal(result, {'InstanceGroups': [{'Id': 'ig-1'},
+                                                 {'Id': 'ig-2'}]})
+        client.get_paginator.assert_called_with('list_instance_groups')
+        paginator.paginate.assert_called_with(ClusterId='j-1')
@@ -0,0 +1,156 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import mock
+from botocore.hooks import HierarchicalEmitter
+
+from awscli.compat import six
+from awscli.testutils import unittest
+from awscli.customizations.s3.bandwidth import TokenBucket, \
+    BandwidthLimitedStream, BandwidthLimiter
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def create_bucket(self, rate, burst_seconds=0.25):
+        return TokenBucket(rate, burst_seconds=burst_seconds,
+                           clock=self.clock.time, sleep=self.clock.sleep)
+
+    def test_consume_within_burst_does_not_sleep(self):
+        bucket = self.create_bucket(100)
+        bucket.consume(25)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_consume_beyond_burst_sleeps_for_deficit(self):
+        bucket = self.create_bucket(100)
+        bucket.consume(75)
+        # 25 bytes come from the burst, the other 50 take half a second.
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_aggregate_rate_is_limited(self):
+        bucket = self.create_bucket(100, burst_seconds=0)
+        for _ in range(10):
+            bucket.consume(50)
+        self.assertEqual(self.clock.now, 5)
+
+    def test_refills_over_time_up_to_burst(self):
+        bucket = self.create_bucket(100)
+        bucket.consume(25)
+        self.clock.now += 10
+        # Only a quarter of a second of bandwidth was saved up.
+        bucket.consume(50)
+        self.assertEqual(self.clock.sleeps, [0.25])
+
+    def test_deficit_is_shared_between_consumers(self):
+        bucket = self.create_bucket(100, burst_seconds=0)
+        # A second consumer arriving before the first has finished
+        # sleeping has to wait for both reservations.
+        with mock.patch.object(bucket, '_sleep') as sleep:
+            bucket.consume(100)
+            bucket.consume(100)
+        self.assertEqual(sleep.call_args_list,
+                         [mock.call(1.0), mock.call(2.0)])
+
+
+class TestBandwidthLimitedStream(unittest.TestCase):
+    def setUp(self):
+        self.token_bucket = mock.Mock()
+        self.fileobj = six.BytesIO(b'a' * 1000)
+
+    def test_read_consumes_tokens(self):
+        stream = BandwidthLimitedStream(self.fileobj, self.token_bucket)
+        self.assertEqual(stream.read(10), b'a' * 10)
+        self.token_bucket.consume.assert_called_once_with(10)
+
+    def test_large_reads_are_split(self):
+        stream = BandwidthLimitedStream(self.fileobj, self.token_bucket)
+        stream.MAX_READ_SIZE = 400
+        self.assertEqual(stream.read(), b'a' * 1000)
+        self.assertEqual(self.token_bucket.consume.call_args_list,
+                         [mock.call(400), mock.call(400), mock.call(400),
+                          mock.call(400)])
+
+    def test_large_read_with_amount(self):
+        stream = BandwidthLimitedStream(self.fileobj, self.token_bucket)
+        stream.MAX_READ_SIZE = 400
+        self.assertEqual(stream.read(500), b'a' * 500)
+        self.assertEqual(self.token_bucket.consume.call_args_list,
+                         [mock.call(400), mock.call(100)])
+
+    def test_disabled_limiting_does_not_consume_tokens(self):
+        stream = BandwidthLimitedStream(self.fileobj, self.token_bucket,
+                                        bandwidth_limiting=False)
+        self.assertEqual(stream.read(), b'a' * 1000)
+        self.assertFalse(self.token_bucket.consume.called)
+        stream.seek(0)
+        stream.enable_bandwidth_limiting()
+        stream.read(10)
+        self.token_bucket.consume.assert_called_once_with(10)
+
+    def test_len_of_stream_without_len(self):
+        stream = BandwidthLimitedStream(self.fileobj, self.token_bucket)
+        self.fileobj.seek(100)
+        self.assertEqual(len(stream), 900)
+        self.assertEqual(stream.tell(), 100)
+
+    def test_passes_through_attributes(self):
+        body = mock.Mock()
+        stream = BandwidthLimitedStream(body, self.token_bucket)
+        stream.set_socket_timeout(60)
+        body.set_socket_timeout.assert_called_once_with(60)
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+    def setUp(self):
+        self.limiter = BandwidthLimiter(1024)
+        self.client = mock.Mock()
+        self.client.meta.events = HierarchicalEmitter()
+
+    def test_upload_stream_enabled_when_request_created(self):
+        stream = self.limiter.get_upload_stream(
+            six.BytesIO(b'foo'), self.client)
+        self.assertFalse(stream._bandwidth_limiting)
+        request = mock.Mock(body=stream)
+        self.client.meta.events.emit('request-created.s3.PutObject',
+                                     request=request,
+                                     operation_name='PutObject')
+        self.assertTrue(stream._bandwidth_limiting)
+
+    def test_client_registered_once(self):
+        events = mock.Mock()
+        self.client.meta.events = events
+        self.limiter.get_upload_stream(six.BytesIO(b'foo'), self.client)
+        self.limiter.get_upload_stream(six.BytesIO(b'bar'), self.client)
+        self.assertEqual(events.register.call_count, 1)
+
+    def test_download_stream_is_limited(self):
+        stream = self.limiter.get_download_stream(six.BytesIO(b'foo'))
+        self.assertTrue(stream._bandwidth_limiting)
+
+
+if __name__ == "__main__":
+    unittest.main()
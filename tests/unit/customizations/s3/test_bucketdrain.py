@@ -0,0 +1,188 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import threading
+
+import mock
+
+from awscli.compat import six
+from awscli.testutils import unittest
+from awscli.customizations.s3.bucketdrain import BucketDrainer, \
+    DrainProgress
+
+
+class FakeS3Client(object):
+    """Lists and deletes keys of an in memory bucket."""
+    def __init__(self, keys, page_size=1000, failing_keys=()):
+        self.keys = set(keys)
+        self.page_size = page_size
+        self.failing_keys = set(failing_keys)
+        self.list_calls = []
+        self.delete_calls = []
+        self._lock = threading.Lock()
+
+    def get_paginator(self, name):
+        paginator = mock.Mock()
+        paginator.paginate.side_effect = self._paginate
+        return paginator
+
+    def _paginate(self, Bucket, Prefix, PaginationConfig, Delimiter=None):
+        with self._lock:
+            self.list_calls.append((Prefix, Delimiter))
+            keys = sorted(k for k in self.keys if k.startswith(Prefix))
+        contents = []
+        prefixes = []
+        for key in keys:
+            rest = key[len(Prefix):]
+            if Delimiter is not None and Delimiter in rest:
+                prefix = Prefix + rest.split(Delimiter)[0] + Delimiter
+                if prefix not in prefixes:
+                    prefixes.append(prefix)
+            else:
+                contents.append({'Key': key})
+        for i in range(0, max(len(contents), 1), self.page_size):
+            page = {'Contents': contents[i:i + self.page_size]}
+            if i == 0:
+                page['CommonPrefixes'] = [{'Prefix': p} for p in prefixes]
+            yield page
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [obj['Key'] for obj in Delete['Objects']]
+        deleted = []
+        errors = []
+        with self._lock:
+            self.delete_calls.append(keys)
+            for key in keys:
+                if key in self.failing_keys:
+                    errors.append({'Key': key, 'Code': 'AccessDenied',
+                                   'Message': 'Access Denied'})
+                else:
+                    self.keys.discard(key)
+                    deleted.append({'Key': key})
+        return {'Deleted': deleted, 'Errors': errors}
+
+
+class TestBucketDrainer(unittest.TestCase):
+    def setUp(self):
+        self.out_file = six.StringIO()
+        self.error_file = six.StringIO()
+
+    def drain(self, client, **kwargs):
+        drainer = BucketDrainer(client, out_file=self.out_file,
+                                error_file=self.error_file, **kwargs)
+        drainer.drain('bucket')
+        return drainer
+
+    def test_deletes_all_keys(self):
+        keys = ['root%s' % i for i in range(5)] + \
+            ['a/%s' % i for i in range(5)] + \
+            ['b/c/%s' % i for i in range(5)]
+        client = FakeS3Client(keys)
+        drainer = self.drain(client)
+        self.assertEqual(client.keys, set())
+        self.assertEqual(drainer.num_deleted, 15)
+        self.assertEqual(drainer.num_failed, 0)
+        lines = sorted(self.out_file.getvalue().splitlines())
+        self.assertEqual(lines,
+                         sorted('delete: s3://bucket/%s' % k for k in keys))
+        self.assertEqual(self.error_file.getvalue(), '')
+
+    def test_deletes_in_batches_of_one_thousand(self):
+        client = FakeS3Client(['key%s' % i for i in range(2500)],
+                              page_size=2500)
+        self.drain(client)
+        self.assertEqual(sorted(len(c) for c in client.delete_calls),
+                         [500, 1000, 1000])
+        self.assertEqual(client.keys, set())
+
+    def test_lists_shards_of_prefixes(self):
+        keys = ['%s/%s/key' % (i, j) for i in range(3) for j in range(2)]
+        client = FakeS3Client(keys)
+        self.drain(client, num_workers=4)
+        # There are fewer top level prefixes than workers, so the next
+        # level is used for the shards.
+        self.assertIn(('', '/'), client.list_calls)
+        self.assertIn(('0/', '/'), client.list_calls)
+        self.assertIn(('2/1/', None), client.list_calls)
+        self.assertEqual(client.keys, set())
+
+    def test_stops_finding_shards_with_enough_prefixes(self):
+        keys = ['%s/%s/key' % (i, j) for i in range(3) for j in range(2)]
+        client = FakeS3Client(keys)
+        self.drain(client, num_workers=2)
+        self.assertNotIn(('0/', '/'), client.list_calls)
+        self.assertIn(('0/', None), client.list_calls)
+        self.assertEqual(client.keys, set())
+
+    def test_reports_failed_keys(self):
+        client = FakeS3Client(['a', 'b', 'c'], failing_keys=['b'])
+        drainer = self.drain(client)
+        self.assertEqual(drainer.num_deleted, 2)
+        self.assertEqual(drainer.num_failed, 1)
+        self.assertEqual(
+            self.error_file.getvalue(),
+            'delete failed: s3://bucket/b An error occurred (AccessDenied) '
+            'when calling the DeleteObjects operation: Access Denied\n')
+
+    def test_failed_request_fails_whole_batch(self):
+        client = FakeS3Client(['a', 'b'])
+        client.delete_objects = mock.Mock(side_effect=Exception('error'))
+        drainer = self.drain(client)
+        self.assertEqual(drainer.num_failed, 2)
+        self.assertEqual(
+            sorted(self.error_file.getvalue().splitlines()),
+            ['delete failed: s3://bucket/a error',
+             'delete failed: s3://bucket/b error'])
+
+    def test_listing_error_is_raised(self):
+        client = FakeS3Client(['a'])
+        client.get_paginator = mock.Mock(side_effect=ValueError('error'))
+        with self.assertRaises(ValueError):
+            self.drain(client)
+
+    def test_empty_bucket(self):
+        client = FakeS3Client([])
+        drainer = self.drain(client)
+        self.assertEqual(drainer.num_deleted, 0)
+        self.assertEqual(client.delete_calls, [])
+        self.assertEqual(self.out_file.getvalue(), '')
+
+
+class TestDrainProgress(unittest.TestCase):
+    def test_progress_line_on_terminal(self):
+        out_file = mock.Mock()
+        out_file.isatty.return_value = True
+        progress = DrainProgress(out_file, out_file)
+        progress.record('bucket', ['a'], [])
+        progress.record('bucket', ['b'], [('c', 'error')])
+        progress.finish()
+        writes = [c[0][0] for c in out_file.write.call_args_list]
+        self.assertEqual(writes, [
+            'delete: s3://bucket/a\n',
+            'Deleted 1 object(s) with 0 failure(s)\r',
+            'delete failed: s3://bucket/c error'.ljust(37) + '\n',
+            'delete: s3://bucket/b\n',
+            'Deleted 2 object(s) with 1 failure(s)\r',
+            ' ' * 37 + '\r',
+        ])
+
+    def test_no_progress_line_when_not_a_terminal(self):
+        out_file = six.StringIO()
+        progress = DrainProgress(out_file, out_file)
+        progress.record('bucket', ['a', 'b'], [])
+        progress.finish()
+        self.assertEqual(out_file.getvalue(),
+                         'delete: s3://bucket/a\ndelete: s3://bucket/b\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -242,3 +242,69 @@ class TestPrintThread(unittest.TestCase):
         self.assert_expected_output(print_task,
                                     decoding_error.error_message,
                                     thread, 'sys.stderr')
+
+    def test_output_is_unchanged_when_not_a_tty(self):
+        thread = PrintThread(result_queue=self.result_queue,
+                             quiet=False, only_show_errors=False)
+        thread.set_total_files(2)
+        thread.set_total_parts(3)
+        self.result_queue.put(PrintTask(
+            message='upload: a to s3://b/a', total_parts=2,
+            bytes_transferred=10))
+        self.result_queue.put(PrintTask(message='upload: a to s3://b/a'))
+        self.result_queue.put(PrintTask(message='upload: c to s3://b/c'))
+        self.result_queue.put(ShutdownThreadRequest())
+        with mock.patch('sys.stdout', new=six.StringIO()) as mock_out:
+            thread.run()
+        progress = 'Completed 1 of 3 part(s) with 2 file(s) remaining'
+        self.assertEqual(
+            mock_out.getvalue(),
+            progress + '\r' +
+            'upload: a to s3://b/a'.ljust(len(progress)) + '\n' +
+            'Completed 1 of 3 part(s) with 1 file(s) remaining\r' +
+            'upload: c to s3://b/c'.ljust(len(progress)) + '\n')
+
+    def test_results_are_written_in_batches(self):
+        thread = PrintThread(result_queue=self.result_queue,
+                             quiet=False, only_show_errors=False)
+        thread.set_total_files(100)
+        thread.set_total_parts(100)
+        for i in range(100):
+            self.result_queue.put(PrintTask(message='upload: %s' % i))
+        self.result_queue.put(ShutdownThreadRequest())
+        stdout = mock.Mock(wraps=six.StringIO())
+        stdout.isatty.return_value = False
+        with mock.patch('sys.stdout', new=stdout):
+            thread.run()
+        self.assertEqual(stdout.write.call_count, 1)
+        self.assertIn('upload: 99', stdout.getvalue())
+
+    def test_progress_is_rendered_on_refresh_for_tty(self):
+        thread = PrintThread(result_queue=self.result_queue,
+                             quiet=False, only_show_errors=False)
+        thread.set_total_files(3)
+        thread.set_total_parts(3)
+        for i in range(2):
+            self.result_queue.put(PrintTask(
+                message='download: s3://b/%s to %s' % (i, i),
+                bytes_transferred=1024 * 1024))
+        self.result_queue.put(ShutdownThreadRequest())
+        stdout = six.StringIO()
+        stdout.isatty = lambda: True
+        # The run starts at 0, the first task arrives before the refresh
+        # interval has passed and the second one arrives after it.
+        times = [0, 0.05, 2]
+        with mock.patch('sys.stdout', new=stdout):
+            with mock.patch('awscli.customizations.s3.executor.time') as t:
+                t.time.side_effect = times
+                thread.run()
+        output = stdout.getvalue()
+        self.assertEqual(output.count('Completed'), 1)
+        self.assertIn(
+            'download: s3://b/0 to 0\n'
+            'download: s3://b/1 to 1\n'
+            'Completed 2 of 3 part(s) with 1 file(s) remaining '
+            '(1.0 MiB/s)\r', output)
+        # A newline is written so the shell prompt is not written over
+        # the progress line.
+        self.assertTrue(output.endswith('\n'))
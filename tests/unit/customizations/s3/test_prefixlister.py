@@ -0,0 +1,135 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import mock
+
+from awscli.testutils import unittest
+from awscli.customizations.s3.prefixlister import ParallelPrefixLister
+
+
+class FakeListingClient(object):
+    def __init__(self, keys, page_size=2):
+        self.keys = sorted(keys)
+        self.page_size = page_size
+        self.list_calls = []
+        self.error_prefixes = []
+
+    def get_paginator(self, name):
+        paginator = mock.Mock()
+        paginator.paginate.side_effect = self._paginate
+        return paginator
+
+    def _paginate(self, Bucket, Prefix, PaginationConfig, Delimiter=None):
+        self.list_calls.append((Prefix, Delimiter))
+        if Prefix in self.error_prefixes:
+            raise ValueError('listing failed')
+        contents = []
+        prefixes = []
+        for key in self.keys:
+            if not key.startswith(Prefix):
+                continue
+            rest = key[len(Prefix):]
+            if Delimiter is not None and Delimiter in rest:
+                prefix = Prefix + rest.split(Delimiter)[0] + Delimiter
+                if not prefixes or prefixes[-1]['Prefix'] != prefix:
+                    prefixes.append({'Prefix': prefix})
+            else:
+                contents.append({'Key': key})
+        # Pages are split the same way S3 does, counting both keys and
+        # common prefixes.
+        entries = sorted(contents + prefixes,
+                         key=lambda e: e.get('Key', e.get('Prefix')))
+        pages = []
+        for i in range(0, len(entries), self.page_size):
+            page = entries[i:i + self.page_size]
+            pages.append({
+                'Contents': [e for e in page if 'Key' in e],
+                'CommonPrefixes': [e for e in page if 'Prefix' in e]})
+        return pages or [{}]
+
+
+class TestParallelPrefixLister(unittest.TestCase):
+    def list_keys(self, client, prefix='', num_workers=3):
+        lister = ParallelPrefixLister(client, num_workers=num_workers)
+        pages = list(lister.list_objects('bucket', prefix))
+        return [content['Key'] for page in pages
+                for content in page['Contents']]
+
+    def test_lists_in_recursive_order(self):
+        keys = ['a', 'a/1', 'a/2', 'a/b/3', 'a0', 'b', 'c/1', 'c/2/3',
+                'd/', 'd/1', 'e', 'f/1', 'g/1']
+        client = FakeListingClient(keys)
+        self.assertEqual(self.list_keys(client), sorted(keys))
+
+    def test_lists_prefixes_separately(self):
+        client = FakeListingClient(['a/1', 'b/1', 'c'])
+        self.list_keys(client)
+        self.assertIn(('', '/'), client.list_calls)
+        self.assertIn(('a/', None), client.list_calls)
+        self.assertIn(('b/', None), client.list_calls)
+
+    def test_more_prefixes_than_workers(self):
+        keys = ['%02d/%s' % (i, j) for i in range(20) for j in range(3)]
+        client = FakeListingClient(keys)
+        self.assertEqual(self.list_keys(client, num_workers=2), keys)
+
+    def test_lists_under_prefix(self):
+        keys = ['foo', 'foo/1', 'foo.txt', 'foobar/1', 'other/1']
+        client = FakeListingClient(keys)
+        self.assertEqual(self.list_keys(client, prefix='foo'),
+                         ['foo', 'foo.txt', 'foo/1', 'foobar/1'])
+
+    def test_empty_listing_yields_one_page(self):
+        client = FakeListingClient([])
+        lister = ParallelPrefixLister(client)
+        self.assertEqual(list(lister.list_objects('bucket')),
+                         [{'Contents': []}])
+
+    def test_listing_error_is_raised(self):
+        client = FakeListingClient(['a/1', 'b/1'])
+        client.error_prefixes = ['b/']
+        lister = ParallelPrefixLister(client)
+        pages = lister.list_objects('bucket')
+        self.assertEqual(next(pages), {'Contents': [{'Key': 'a/1'}]})
+        with self.assertRaises(ValueError):
+            next(pages)
+
+    def test_unordered_listing_lists_all_keys(self):
+        keys = ['root%s' % i for i in range(5)] + \
+            ['%02d/%s' % (i, j) for i in range(20) for j in range(3)]
+        client = FakeListingClient(keys)
+        lister = ParallelPrefixLister(client, num_workers=3)
+        pages = list(lister.list_objects('bucket', ordered=False))
+        listed = [content['Key'] for page in pages
+                  for content in page['Contents']]
+        self.assertEqual(sorted(listed), sorted(keys))
+
+    def test_unordered_listing_error_is_raised(self):
+        client = FakeListingClient(['a/1', 'b/1'])
+        client.error_prefixes = ['b/']
+        lister = ParallelPrefixLister(client)
+        with self.assertRaises(ValueError):
+            list(lister.list_objects('bucket', ordered=False))
+
+    def test_stopping_early_stops_listings(self):
+        keys = ['%02d/%s' % (i, j) for i in range(10) for j in range(10)]
+        client = FakeListingClient(keys)
+        lister = ParallelPrefixLister(client, num_workers=4)
+        pages = lister.list_objects('bucket')
+        next(pages)
+        # Closing the generator waits for the listings to stop.
+        pages.close()
+        self.assertLess(len(client.list_calls), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,7 +20,9 @@ import mock
 from awscli.testutils import unittest
 from awscli import EnvironmentVariables
 from awscli.compat import six
-from awscli.customizations.s3.s3handler import S3Handler, S3StreamHandler
+from awscli.customizations.s3.s3handler import S3Handler, S3StreamHandler, \
+    S3TransferHandler
+from awscli.customizations.s3.bandwidth import BandwidthLimiter
 from awscli.customizations.s3.fileinfo import FileInfo
 from awscli.customizations.s3.tasks import CreateMultipartUploadTask, \
     UploadPartTask, CreateLocalFileTask
@@ -996,6 +998,183 @@ class TestStreams(S3HandlerBaseTest):
                             CreateLocalFileTask)
 
 
+class TestS3TransferHandler(S3HandlerBaseTest):
+    def setUp(self):
+        super(TestS3TransferHandler, self).setUp()
+        self.params = {'region': 'us-east-1', 'acl': 'private',
+                       'quiet': True}
+        self.s3_handler = S3TransferHandler(
+            self.session, self.params, runtime_config=runtime_config(
+                multipart_threshold=10, multipart_chunksize=10,
+                max_concurrent_requests=1, transfer_engine='s3transfer'))
+        self.bucket = 'mybucket'
+        self.loc_files = make_loc_files(self.file_creator)
+        self.download_dest = os.path.join(
+            self.file_creator.rootdir, 'downloads', 'text1.txt')
+
+    def test_small_upload_uses_put_object(self):
+        tasks = [FileInfo(
+            src=self.loc_files[0], src_type='local',
+            dest=self.bucket + '/text1.txt', dest_type='s3',
+            operation_name='upload', size=5, client=self.client)]
+        self.parsed_responses = [
+            {'ETag': '"120ea8a25e5d487bf68b5f7096440019"'}]
+        ref_calls = [
+            ('PutObject',
+             {'Bucket': self.bucket, 'Key': 'text1.txt', 'Body': mock.ANY,
+              'ContentType': 'text/plain', 'ACL': 'private'}),
+        ]
+        self.assert_operations_for_s3_handler(self.s3_handler, tasks,
+                                              ref_calls)
+
+    def test_multipart_upload_uses_s3transfer(self):
+        tasks = [FileInfo(
+            src=self.loc_files[0], src_type='local',
+            dest=self.bucket + '/text1.txt', dest_type='s3',
+            operation_name='upload', size=15, client=self.client)]
+        self.parsed_responses = [
+            {'UploadId': 'foo'},
+            {'ETag': '"120ea8a25e5d487bf68b5f7096440019"'},
+            {'ETag': '"120ea8a25e5d487bf68b5f7096440019"'},
+            {},
+        ]
+        ref_calls = [
+            ('CreateMultipartUpload',
+             {'Bucket': self.bucket, 'Key': 'text1.txt',
+              'ContentType': 'text/plain', 'ACL': 'private'}),
+            ('UploadPart',
+             {'Body': mock.ANY, 'Bucket': self.bucket, 'PartNumber': 1,
+              'UploadId': 'foo', 'Key': 'text1.txt'}),
+            ('UploadPart',
+             {'Body': mock.ANY, 'Bucket': self.bucket, 'PartNumber': 2,
+              'UploadId': 'foo', 'Key': 'text1.txt'}),
+            ('CompleteMultipartUpload',
+             {'MultipartUpload': {'Parts': [{'PartNumber': 1,
+                                             'ETag': mock.ANY},
+                                            {'PartNumber': 2,
+                                             'ETag': mock.ANY}]},
+              'Bucket': self.bucket, 'UploadId': 'foo', 'Key': 'text1.txt'}),
+        ]
+        self.assert_operations_for_s3_handler(self.s3_handler, tasks,
+                                              ref_calls)
+
+    def test_multipart_upload_failure_is_reported(self):
+        tasks = [FileInfo(
+            src=self.loc_files[0], src_type='local',
+            dest=self.bucket + '/text1.txt', dest_type='s3',
+            operation_name='upload', size=15, client=self.client)]
+        self.parsed_responses = [
+            {'UploadId': 'foo'},
+            {'ETag': '"120ea8a25e5d487bf68b5f7096440019"'},
+            # The second part has no ETag, which fails the upload.
+            {},
+            {},
+        ]
+        stdout, stderr, rc = self.run_s3_handler(self.s3_handler, tasks)
+        self.assertEqual(rc.num_tasks_failed, 1)
+        self.assertEqual(self.operations_called[-1][0].name,
+                         'AbortMultipartUpload')
+
+    def test_multipart_download_uses_s3transfer(self):
+        time = datetime.datetime.now()
+        tasks = [FileInfo(
+            src=self.bucket + '/text1.txt', src_type='s3',
+            dest=self.download_dest, dest_type='local',
+            last_update=time, operation_name='download',
+            size=15, client=self.client)]
+        self.parsed_responses = [
+            {'ContentLength': 15},
+            {'ETag': '"foo-1"', 'Body': six.BytesIO(b'This is a ')},
+            {'ETag': '"foo-1"', 'Body': six.BytesIO(b'test.')},
+        ]
+        ref_calls = [
+            ('HeadObject', {'Bucket': self.bucket, 'Key': 'text1.txt'}),
+            ('GetObject',
+             {'Bucket': self.bucket, 'Key': 'text1.txt',
+              'Range': 'bytes=0-9'}),
+            ('GetObject',
+             {'Bucket': self.bucket, 'Key': 'text1.txt',
+              'Range': 'bytes=10-'}),
+        ]
+        self.assert_operations_for_s3_handler(self.s3_handler, tasks,
+                                              ref_calls)
+        with open(self.download_dest, 'rb') as f:
+            self.assertEqual(f.read(), b'This is a test.')
+
+    def test_multipart_copy_falls_back_to_part_tasks(self):
+        tasks = [FileInfo(
+            src=self.bucket + '/text1.txt', src_type='s3',
+            dest=self.bucket + '/text2.txt', dest_type='s3',
+            operation_name='copy', size=15, client=self.client,
+            source_client=self.source_client)]
+        self.parsed_responses = [
+            {'UploadId': 'foo'},
+            {'CopyPartResult': {'ETag': '"120ea8a25e5d487bf68b5f7096440019"'}},
+            {'CopyPartResult': {'ETag': '"120ea8a25e5d487bf68b5f7096440019"'}},
+            {},
+        ]
+        stdout, stderr, rc = self.run_s3_handler(self.s3_handler, tasks)
+        self.assertEqual(rc.num_tasks_failed, 0)
+        operation_names = [op[0].name for op in self.operations_called]
+        self.assertEqual(
+            operation_names,
+            ['CreateMultipartUpload', 'UploadPartCopy', 'UploadPartCopy',
+             'CompleteMultipartUpload'])
+
+    def test_concurrency_is_bounded_by_max_concurrent_requests(self):
+        s3_handler = S3TransferHandler(
+            self.session, self.params, runtime_config=runtime_config(
+                max_concurrent_requests=10, transfer_engine='s3transfer'))
+        self.assertLessEqual(
+            s3_handler._max_workers *
+            s3_handler._transfer_config.max_concurrency, 10)
+
+    def test_dryrun_does_not_transfer(self):
+        self.params['dryrun'] = True
+        s3_handler = S3TransferHandler(
+            self.session, self.params, runtime_config=runtime_config(
+                multipart_threshold=10, transfer_engine='s3transfer'))
+        tasks = [FileInfo(
+            src=self.loc_files[0], src_type='local',
+            dest=self.bucket + '/text1.txt', dest_type='s3',
+            operation_name='upload', size=15, client=self.client)]
+        self.assert_operations_for_s3_handler(s3_handler, tasks, [])
+
+    def test_s3transfer_not_used_for_unsupported_upload_args(self):
+        self.params['website_redirect'] = '/foo'
+        s3_handler = S3TransferHandler(
+            self.session, self.params, runtime_config=runtime_config(
+                multipart_threshold=10, transfer_engine='s3transfer'))
+        filename = FileInfo(
+            src=self.loc_files[0], src_type='local',
+            dest=self.bucket + '/text1.txt', dest_type='s3',
+            operation_name='upload', size=15, client=self.client)
+        self.assertFalse(s3_handler._can_use_s3transfer(filename))
+
+    def test_s3transfer_not_used_for_sse_c_downloads(self):
+        self.params['sse_c'] = 'AES256'
+        self.params['sse_c_key'] = 'foo'
+        s3_handler = S3TransferHandler(
+            self.session, self.params, runtime_config=runtime_config(
+                multipart_threshold=10, transfer_engine='s3transfer'))
+        filename = FileInfo(
+            src=self.bucket + '/text1.txt', src_type='s3',
+            dest=self.download_dest, dest_type='local',
+            operation_name='download', size=15, client=self.client)
+        self.assertFalse(s3_handler._can_use_s3transfer(filename))
+
+    def test_s3transfer_not_used_with_max_bandwidth(self):
+        s3_handler = S3TransferHandler(
+            self.session, self.params, runtime_config=runtime_config(
+                multipart_threshold=10, transfer_engine='s3transfer',
+                max_bandwidth='1MB/s'))
+        filename = FileInfo(
+            src=self.loc_files[0], src_type='local',
+            dest=self.bucket + '/text1.txt', dest_type='s3',
+            operation_name='upload', size=15, client=self.client)
+        self.assertFalse(s3_handler._can_use_s3transfer(filename))
+
+
 class TestS3HandlerInitialization(unittest.TestCase):
     def setUp(self):
         self.arbitrary_params = {'region': 'us-west-2'}
@@ -1031,6 +1210,17 @@ class TestS3HandlerInitialization(unittest.TestCase):
         self.assertEqual(handler.chunksize, 1000)
         self.assertEqual(handler.multi_threshold, 10000)
 
+    def test_no_bandwidth_limiter_by_default(self):
+        handler = S3Handler(session=None, params=self.arbitrary_params,
+                            runtime_config=runtime_config())
+        self.assertIsNone(handler._bandwidth_limiter)
+
+    def test_max_bandwidth_is_plumbed_through(self):
+        config = runtime_config(max_bandwidth='1MB/s')
+        handler = S3Handler(session=None, params=self.arbitrary_params,
+                            runtime_config=config)
+        self.assertIsInstance(handler._bandwidth_limiter, BandwidthLimiter)
+
 
 if __name__ == "__main__":
     unittest.main()
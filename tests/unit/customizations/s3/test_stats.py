@@ -0,0 +1,156 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import json
+
+import mock
+from botocore.hooks import HierarchicalEmitter
+
+from awscli.testutils import unittest
+from awscli.customizations.s3.stats import TransferStats, TimedTask
+
+
+class TestTransferStats(unittest.TestCase):
+    def setUp(self):
+        self.stats = TransferStats()
+        self.time_patch = mock.patch('awscli.customizations.s3.stats.time')
+        self.time = self.time_patch.start()
+
+    def tearDown(self):
+        self.time_patch.stop()
+
+    def set_times(self, *times):
+        self.time.time.side_effect = list(times)
+
+    def test_records_exclusive_phase_time_for_nested_iterators(self):
+        # Producing the item from the listing iterator takes 2 seconds,
+        # and the comparator spends 1 more second on it.
+        self.set_times(
+            10,    # comparing timer started
+            10,    # listing timer started
+            12,    # listing timer stopped
+            13,    # comparing timer stopped
+            20,    # comparing timer started
+            21,    # listing timer started
+            21.5,  # listing timer stopped, exhausted
+            22,    # comparing timer stopped, exhausted
+        )
+        listing = self.stats.timed_iter(['file'], 'listing')
+        comparing = self.stats.timed_iter(listing, 'comparing')
+        self.assertEqual(list(comparing), ['file'])
+        phases = self.stats.to_dict()['phases']
+        self.assertEqual(phases['listing']['seconds'], 2.5)
+        self.assertEqual(phases['comparing']['seconds'], 2.5)
+
+    def test_timed_task_records_queue_wait_and_run_time(self):
+        task = mock.Mock(return_value=None)
+        task.PRIORITY = 5
+        self.set_times(1, 4, 10)
+        timed_task = self.stats.timed_task(task)
+        self.assertIsInstance(timed_task, TimedTask)
+        self.assertEqual(timed_task.PRIORITY, 5)
+        timed_task()
+        task.assert_called_with()
+        phases = self.stats.to_dict()['phases']
+        self.assertEqual(phases['queued']['seconds'], 3)
+        self.assertEqual(phases['queued']['count'], 1)
+        self.assertEqual(phases['transferring']['seconds'], 6)
+        self.assertEqual(phases['transferring']['max'], 6)
+
+    def test_timed_task_records_run_time_when_task_raises(self):
+        task = mock.Mock(side_effect=ValueError())
+        task.PRIORITY = 10
+        self.set_times(1, 2, 3)
+        timed_task = self.stats.timed_task(task)
+        with self.assertRaises(ValueError):
+            timed_task()
+        self.assertEqual(
+            self.stats.to_dict()['phases']['transferring']['seconds'], 1)
+
+    def test_request_latency_percentiles(self):
+        for latency in range(1, 101):
+            self.stats.record_request('PutObject', latency / 100.0)
+        self.stats.record_request('ListObjects', 2.0)
+        requests = self.stats.to_dict()['requests']
+        self.assertEqual(requests['count'], 101)
+        self.assertEqual(requests['operations'],
+                         {'PutObject': 100, 'ListObjects': 1})
+        self.assertEqual(requests['p50'], 0.51)
+        self.assertEqual(requests['p90'], 0.91)
+        self.assertEqual(requests['p99'], 1.0)
+        self.assertEqual(requests['max'], 2.0)
+
+    def test_empty_stats(self):
+        stats = self.stats.to_dict()
+        self.assertEqual(stats['wall_time'], 0.0)
+        self.assertEqual(stats['bytes_per_second'], 0.0)
+        self.assertEqual(stats['requests']['count'], 0)
+        self.assertEqual(stats['requests']['p99'], 0.0)
+
+    def test_throughput(self):
+        self.set_times(100, 104)
+        self.stats.start()
+        self.stats.stop()
+        self.stats.record_bytes(1024)
+        self.stats.record_bytes(1024)
+        self.stats.set_total_files(2)
+        stats = self.stats.to_dict()
+        self.assertEqual(stats['wall_time'], 4)
+        self.assertEqual(stats['total_files'], 2)
+        self.assertEqual(stats['bytes_transferred'], 2048)
+        self.assertEqual(stats['bytes_per_second'], 512)
+
+    def test_retries(self):
+        self.stats.record_retry('task')
+        self.stats.record_retry('download_part')
+        self.stats.record_retry('download_part')
+        self.assertEqual(
+            self.stats.to_dict()['retries'],
+            {'count': 3, 'sources': {'task': 1, 'download_part': 2}})
+
+    def test_registered_client_records_requests(self):
+        client = mock.Mock()
+        client.meta.events = HierarchicalEmitter()
+        self.stats.register_client(client)
+        # Registering the same client twice does not double count.
+        self.stats.register_client(client)
+        model = mock.Mock()
+        model.name = 'PutObject'
+        context = {}
+        self.set_times(5, 7)
+        client.meta.events.emit('before-call.s3.PutObject', model=model,
+                                params={}, context=context)
+        client.meta.events.emit('after-call.s3.PutObject', model=model,
+                                http_response=None, parsed={},
+                                context=context)
+        requests = self.stats.to_dict()['requests']
+        self.assertEqual(requests['operations'], {'PutObject': 1})
+        self.assertEqual(requests['max'], 2)
+
+    def test_json_and_summary(self):
+        self.stats.record_request('PutObject', 0.25)
+        self.stats.record_retry('task')
+        self.stats.record_bytes(2048)
+        self.assertEqual(json.loads(self.stats.to_json()),
+                         self.stats.to_dict())
+        summary = self.stats.format_summary()
+        self.assertIn('Transfer statistics:', summary)
+        self.assertIn('Bytes transferred: 2.0 KiB', summary)
+        self.assertIn('Requests: 1 (p50 0.250s', summary)
+        self.assertIn('      PutObject: 1\n', summary)
+        self.assertIn('      task: 1\n', summary)
+        for phase in TransferStats.PHASES:
+            self.assertIn('      %s: ' % phase, summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
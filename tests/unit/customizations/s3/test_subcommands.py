@@ -22,8 +22,10 @@ from awscli.customizations.s3.s3 import S3
 from awscli.customizations.s3.subcommands import CommandParameters, \
     CommandArchitecture, CpCommand, SyncCommand, ListCommand, \
     RbCommand, get_client
+from awscli.customizations.s3.s3handler import S3Handler, S3TransferHandler
 from awscli.customizations.s3.syncstrategy.base import \
     SizeAndLastModifiedSync, NeverSync, MissingFileSync
+from awscli.customizations.s3.transferconfig import RuntimeConfig
 from awscli.testutils import unittest, BaseAWSHelpOutputTest, \
     BaseAWSCommandParamsTest, FileCreator
 from tests.unit.customizations.s3 import make_loc_files, clean_loc_files
@@ -57,18 +59,35 @@ class TestRbCommand(unittest.TestCase):
                                     force=True, dir_op=False)
         self.parsed_globals = FakeArgs(region=None, endpoint_url=None,
                                        verify_ssl=None)
-        self.cmd_name = 'awscli.customizations.s3.subcommands.RmCommand'
+        self.drainer_name = \
+            'awscli.customizations.s3.subcommands.BucketDrainer'
         self.arch_name = 'awscli.customizations.s3.subcommands.CommandArchitecture'
 
     def test_rb_command_with_force_deletes_objects_in_bucket(self):
-        with mock.patch(self.cmd_name) as rm_command:
-            with mock.patch(self.arch_name):
+        with mock.patch(self.drainer_name) as drainer:
+            drainer.return_value.num_failed = 0
+            with mock.patch(self.arch_name) as arch:
                 self.rb_command._run_main(self.parsed_args,
-                                     parsed_globals=self.parsed_globals)
-            # Because of --force we should have called the
-            # rm_command with the --recursive option.
-            rm_command.return_value.assert_called_with(
-                ['s3://mybucket', '--recursive'], mock.ANY)
+                                          parsed_globals=self.parsed_globals)
+            # Because of --force we should have drained the bucket
+            # before removing it.
+            drainer.assert_called_with(
+                self.session.create_client.return_value, num_workers=10)
+            drainer.return_value.drain.assert_called_with('mybucket')
+            self.assertTrue(arch.return_value.run.called)
+
+    def test_rb_command_with_force_does_not_remove_bucket_on_failure(self):
+        with mock.patch(self.drainer_name) as drainer:
+            drainer.return_value.num_failed = 3
+            with mock.patch(self.arch_name) as arch:
+                with mock.patch('sys.stderr') as stderr:
+                    rc = self.rb_command._run_main(
+                        self.parsed_args, parsed_globals=self.parsed_globals)
+        self.assertEqual(rc, 1)
+        self.assertFalse(arch.return_value.run.called)
+        stderr.write.assert_called_with(
+            'remove_bucket failed: s3://mybucket 3 object(s) could not be '
+            'deleted\n')
 
     def test_rb_command_with_force_requires_strict_path(self):
         with self.assertRaises(ValueError):
@@ -89,7 +108,7 @@ class TestLSCommand(unittest.TestCase):
         ls_command = ListCommand(self.session)
         parsed_args = FakeArgs(paths='s3://mybucket/', dir_op=False,
                                page_size='5', human_readable=False,
-                               summarize=False)
+                               summarize=False, summary_only=False)
         parsed_globals = mock.Mock()
         ls_command._run_main(parsed_args, parsed_globals)
         call = self.session.create_client.return_value.list_objects
@@ -106,12 +125,37 @@ class TestLSCommand(unittest.TestCase):
 
         paginate.assert_called_with(**ref_call_args)
 
+    def test_ls_command_with_parallel_prefixes(self):
+        self.session.get_scoped_config.return_value = {}
+        ls_command = ListCommand(self.session)
+        parsed_args = FakeArgs(paths='s3://mybucket/foo', dir_op=True,
+                               page_size='5', human_readable=False,
+                               summarize=False, parallel_prefixes=True,
+                               summary_only=False)
+        lister_name = \
+            'awscli.customizations.s3.subcommands.ParallelPrefixLister'
+        with mock.patch(lister_name) as lister:
+            lister.return_value.list_objects.return_value = [
+                {'Contents': [{'Key': 'foo/bar', 'Size': 3,
+                               'LastModified': '2014-01-09T20:45:49.000Z'}]}]
+            with mock.patch('sys.stdout') as stdout:
+                rc = ls_command._run_main(parsed_args, mock.Mock())
+        self.assertEqual(rc, 0)
+        lister.assert_called_with(
+            self.session.create_client.return_value, num_workers=10)
+        lister.return_value.list_objects.assert_called_with(
+            'mybucket', 'foo', '5')
+        self.assertEqual(stdout.write.call_count, 1)
+        self.assertIn('          3 foo/bar\n',
+                      stdout.write.call_args[0][0])
+
     def test_ls_command_with_no_args(self):
         ls_command = ListCommand(self.session)
         parsed_global = FakeArgs(region=None, endpoint_url=None,
                                  verify_ssl=None)
         parsed_args = FakeArgs(dir_op=False, paths='s3://',
-                               human_readable=False, summarize=False)
+                               human_readable=False, summarize=False,
+                               summary_only=False)
         ls_command._run_main(parsed_args, parsed_global)
         # We should only be a single call.
         call = self.session.create_client.return_value.list_buckets
@@ -131,7 +175,8 @@ class TestLSCommand(unittest.TestCase):
         parsed_global = FakeArgs(region='us-west-2', endpoint_url=None,
                                  verify_ssl=False)
         parsed_args = FakeArgs(paths='s3://', dir_op=False,
-                               human_readable=False, summarize=False)
+                               human_readable=False, summarize=False,
+                               summary_only=False)
         ls_command._run_main(parsed_args, parsed_global)
         # Verify get_client
         get_client = self.session.create_client
@@ -172,21 +217,16 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
                                        'verify_ssl': None,
                                        'source_region': None})
         cmd_arc.set_clients()
-        self.assertEqual( session.create_client.call_count, 2)
+        # The client created with the same arguments as the first is
+        # reused for the source client since no source region was provided.
+        self.assertEqual( session.create_client.call_count, 1)
         self.assertEqual(
             session.create_client.call_args_list[0],
             mock.call(
              's3', region_name='us-west-1', endpoint_url=None, verify=None,
              config=None)
         )
-        # A client created with the same arguments as the first should be used
-        # for the source client since no source region was provided.
-        self.assertEqual(
-            session.create_client.call_args_list[1],
-            mock.call(
-                's3', region_name='us-west-1', endpoint_url=None, verify=None,
-                config=None)
-        )
+        self.assertIs(cmd_arc._client, cmd_arc._source_client)
 
     def test_set_client_with_source(self):
         session = Mock()
@@ -199,21 +239,16 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
         cmd_arc.set_clients()
         create_client_args = session.create_client.call_args_list
         # Assert that two clients were created
-        self.assertEqual(len(create_client_args), 3)
+        self.assertEqual(len(create_client_args), 2)
         self.assertEqual(
             create_client_args[0][1],
             {'region_name': 'us-west-1', 'verify': None, 'endpoint_url': None,
              'config': None}
         )
-        self.assertEqual(
-            create_client_args[1][1],
-            {'region_name': 'us-west-1', 'verify': None, 'endpoint_url': None,
-             'config': None}
-        )
         # Assert override the second client created with the one needed for the
         # source region.
         self.assertEqual(
-            create_client_args[2][1],
+            create_client_args[1][1],
             {'region_name': 'us-west-2', 'verify': None, 'endpoint_url': None,
              'config': None}
         )
@@ -225,15 +260,13 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
             {'region': 'us-west-1', 'endpoint_url': None, 'verify_ssl': None,
              'source_region': None, 'sse': 'aws:kms'})
         cmd_arc.set_clients()
-        self.assertEqual( session.create_client.call_count, 2)
+        self.assertEqual( session.create_client.call_count, 1)
         create_client_call = session.create_client.call_args_list[0]
-        create_source_client_call = session.create_client.call_args_list[1]
 
         # Make sure that both clients are using sigv4 if kms is enabled.
         self.assertEqual(
             create_client_call[1]['config'].signature_version, 's3v4')
-        self.assertEqual(
-            create_source_client_call[1]['config'].signature_version, 's3v4')
+        self.assertIs(cmd_arc._client, cmd_arc._source_client)
 
     def test_create_instructions(self):
         """
@@ -330,6 +363,52 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
             mock_not_at_src_sync_strategy
         )
 
+    def test_run_cp_put_uses_s3transfer_engine_by_default(self):
+        s3_file = 's3://' + self.bucket + '/' + 'text1.txt'
+        local_file = self.loc_files[0]
+        rel_local_file = os.path.relpath(local_file)
+        filters = [['--include', '*']]
+        params = {'dir_op': False, 'dryrun': True, 'quiet': False,
+                  'src': local_file, 'dest': s3_file, 'filters': filters,
+                  'paths_type': 'locals3', 'region': 'us-east-1',
+                  'endpoint_url': None, 'verify_ssl': None,
+                  'follow_symlinks': True, 'page_size': None,
+                  'is_stream': False, 'source_region': None}
+        config = RuntimeConfig().build_config()
+        cmd_arc = CommandArchitecture(self.session, 'cp', params, config)
+        cmd_arc.set_clients()
+        cmd_arc.create_instructions()
+        self.patch_make_request()
+        with patch('awscli.customizations.s3.subcommands.S3TransferHandler',
+                   wraps=S3TransferHandler) as handler_cls:
+            cmd_arc.run()
+        self.assertTrue(handler_cls.called)
+        output_str = "(dryrun) upload: %s to %s" % (rel_local_file, s3_file)
+        self.assertIn(output_str, self.output.getvalue())
+
+    def test_run_cp_put_with_classic_engine(self):
+        s3_file = 's3://' + self.bucket + '/' + 'text1.txt'
+        local_file = self.loc_files[0]
+        rel_local_file = os.path.relpath(local_file)
+        filters = [['--include', '*']]
+        params = {'dir_op': False, 'dryrun': True, 'quiet': False,
+                  'src': local_file, 'dest': s3_file, 'filters': filters,
+                  'paths_type': 'locals3', 'region': 'us-east-1',
+                  'endpoint_url': None, 'verify_ssl': None,
+                  'follow_symlinks': True, 'page_size': None,
+                  'is_stream': False, 'source_region': None}
+        config = RuntimeConfig().build_config(transfer_engine='classic')
+        cmd_arc = CommandArchitecture(self.session, 'cp', params, config)
+        cmd_arc.set_clients()
+        cmd_arc.create_instructions()
+        self.patch_make_request()
+        with patch('awscli.customizations.s3.subcommands.S3Handler',
+                   wraps=S3Handler) as handler_cls:
+            cmd_arc.run()
+        self.assertTrue(handler_cls.called)
+        output_str = "(dryrun) upload: %s to %s" % (rel_local_file, s3_file)
+        self.assertIn(output_str, self.output.getvalue())
+
     def test_run_cp_put(self):
         # This ensures that the architecture sets up correctly for a ``cp`` put
         # command.  It is just just a dry run, but all of the components need
@@ -0,0 +1,112 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import json
+
+from awscli.testutils import unittest
+from awscli.customizations.s3.summary import ListingSummary
+
+
+def make_content(key, size, storage_class='STANDARD'):
+    return {'Key': key, 'Size': size, 'StorageClass': storage_class,
+            'LastModified': '2014-01-09T20:45:49.000Z'}
+
+
+class TestListingSummary(unittest.TestCase):
+    def setUp(self):
+        self.summary = ListingSummary()
+        self.summary.add_contents([
+            make_content('logs/a', 100),
+            make_content('logs/2016/b', 2048, 'GLACIER'),
+            make_content('root', 0),
+        ])
+        self.summary.add_contents([
+            make_content('images/c', 20 * 1024 ** 2),
+        ])
+
+    def test_totals(self):
+        summary = self.summary.to_dict()
+        self.assertEqual(summary['TotalObjects'], 4)
+        self.assertEqual(summary['TotalSize'], 100 + 2048 + 20 * 1024 ** 2)
+
+    def test_counts_by_first_level_prefix(self):
+        self.assertEqual(self.summary.to_dict()['Prefixes'], [
+            {'Prefix': None, 'Objects': 1, 'Size': 0},
+            {'Prefix': 'images/', 'Objects': 1, 'Size': 20 * 1024 ** 2},
+            {'Prefix': 'logs/', 'Objects': 2, 'Size': 2148},
+        ])
+
+    def test_prefix_is_relative_to_listed_prefix(self):
+        summary = ListingSummary('logs')
+        summary.add_contents([make_content('logs/a', 1),
+                              make_content('logs.txt', 1),
+                              make_content('logs2/b', 1)])
+        self.assertEqual(
+            [p['Prefix'] for p in summary.to_dict()['Prefixes']],
+            [None, 'logs/', 'logs2/'])
+
+    def test_counts_by_storage_class(self):
+        self.assertEqual(self.summary.to_dict()['StorageClasses'], [
+            {'StorageClass': 'GLACIER', 'Objects': 1, 'Size': 2048},
+            {'StorageClass': 'STANDARD', 'Objects': 3,
+             'Size': 100 + 20 * 1024 ** 2},
+        ])
+
+    def test_counts_by_size_range(self):
+        size_ranges = self.summary.to_dict()['SizeRanges']
+        self.assertEqual(size_ranges[0],
+                         {'Range': '< 1 KiB', 'Objects': 2, 'Size': 100})
+        self.assertEqual(size_ranges[1],
+                         {'Range': '1 KiB - 1 MiB', 'Objects': 1,
+                          'Size': 2048})
+        self.assertEqual(size_ranges[3],
+                         {'Range': '16 MiB - 128 MiB', 'Objects': 1,
+                          'Size': 20 * 1024 ** 2})
+        self.assertEqual(size_ranges[-1],
+                         {'Range': '>= 5 GiB', 'Objects': 0, 'Size': 0})
+
+    def test_size_range_boundaries(self):
+        summary = ListingSummary()
+        summary.add_contents([make_content('a', 1023),
+                              make_content('b', 1024),
+                              make_content('c', 5 * 1024 ** 3)])
+        counts = [r['Objects'] for r in summary.to_dict()['SizeRanges']]
+        self.assertEqual(counts, [1, 1, 0, 0, 0, 0, 1])
+
+    def test_json(self):
+        self.assertEqual(json.loads(self.summary.to_json()),
+                         self.summary.to_dict())
+
+    def test_text(self):
+        text = self.summary.format_text()
+        self.assertTrue(text.startswith(
+            'Total Objects: 4\n   Total Size: 20973668\n\n'))
+        self.assertIn('Prefix   Objects      Size\n'
+                      '(none)         1         0\n'
+                      'images/        1  20971520\n'
+                      'logs/          2      2148\n', text)
+        self.assertIn('GLACIER              1      2048\n', text)
+
+    def test_human_readable_text(self):
+        text = self.summary.format_text(human_readable=True)
+        self.assertIn('   Total Size: 20.0 MiB\n', text)
+        self.assertIn('logs/          2   2.1 KiB\n', text)
+
+    def test_empty_summary(self):
+        summary = ListingSummary().to_dict()
+        self.assertEqual(summary['TotalObjects'], 0)
+        self.assertEqual(summary['Prefixes'], [])
+        self.assertIn('Total Objects: 0\n', ListingSummary().format_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,10 +21,12 @@ import shutil
 from six.moves import queue
 
 from botocore.exceptions import IncompleteReadError
+from botocore.vendored import requests
 from botocore.vendored.requests.packages.urllib3.exceptions import \
     ReadTimeoutError
 
 from awscli.customizations.s3 import transferconfig
+from awscli.customizations.s3.tasks import BasicTask
 from awscli.customizations.s3.tasks import CreateLocalFileTask
 from awscli.customizations.s3.tasks import CompleteDownloadTask
 from awscli.customizations.s3.tasks import DownloadPartTask
@@ -34,6 +36,7 @@ from awscli.customizations.s3.tasks import UploadCancelledError
 from awscli.customizations.s3.tasks import print_operation
 from awscli.customizations.s3.tasks import RetriesExeededError
 from awscli.customizations.s3.executor import ShutdownThreadRequest
+from awscli.customizations.s3.stats import TransferStats
 from awscli.customizations.s3.utils import StablePriorityQueue
 from awscli.testutils import skip_if_windows
 
@@ -474,6 +477,88 @@ class TestDownloadPartTask(unittest.TestCase):
                          mock.call(('local/file', 0, b'foobar', True)))
         success_body.read.assert_called_with()
 
+    def test_retries_and_bytes_are_recorded_in_stats(self):
+        body = mock.Mock()
+        body.read.side_effect = [b'foobar', b'']
+        self.client.get_object.side_effect = [socket.error, {'Body': body}]
+        stats = TransferStats()
+        task = DownloadPartTask(0, 1024 * 1024, self.result_queue,
+                                self.filename, self.context,
+                                self.io_queue, self.params, stats=stats)
+        task()
+        recorded = stats.to_dict()
+        self.assertEqual(recorded['retries']['sources'], {'download_part': 1})
+        self.assertEqual(recorded['bytes_transferred'], 6)
+
+    def test_download_reads_are_bandwidth_limited(self):
+        body = mock.Mock()
+        body.read.side_effect = [b'foobar', b'']
+        self.client.get_object.side_effect = [{'Body': body}]
+        bandwidth_limiter = mock.Mock()
+        bandwidth_limiter.get_download_stream.side_effect = lambda x: x
+        task = DownloadPartTask(0, 1024 * 1024, self.result_queue,
+                                self.filename, self.context,
+                                self.io_queue, self.params,
+                                bandwidth_limiter=bandwidth_limiter)
+        task()
+        bandwidth_limiter.get_download_stream.assert_called_once_with(body)
+        body.set_socket_timeout.assert_called_once_with(
+            DownloadPartTask.READ_TIMEOUT)
+
+
+class TestBasicTask(unittest.TestCase):
+    def setUp(self):
+        self.result_queue = queue.Queue()
+        self.filename = mock.Mock()
+        self.filename.src = 'local/file'
+        self.filename.dest = 'bucket/key'
+        self.filename.src_type = 'local'
+        self.filename.dest_type = 's3'
+        self.filename.operation_name = 'upload'
+        self.filename.size = 10
+        self.parameters = {'dryrun': False}
+        self.stats = TransferStats()
+
+    def test_retries_and_bytes_are_recorded_in_stats(self):
+        self.filename.upload.side_effect = [
+            requests.ConnectionError('connection reset'), None]
+        task = BasicTask(session=None, filename=self.filename,
+                         parameters=self.parameters,
+                         result_queue=self.result_queue, stats=self.stats)
+        task()
+        self.assertEqual(self.filename.upload.call_count, 2)
+        recorded = self.stats.to_dict()
+        self.assertEqual(recorded['retries']['sources'], {'task': 1})
+        self.assertEqual(recorded['bytes_transferred'], 10)
+        self.assertFalse(self.result_queue.get().error)
+
+    def test_final_failed_attempt_is_not_a_retry(self):
+        self.filename.upload.side_effect = requests.ConnectionError(
+            'connection reset')
+        task = BasicTask(session=None, filename=self.filename,
+                         parameters=self.parameters,
+                         result_queue=self.result_queue, stats=self.stats)
+        task()
+        recorded = self.stats.to_dict()
+        self.assertEqual(recorded['retries']['sources'], {'task': 2})
+        self.assertEqual(recorded['bytes_transferred'], 0)
+        self.assertTrue(self.result_queue.get().error)
+
+    def test_bytes_transferred_are_reported_without_stats(self):
+        task = BasicTask(session=None, filename=self.filename,
+                         parameters=self.parameters,
+                         result_queue=self.result_queue)
+        task()
+        self.assertEqual(self.result_queue.get().bytes_transferred, 10)
+
+    def test_dryrun_does_not_report_bytes_transferred(self):
+        self.parameters['dryrun'] = True
+        task = BasicTask(session=None, filename=self.filename,
+                         parameters=self.parameters,
+                         result_queue=self.result_queue)
+        task()
+        self.assertIsNone(self.result_queue.get().bytes_transferred)
+
 
 class TestMultipartDownloadContext(unittest.TestCase):
     def setUp(self):
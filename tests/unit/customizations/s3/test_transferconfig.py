@@ -59,3 +59,54 @@ class TestTransferConfig(unittest.TestCase):
         runtime_config = self.build_config_with(multipart_threshold="10MB")
         self.assertEqual(runtime_config['multipart_threshold'],
                          10 * 1024 * 1024)
+
+    def test_validates_transfer_engine(self):
+        with self.assertRaises(transferconfig.InvalidConfigError):
+            self.build_config_with(transfer_engine='not-an-engine')
+
+    def test_s3transfer_engine_is_default(self):
+        runtime_config = self.build_config_with()
+        self.assertEqual(runtime_config['transfer_engine'], 's3transfer')
+
+    def test_transfer_engine_override(self):
+        runtime_config = self.build_config_with(transfer_engine='classic')
+        self.assertEqual(runtime_config['transfer_engine'], 'classic')
+
+    def test_max_bandwidth_rate_converted_to_bytes(self):
+        runtime_config = self.build_config_with(max_bandwidth='10MB/s')
+        self.assertEqual(runtime_config['max_bandwidth'], 10 * 1024 * 1024)
+
+    def test_max_bandwidth_in_bytes(self):
+        runtime_config = self.build_config_with(max_bandwidth='1000')
+        self.assertEqual(runtime_config['max_bandwidth'], 1000)
+
+    def test_validates_max_bandwidth(self):
+        with self.assertRaises(transferconfig.InvalidConfigError):
+            self.build_config_with(max_bandwidth='10MB')
+        with self.assertRaises(transferconfig.InvalidConfigError):
+            self.build_config_with(max_bandwidth='0')
+
+    def test_create_transfer_config(self):
+        runtime_config = self.build_config_with(
+            multipart_threshold='16MB', multipart_chunksize='4MB',
+            max_concurrent_requests='5')
+        transfer_config = \
+            transferconfig.create_transfer_config_from_runtime_config(
+                runtime_config)
+        self.assertEqual(transfer_config.multipart_threshold,
+                         16 * 1024 * 1024)
+        self.assertEqual(transfer_config.multipart_chunksize,
+                         4 * 1024 * 1024)
+        self.assertEqual(transfer_config.max_concurrency, 2)
+
+    def test_split_concurrency_respects_max_concurrent_requests(self):
+        for max_concurrent_requests in range(1, 101):
+            max_workers, max_concurrency = \
+                transferconfig.split_concurrency(max_concurrent_requests)
+            self.assertGreaterEqual(max_workers, 1)
+            self.assertGreaterEqual(max_concurrency, 1)
+            self.assertLessEqual(max_workers * max_concurrency,
+                                 max_concurrent_requests)
+
+    def test_split_concurrency_of_default(self):
+        self.assertEqual(transferconfig.split_concurrency(10), (3, 3))
@@ -9,7 +9,7 @@ import datetime
 import io
 
 import mock
-from dateutil.tz import tzlocal
+from dateutil.tz import tzlocal, tzoffset, tzstr
 from nose.tools import assert_equal
 
 from botocore.hooks import HierarchicalEmitter
@@ -27,6 +27,7 @@ from awscli.customizations.s3.utils import MAX_SINGLE_UPLOAD_SIZE, EPOCH_TIME
 from awscli.customizations.s3.utils import set_file_utime, SetFileUtimeError
 from awscli.customizations.s3.utils import RequestParamsMapper
 from awscli.customizations.s3.utils import uni_print
+from awscli.customizations.s3.utils import LocalTimeFormatter
 
 
 def test_human_readable_size():
@@ -316,6 +317,46 @@ class TestBucketList(unittest.TestCase):
             self.assertEqual(individual_response['LastModified'], now)
 
 
+class TestLocalTimeFormatter(unittest.TestCase):
+    def test_formats_in_timezone(self):
+        formatter = LocalTimeFormatter(tzoffset(None, -3600 * 5))
+        self.assertEqual(formatter.format('2014-01-09T02:45:49.000Z'),
+                         '2014-01-08 21:45:49')
+
+    def test_timestamp_without_fractional_seconds(self):
+        formatter = LocalTimeFormatter(tzoffset(None, 3600))
+        self.assertEqual(formatter.format('2014-01-09T23:45:49Z'),
+                         '2014-01-10 00:45:49')
+
+    def test_other_formats_are_parsed(self):
+        formatter = LocalTimeFormatter(tzoffset(None, 0))
+        self.assertEqual(formatter.format('2014-01-09T20:45:49+02:00'),
+                         '2014-01-09 18:45:49')
+
+    def test_daylight_saving_time(self):
+        formatter = LocalTimeFormatter(tzstr('EST5EDT,M3.2.0,M11.1.0'))
+        self.assertEqual(formatter.format('2015-03-08T06:59:59.000Z'),
+                         '2015-03-08 01:59:59')
+        self.assertEqual(formatter.format('2015-03-08T07:00:00.000Z'),
+                         '2015-03-08 03:00:00')
+
+    def test_offset_changes_within_hour(self):
+        # Daylight saving time starts at 2:30 local time.
+        formatter = LocalTimeFormatter(tzstr('EST5EDT,M3.2.0/2:30,M11.1.0'))
+        self.assertEqual(formatter.format('2015-03-08T07:29:59.000Z'),
+                         '2015-03-08 02:29:59')
+        self.assertEqual(formatter.format('2015-03-08T07:30:00.000Z'),
+                         '2015-03-08 03:30:00')
+
+    def test_matches_tzlocal(self):
+        formatter = LocalTimeFormatter()
+        timestamp = '2014-06-09T20:45:49.000Z'
+        expected = datetime.datetime(
+            2014, 6, 9, 20, 45, 49, tzinfo=tzoffset(None, 0)).astimezone(
+                tzlocal()).strftime('%Y-%m-%d %H:%M:%S')
+        self.assertEqual(formatter.format(timestamp), expected)
+
+
 class TestGetFileStat(unittest.TestCase):
 
     def test_get_file_stat(self):
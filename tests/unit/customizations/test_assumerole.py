@@ -14,6 +14,8 @@ import shutil
 import tempfile
 import os
 import platform
+import threading
+import time
 from datetime import datetime, timedelta
 
 import mock
@@ -119,3 +121,76 @@ class TestJSONCache(unittest.TestCase):
         self.cache['mykey'] = {'foo': 'bar'}
         filename = os.path.join(self.tempdir, 'mykey.json')
         self.assertEqual(os.stat(filename).st_mode & 0xFFF, 0o600)
+
+    def test_value_is_read_from_memory(self):
+        self.cache['mykey'] = {'foo': 'bar'}
+        os.remove(os.path.join(self.tempdir, 'mykey.json'))
+        self.assertEqual(self.cache['mykey'], {'foo': 'bar'})
+
+    def test_value_can_not_be_modified_in_memory(self):
+        self.cache['mykey'] = {'foo': 'bar'}
+        self.cache['mykey']['foo'] = 'changed'
+        self.assertEqual(self.cache['mykey'], {'foo': 'bar'})
+
+    def test_value_is_read_from_other_cache(self):
+        other_cache = assumerole.JSONFileCache(self.tempdir)
+        other_cache['mykey'] = {'foo': 'bar'}
+        self.assertEqual(self.cache['mykey'], {'foo': 'bar'})
+
+    def test_expired_credentials_are_missing(self):
+        expiration = datetime.now(tzlocal()) + timedelta(minutes=5)
+        self.cache['mykey'] = {
+            'Credentials': {'Expiration': expiration.isoformat()}}
+        self.assertFalse('mykey' in self.cache)
+        with self.assertRaises(KeyError):
+            self.cache['mykey']
+
+    def test_credentials_that_are_not_expired_are_returned(self):
+        expiration = datetime.now(tzlocal()) + timedelta(hours=1)
+        value = {'Credentials': {'Expiration': expiration.isoformat()}}
+        self.cache['mykey'] = value
+        self.assertEqual(self.cache['mykey'], value)
+
+    def test_write_leaves_no_temporary_files(self):
+        self.cache['mykey'] = {'foo': 'bar'}
+        self.cache['mykey'] = {'foo': 'baz'}
+        self.assertEqual(os.listdir(self.tempdir), ['mykey.json'])
+
+    def test_miss_takes_lock_until_value_is_set(self):
+        with self.assertRaises(KeyError):
+            self.cache['mykey']
+        lock_file = os.path.join(self.tempdir, 'mykey.lock')
+        self.assertTrue(os.path.isfile(lock_file))
+        self.cache['mykey'] = {'foo': 'bar'}
+        self.assertFalse(os.path.isfile(lock_file))
+
+    def test_miss_waits_for_value_of_other_process(self):
+        other_cache = assumerole.JSONFileCache(self.tempdir)
+        with self.assertRaises(KeyError):
+            other_cache['mykey']
+        timer = threading.Timer(
+            0.2, other_cache.__setitem__, ('mykey', {'foo': 'bar'}))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.cache.LOCK_POLL_SECONDS = 0.05
+        self.assertEqual(self.cache['mykey'], {'foo': 'bar'})
+
+    def test_abandoned_lock_is_taken_over(self):
+        lock_file = os.path.join(self.tempdir, 'mykey.lock')
+        open(lock_file, 'w').close()
+        abandoned = time.time() - self.cache.LOCK_TIMEOUT_SECONDS - 1
+        os.utime(lock_file, (abandoned, abandoned))
+        self.cache.LOCK_POLL_SECONDS = 0.01
+        with self.assertRaises(KeyError):
+            self.cache['mykey']
+        self.cache['mykey'] = {'foo': 'bar'}
+        self.assertFalse(os.path.isfile(lock_file))
+
+    def test_waiting_for_lock_times_out(self):
+        open(os.path.join(self.tempdir, 'mykey.lock'), 'w').close()
+        self.cache.LOCK_TIMEOUT_SECONDS = 0.1
+        self.cache.LOCK_POLL_SECONDS = 0.01
+        # The lock file keeps being recent, so it is not taken over.
+        with mock.patch('os.path.getmtime', return_value=time.time() + 60):
+            with self.assertRaises(KeyError):
+                self.cache['mykey']
@@ -11,10 +11,13 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 import decimal
+import threading
+import time
 
 from awscli.testutils import unittest
 
 import mock
+from awscli.compat import six
 
 from awscli.customizations import putmetricdata
 
@@ -79,3 +82,148 @@ class TestPutMetricArgument(unittest.TestCase):
         parameters = {}
         arg.add_to_params(parameters, None)
         self.assertEqual(parameters, {})
+
+
+class TestReadMetricRecords(unittest.TestCase):
+    def read(self, contents, data_format):
+        return list(putmetricdata.read_metric_records(
+            six.StringIO(contents), data_format))
+
+    def test_read_json_lines(self):
+        records = self.read(
+            '{"MetricName": "Latency", "Value": 12.5}\n'
+            '\n'
+            '{"MetricName": "Errors", "Value": 1, "Unit": "Count"}\n',
+            'json')
+        self.assertEqual(records, [
+            (1, {'MetricName': 'Latency',
+                 'Value': decimal.Decimal('12.5')}, None),
+            (3, {'MetricName': 'Errors', 'Value': 1, 'Unit': 'Count'},
+             None),
+        ])
+
+    def test_invalid_json_line_is_reported(self):
+        records = self.read('{"MetricName": "Latency"}\nnot json\n[1]\n',
+                            'json')
+        self.assertEqual([r[0] for r in records], [1, 2, 3])
+        self.assertIsNone(records[1][1])
+        self.assertIn('Invalid JSON', records[1][2])
+        self.assertEqual(records[2][2], 'Expected a JSON object')
+
+    def test_read_csv(self):
+        records = self.read(
+            'MetricName,Value,Unit,Dimensions\n'
+            'Latency,12.5,Milliseconds,"Host=web-1,Stage=prod"\n'
+            'Errors,1,,\n',
+            'csv')
+        self.assertEqual(records, [
+            (2, {'MetricName': 'Latency', 'Value': decimal.Decimal('12.5'),
+                 'Unit': 'Milliseconds',
+                 'Dimensions': [{'Name': 'Host', 'Value': 'web-1'},
+                                {'Name': 'Stage', 'Value': 'prod'}]},
+             None),
+            (3, {'MetricName': 'Errors', 'Value': decimal.Decimal('1')},
+             None),
+        ])
+
+    def test_read_csv_statistic_values(self):
+        records = self.read(
+            'MetricName,StatisticValues\n'
+            'Latency,"Sum=10,Minimum=1,Maximum=5,SampleCount=4"\n',
+            'csv')
+        self.assertEqual(records[0][1]['StatisticValues'], {
+            'Sum': decimal.Decimal('10'), 'Minimum': decimal.Decimal('1'),
+            'Maximum': decimal.Decimal('5'),
+            'SampleCount': decimal.Decimal('4')})
+
+    def test_invalid_csv_row_is_reported(self):
+        records = self.read('MetricName,Value\nLatency,abc\nErrors,1\n',
+                            'csv')
+        self.assertEqual(records[0][0], 2)
+        self.assertIsNone(records[0][1])
+        self.assertEqual(records[1],
+                         (3, {'MetricName': 'Errors',
+                              'Value': decimal.Decimal('1')}, None))
+
+    def test_unknown_csv_column(self):
+        with self.assertRaises(ValueError):
+            self.read('MetricName,Bogus\nLatency,1\n', 'csv')
+
+    def test_empty_csv(self):
+        self.assertEqual(self.read('', 'csv'), [])
+
+
+class TestMetricDataPublisher(unittest.TestCase):
+    def setUp(self):
+        self.client = mock.Mock()
+        self.error_file = six.StringIO()
+
+    def records(self, count):
+        return [(i + 1, {'MetricName': 'Metric%s' % i, 'Value': i}, None)
+                for i in range(count)]
+
+    def publish(self, records, **kwargs):
+        publisher = putmetricdata.MetricDataPublisher(
+            self.client, {'Namespace': 'Foo'}, error_file=self.error_file,
+            **kwargs)
+        publisher.publish(records)
+        return publisher
+
+    def published_batches(self):
+        return [call[1]['MetricData']
+                for call in self.client.put_metric_data.call_args_list]
+
+    def test_records_are_batched(self):
+        publisher = self.publish(self.records(45))
+        batches = self.published_batches()
+        self.assertEqual(sorted(len(b) for b in batches), [5, 20, 20])
+        self.assertEqual(
+            sorted(d['Value'] for b in batches for d in b), list(range(45)))
+        for call in self.client.put_metric_data.call_args_list:
+            self.assertEqual(call[1]['Namespace'], 'Foo')
+        self.assertEqual(publisher.num_published, 45)
+        self.assertEqual(publisher.num_failed, 0)
+        self.assertEqual(self.error_file.getvalue(), '')
+
+    def test_in_flight_requests_are_bounded(self):
+        lock = threading.Lock()
+        counts = {'in_flight': 0, 'max_in_flight': 0}
+
+        def put_metric_data(**kwargs):
+            with lock:
+                counts['in_flight'] += 1
+                counts['max_in_flight'] = max(counts['max_in_flight'],
+                                              counts['in_flight'])
+            time.sleep(0.01)
+            with lock:
+                counts['in_flight'] -= 1
+
+        self.client.put_metric_data.side_effect = put_metric_data
+        publisher = self.publish(self.records(200),
+                                 max_concurrent_requests=3)
+        self.assertEqual(publisher.num_published, 200)
+        self.assertLessEqual(counts['max_in_flight'], 3)
+
+    def test_failed_batch_is_reported(self):
+        def put_metric_data(MetricData, **kwargs):
+            if MetricData[0]['Value'] == 20:
+                raise ValueError('throttled')
+
+        self.client.put_metric_data.side_effect = put_metric_data
+        publisher = self.publish(self.records(45))
+        self.assertEqual(publisher.num_published, 25)
+        self.assertEqual(publisher.num_failed, 20)
+        self.assertEqual(
+            self.error_file.getvalue(),
+            'put-metric-data failed for the records on lines 21-40: '
+            'throttled\n')
+
+    def test_invalid_records_are_reported(self):
+        records = self.records(2) + [(3, None, 'Invalid JSON')]
+        publisher = self.publish(records)
+        self.assertEqual(publisher.num_published, 2)
+        self.assertEqual(publisher.num_failed, 1)
+        self.assertEqual(
+            self.error_file.getvalue(),
+            'put-metric-data failed for the records on line 3: '
+            'Invalid JSON\n')
@@ -0,0 +1,78 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import mock
+import rsa
+
+from awscli.testutils import unittest
+from awscli.customizations import crypto
+
+
+class BaseBackendTest(object):
+    # The keys are generated once, as generating them is slow.
+    public_key, private_key = rsa.newkeys(512)
+
+    def load_private_key(self):
+        return crypto.load_private_key(
+            self.private_key.save_pkcs1(), backend=self.backend)
+
+    def load_public_key(self):
+        return crypto.load_public_key(
+            self.public_key.save_pkcs1(format='DER'), format='DER',
+            backend=self.backend)
+
+    def test_signature_is_verified_by_rsa(self):
+        signature = self.load_private_key().sign(b'message', 'SHA-1')
+        rsa.verify(b'message', signature, self.public_key)
+
+    def test_verifies_rsa_signature(self):
+        signature = rsa.sign(b'message', self.private_key, 'SHA-256')
+        self.load_public_key().verify(b'message', signature, 'SHA-256')
+
+    def test_verification_error(self):
+        signature = rsa.sign(b'message', self.private_key, 'SHA-256')
+        with self.assertRaises(crypto.VerificationError):
+            self.load_public_key().verify(b'other', signature, 'SHA-256')
+
+    def test_decrypts_rsa_ciphertext(self):
+        ciphertext = rsa.encrypt(b'password', self.public_key)
+        self.assertEqual(self.load_private_key().decrypt(ciphertext),
+                         b'password')
+
+    def test_invalid_key_error_is_raised(self):
+        with self.assertRaises(ValueError):
+            crypto.load_private_key(b'invalid', backend=self.backend)
+
+
+class TestRSABackend(BaseBackendTest, unittest.TestCase):
+    backend = crypto.RSABackend()
+
+
+@unittest.skipIf(crypto.openssl_rsa is None,
+                 'The cryptography package is not installed.')
+class TestOpenSSLBackend(BaseBackendTest, unittest.TestCase):
+    backend = crypto.OpenSSLBackend()
+
+
+class TestGetBackend(unittest.TestCase):
+    def test_falls_back_to_rsa(self):
+        with mock.patch('awscli.customizations.crypto.openssl_rsa', None):
+            self.assertEqual(crypto.get_backend().name, 'rsa')
+
+    @unittest.skipIf(crypto.openssl_rsa is None,
+                     'The cryptography package is not installed.')
+    def test_prefers_cryptography(self):
+        self.assertEqual(crypto.get_backend().name, 'cryptography')
+
+
+if __name__ == "__main__":
+    unittest.main()
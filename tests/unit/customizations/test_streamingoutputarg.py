@@ -0,0 +1,191 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import io
+import re
+import threading
+
+import mock
+
+from awscli.testutils import unittest, FileCreator
+from awscli.customizations.streamingoutputarg import copy_stream, \
+    RangedGetter, StreamingOutputArgument
+
+
+class ReadOnlyStream(object):
+    # A stream with only a read method, like the body of a botocore response.
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+        self.closed = False
+
+    def read(self, amt=None):
+        return self._stream.read(amt)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRangeClient(object):
+    def __init__(self, data):
+        self.data = data
+        self.ranges = []
+        self.parameters = []
+        self.error_range = None
+        self.bodies = []
+        self._lock = threading.Lock()
+
+    def get_object(self, Range, **kwargs):
+        start, end = [int(i) for i in re.match(
+            r'bytes=(\d+)-(\d+)', Range).groups()]
+        with self._lock:
+            self.ranges.append((start, end))
+            self.parameters.append(kwargs)
+        if start == self.error_range:
+            raise ValueError('range failed')
+        body = ReadOnlyStream(self.data[start:end + 1])
+        with self._lock:
+            self.bodies.append(body)
+        return {'Body': body}
+
+
+class TestCopyStream(unittest.TestCase):
+    def copy(self, stream, buffer_size, limit=None):
+        output = io.BytesIO()
+        copied = copy_stream(stream, output.write, buffer_size, limit)
+        return copied, output.getvalue()
+
+    def test_copies_stream(self):
+        stream = ReadOnlyStream(b'0123456789')
+        self.assertEqual(self.copy(stream, 4), (10, b'0123456789'))
+
+    def test_copies_up_to_limit(self):
+        stream = ReadOnlyStream(b'0123456789')
+        self.assertEqual(self.copy(stream, 4, limit=6), (6, b'012345'))
+        self.assertEqual(stream.read(), b'6789')
+
+    def test_copies_empty_stream(self):
+        self.assertEqual(self.copy(ReadOnlyStream(b''), 4), (0, b''))
+
+
+class TestRangedGetter(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = self.files.full_path('outfile')
+        self.data = bytes(bytearray(i % 256 for i in range(1000)))
+        self.client = FakeRangeClient(self.data)
+
+    def create_getter(self, call_parameters=None, range_size=100):
+        if call_parameters is None:
+            call_parameters = {'Bucket': 'bucket', 'Key': 'key'}
+        return RangedGetter(self.client, 'GetObject', call_parameters,
+                            'Body', max_concurrency=3,
+                            range_size=range_size, buffer_size=7)
+
+    def get(self, getter):
+        parsed = {'ContentLength': len(self.data), 'ETag': '"abc"'}
+        self.body = ReadOnlyStream(self.data)
+        getter.get(parsed, self.body, self.filename)
+        with open(self.filename, 'rb') as f:
+            return f.read()
+
+    def test_gets_ranges(self):
+        getter = self.create_getter()
+        self.assertEqual(self.get(getter), self.data)
+        self.assertEqual(getter.content_length, 1000)
+        # The first range is read from the response of the operation.
+        self.assertEqual(sorted(self.client.ranges),
+                         [(i, i + 99) for i in range(100, 1000, 100)])
+
+    def test_first_response_is_closed(self):
+        self.get(self.create_getter())
+        self.assertTrue(self.body.closed)
+        self.assertTrue(all(body.closed for body in self.client.bodies))
+
+    def test_first_response_is_closed_on_error(self):
+        self.client.error_range = 500
+        with self.assertRaises(ValueError):
+            self.get(self.create_getter())
+        self.assertTrue(self.body.closed)
+
+    def test_last_range_is_shorter(self):
+        self.data = self.data[:950]
+        self.client = FakeRangeClient(self.data)
+        self.assertEqual(self.get(self.create_getter()), self.data)
+        self.assertEqual(max(self.client.ranges), (900, 949))
+
+    def test_ranges_must_match_etag(self):
+        self.get(self.create_getter())
+        self.assertEqual(
+            self.client.parameters[0],
+            {'Bucket': 'bucket', 'Key': 'key', 'IfMatch': '"abc"'})
+
+    def test_range_error_is_raised(self):
+        self.client.error_range = 500
+        with self.assertRaises(ValueError):
+            self.get(self.create_getter())
+
+    def test_short_range_is_an_error(self):
+        self.client.data = self.data[:-10]
+        with self.assertRaises(IOError):
+            self.get(self.create_getter())
+
+    def test_should_get(self):
+        getter = self.create_getter()
+        self.assertTrue(getter.should_get({'ContentLength': 101}))
+        self.assertFalse(getter.should_get({'ContentLength': 100}))
+
+    def test_should_not_get_specified_range(self):
+        getter = self.create_getter(
+            {'Bucket': 'bucket', 'Key': 'key', 'Range': 'bytes=0-999'})
+        self.assertFalse(getter.should_get({'ContentLength': 1000}))
+
+
+class TestStreamingOutputArgument(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = self.files.full_path('outfile')
+        self.argument = StreamingOutputArgument(
+            'Body', mock.Mock(), 'outfile', mock.Mock(), buffer_size=3)
+        self.argument.add_to_params({}, self.filename)
+
+    def test_saves_payload(self):
+        parsed = {'Body': ReadOnlyStream(b'0123456789')}
+        self.argument.save_file(parsed)
+        self.assertEqual(parsed, {})
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), b'0123456789')
+
+    def test_saves_payload_with_ranged_getter(self):
+        data = b'0123456789' * 100
+        client = FakeRangeClient(data)
+        self.argument.set_ranged_getter(RangedGetter(
+            client, 'GetObject', {'Bucket': 'bucket', 'Key': 'key'}, 'Body',
+            max_concurrency=2, range_size=300))
+        parsed = {'Body': ReadOnlyStream(data), 'ContentLength': 1000}
+        self.argument.save_file(parsed)
+        self.assertEqual(parsed, {'ContentLength': 1000})
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_saves_only_first_response(self):
+        self.argument.save_file({'Body': ReadOnlyStream(b'first')})
+        parsed = {'Body': ReadOnlyStream(b'second')}
+        self.argument.save_file(parsed)
+        self.assertIn('Body', parsed)
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), b'first')
+
+
+if __name__ == "__main__":
+    unittest.main()
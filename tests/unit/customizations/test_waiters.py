@@ -13,13 +13,15 @@
 import mock
 
 from botocore.waiter import WaiterModel
-from botocore.exceptions import DataNotFoundError
+from botocore.exceptions import ClientError, DataNotFoundError
 
 from awscli.testutils import unittest, BaseAWSHelpOutputTest, \
     BaseAWSCommandParamsTest
 from awscli.customizations.waiters import add_waiters, WaitCommand, \
     get_waiter_model_from_service_model, WaiterStateCommand, WaiterCaller, \
-    WaiterStateDocBuilder, WaiterStateCommandBuilder
+    WaiterStateDocBuilder, WaiterStateCommandBuilder, MultiResourceWaiter, \
+    MULTI_RESOURCE_OPERATIONS
+from awscli.compat import six
 
 
 class TestAddWaiters(unittest.TestCase):
@@ -174,6 +176,31 @@ class TestWait(BaseAWSCommandParamsTest):
         }
         self.assert_params_for_cmd(cmdline, result)
 
+    def test_ec2_instance_running_multi_resource(self):
+        cmdline = 'ec2 wait instance-running --multi-resource'
+        cmdline += ' --instance-ids i-12345678 i-87654321'
+        self.parsed_response = {
+            'Reservations': [{
+                'Instances': [
+                    {'InstanceId': 'i-12345678',
+                     'State': {'Name': 'running'}},
+                    {'InstanceId': 'i-87654321',
+                     'State': {'Name': 'running'}},
+                ]
+            }]
+        }
+        _, stderr, _ = self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 1)
+        self.assertEqual(self.operations_called[0][1],
+                         {'InstanceIds': ['i-12345678', 'i-87654321']})
+        self.assertIn('i-12345678: success (1 of 2 done)', stderr)
+        self.assertIn('i-87654321: success (2 of 2 done)', stderr)
+
+    def test_multi_resource_requires_ids(self):
+        cmdline = 'ec2 wait instance-running --multi-resource'
+        _, stderr, _ = self.run_cmd(cmdline, expected_rc=255)
+        self.assertIn('--multi-resource requires --instance-ids', stderr)
+
     def test_dynamodb_table_exists(self):
         cmdline = 'dynamodb wait table-exists'
         cmdline += ' --table-name mytable'
@@ -376,7 +403,8 @@ class TestWaiterCaller(unittest.TestCase):
             'myservice',
             region_name=parsed_globals.region,
             endpoint_url=parsed_globals.endpoint_url,
-            verify=parsed_globals.verify_ssl
+            verify=parsed_globals.verify_ssl,
+            config=None
         )
 
         # Make sure we got the correct waiter.
@@ -386,3 +414,160 @@ class TestWaiterCaller(unittest.TestCase):
         # Ensure the wait command was called properly.
         waiter.wait.assert_called_with(
             Foo='bar', Baz='biz')
+
+
+class FakeDescribeInstancesClient(object):
+    """Returns the states of instances from a list of states per poll."""
+    def __init__(self, states):
+        self.states = states
+        self.calls = []
+        self.missing = set()
+        self.absent = set()
+
+    def describe_instances(self, InstanceIds):
+        self.calls.append(InstanceIds)
+        if any(instance_id in self.missing for instance_id in InstanceIds):
+            raise ClientError(
+                {'Error': {'Code': 'InvalidInstanceID.NotFound',
+                           'Message': 'The instance ID does not exist'}},
+                'DescribeInstances')
+        instances = []
+        for instance_id in InstanceIds:
+            if instance_id in self.absent:
+                continue
+            states = self.states[instance_id]
+            state = states[min(self._num_polls(instance_id), len(states)) - 1]
+            instances.append({'InstanceId': instance_id,
+                              'State': {'Name': state}})
+        return {'Reservations': [{'Instances': instances}]}
+
+    def _num_polls(self, instance_id):
+        return sum(1 for c in self.calls if instance_id in c)
+
+
+class TestMultiResourceWaiter(unittest.TestCase):
+    def setUp(self):
+        self.waiter_config = WaiterModel({
+            'version': 2,
+            'waiters': {
+                'InstanceRunning': {
+                    'delay': 10,
+                    'maxAttempts': 5,
+                    'operation': 'DescribeInstances',
+                    'acceptors': [
+                        {'expected': 'running', 'matcher': 'pathAll',
+                         'state': 'success',
+                         'argument': 'Reservations[].Instances[].State.Name'},
+                        {'expected': 'terminated', 'matcher': 'pathAny',
+                         'state': 'failure',
+                         'argument': 'Reservations[].Instances[].State.Name'},
+                    ],
+                },
+            },
+        }).get_waiter('InstanceRunning')
+        self.resource_config = MULTI_RESOURCE_OPERATIONS[
+            ('ec2', 'DescribeInstances')]
+        self.stream = six.StringIO()
+        self.sleeps = []
+        self.now = 0
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+    def wait(self, client, instance_ids, resource_config=None):
+        waiter = MultiResourceWaiter(
+            client, self.waiter_config,
+            resource_config or self.resource_config, stream=self.stream,
+            sleep=self.sleep, clock=lambda: self.now)
+        return waiter.wait({'InstanceIds': instance_ids})
+
+    def test_polls_pending_resources_together(self):
+        client = FakeDescribeInstancesClient({
+            'i-1': ['pending', 'running'],
+            'i-2': ['pending', 'pending', 'running'],
+            'i-3': ['running'],
+        })
+        rc = self.wait(client, ['i-1', 'i-2', 'i-3'])
+        self.assertEqual(rc, 0)
+        self.assertEqual(client.calls, [['i-1', 'i-2', 'i-3'],
+                                        ['i-1', 'i-2'], ['i-2']])
+        self.assertEqual(self.stream.getvalue(),
+                         'i-3: success (1 of 3 done)\n'
+                         'i-1: success (2 of 3 done)\n'
+                         'i-2: success (3 of 3 done)\n')
+
+    def test_batches_ids(self):
+        instance_ids = ['i-%s' % i for i in range(5)]
+        client = FakeDescribeInstancesClient(
+            dict((i, ['running']) for i in instance_ids))
+        resource_config = self.resource_config._replace(max_ids=2)
+        self.assertEqual(self.wait(client, instance_ids, resource_config), 0)
+        self.assertEqual(client.calls, [['i-0', 'i-1'], ['i-2', 'i-3'],
+                                        ['i-4']])
+
+    def test_backs_off_without_progress(self):
+        client = FakeDescribeInstancesClient({
+            'i-1': ['pending', 'running'],
+            'i-2': ['pending', 'pending', 'pending', 'running'],
+        })
+        self.assertEqual(self.wait(client, ['i-1', 'i-2']), 0)
+        # The delay is reset after i-1 is running and grows while i-2 is
+        # still pending.
+        self.assertEqual(self.sleeps, [15, 10, 15])
+
+    def test_failed_resource_does_not_stop_wait(self):
+        client = FakeDescribeInstancesClient({
+            'i-1': ['terminated'],
+            'i-2': ['pending', 'running'],
+        })
+        self.assertEqual(self.wait(client, ['i-1', 'i-2']), 255)
+        self.assertEqual(
+            self.stream.getvalue(),
+            'i-1: failure: Reached a failure state (1 of 2 done)\n'
+            'i-2: success (2 of 2 done)\n'
+            '1 of 2 resource(s) did not reach a success state\n')
+
+    def test_error_is_attributed_to_resource(self):
+        client = FakeDescribeInstancesClient({
+            'i-1': ['running'], 'i-3': ['running'], 'i-4': ['running']})
+        client.missing.add('i-2')
+        self.assertEqual(self.wait(client, ['i-1', 'i-2', 'i-3', 'i-4']),
+                         255)
+        self.assertIn(
+            'i-2: failure: The instance ID does not exist (',
+            self.stream.getvalue())
+        self.assertIn('i-4: success', self.stream.getvalue())
+
+    def test_resource_absent_from_response_is_not_matched(self):
+        self.waiter_config = WaiterModel({
+            'version': 2,
+            'waiters': {
+                'InstanceExists': {
+                    'delay': 5,
+                    'maxAttempts': 4,
+                    'operation': 'DescribeInstances',
+                    'acceptors': [
+                        {'expected': True, 'matcher': 'path',
+                         'state': 'success',
+                         'argument': 'length(Reservations[]) > `0`'},
+                    ],
+                },
+            },
+        }).get_waiter('InstanceExists')
+        client = FakeDescribeInstancesClient({'i-1': ['running']})
+        client.absent.add('i-2')
+        self.assertEqual(self.wait(client, ['i-1', 'i-2']), 255)
+        self.assertEqual(
+            self.stream.getvalue(),
+            'i-1: success (1 of 2 done)\n'
+            'i-2: failure: Max wait time exceeded (2 of 2 done)\n'
+            '1 of 2 resource(s) did not reach a success state\n')
+        self.assertEqual(client.calls[-1], ['i-2'])
+
+    def test_gives_up_after_max_wait_time(self):
+        client = FakeDescribeInstancesClient({'i-1': ['pending']})
+        self.assertEqual(self.wait(client, ['i-1']), 255)
+        self.assertLessEqual(sum(self.sleeps), 50)
+        self.assertIn('i-1: failure: Max wait time exceeded (1 of 1 done)',
+                      self.stream.getvalue())
@@ -0,0 +1,265 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import binascii
+import os
+import threading
+import time
+import zipfile
+
+from awscli.compat import six
+from awscli.testutils import unittest, mock, FileCreator
+from awscli.customizations import zipbundle
+from awscli.customizations.zipbundle import ZipBundler, StreamingBundle, \
+    BundlePartReader
+
+
+class WriteOnlyFile(object):
+    def __init__(self):
+        self._buffer = six.BytesIO()
+
+    def write(self, data):
+        self._buffer.write(data)
+
+    def getvalue(self):
+        return self._buffer.getvalue()
+
+
+class TestZipBundler(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+
+    def tearDown(self):
+        self.files.remove_all()
+
+    def create_file(self, name, contents):
+        filename = self.files.create_file(name, '')
+        with open(filename, 'wb') as f:
+            f.write(contents)
+        return filename, name
+
+    def bundle(self, members, **kwargs):
+        output = six.BytesIO()
+        ZipBundler(max_workers=4, **kwargs).write(members, output)
+        output.seek(0)
+        zf = zipfile.ZipFile(output)
+        self.assertIsNone(zf.testzip())
+        return zf
+
+    def test_bundles_files(self):
+        members = [
+            self.create_file('foo', b'foo contents' * 100),
+            self.create_file(os.path.join('bar', 'baz'), b'baz contents'),
+        ]
+        zf = self.bundle(members)
+        self.assertEqual(zf.namelist(), ['foo', 'bar/baz'])
+        self.assertEqual(zf.read('foo'), b'foo contents' * 100)
+        self.assertEqual(zf.read('bar/baz'), b'baz contents')
+        self.assertEqual(zf.getinfo('foo').compress_type,
+                         zipfile.ZIP_DEFLATED)
+
+    def test_large_files_are_compressed_in_chunks(self):
+        contents = os.urandom(1000) * 10 + os.urandom(2500)
+        members = [self.create_file('foo', contents)]
+        zf = self.bundle(members, chunk_size=1024)
+        self.assertEqual(zf.read('foo'), contents)
+        info = zf.getinfo('foo')
+        self.assertEqual(info.file_size, len(contents))
+        self.assertTrue(info.flag_bits & zipbundle.DATA_DESCRIPTOR_FLAG)
+
+    def test_file_that_is_a_multiple_of_chunk_size(self):
+        contents = b'a' * 4096
+        zf = self.bundle([self.create_file('foo', contents)], chunk_size=1024)
+        self.assertEqual(zf.read('foo'), contents)
+
+    def test_compressed_extensions_are_stored(self):
+        members = [self.create_file('foo.gz', b'a' * 1000)]
+        zf = self.bundle(members)
+        self.assertEqual(zf.getinfo('foo.gz').compress_type,
+                         zipfile.ZIP_STORED)
+        self.assertEqual(zf.read('foo.gz'), b'a' * 1000)
+
+    def test_incompressible_files_are_stored(self):
+        contents = os.urandom(1000)
+        zf = self.bundle([self.create_file('foo', contents)])
+        self.assertEqual(zf.getinfo('foo').compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(zf.read('foo'), contents)
+
+    def test_store_compression(self):
+        members = [self.create_file('foo', b'a' * 1000)]
+        zf = self.bundle(members, compression=zipfile.ZIP_STORED)
+        self.assertEqual(zf.getinfo('foo').compress_type, zipfile.ZIP_STORED)
+
+    def test_empty_file(self):
+        zf = self.bundle([self.create_file('foo', b'')])
+        self.assertEqual(zf.read('foo'), b'')
+
+    def test_writes_to_non_seekable_file(self):
+        output = WriteOnlyFile()
+        members = [self.create_file('foo', b'foo' * 1000)]
+        ZipBundler(chunk_size=1024).write(members, output)
+        zf = zipfile.ZipFile(six.BytesIO(output.getvalue()))
+        self.assertEqual(zf.read('foo'), b'foo' * 1000)
+
+    def test_zip64(self):
+        members = [self.create_file('foo', b'foo' * 1000),
+                   self.create_file('bar', b'bar' * 1000)]
+        # Lower the limits so the zip64 extensions are used for everything.
+        with mock.patch.object(zipbundle, 'ZIP64_LIMIT', 10):
+            with mock.patch.object(zipbundle, 'ZIP_FILECOUNT_LIMIT', 1):
+                zf = self.bundle(members, chunk_size=1024)
+        self.assertEqual(zf.read('foo'), b'foo' * 1000)
+        self.assertEqual(zf.read('bar'), b'bar' * 1000)
+
+    def test_error_reading_file_is_raised(self):
+        members = [('/does/not/exist', 'foo')]
+        with self.assertRaises(OSError):
+            ZipBundler().write(members, six.BytesIO())
+
+
+class TestCrc32Combine(unittest.TestCase):
+    def test_combine(self):
+        first, second = os.urandom(100), os.urandom(1000)
+        combined = zipbundle._crc32_combine(
+            binascii.crc32(first) & 0xFFFFFFFF,
+            binascii.crc32(second) & 0xFFFFFFFF, len(second))
+        self.assertEqual(combined,
+                         binascii.crc32(first + second) & 0xFFFFFFFF)
+
+    def test_shift_operator(self):
+        first, second = os.urandom(100), os.urandom(1000)
+        operator = zipbundle._crc32_shift_operator(len(second))
+        combined = zipbundle._gf2_matrix_times(
+            operator, binascii.crc32(first) & 0xFFFFFFFF) ^ (
+                binascii.crc32(second) & 0xFFFFFFFF)
+        self.assertEqual(combined,
+                         binascii.crc32(first + second) & 0xFFFFFFFF)
+
+
+class FakeBundler(object):
+    """Writes the archive one piece at a time when told to."""
+    def __init__(self, pieces, error=None):
+        self.pieces = pieces
+        self.error = error
+        self.can_write = threading.Semaphore(0)
+
+    def write(self, members, fileobj):
+        for piece in self.pieces:
+            self.can_write.acquire()
+            fileobj.write(piece)
+        if self.error is not None:
+            raise self.error
+
+
+class TestStreamingBundle(unittest.TestCase):
+    def test_read_returns_data_as_it_is_written(self):
+        bundler = FakeBundler([b'foo', b'bar'])
+        bundle = StreamingBundle(bundler, [])
+        bundle.start()
+        try:
+            bundler.can_write.release()
+            self.assertEqual(bundle.read(3), b'foo')
+            bundler.can_write.release()
+            self.assertEqual(bundle.read(), b'bar')
+            self.assertEqual(bundle.read(), b'')
+        finally:
+            bundle.close()
+
+    def test_size_waits_for_archive(self):
+        bundler = FakeBundler([b'foo', b'bar'])
+        bundle = StreamingBundle(bundler, [])
+        bundle.start()
+        try:
+            bundler.can_write.release()
+            bundler.can_write.release()
+            self.assertEqual(len(bundle), 6)
+            bundle.seek(0, 2)
+            self.assertEqual(bundle.tell(), 6)
+            bundle.seek(2)
+            self.assertEqual(len(bundle), 4)
+            self.assertEqual(bundle.read(), b'obar')
+        finally:
+            bundle.close()
+
+    def test_read_at_does_not_change_position(self):
+        bundler = FakeBundler([b'foo', b'bar'])
+        bundle = StreamingBundle(bundler, [])
+        bundle.start()
+        try:
+            bundler.can_write.release()
+            bundler.can_write.release()
+            self.assertEqual(bundle.read_at(2, 3), b'oba')
+            self.assertEqual(bundle.read_at(4), b'ar')
+            self.assertEqual(bundle.read_at(10, 3), b'')
+            self.assertEqual(bundle.tell(), 0)
+        finally:
+            bundle.close()
+
+    def test_part_reader(self):
+        bundler = FakeBundler([b'foo', b'bar'])
+        bundle = StreamingBundle(bundler, [])
+        bundle.start()
+        try:
+            bundler.can_write.release()
+            part = BundlePartReader(bundle, 2, 3)
+            bundler.can_write.release()
+            self.assertEqual(len(part), 3)
+            self.assertEqual(part.read(1), b'o')
+            self.assertEqual(part.read(), b'ba')
+            self.assertEqual(part.read(), b'')
+            part.seek(0)
+            self.assertEqual(part.read(10), b'oba')
+        finally:
+            bundle.close()
+
+    def test_write_error_is_raised_from_read(self):
+        bundler = FakeBundler([b'foo'], error=OSError('bad file'))
+        bundle = StreamingBundle(bundler, [])
+        bundle.start()
+        try:
+            bundler.can_write.release()
+            with self.assertRaises(OSError):
+                bundle.read()
+        finally:
+            bundle.close()
+
+    def test_close_stops_writing(self):
+        bundler = FakeBundler([b'foo', b'bar'])
+        bundle = StreamingBundle(bundler, [])
+        bundle.start()
+        bundler.can_write.release()
+        self.assertEqual(bundle.read(3), b'foo')
+        closer = threading.Thread(target=bundle.close)
+        closer.start()
+        while not bundle._closed:
+            time.sleep(0.01)
+        bundler.can_write.release()
+        closer.join()
+        self.assertIsInstance(bundle._error, ValueError)
+
+    def test_bundles_files(self):
+        files = FileCreator()
+        try:
+            filename = files.create_file('foo', 'foo' * 1000)
+            bundle = StreamingBundle(ZipBundler(), [(filename, 'foo')])
+            bundle.start()
+            try:
+                zf = zipfile.ZipFile(six.BytesIO(bundle.read()))
+                self.assertEqual(zf.read('foo'), b'foo' * 1000)
+            finally:
+                bundle.close()
+        finally:
+            files.remove_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,10 @@
 import unittest
 from awscli.compat import six
 
+import jmespath
+import mock
+from botocore.paginate import PageIterator
+
 from awscli.formatter import TableFormatter
 from awscli.table import MultiTable, Styler
 
@@ -425,3 +429,97 @@ class TestTableFormatter(unittest.TestCase):
     def test_jmespath_filtered_dict_response(self):
         self.assert_data_renders_to(data=JMESPATH_FILTERED_RESPONSE_DICT,
                                     table=JMESPATH_FILTERED_RESPONSE_DICT_TABLE)
+
+
+class TestPaginatedTableFormatter(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        self.stream = six.StringIO()
+
+    def create_formatter(self, query=None):
+        formatter = TableFormatter(Object(color='off'))
+        formatter.table = MultiTable(initial_section=False,
+                                     column_separator='|', styler=Styler(),
+                                     auto_reformat=False)
+        formatter._args.query = query
+        return formatter
+
+    def create_pages(self, pages, resume_token=None):
+        response = mock.Mock(spec=PageIterator)
+        response.__iter__ = mock.Mock(return_value=iter(pages))
+        response.result_keys = [jmespath.compile('Users')]
+        response.non_aggregate_part = {}
+        response.resume_token = resume_token
+        response.build_full_result.return_value = {
+            'Users': [user for page in pages for user in page['Users']]}
+        return response
+
+    def create_users(self, start, end):
+        return {'Users': [{'UserName': 'user-%s' % i, 'Path': '/'}
+                          for i in range(start, end)]}
+
+    def format(self, formatter, response):
+        stream = six.StringIO()
+        formatter('ListUsers', response, stream=stream)
+        return stream.getvalue()
+
+    def test_buffered_pages_render_full_table(self):
+        pages = [self.create_users(0, 2), self.create_users(2, 4)]
+        expected = self.format(
+            self.create_formatter(),
+            {'Users': [user for page in pages for user in page['Users']]})
+        rendered = self.format(self.create_formatter(),
+                               self.create_pages(pages))
+        self.assertEqual(rendered, expected)
+
+    def test_rows_after_buffer_are_streamed(self):
+        formatter = self.create_formatter()
+        formatter.MAX_BUFFERED_ROWS = 2
+        pages = [self.create_users(0, 3), self.create_users(3, 5),
+                 self.create_users(10, 12)]
+        rendered = self.format(formatter, self.create_pages(pages))
+        self.assertEqual(
+            rendered,
+            '------------------------\n'
+            '|       ListUsers      |\n'
+            '+----------------------+\n'
+            '||        Users       ||\n'
+            '|+-------+------------+|\n'
+            '|| Path  | UserName   ||\n'
+            '|+-------+------------+|\n'
+            '||  /    |  user-0    ||\n'
+            '||  /    |  user-1    ||\n'
+            '||  /    |  user-2    ||\n'
+            '||  /    |  user-3    ||\n'
+            '||  /    |  user-4    ||\n'
+            '||  /    |  user-10   ||\n'
+            '||  /    |  user-11   ||\n'
+            '|+-------+------------+|\n')
+
+    def test_new_keys_in_later_page_start_new_section(self):
+        formatter = self.create_formatter()
+        formatter.MAX_BUFFERED_ROWS = 1
+        pages = [self.create_users(0, 2),
+                 {'Users': [{'UserName': 'user-2', 'Path': '/',
+                             'UserId': 'id'}]}]
+        rendered = self.format(formatter, self.create_pages(pages))
+        self.assertEqual(rendered.count('||        Users       ||'), 2)
+        self.assertIn('UserId', rendered)
+
+    def test_resume_token_rendered_after_streamed_rows(self):
+        formatter = self.create_formatter()
+        formatter.MAX_BUFFERED_ROWS = 1
+        pages = [self.create_users(0, 2), self.create_users(2, 4)]
+        rendered = self.format(formatter, self.create_pages(pages, 'token'))
+        self.assertTrue(rendered.endswith('|  NextToken |  token  |\n'
+                                          '+------------+---------+\n'))
+
+    def test_query_uses_full_result(self):
+        formatter = self.create_formatter(
+            query=jmespath.compile('Users[].UserName'))
+        formatter.MAX_BUFFERED_ROWS = 1
+        response = self.create_pages([self.create_users(0, 2),
+                                      self.create_users(2, 4)])
+        self.format(formatter, response)
+        self.assertTrue(response.build_full_result.called)
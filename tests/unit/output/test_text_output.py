@@ -23,7 +23,10 @@ from awscli.compat import six
 from six.moves import cStringIO
 import mock
 
-from awscli.formatter import Formatter
+import jmespath
+from botocore.paginate import PageIterator
+
+from awscli.formatter import Formatter, TextFormatter
 
 
 class TestListUsers(BaseAWSCommandParamsTest):
@@ -77,6 +80,49 @@ class TestListUsers(BaseAWSCommandParamsTest):
             'ENGINEDEFAULTS\tNone\n')
 
 
+class FakeArgs(object):
+    def __init__(self, query=None):
+        self.query = query
+
+
+class TestTextFormatter(unittest.TestCase):
+    def create_pages(self, pages):
+        response = mock.Mock(spec=PageIterator)
+        response.__iter__ = mock.Mock(return_value=iter(pages))
+        response.result_keys = [jmespath.compile('Users')]
+        response.resume_token = None
+        return response
+
+    def test_writes_each_page_with_single_write(self):
+        stream = mock.Mock()
+        formatter = TextFormatter(FakeArgs())
+        formatter('list-users', self.create_pages([
+            {'Users': [{'UserName': 'a', 'Path': '/'},
+                       {'UserName': 'b', 'Path': '/'}]},
+            {'Users': [{'UserName': 'c', 'Path': '/'}]},
+        ]), stream)
+        self.assertEqual(
+            stream.write.call_args_list,
+            [mock.call('USERS\t/\ta\nUSERS\t/\tb\n'),
+             mock.call('USERS\t/\tc\n')])
+
+    def test_query_applied_to_each_page(self):
+        stream = six.StringIO()
+        formatter = TextFormatter(
+            FakeArgs(jmespath.compile('Users[].UserName')))
+        formatter('list-users', self.create_pages([
+            {'Users': [{'UserName': 'a'}, {'UserName': 'b'}]},
+            {'Users': [{'UserName': 'c'}]},
+        ]), stream)
+        self.assertEqual(stream.getvalue(), 'a\tb\nc\n')
+
+    def test_writer_reused_for_same_command(self):
+        formatter = TextFormatter(FakeArgs())
+        writer = formatter._get_text_writer('list-users')
+        self.assertIs(formatter._get_text_writer('list-users'), writer)
+        self.assertIsNot(formatter._get_text_writer('list-groups'), writer)
+
+
 class CustomFormatter(Formatter):
     def __call__(self, operation, response, stream=None):
         self.stream = self._get_default_stream()
@@ -386,6 +386,42 @@ class TestParamShorthand(BaseArgProcessTest):
         with self.assertRaisesRegexp(ParamError, error_msg):
             self.simplify(p, ['ParameterKey=key,ParameterValue="foo,bar\''])
 
+    def test_repeated_list_elements_parsed_once(self):
+        p = self.get_param_model('ec2.RunInstances.BlockDeviceMappings')
+        value = 'DeviceName=/dev/sdb,Ebs={VolumeSize=100}'
+        with mock.patch.object(self.simplify._parser, 'parse',
+                               wraps=self.simplify._parser.parse) as parse:
+            returned = self.simplify(p, [value] * 3)
+            self.simplify(p, [value])
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(returned, [
+            {'DeviceName': '/dev/sdb', 'Ebs': {'VolumeSize': 100}}] * 3)
+
+    def test_cached_values_are_copies(self):
+        p = self.get_param_model('ec2.RunInstances.BlockDeviceMappings')
+        value = 'DeviceName=/dev/sdb,Ebs={VolumeSize=100}'
+        returned = self.simplify(p, [value, value])
+        returned[0]['Ebs']['VolumeSize'] = 1
+        self.assertEqual(returned[1]['Ebs']['VolumeSize'], 100)
+        self.assertEqual(self.simplify(p, [value])[0]['Ebs']['VolumeSize'],
+                         100)
+
+    def test_cache_is_per_argument_model(self):
+        p = self.get_param_model(
+            'elasticbeanstalk.CreateConfigurationTemplate.SourceConfiguration')
+        other = self.get_param_model(
+            'elasticbeanstalk.CreateEnvironment.Tags')
+        self.assertEqual(self.simplify(p, 'ApplicationName=foo'),
+                         {'ApplicationName': 'foo'})
+        self.assertEqual(self.simplify(other, ['Key=foo,Value=bar']),
+                         [{'Key': 'foo', 'Value': 'bar'}])
+
+    def test_parse_errors_are_not_cached(self):
+        p = self.get_param_model('ec2.RunInstances.BlockDeviceMappings')
+        for _ in range(2):
+            with self.assertRaises(ParamError):
+                self.simplify(p, ['DeviceName=/dev/sdb,Ebs={'])
+
 
 class TestParamShorthandCustomArguments(BaseArgProcessTest):
 
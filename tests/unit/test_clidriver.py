@@ -12,6 +12,7 @@
 # language governing permissions and limitations under the License.
 from awscli.testutils import unittest
 from awscli.testutils import BaseAWSCommandParamsTest
+from awscli.testutils import FileCreator
 import logging
 
 import mock
@@ -30,6 +31,7 @@ from awscli.clidriver import ServiceCommand
 from awscli.clidriver import ServiceOperation
 from awscli.customizations.commands import BasicCommand
 from awscli import formatter
+from awscli import paramfile
 from awscli.argparser import HELP_BLURB
 from botocore.hooks import HierarchicalEmitter
 
@@ -752,13 +754,49 @@ class TestHTTPParamFileDoesNotExist(BaseAWSCommandParamsTest):
         error_msg = ("Error parsing parameter '--filters': "
                      "Unable to retrieve http://does/not/exist.json: "
                      "received non 200 status code of 404")
-        with mock.patch('botocore.vendored.requests.get') as get:
+        with mock.patch('awscli.paramfile.get_http_session') as session:
+            get = session.return_value.get
             get.return_value.status_code = 404
             self.assert_params_for_cmd(
                 'ec2 describe-instances --filters http://does/not/exist.json',
                 expected_rc=255, stderr_contains=error_msg)
 
 
+class TestParamFilePrefetch(BaseAWSCommandParamsTest):
+    def setUp(self):
+        super(TestParamFilePrefetch, self).setUp()
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.load_patch = mock.patch('awscli.paramfile._load_paramfile',
+                                     side_effect=paramfile._load_paramfile)
+        self.load_mock = self.load_patch.start()
+        self.addCleanup(self.load_patch.stop)
+
+    def test_resources_of_arguments_are_loaded_once(self):
+        filters = self.files.create_file(
+            'filters.json', '[{"Name": "foo", "Values": ["bar"]}]')
+        input_json = self.files.create_file(
+            'input.json', '{"InstanceIds": ["i-12345"]}')
+        self.assert_params_for_cmd(
+            'ec2 describe-instances --filters file://%s '
+            '--cli-input-json file://%s' % (filters, input_json),
+            {'Filters': [{'Name': 'foo', 'Values': ['bar']}],
+             'InstanceIds': ['i-12345']})
+        self.assertEqual(
+            sorted(call[0][0] for call in self.load_mock.call_args_list),
+            ['file://' + filters, 'file://' + input_json])
+
+    def test_disabled_arguments_are_not_prefetched(self):
+        body = self.files.create_file('body.txt', 'message')
+        self.assert_params_for_cmd(
+            'sqs send-message --queue-url http://queue.url '
+            '--message-body file://%s' % body,
+            {'QueueUrl': 'http://queue.url', 'MessageBody': 'message'})
+        self.assertEqual(
+            [call[0][0] for call in self.load_mock.call_args_list],
+            ['file://' + body])
+
+
 class TestVerifyArgument(BaseAWSCommandParamsTest):
     def setUp(self):
         super(TestVerifyArgument, self).setUp()
@@ -0,0 +1,100 @@
+# Copyright 2016 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import mock
+from botocore.client import Config
+
+from awscli.testutils import unittest
+from awscli.clientcache import ClientCache, create_client, get_client_cache
+
+
+class TestClientCache(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock()
+        self.session.create_client.side_effect = \
+            lambda *args, **kwargs: mock.Mock()
+        self.cache = ClientCache(self.session)
+
+    def test_reuses_client(self):
+        client = self.cache.get_client('emr', region_name='us-west-2')
+        self.assertIs(
+            self.cache.get_client('emr', region_name='us-west-2'), client)
+        self.session.create_client.assert_called_once_with(
+            'emr', region_name='us-west-2', endpoint_url=None, verify=None,
+            config=None)
+        self.assertEqual(self.cache.created, 1)
+        self.assertEqual(self.cache.reused, 1)
+
+    def test_clients_are_keyed_by_arguments(self):
+        clients = [
+            self.cache.get_client('emr', region_name='us-west-2'),
+            self.cache.get_client('s3', region_name='us-west-2'),
+            self.cache.get_client('emr', region_name='us-east-1'),
+            self.cache.get_client('emr', region_name='us-west-2',
+                                  endpoint_url='https://example.com'),
+            self.cache.get_client('emr', region_name='us-west-2',
+                                  verify=False),
+            self.cache.get_client('emr', region_name='us-west-2',
+                                  config=Config(signature_version='v4')),
+        ]
+        self.assertEqual(len(set(id(client) for client in clients)), 6)
+
+    def test_equal_configs_share_client(self):
+        client = self.cache.get_client(
+            's3', config=Config(signature_version='s3v4'))
+        self.assertIs(
+            self.cache.get_client(
+                's3', config=Config(signature_version='s3v4')),
+            client)
+
+    def test_new_credentials_create_new_client(self):
+        self.session.get_credentials.return_value = mock.Mock()
+        client = self.cache.get_client('emr')
+        self.session.get_credentials.return_value = mock.Mock()
+        self.assertIsNot(self.cache.get_client('emr'), client)
+
+    def test_removes_error_handler_from_separate_client(self):
+        client = self.cache.get_client('s3')
+        no_handler_client = self.cache.get_client(
+            's3', remove_error_handler=True)
+        self.assertIsNot(no_handler_client, client)
+        self.assertIs(
+            self.cache.get_client('s3', remove_error_handler=True),
+            no_handler_client)
+        no_handler_client.meta.events.unregister.assert_called_once_with(
+            'after-call', unique_id='awscli-error-handler')
+        self.assertFalse(client.meta.events.unregister.called)
+
+    def test_clear(self):
+        client = self.cache.get_client('emr')
+        self.cache.clear()
+        self.assertIsNot(self.cache.get_client('emr'), client)
+
+
+class TestCreateClient(unittest.TestCase):
+    def test_cache_is_per_session(self):
+        session = mock.Mock()
+        other_session = mock.Mock()
+        self.assertIs(get_client_cache(session), get_client_cache(session))
+        self.assertIsNot(get_client_cache(session),
+                         get_client_cache(other_session))
+
+    def test_create_client_uses_session_cache(self):
+        session = mock.Mock()
+        client = create_client(session, 'emr', region_name='us-west-2')
+        self.assertIs(create_client(session, 'emr', region_name='us-west-2'),
+                      client)
+        self.assertEqual(session.create_client.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,7 +21,8 @@ import mock
 
 from awscli.help import PosixHelpRenderer, ExecutableNotFoundError
 from awscli.help import WindowsHelpRenderer, ProviderHelpCommand, HelpCommand
-from awscli.help import TopicListerCommand, TopicHelpCommand
+from awscli.help import TopicListerCommand, TopicHelpCommand, HelpCache
+from awscli.help import PagingHelpRenderer
 from awscli.argparser import HELP_BLURB
 
 
@@ -138,6 +139,84 @@ class TestHelpPager(unittest.TestCase):
         self.assertEqual(last_call, mock.call(input='send to pager'))
 
 
+class TestHelpCache(unittest.TestCase):
+    def setUp(self):
+        self.file_creator = FileCreator()
+        self.addCleanup(self.file_creator.remove_all)
+        self.cache = HelpCache(
+            os.path.join(self.file_creator.rootdir, 'help'))
+
+    def test_missing_key(self):
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_set_and_get(self):
+        self.cache.set('key', b'output')
+        self.assertEqual(self.cache.get('key'), b'output')
+        self.assertIsNone(self.cache.get('other-key'))
+
+    def test_set_replaces_output(self):
+        self.cache.set('key', b'output')
+        self.cache.set('key', b'new output')
+        self.assertEqual(self.cache.get('key'), b'new output')
+
+    def test_other_versions_are_removed(self):
+        root_dir = os.path.join(self.file_creator.rootdir, 'help')
+        old_cache = HelpCache(root_dir, version='1.0.0-1.0.0')
+        old_cache.set('key', b'old output')
+        self.cache.set('key', b'output')
+        self.assertIsNone(old_cache.get('key'))
+        self.assertEqual(self.cache.get('key'), b'output')
+        self.assertEqual(len(os.listdir(root_dir)), 1)
+
+    def test_least_recently_used_entries_are_removed(self):
+        self.cache.MAX_ENTRIES = 2
+        for i, key in enumerate(['a', 'b', 'c']):
+            if key == 'c':
+                # Make 'a' the most recently used entry.
+                self.assertEqual(self.cache.get('a'), b'a')
+            self.cache.set(key, key.encode('utf-8'))
+            path = self.cache._get_path(key)
+            os.utime(path, (i * 10, i * 10))
+        self.assertEqual(self.cache.get('a'), b'a')
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), b'c')
+
+
+class TestCachedHelpRenderer(unittest.TestCase):
+    def setUp(self):
+        self.file_creator = FileCreator()
+        self.addCleanup(self.file_creator.remove_all)
+        self.renderer = FakePosixHelpRenderer()
+        self.renderer.exists_on_path['groff'] = True
+        self.renderer.mock_popen.communicate.return_value = (b'rendered', b'')
+        self.renderer.help_cache = HelpCache(self.file_creator.rootdir)
+
+    def test_not_cached(self):
+        self.assertFalse(self.renderer.render_cached('key'))
+        self.assertEqual(self.renderer.popen_calls, [])
+
+    def test_renders_cached_output(self):
+        self.renderer.render('foo', cache_key='key')
+        self.renderer.popen_calls = []
+        self.assertTrue(self.renderer.render_cached('key'))
+        # Only the pager is run.
+        self.assertEqual(len(self.renderer.popen_calls), 1)
+        self.assertEqual(self.renderer.popen_calls[0][0], (['less', '-R'],))
+        last_call = self.renderer.mock_popen.communicate.call_args_list[-1]
+        self.assertEqual(last_call, mock.call(input=b'rendered'))
+
+    def test_output_is_cached_by_terminal_width(self):
+        self.renderer.render('foo', cache_key='key')
+        with mock.patch('awscli.help.determine_terminal_width',
+                        return_value=1000):
+            self.assertFalse(self.renderer.render_cached('key'))
+
+    def test_render_without_cache(self):
+        self.renderer.help_cache = None
+        self.renderer.render('foo', cache_key='key')
+        self.assertFalse(self.renderer.render_cached('key'))
+
+
 class TestHelpCommandBase(unittest.TestCase):
     def setUp(self):
         self.session = mock.Mock()
@@ -180,6 +259,59 @@ class TestHelpCommand(TestHelpCommandBase):
         self.doc_handler_mock.assert_called_with(self.cmd)
         self.assertTrue(self.renderer.render.called)
 
+    def test_renders_from_cache(self):
+        renderer = FakePosixHelpRenderer()
+        renderer.exists_on_path['groff'] = True
+        renderer.mock_popen.communicate.return_value = (b'rendered', b'')
+        renderer.help_cache = HelpCache(self.file_creator.rootdir)
+        self.session.full_config = {'plugins': {'foo': 'bar'}}
+        self.session.get_component.return_value.search_paths = []
+        self.cmd.renderer = renderer
+        with mock.patch('awscli.help.docevents') as docevents:
+            self.cmd([], None)
+            self.cmd([], None)
+            self.assertEqual(docevents.generate_events.call_count, 1)
+            self.session.full_config = {'plugins': {'foo': 'baz'}}
+            self.cmd([], None)
+            self.assertEqual(docevents.generate_events.call_count, 2)
+
+    def test_renders_with_renderer_without_cache(self):
+        rendered = []
+
+        class ContentsOnlyRenderer(PagingHelpRenderer):
+            def __init__(self):
+                pass
+
+            def render(self, contents):
+                rendered.append(contents)
+
+        self.cmd.renderer = ContentsOnlyRenderer()
+        with mock.patch('awscli.help.docevents'):
+            self.cmd([], None)
+        self.assertEqual(len(rendered), 1)
+
+    def test_cache_key_changes_with_model_files(self):
+        models_dir = os.path.join(self.file_creator.rootdir, 'models')
+        model_file = self.file_creator.create_file(
+            os.path.join('models', 'foo', '2016-01-01', 'service-2.json'),
+            '{}')
+        self.session.full_config = {}
+        self.session.get_component.return_value.search_paths = [models_dir]
+        cache_key = self.cmd._get_cache_key()
+        self.assertEqual(self.cmd._get_cache_key(), cache_key)
+        os.utime(model_file, (0, 0))
+        self.assertNotEqual(self.cmd._get_cache_key(), cache_key)
+
+    def test_cache_key_changes_with_plugin_code(self):
+        plugin_file = self.file_creator.create_file('myplugin.py', '')
+        plugin_module = mock.Mock(__file__=plugin_file)
+        self.session.full_config = {'plugins': {'myplugin': 'myplugin'}}
+        self.session.get_component.return_value.search_paths = []
+        with mock.patch.dict('sys.modules', {'myplugin': plugin_module}):
+            cache_key = self.cmd._get_cache_key()
+            os.utime(plugin_file, (0, 0))
+            self.assertNotEqual(self.cmd._get_cache_key(), cache_key)
+
     def test_invalid_subcommand(self):
         with mock.patch('sys.stderr') as f:
             with self.assertRaises(SystemExit):
@@ -17,6 +17,7 @@ from awscli.compat import six
 from awscli.testutils import unittest, FileCreator
 from awscli.testutils import skip_if_windows
 
+from awscli import paramfile
 from awscli.paramfile import get_paramfile, ResourceLoadingError
 
 
@@ -65,8 +66,9 @@ class TestParamFile(unittest.TestCase):
 
 class TestHTTPBasedResourceLoading(unittest.TestCase):
     def setUp(self):
-        self.requests_patch = mock.patch('awscli.paramfile.requests')
-        self.requests_mock = self.requests_patch.start()
+        self.requests_patch = mock.patch(
+            'awscli.paramfile.get_http_session')
+        self.requests_mock = self.requests_patch.start().return_value
         self.response = mock.Mock(status_code=200)
         self.requests_mock.get.return_value = self.response
 
@@ -94,3 +96,72 @@ class TestHTTPBasedResourceLoading(unittest.TestCase):
         self.requests_mock.get.side_effect = Exception("Connection error.")
         with self.assertRaisesRegexp(ResourceLoadingError, 'foo\.bar\.baz'):
             get_paramfile('https://foo.bar.baz')
+
+
+class TestHTTPSession(unittest.TestCase):
+    def test_session_is_shared(self):
+        self.assertIs(paramfile.get_http_session(),
+                      paramfile.get_http_session())
+
+    def test_session_keeps_connections_for_concurrent_loads(self):
+        adapter = paramfile.get_http_session().get_adapter('https://foo')
+        self.assertEqual(adapter._pool_maxsize,
+                         paramfile.MAX_CONCURRENT_LOADS)
+
+
+class TestParamFileCache(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = self.files.create_file('foo', 'contents')
+        self.load_patch = mock.patch('awscli.paramfile._load_paramfile',
+                                     side_effect=paramfile._load_paramfile)
+        self.load_mock = self.load_patch.start()
+        self.addCleanup(self.load_patch.stop)
+
+    def test_resource_is_loaded_once(self):
+        with paramfile.ParamFileCache():
+            self.assertEqual(get_paramfile('file://' + self.filename),
+                             'contents')
+            self.assertEqual(get_paramfile('file://' + self.filename),
+                             'contents')
+        self.assertEqual(self.load_mock.call_count, 1)
+
+    def test_resource_is_loaded_again_once_inactive(self):
+        with paramfile.ParamFileCache():
+            get_paramfile('file://' + self.filename)
+        get_paramfile('file://' + self.filename)
+        self.assertEqual(self.load_mock.call_count, 2)
+
+    def test_non_resource_uris_are_not_cached(self):
+        with paramfile.ParamFileCache():
+            self.assertIsNone(get_paramfile('foobar://somewhere.bar'))
+            self.assertIsNone(get_paramfile(100))
+        self.assertFalse(self.load_mock.called)
+
+    def test_errors_are_cached(self):
+        path = 'file://' + self.filename + '-does-not-exist'
+        with paramfile.ParamFileCache():
+            for _ in range(2):
+                with self.assertRaises(ResourceLoadingError):
+                    get_paramfile(path)
+        self.assertEqual(self.load_mock.call_count, 1)
+
+    def test_prefetch_loads_resources(self):
+        other_filename = self.files.create_file('bar', 'other contents')
+        paths = ['file://' + self.filename, 'file://' + other_filename,
+                 'file://' + self.filename + '-does-not-exist',
+                 'not a resource', None, ['file://' + self.filename]]
+        with paramfile.ParamFileCache() as cache:
+            cache.prefetch(paths)
+            self.assertEqual(self.load_mock.call_count, 3)
+            self.assertEqual(get_paramfile('file://' + other_filename),
+                             'other contents')
+            with self.assertRaises(ResourceLoadingError):
+                get_paramfile(paths[2])
+        self.assertEqual(self.load_mock.call_count, 3)
+
+    def test_prefetch_does_not_load_single_resource(self):
+        with paramfile.ParamFileCache() as cache:
+            cache.prefetch(['file://' + self.filename])
+            self.assertFalse(self.load_mock.called)
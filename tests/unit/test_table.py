@@ -21,7 +21,9 @@
 #
 import unittest
 
-from awscli.table import Section, MultiTable, convert_to_vertical_table
+from awscli.compat import six
+from awscli.table import Section, MultiTable, Styler, \
+    convert_to_vertical_table
 
 
 class TestSection(unittest.TestCase):
@@ -123,5 +125,84 @@ class TestVerticalTableConversion(unittest.TestCase):
             [['key1', 'val1'], ['key2', 'val2'], ['key3', 'val3']])
 
 
+class TestMultiTableFlush(unittest.TestCase):
+    def setUp(self):
+        self.table = MultiTable(terminal_width=80, initial_section=False,
+                                styler=Styler())
+        self.stream = six.StringIO()
+
+    def create_table(self):
+        table = MultiTable(terminal_width=80, initial_section=False,
+                           styler=Styler())
+        table.new_section('foo')
+        table.new_section('bar', indent_level=1)
+        table.add_row_header(['one', 'two'])
+        return table
+
+    def render(self, table):
+        stream = six.StringIO()
+        table.render(stream)
+        return stream.getvalue()
+
+    def test_flushed_table_renders_the_same(self):
+        expected = self.create_table()
+        expected.add_row(['a', 'b'])
+        expected.add_row(['c', 'd'])
+        expected.add_row(['e', 'f'])
+        table = self.create_table()
+        table.add_row(['a', 'b'])
+        table.add_row(['c', 'd'])
+        table.flush(self.stream)
+        table.add_row(['e', 'f'])
+        table.render(self.stream)
+        self.assertEqual(self.stream.getvalue(), self.render(expected))
+
+    def test_flush_forgets_rendered_rows(self):
+        table = self.create_table()
+        table.add_row(['a', 'b'])
+        table.add_row(['c', 'd'])
+        table.flush(self.stream)
+        self.assertEqual(table.current_section.rows, [])
+        self.assertTrue(self.stream.getvalue().endswith(
+            '||  c   |  d    ||\n'))
+
+    def test_column_widths_fixed_on_first_flush(self):
+        table = self.create_table()
+        table.add_row(['a', 'b'])
+        table.add_row(['c', 'd'])
+        table.flush(self.stream)
+        table.add_row(['longer', 'e'])
+        table.render(self.stream)
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(lines[-3], '||  c   |  d    ||')
+        self.assertEqual(lines[-2], '||longer|  e    ||')
+        self.assertEqual(lines[-1], '|+------+-------+|')
+
+    def test_single_row_section_held_back(self):
+        table = self.create_table()
+        table.add_row(['a', 'b'])
+        table.flush(self.stream)
+        # Only the top border and the first section are written.
+        self.assertEqual(self.stream.getvalue().count('\n'), 3)
+        self.assertEqual(len(table.current_section.rows), 1)
+
+    def test_new_sections_rendered_on_next_flush(self):
+        table = self.create_table()
+        table.add_row(['a', 'b'])
+        table.add_row(['c', 'd'])
+        table.flush(self.stream)
+        table.new_section('baz')
+        table.add_row(['e', 'f'])
+        table.add_row(['g', 'h'])
+        table.flush(self.stream)
+        rendered = self.stream.getvalue()
+        self.assertIn('|+------+-------+|\n|       baz      |\n', rendered)
+        self.assertTrue(rendered.endswith('|  g    |  h     |\n'))
+
+    def test_flush_empty_table(self):
+        self.table.flush(self.stream)
+        self.assertEqual(self.stream.getvalue(), '')
+
+
 if __name__ == '__main__':
     unittest.main()
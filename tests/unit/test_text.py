@@ -221,5 +221,70 @@ class TestSection(unittest.TestCase):
         )
 
 
+class TestTextWriter(unittest.TestCase):
+    def setUp(self):
+        self.writer = text.TextWriter()
+
+    def write(self, data):
+        stream = six.StringIO()
+        self.writer.write(data, stream)
+        return stream.getvalue()
+
+    def test_writes_each_call_with_single_write(self):
+        stream = mock.Mock()
+        self.writer.write(
+            {'foo': [dict(a=1, b=2), dict(a=3, b=4)], 'bar': 'baz'}, stream)
+        stream.write.assert_called_once_with(
+            'baz\n'
+            'FOO\t1\t2\n'
+            'FOO\t3\t4\n')
+
+    def test_nothing_written_for_empty_data(self):
+        stream = mock.Mock()
+        self.writer.write({'foo': []}, stream)
+        self.assertFalse(stream.write.called)
+
+    def test_reused_for_multiple_pages(self):
+        self.assertEqual(self.write({'foo': [dict(a=1, b=[1])]}),
+                         'FOO\t1\nB\t1\n')
+        # The layout of the first page does not leak into the next
+        # pages even if the same keys have different types.
+        self.assertEqual(self.write({'foo': [dict(a=[2], b=2)]}),
+                         'FOO\t2\nA\t2\n')
+        self.assertEqual(self.write({'foo': [dict(a=3, b=[3]), dict(c=4)]}),
+                         'FOO\t3\t\nB\t3\nFOO\t\t4\n')
+
+    def test_same_output_as_format_text(self):
+        data = {'Reservations': [
+            {'ReservationId': 'r-1', 'Instances': [
+                {'InstanceId': 'i-1', 'State': {'Name': 'running'},
+                 'Tags': [{'Key': 'Name', 'Value': 'a'}]}]},
+            {'ReservationId': 'r-2', 'Instances': [
+                {'InstanceId': 'i-2', 'State': {'Name': 'stopped'},
+                 'Tags': []}]},
+        ]}
+        stream = six.StringIO()
+        text.format_text(data, stream)
+        self.assertEqual(self.write(data), stream.getvalue())
+        self.assertEqual(self.write(data), stream.getvalue())
+
+    def test_layout_caches_are_bounded(self):
+        # Map shaped dicts have different keys in every item.
+        items = [{'key%s' % i: 'value', 'Nested': [{'key%s' % i: i}]}
+                 for i in range(20)]
+        with mock.patch('awscli.text.MAX_CACHED_LAYOUTS', 5):
+            self.write({'Items': items})
+            output = self.write({'Items': items})
+        self.assertIn('NESTED\t19\n', output)
+        self.assertEqual(len(self.writer._list_layouts), 5)
+        for layout in self.writer._list_layouts.values():
+            self.assertLessEqual(len(layout._remaining_keys), 5)
+        maps = [{'key%s' % i: 'value'} for i in range(20)]
+        with mock.patch('awscli.text.MAX_CACHED_LAYOUTS', 5):
+            for item in maps:
+                self.assertEqual(self.write(item), 'value\n')
+        self.assertEqual(len(self.writer._sorted_keys), 5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,7 @@
 # IN THE SOFTWARE.
 #
 import json
+import os
 
 import mock
 
@@ -97,6 +98,17 @@ class TestTopicTagDBGeneral(TestTopicTagDB):
             source_files
         )
 
+    def test_get_all_topic_source_files_ignore_compiled_index(self):
+        source_files = [self.file_creator.create_file('mytopic', '')]
+        index_file = self.file_creator.create_file('topic-tags.json', '')
+        self.file_creator.create_file('topic-tags.index.json', '')
+        self.topic_tag_db = TopicTagDB(index_file=index_file,
+                                       topic_dir=self.file_creator.rootdir)
+        self.assertCountEqual(
+            self.topic_tag_db.get_all_topic_src_files(),
+            source_files
+        )
+
     def test_get_all_topic_source_files_ignore_hidden(self):
         topic_filename = 'mytopic'
         hidden_filename = '.' + topic_filename
@@ -393,6 +405,68 @@ class TestTopicTagDBQuery(TestTopicTagDB):
                               {'foo': ['topic-name-1'],
                                'bar': ['topic-name-1', 'topic-name-2']})
 
+    def test_query_after_adding_tags(self):
+        self.topic_tag_db = TopicTagDB({'topic-name-1': {'category': ['foo']}})
+        self.assertEqual(self.topic_tag_db.query('category'),
+                         {'foo': ['topic-name-1']})
+        self.topic_tag_db._add_tag_to_dict('topic-name-2', 'category', ['foo'])
+        self.assertEqual(self.topic_tag_db.query('category'),
+                         {'foo': ['topic-name-1', 'topic-name-2']})
+
+    def test_query_result_does_not_change_index(self):
+        self.topic_tag_db = TopicTagDB({'topic-name-1': {'category': ['foo']}})
+        self.topic_tag_db.query('category')['foo'].append('topic-name-2')
+        self.assertEqual(self.topic_tag_db.query('category'),
+                         {'foo': ['topic-name-1']})
+
+    def test_save_and_load_compiled_index(self):
+        tag_dict = {
+            'topic-name-1': {
+                'category': ['foo', 'bar'],
+                'title': ['First']
+            },
+            'topic-name-2': {
+                'category': ['bar'],
+                'title': ['Second']
+            }
+        }
+        json_index = self.file_creator.create_file('index.json', '')
+        self.topic_tag_db = TopicTagDB(tag_dict, index_file=json_index)
+        self.topic_tag_db.save_compiled_index()
+        self.assertEqual(
+            self.topic_tag_db.compiled_index_file,
+            os.path.join(self.file_creator.rootdir, 'index.index.json'))
+
+        loaded_db = TopicTagDB(index_file=json_index)
+        loaded_db.load_index()
+        self.assertCountEqual(loaded_db.get_all_topic_names(),
+                              ['topic-name-1', 'topic-name-2'])
+        self.assertEqual(loaded_db.get_tag_single_value('topic-name-2',
+                                                        'title'), 'Second')
+        self.assertEqual(loaded_db.query('category'),
+                         {'foo': ['topic-name-1'],
+                          'bar': ['topic-name-1', 'topic-name-2']})
+
+    def test_load_index_without_compiled_index(self):
+        tag_dict = {'topic-name-1': {'category': ['foo']}}
+        json_index = self.file_creator.create_file(
+            'index.json', json.dumps(tag_dict))
+        self.topic_tag_db = TopicTagDB(index_file=json_index)
+        self.topic_tag_db.load_index()
+        self.assertEqual(self.topic_tag_db.query('category'),
+                         {'foo': ['topic-name-1']})
+
+    def test_compiled_index_is_up_to_date(self):
+        # The compiled index of the CLI must be generated again by
+        # scripts/make-topic-index whenever the JSON index changes.
+        json_db = TopicTagDB()
+        json_db.load_json_index()
+        compiled_db = TopicTagDB()
+        compiled_db.load_compiled_index()
+        self.assertEqual(compiled_db._tag_dictionary, json_db._tag_dictionary)
+        for tag in TopicTagDB.VALID_TAGS:
+            self.assertEqual(compiled_db.query(tag), json_db.query(tag))
+
     def topic_query_with_non_existant_tag(self):
         tag_dict = {
             'topic-name-1': {
@@ -15,7 +15,7 @@ import platform
 import os
 
 from awscli.testutils import unittest, skip_if_windows
-from awscli.utils import split_on_commas, ignore_ctrl_c
+from awscli.utils import split_on_commas, ignore_ctrl_c, LRUCache
 
 
 class TestCSVSplit(unittest.TestCase):
@@ -100,3 +100,44 @@ class TestIgnoreCtrlC(unittest.TestCase):
             # And if we actually try to sigint ourselves, an exception
             # should not propogate.
             os.kill(os.getpid(), signal.SIGINT)
+
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(max_size=2)
+
+    def test_get_missing_key(self):
+        self.assertIsNone(self.cache.get('foo'))
+        self.assertEqual(self.cache.get('foo', 'default'), 'default')
+
+    def test_put_and_get(self):
+        self.cache.put('foo', 1)
+        self.assertEqual(self.cache.get('foo'), 1)
+        self.assertIn('foo', self.cache)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_evicts_least_recently_used_entry(self):
+        self.cache.put('foo', 1)
+        self.cache.put('bar', 2)
+        self.cache.put('baz', 3)
+        self.assertNotIn('foo', self.cache)
+        self.assertEqual(self.cache.get('bar'), 2)
+        self.assertEqual(self.cache.get('baz'), 3)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_get_refreshes_entry(self):
+        self.cache.put('foo', 1)
+        self.cache.put('bar', 2)
+        self.cache.get('foo')
+        self.cache.put('baz', 3)
+        self.assertIn('foo', self.cache)
+        self.assertNotIn('bar', self.cache)
+
+    def test_put_existing_key_replaces_and_refreshes_entry(self):
+        self.cache.put('foo', 1)
+        self.cache.put('bar', 2)
+        self.cache.put('foo', 10)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.put('baz', 3)
+        self.assertEqual(self.cache.get('foo'), 10)
+        self.assertNotIn('bar', self.cache)